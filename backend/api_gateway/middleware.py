@@ -2,6 +2,7 @@
 API Gateway Middleware - Rate limiting, auth, and logging
 """
 
+import math
 import time
 import json
 from typing import Callable, Optional
@@ -33,31 +34,25 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         tenant_id = request.state.__dict__.get("tenant_id")
         
         if tenant_id:
-            allowed, retry_after = self.tenant_rate_limiter.check_rate_limit(
-                tenant_id, client_id
-            )
+            decision = self.tenant_rate_limiter.check(tenant_id, client_id)
         else:
-            allowed, retry_after = self.rate_limiter.check_rate_limit(client_id)
+            decision = self.rate_limiter.check(client_id)
+        retry_after = decision.retry_after
         
-        if not allowed:
+        if not decision.allowed:
             return JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": "Rate limit exceeded",
                     "retry_after": retry_after
                 },
-                headers={"Retry-After": str(int(retry_after or 1))}
+                headers={"Retry-After": str(max(1, math.ceil(retry_after or 1)))}
             )
         
         response = await call_next(request)
         
-        if tenant_id:
-            stats = self.tenant_rate_limiter.get_stats(tenant_id, client_id)
-        else:
-            stats = self.rate_limiter.get_stats(client_id)
-        
-        response.headers["X-RateLimit-Limit"] = str(stats["capacity"])
-        response.headers["X-RateLimit-Remaining"] = str(stats["tokens_available"])
+        response.headers["X-RateLimit-Limit"] = str(decision.limit)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
         
         return response
     
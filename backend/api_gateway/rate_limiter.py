@@ -2,116 +2,62 @@
 Rate Limiter - Token bucket algorithm with per-tenant limits
 """
 
-import time
 from typing import Dict, Optional
-from dataclasses import dataclass, field
-from threading import Lock
 
-
-@dataclass
-class TokenBucket:
-    """Token bucket for rate limiting"""
-    capacity: int
-    refill_rate: float  # tokens per second
-    tokens: float = field(init=False)
-    last_refill: float = field(init=False)
-    lock: Lock = field(default_factory=Lock, init=False)
-    
-    def __post_init__(self):
-        self.tokens = float(self.capacity)
-        self.last_refill = time.time()
-    
-    def consume(self, tokens: int = 1) -> bool:
-        """Try to consume tokens. Returns True if successful."""
-        with self.lock:
-            self._refill()
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-            return False
-    
-    def _refill(self):
-        """Refill tokens based on time elapsed"""
-        now = time.time()
-        elapsed = now - self.last_refill
-        self.tokens = min(
-            self.capacity,
-            self.tokens + (elapsed * self.refill_rate)
-        )
-        self.last_refill = now
-    
-    def get_wait_time(self, tokens: int = 1) -> float:
-        """Get time to wait before tokens are available"""
-        with self.lock:
-            self._refill()
-            if self.tokens >= tokens:
-                return 0.0
-            deficit = tokens - self.tokens
-            return deficit / self.refill_rate
+from backend.scaling.rate_limit_engine import RateLimitDecision, RateLimitEngine, get_rate_limit_engine
 
 
 class RateLimiter:
-    """Global rate limiter with per-IP limits"""
+    """Global rate limiter with per-IP limits (state lives in the shared RateLimitEngine)"""
     
     def __init__(
         self,
         requests_per_second: int = 100,
-        burst_size: int = 200
+        burst_size: int = 200,
+        namespace: str = "gateway",
+        engine: Optional[RateLimitEngine] = None
     ):
         self.requests_per_second = requests_per_second
         self.burst_size = burst_size
-        self.buckets: Dict[str, TokenBucket] = {}
-        self.lock = Lock()
+        self.namespace = namespace
+        self.engine = engine or get_rate_limit_engine()
+    
+    def check(self, client_id: str) -> RateLimitDecision:
+        """Consume one request for client and return the full decision"""
+        return self.engine.check(
+            f"{self.namespace}:{client_id}",
+            self.requests_per_second,
+            self.burst_size
+        )
     
     def check_rate_limit(self, client_id: str) -> tuple[bool, Optional[float]]:
         """
         Check if request is allowed for client.
         Returns (allowed, retry_after_seconds)
         """
-        bucket = self._get_bucket(client_id)
-        if bucket.consume():
-            return True, None
-        else:
-            wait_time = bucket.get_wait_time()
-            return False, wait_time
-    
-    def _get_bucket(self, client_id: str) -> TokenBucket:
-        """Get or create bucket for client"""
-        if client_id not in self.buckets:
-            with self.lock:
-                if client_id not in self.buckets:
-                    self.buckets[client_id] = TokenBucket(
-                        capacity=self.burst_size,
-                        refill_rate=self.requests_per_second
-                    )
-        return self.buckets[client_id]
+        decision = self.check(client_id)
+        return decision.allowed, decision.retry_after
     
     def get_stats(self, client_id: str) -> dict:
         """Get rate limit stats for client"""
-        if client_id not in self.buckets:
-            return {
-                "tokens_available": self.burst_size,
-                "capacity": self.burst_size,
-                "refill_rate": self.requests_per_second
-            }
-        
-        bucket = self.buckets[client_id]
-        with bucket.lock:
-            bucket._refill()
-            return {
-                "tokens_available": int(bucket.tokens),
-                "capacity": bucket.capacity,
-                "refill_rate": bucket.refill_rate
-            }
+        decision = self.engine.status(
+            f"{self.namespace}:{client_id}",
+            self.requests_per_second,
+            self.burst_size
+        )
+        return {
+            "tokens_available": decision.remaining,
+            "capacity": self.burst_size,
+            "refill_rate": self.requests_per_second
+        }
 
 
 class TenantRateLimiter:
     """Per-tenant rate limiter with configurable limits"""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[RateLimitEngine] = None):
         self.tenant_limits: Dict[str, tuple[int, int]] = {}  # tenant_id -> (rps, burst)
-        self.limiters: Dict[str, RateLimiter] = {}
-        self.lock = Lock()
+        self.engine = engine or get_rate_limit_engine()
         
         self.default_rps = 100
         self.default_burst = 200
@@ -123,10 +69,15 @@ class TenantRateLimiter:
         burst_size: int
     ):
         """Configure custom limits for a tenant"""
-        with self.lock:
-            self.tenant_limits[tenant_id] = (requests_per_second, burst_size)
-            if tenant_id in self.limiters:
-                del self.limiters[tenant_id]
+        self.tenant_limits[tenant_id] = (requests_per_second, burst_size)
+    
+    def _limits(self, tenant_id: str) -> tuple[int, int]:
+        return self.tenant_limits.get(tenant_id, (self.default_rps, self.default_burst))
+    
+    def check(self, tenant_id: str, client_id: str) -> RateLimitDecision:
+        """Consume one request for tenant + client and return the full decision"""
+        rps, burst = self._limits(tenant_id)
+        return self.engine.check(f"tenant:{tenant_id}:{client_id}", rps, burst)
     
     def check_rate_limit(
         self,
@@ -134,22 +85,15 @@ class TenantRateLimiter:
         client_id: str
     ) -> tuple[bool, Optional[float]]:
         """Check rate limit for tenant + client combination"""
-        limiter = self._get_limiter(tenant_id)
-        return limiter.check_rate_limit(f"{tenant_id}:{client_id}")
-    
-    def _get_limiter(self, tenant_id: str) -> RateLimiter:
-        """Get or create rate limiter for tenant"""
-        if tenant_id not in self.limiters:
-            with self.lock:
-                if tenant_id not in self.limiters:
-                    rps, burst = self.tenant_limits.get(
-                        tenant_id,
-                        (self.default_rps, self.default_burst)
-                    )
-                    self.limiters[tenant_id] = RateLimiter(rps, burst)
-        return self.limiters[tenant_id]
+        decision = self.check(tenant_id, client_id)
+        return decision.allowed, decision.retry_after
     
     def get_stats(self, tenant_id: str, client_id: str) -> dict:
         """Get rate limit stats for tenant + client"""
-        limiter = self._get_limiter(tenant_id)
-        return limiter.get_stats(f"{tenant_id}:{client_id}")
+        rps, burst = self._limits(tenant_id)
+        decision = self.engine.status(f"tenant:{tenant_id}:{client_id}", rps, burst)
+        return {
+            "tokens_available": decision.remaining,
+            "capacity": burst,
+            "refill_rate": rps
+        }
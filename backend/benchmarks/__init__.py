@@ -1,4 +1,8 @@
 """Benchmark suite package"""
 from .benchmark_suite import benchmark_suite, BenchmarkSuite, BenchmarkResult
+from .performance import PerformanceScenario, ScenarioSkipped, default_scenarios
 
-__all__ = ["benchmark_suite", "BenchmarkSuite", "BenchmarkResult"]
+__all__ = [
+    "benchmark_suite", "BenchmarkSuite", "BenchmarkResult",
+    "PerformanceScenario", "ScenarioSkipped", "default_scenarios",
+]
@@ -6,6 +6,8 @@ Provides regression detection through:
 - Critical path performance tests
 - Golden baseline comparisons
 - Drift detection and alerting
+- Hot-path performance scenarios with repeated trials and
+  confidence intervals (see performance.py)
 
 Validates that agentic actions don't degrade system stability.
 """
@@ -20,7 +22,8 @@ import time
 from sqlalchemy import Column, String, JSON, DateTime, Float, Boolean, Integer
 
 from ..models import Base, async_session
-from ..immutable_log import immutable_log
+from ..logging_system.immutable_log import immutable_log
+from .performance import PerformanceScenario, default_scenarios, metric_direction, run_scenario
 
 
 class BenchmarkRun(Base):
@@ -32,7 +35,7 @@ class BenchmarkRun(Base):
     
     # What triggered this benchmark
     triggered_by = Column(String, nullable=True)
-    benchmark_type = Column(String, nullable=False)  # "full", "smoke", "regression"
+    benchmark_type = Column(String, nullable=False)  # "full", "smoke", "regression", "performance"
     
     # Results
     results = Column(JSON, nullable=False)
@@ -192,7 +195,7 @@ class BenchmarkSuite:
         baseline_id = None
         
         if compare_to_baseline:
-            baseline = await self._get_latest_golden()
+            baseline = await self._get_latest_golden("regression")
             if baseline:
                 baseline_id = baseline.run_id
                 delta = self._compare_to_baseline(metrics, baseline.metrics)
@@ -225,20 +228,109 @@ class BenchmarkSuite:
             "drift_detected": drift_detected
         }
     
+    async def run_performance_suite(
+        self,
+        triggered_by: Optional[str] = None,
+        compare_to_baseline: bool = True,
+        scenarios: Optional[List[str]] = None,
+        trials: int = 5,
+        warmup: int = 1,
+        regression_threshold: float = 10.0
+    ) -> Dict[str, Any]:
+        """
+        Hot-path performance suite against synthetic local data.
+        
+        Every scenario runs `warmup` unmeasured trials and `trials` measured
+        ones; each metric is reported as mean with stddev and a 95% CI.
+        Scenarios whose optional dependencies are missing are skipped, not
+        failed. A metric regresses when it moved the wrong way by more than
+        `regression_threshold` percent AND its CI no longer overlaps the
+        golden baseline's.
+        
+        Args:
+            scenarios: Scenario names to run (None = all)
+            trials: Measured trials per scenario
+            warmup: Unmeasured trials per scenario
+            regression_threshold: Minimum % change counted as a regression
+        """
+        
+        start_time = time.time()
+        run_id = f"performance-{datetime.now(timezone.utc).timestamp()}"
+        
+        selected = self._select_scenarios(scenarios)
+        
+        results = []
+        for scenario in selected:
+            outcome = await run_scenario(scenario, trials=trials, warmup=warmup)
+            results.append(self._scenario_result(outcome))
+            
+            status = "skipped" if outcome["skipped"] else ("failed" if outcome["error"] else "ok")
+            print(f"  [BENCH] {scenario.name}: {status} ({outcome['duration_ms']:.0f} ms)")
+        
+        duration = time.time() - start_time
+        passed = all(r.passed for r in results)
+        
+        # Aggregate metrics
+        metrics = {}
+        for r in results:
+            for k, v in r.metrics.items():
+                metrics[f"{r.name}.{k}"] = v
+        
+        delta = None
+        drift_detected = False
+        baseline_id = None
+        regressions: List[str] = []
+        
+        if compare_to_baseline:
+            baseline = await self._get_latest_golden("performance")
+            if baseline:
+                baseline_id = baseline.run_id
+                delta = self._compare_performance(metrics, baseline.metrics, regression_threshold)
+                regressions = sorted(k for k, v in delta.items() if v["regressed"])
+                drift_detected = bool(regressions)
+        
+        await self._save_run(
+            run_id=run_id,
+            benchmark_type="performance",
+            results=[asdict(r) for r in results],
+            metrics=metrics,
+            passed=passed,
+            duration=duration,
+            triggered_by=triggered_by,
+            baseline_id=baseline_id,
+            delta=delta,
+            drift_detected=drift_detected
+        )
+        
+        return {
+            "run_id": run_id,
+            "type": "performance",
+            "passed": passed,
+            "duration_seconds": duration,
+            "tests": len(results),
+            "trials": trials,
+            "failures": [r.name for r in results if not r.passed],
+            "skipped": [r.name for r in results if r.metrics.get("skipped")],
+            "metrics": metrics,
+            "baseline_id": baseline_id,
+            "delta_from_baseline": delta,
+            "regressions": regressions,
+            "drift_detected": drift_detected
+        }
+    
+    def list_performance_scenarios(self) -> List[Dict[str, Any]]:
+        """Available performance scenarios"""
+        return [
+            {"name": s.name, "description": s.description, "requires": s.requires}
+            for s in default_scenarios()
+        ]
+    
     async def set_golden_baseline(self, run_id: str) -> bool:
-        """Mark a benchmark run as the golden baseline"""
+        """Mark a benchmark run as the golden baseline for its benchmark type"""
         
         async with async_session() as session:
             from sqlalchemy import select, update
             
-            # Unmark all previous golden baselines
-            await session.execute(
-                update(BenchmarkRun)
-                .where(BenchmarkRun.is_golden == True)
-                .values(is_golden=False)
-            )
-            
-            # Mark new golden
             result = await session.execute(
                 select(BenchmarkRun).where(BenchmarkRun.run_id == run_id)
             )
@@ -247,6 +339,14 @@ class BenchmarkSuite:
             if not run:
                 return False
             
+            # Unmark previous golden baselines of the same type
+            await session.execute(
+                update(BenchmarkRun)
+                .where(BenchmarkRun.is_golden == True)
+                .where(BenchmarkRun.benchmark_type == run.benchmark_type)
+                .values(is_golden=False)
+            )
+            
             run.is_golden = True
             await session.commit()
             
@@ -472,7 +572,7 @@ class BenchmarkSuite:
         start = time.time()
         
         try:
-            from ..trigger_mesh import trigger_mesh
+            from ..misc.trigger_mesh import trigger_mesh
             
             # Check if trigger mesh is running
             is_running = trigger_mesh._running
@@ -577,19 +677,59 @@ class BenchmarkSuite:
         
         return run
     
-    async def _get_latest_golden(self) -> Optional[BenchmarkRun]:
-        """Get the latest golden baseline"""
+    async def _get_latest_golden(self, benchmark_type: Optional[str] = None) -> Optional[BenchmarkRun]:
+        """Get the latest golden baseline (optionally of one benchmark type)"""
         
         async with async_session() as session:
             from sqlalchemy import select
+            query = select(BenchmarkRun).where(BenchmarkRun.is_golden == True)
+            if benchmark_type:
+                query = query.where(BenchmarkRun.benchmark_type == benchmark_type)
             result = await session.execute(
-                select(BenchmarkRun)
-                .where(BenchmarkRun.is_golden == True)
-                .order_by(BenchmarkRun.created_at.desc())
-                .limit(1)
+                query.order_by(BenchmarkRun.created_at.desc()).limit(1)
             )
             return result.scalar_one_or_none()
     
+    def _select_scenarios(self, names: Optional[List[str]]) -> List[PerformanceScenario]:
+        """Filter the default scenarios by name"""
+        available = default_scenarios()
+        if not names:
+            return available
+        
+        by_name = {s.name: s for s in available}
+        unknown = [n for n in names if n not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown performance scenarios: {', '.join(unknown)}")
+        return [by_name[n] for n in names]
+    
+    def _scenario_result(self, outcome: Dict[str, Any]) -> BenchmarkResult:
+        """Flatten a scenario outcome into a BenchmarkResult"""
+        if outcome["skipped"]:
+            return BenchmarkResult(
+                name=outcome["name"],
+                passed=True,
+                duration_ms=outcome["duration_ms"],
+                metrics={"skipped": 1},
+                error=outcome["error"]
+            )
+        
+        metrics = {}
+        for metric, summary in outcome["metrics"].items():
+            metrics[metric] = summary["mean"]
+            metrics[f"{metric}.stddev"] = summary["stddev"]
+            metrics[f"{metric}.ci_low"] = summary["ci_low"]
+            metrics[f"{metric}.ci_high"] = summary["ci_high"]
+        if outcome["metrics"]:
+            metrics["trials"] = max(s["trials"] for s in outcome["metrics"].values())
+        
+        return BenchmarkResult(
+            name=outcome["name"],
+            passed=outcome["error"] is None,
+            duration_ms=outcome["duration_ms"],
+            metrics=metrics,
+            error=outcome["error"]
+        )
+    
     def _compare_to_baseline(
         self,
         current: Dict[str, float],
@@ -610,6 +750,46 @@ class BenchmarkSuite:
         
         return delta
     
+    def _compare_performance(
+        self,
+        current: Dict[str, float],
+        baseline: Dict[str, float],
+        threshold: float = 10.0
+    ) -> Dict[str, Any]:
+        """
+        CI-aware comparison of performance metrics to baseline
+        
+        A change only counts as a regression when it goes in the bad
+        direction by more than `threshold` percent and the two 95% CIs
+        don't overlap (so noisy metrics don't flag on their own).
+        """
+        
+        delta = {}
+        for key, current_value in current.items():
+            direction = metric_direction(key)
+            baseline_value = baseline.get(key)
+            if direction == 0 or not baseline_value:
+                continue
+            
+            percent_change = ((current_value - baseline_value) / baseline_value) * 100
+            current_ci = (current.get(f"{key}.ci_low", current_value), current.get(f"{key}.ci_high", current_value))
+            baseline_ci = (baseline.get(f"{key}.ci_low", baseline_value), baseline.get(f"{key}.ci_high", baseline_value))
+            overlap = current_ci[0] <= baseline_ci[1] and baseline_ci[0] <= current_ci[1]
+            worse = percent_change * direction < 0
+            
+            delta[key] = {
+                "current": current_value,
+                "baseline": baseline_value,
+                "percent_change": percent_change,
+                "current_ci": list(current_ci),
+                "baseline_ci": list(baseline_ci),
+                "significant": not overlap,
+                "regressed": worse and not overlap and abs(percent_change) > threshold,
+                "improved": not worse and not overlap and abs(percent_change) > threshold
+            }
+        
+        return delta
+    
     def _detect_drift(self, delta: Dict[str, Any], threshold: float = 20.0) -> bool:
         """Detect if metrics have drifted significantly from baseline"""
         
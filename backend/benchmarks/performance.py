@@ -0,0 +1,597 @@
+"""
+Performance Scenarios - hot-path benchmarks against synthetic local data
+
+Each scenario exercises a real Grace code path:
+- Vector search (FAISSBackend) at several corpus sizes
+- Batch embedding (EmbeddingService local provider, one batched encode)
+- TriggerMesh publish -> deliver throughput
+- Immutable log append rate
+- HTM enqueue -> dispatch latency
+- Ingestion chunking and PII scrubbing throughput (MB/s)
+- RAG end-to-end latency (embed query -> search -> assemble context)
+
+A scenario runs warmup trials, then N measured trials. Every metric is
+summarised across trials as mean, stddev and a 95% confidence interval so
+a golden baseline comparison can tell noise from a real regression.
+
+Metric naming carries direction: names ending in "_ms" are lower-is-better,
+names ending in "_per_s" are higher-is-better.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145,
+    15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+    25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+VECTOR_CORPUS_SIZES = (1_000, 10_000, 50_000)
+VECTOR_DIMENSIONS = 384
+
+_WORDS = (
+    "grace governance kernel memory trust mission agent verification ledger "
+    "signal pipeline latency schema domain policy audit retrieval context "
+    "vector index snapshot recovery incident playbook metric threshold "
+    "ingestion librarian chunk embedding query response model runtime"
+).split()
+
+
+class ScenarioSkipped(Exception):
+    """Raised by a scenario setup when an optional dependency is missing"""
+
+
+@dataclass
+class PerformanceScenario:
+    """
+    One benchmark scenario
+
+    setup() builds the synthetic fixture (raise ScenarioSkipped when a
+    dependency is unavailable), trial(state) runs one measured iteration and
+    returns its metrics, teardown(state) releases anything setup started.
+    """
+    name: str
+    description: str
+    setup: Callable[[], Awaitable[Any]]
+    trial: Callable[[Any], Awaitable[Dict[str, float]]]
+    teardown: Optional[Callable[[Any], Awaitable[None]]] = None
+    requires: List[str] = field(default_factory=list)
+
+
+# ----------------------------------------------------------------------
+# Statistics
+# ----------------------------------------------------------------------
+
+def t_critical(df: int) -> float:
+    """95% two-sided t critical value (falls back to the next tabulated df)"""
+    if df <= 0:
+        return float("nan")
+    for key in sorted(_T_95):
+        if df <= key:
+            return _T_95[key]
+    return 1.960
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Linear-interpolated percentile (p in 0..100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Mean, stddev and 95% CI of the per-trial values of one metric"""
+    n = len(samples)
+    mean = statistics.fmean(samples) if n else 0.0
+    stddev = statistics.stdev(samples) if n > 1 else 0.0
+    half_width = t_critical(n - 1) * stddev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "mean": mean,
+        "stddev": stddev,
+        "ci_low": mean - half_width,
+        "ci_high": mean + half_width,
+        "trials": n,
+    }
+
+
+def metric_direction(metric: str) -> int:
+    """+1 if higher is better, -1 if lower is better, 0 if not a performance metric"""
+    if metric.endswith("_per_s"):
+        return 1
+    if metric.endswith("_ms"):
+        return -1
+    return 0
+
+
+async def run_scenario(
+    scenario: PerformanceScenario,
+    trials: int = 5,
+    warmup: int = 1
+) -> Dict[str, Any]:
+    """
+    Run a scenario and summarise every metric across trials
+
+    Returns:
+        {"name", "skipped", "error", "duration_ms", "metrics": {metric: summary}}
+    """
+    started = time.perf_counter()
+    outcome: Dict[str, Any] = {"name": scenario.name, "skipped": False, "error": None, "metrics": {}}
+
+    try:
+        state = await scenario.setup()
+    except ScenarioSkipped as e:
+        outcome.update(skipped=True, error=str(e), duration_ms=(time.perf_counter() - started) * 1000)
+        return outcome
+    except Exception as e:
+        outcome.update(error=f"setup failed: {e}", duration_ms=(time.perf_counter() - started) * 1000)
+        return outcome
+
+    samples: Dict[str, List[float]] = {}
+    try:
+        for _ in range(warmup):
+            await scenario.trial(state)
+        for _ in range(trials):
+            for metric, value in (await scenario.trial(state)).items():
+                samples.setdefault(metric, []).append(float(value))
+    except Exception as e:
+        outcome["error"] = str(e)
+    finally:
+        if scenario.teardown:
+            try:
+                await scenario.teardown(state)
+            except Exception as e:
+                print(f"[WARN] Benchmark teardown failed for {scenario.name}: {e}")
+
+    outcome["metrics"] = {metric: summarize(values) for metric, values in samples.items()}
+    outcome["duration_ms"] = (time.perf_counter() - started) * 1000
+    return outcome
+
+
+# ----------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------
+
+def synthetic_text(size_bytes: int, seed: int = 7, pii_every: int = 0) -> str:
+    """
+    Deterministic prose of roughly size_bytes
+
+    pii_every: insert a PII-bearing sentence every N sentences (0 = never)
+    """
+    rng = random.Random(seed)
+    sentences = []
+    total = 0
+    index = 0
+    while total < size_bytes:
+        index += 1
+        if pii_every and index % pii_every == 0:
+            sentence = rng.choice((
+                f"Contact agent{index}@example.com or call 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}.",
+                f"Record {index} lists SSN {rng.randint(100, 899)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}.",
+                f"Request from 10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)} on {rng.randint(1, 12)}/{rng.randint(1, 28)}/1990.",
+                f"Ship to {rng.randint(1, 999)} Maple Street before noon.",
+            ))
+        else:
+            words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 20))]
+            sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        total += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def synthetic_vectors(count: int, dimensions: int = VECTOR_DIMENSIONS, seed: int = 7):
+    """Random unit vectors (numpy float32 array)"""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dimensions)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def _require(module: str):
+    try:
+        __import__(module)
+    except ImportError:
+        raise ScenarioSkipped(f"{module} not installed")
+
+
+def _timed_ops_summary(latencies_ms: List[float], elapsed_s: float, rate_metric: str) -> Dict[str, float]:
+    return {
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+        rate_metric: len(latencies_ms) / elapsed_s if elapsed_s > 0 else 0.0,
+    }
+
+
+# ----------------------------------------------------------------------
+# Scenarios
+# ----------------------------------------------------------------------
+
+def vector_search_scenario(corpus_size: int, queries: int = 200, top_k: int = 10) -> PerformanceScenario:
+    """FAISSBackend top-k search latency over a random unit-vector corpus"""
+
+    async def setup():
+        _require("numpy")
+        _require("faiss")
+        from backend.services.vector_store import FAISSBackend
+
+        backend = FAISSBackend()
+        if not await backend.initialize({"dimensions": VECTOR_DIMENSIONS}):
+            raise ScenarioSkipped("faiss unavailable")
+        corpus = synthetic_vectors(corpus_size)
+        await backend.add_vectors(
+            corpus,
+            [f"bench_{i}" for i in range(corpus_size)],
+            [{} for _ in range(corpus_size)]
+        )
+        return {"backend": backend, "queries": synthetic_vectors(queries, seed=corpus_size + 1)}
+
+    async def trial(state):
+        backend = state["backend"]
+        latencies = []
+        started = time.perf_counter()
+        for query in state["queries"]:
+            t0 = time.perf_counter()
+            await backend.search(query, top_k=top_k)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        return _timed_ops_summary(latencies, time.perf_counter() - started, "queries_per_s")
+
+    label = f"{corpus_size // 1000}k" if corpus_size >= 1000 else str(corpus_size)
+    return PerformanceScenario(
+        name=f"vector_search_{label}",
+        description=f"FAISS top-{top_k} search over {corpus_size} x {VECTOR_DIMENSIONS}d vectors",
+        setup=setup,
+        trial=trial,
+        requires=["numpy", "faiss"],
+    )
+
+
+def _local_embedder():
+    """Fresh local EmbeddingService (no DB cache load) and its model name"""
+    _require("sentence_transformers")
+    from backend.services.embedding_service import EmbeddingService
+
+    service = EmbeddingService(provider="local")
+    return service, service.default_model
+
+
+def batch_embedding_scenario(batch_size: int = 64) -> PerformanceScenario:
+    """Local model embedding throughput over a batch of synthetic passages (one encode call)"""
+
+    async def setup():
+        service, model = _local_embedder()
+        rng = random.Random(11)
+        texts = [synthetic_text(rng.randint(200, 600), seed=i) for i in range(batch_size)]
+        # Load the model outside the measured trials
+        await service._generate_embedding(texts[0], model)
+        return {"service": service, "model": model, "texts": texts}
+
+    async def trial(state):
+        service, model = state["service"], state["model"]
+        started = time.perf_counter()
+        await service._generate_embeddings(state["texts"], model)
+        elapsed = time.perf_counter() - started
+        return {
+            "batch_ms": elapsed * 1000,
+            "texts_per_s": len(state["texts"]) / elapsed if elapsed > 0 else 0.0,
+        }
+
+    return PerformanceScenario(
+        name="batch_embedding",
+        description=f"Embed {batch_size} synthetic passages with the local provider",
+        setup=setup,
+        trial=trial,
+        requires=["sentence_transformers"],
+    )
+
+
+def trigger_mesh_scenario(events: int = 500) -> PerformanceScenario:
+    """Publish -> deliver throughput and latency through a private TriggerMesh"""
+
+    async def setup():
+        from backend.misc.trigger_mesh import TriggerMesh, TriggerEvent
+
+        mesh = TriggerMesh()
+        state = {"mesh": mesh, "event_cls": TriggerEvent, "latencies": [], "done": asyncio.Event(), "expected": 0}
+
+        async def on_event(event):
+            state["latencies"].append((time.perf_counter() - event.payload["sent"]) * 1000)
+            if len(state["latencies"]) >= state["expected"]:
+                state["done"].set()
+
+        mesh.subscribe("benchmark.mesh.*", on_event)
+        await mesh.start()
+        return state
+
+    async def trial(state):
+        mesh, event_cls = state["mesh"], state["event_cls"]
+        state["latencies"] = []
+        state["expected"] = events
+        state["done"].clear()
+
+        started = time.perf_counter()
+        for i in range(events):
+            await mesh.publish(event_cls(
+                event_type="benchmark.mesh.ping",
+                source="benchmarks",
+                actor="benchmark_suite",
+                resource=f"event_{i}",
+                payload={"sent": time.perf_counter()},
+            ))
+        await asyncio.wait_for(state["done"].wait(), timeout=60)
+        return _timed_ops_summary(state["latencies"], time.perf_counter() - started, "events_per_s")
+
+    async def teardown(state):
+        await state["mesh"].stop()
+
+    return PerformanceScenario(
+        name="trigger_mesh_throughput",
+        description=f"Publish {events} events and wait for delivery to a wildcard subscriber",
+        setup=setup,
+        trial=trial,
+        teardown=teardown,
+    )
+
+
+def immutable_log_scenario(appends: int = 50) -> PerformanceScenario:
+    """Sequential append rate of the hash-chained immutable log (private log on a temp DB)"""
+
+    async def setup():
+        _require("aiosqlite")
+        import tempfile
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from backend.logging_system.immutable_log import ImmutableLog
+        from backend.models.base_models import ImmutableLogEntry
+
+        tmpdir = tempfile.TemporaryDirectory(prefix="grace_bench_log_")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmpdir.name}/immutable_log.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(ImmutableLogEntry.__table__.create)
+        log = ImmutableLog(session_factory=async_sessionmaker(engine, expire_on_commit=False))
+        return {"log": log, "engine": engine, "tmpdir": tmpdir}
+
+    async def trial(state):
+        latencies = []
+        started = time.perf_counter()
+        for i in range(appends):
+            t0 = time.perf_counter()
+            await state["log"].append(
+                actor="benchmark_suite",
+                action="benchmark.append",
+                resource=f"append_{i}",
+                subsystem="benchmarks",
+                payload={"index": i},
+                result="success"
+            )
+            latencies.append((time.perf_counter() - t0) * 1000)
+        return _timed_ops_summary(latencies, time.perf_counter() - started, "appends_per_s")
+
+    async def teardown(state):
+        try:
+            await state["log"].stop()
+            await state["engine"].dispose()
+        finally:
+            state["tmpdir"].cleanup()
+
+    return PerformanceScenario(
+        name="immutable_log_append",
+        description=f"Append {appends} entries to a private immutable log on a temp SQLite DB",
+        setup=setup,
+        trial=trial,
+        teardown=teardown,
+        requires=["aiosqlite"],
+    )
+
+
+def htm_dispatch_scenario(tasks: int = 20, workers: int = 4) -> PerformanceScenario:
+    """
+    HTM enqueue -> dispatch latency on a private HTMEnhancedV2 instance
+
+    Only the dispatcher workers run: the metrics loop, worker-update
+    subscription and watchdogs are left off since no kernel executes the
+    benchmark tasks.
+    """
+
+    async def setup():
+        from backend.core.htm_enhanced_v2 import HTMEnhancedV2, TaskPriority
+
+        htm = HTMEnhancedV2()
+
+        async def no_watchdog(task_id, attempt_number):
+            return None
+
+        htm._watchdog = no_watchdog
+        htm.running_flag = True
+        htm._workers = [asyncio.create_task(htm._worker(i)) for i in range(workers)]
+        return {"htm": htm, "priority": TaskPriority.NORMAL, "trial": 0}
+
+    async def trial(state):
+        htm = state["htm"]
+        state["trial"] += 1
+        task_ids = []
+        started = time.perf_counter()
+        for i in range(tasks):
+            task_ids.append(await htm.enqueue_task(
+                task_type=f"benchmark_{state['trial']}_{i}",
+                handler="benchmark.noop",
+                payload={"index": i},
+                priority=state["priority"],
+                domain="benchmarks",
+            ))
+
+        deadline = time.perf_counter() + 30
+        while any(htm.tasks[t].assigned_at is None for t in task_ids):
+            if time.perf_counter() > deadline:
+                raise TimeoutError("HTM did not dispatch all benchmark tasks within 30s")
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - started
+
+        latencies = [
+            (htm.tasks[t].assigned_at - htm.tasks[t].queued_at).total_seconds() * 1000
+            for t in task_ids
+        ]
+        for t in task_ids:
+            htm.running.pop(t, None)
+            htm.tasks.pop(t, None)
+        return _timed_ops_summary(latencies, elapsed, "tasks_per_s")
+
+    async def teardown(state):
+        htm = state["htm"]
+        htm.running_flag = False
+        for worker in htm._workers:
+            worker.cancel()
+        await asyncio.gather(*htm._workers, return_exceptions=True)
+
+    return PerformanceScenario(
+        name="htm_enqueue_to_dispatch",
+        description=f"Enqueue {tasks} tasks and time queued_at -> assigned_at with {workers} dispatchers",
+        setup=setup,
+        trial=trial,
+        teardown=teardown,
+    )
+
+
+def chunking_scenario(documents: int = 64, document_bytes: int = 16_384) -> PerformanceScenario:
+    """Ingestion pipeline chunker (ChunkingEngine) throughput over synthetic documents"""
+
+    async def setup():
+        from backend.processors.multimodal_processors import ChunkingEngine
+
+        docs = [synthetic_text(document_bytes, seed=i) for i in range(documents)]
+        return {"engine": ChunkingEngine, "docs": docs, "bytes": sum(len(d.encode()) for d in docs)}
+
+    async def trial(state):
+        engine = state["engine"]
+        started = time.perf_counter()
+        for doc in state["docs"]:
+            await engine.chunk_text(text=doc, chunk_size=512, overlap=50, preserve_sentences=True)
+        elapsed = time.perf_counter() - started
+        return {
+            "total_ms": elapsed * 1000,
+            "mb_per_s": state["bytes"] / 1_048_576 / elapsed if elapsed > 0 else 0.0,
+        }
+
+    return PerformanceScenario(
+        name="chunking",
+        description=f"Chunk {documents} x {document_bytes // 1024}KB synthetic documents",
+        setup=setup,
+        trial=trial,
+    )
+
+
+def pii_scrub_scenario(documents: int = 32, document_bytes: int = 8_192) -> PerformanceScenario:
+    """PIIScrubber throughput over synthetic documents with embedded PII"""
+
+    async def setup():
+        from backend.ingestion.pii_scrubber import PIIScrubber
+
+        docs = [synthetic_text(document_bytes, seed=i, pii_every=6) for i in range(documents)]
+        return {"scrubber": PIIScrubber(), "docs": docs, "bytes": sum(len(d.encode()) for d in docs)}
+
+    async def trial(state):
+        scrubber = state["scrubber"]
+        started = time.perf_counter()
+        for doc in state["docs"]:
+            await scrubber.scrub_content({"text": doc})
+        elapsed = time.perf_counter() - started
+        return {
+            "total_ms": elapsed * 1000,
+            "mb_per_s": state["bytes"] / 1_048_576 / elapsed if elapsed > 0 else 0.0,
+        }
+
+    return PerformanceScenario(
+        name="pii_scrubbing",
+        description=f"Scrub {documents} x {document_bytes // 1024}KB synthetic documents",
+        setup=setup,
+        trial=trial,
+    )
+
+
+def rag_end_to_end_scenario(documents: int = 20, queries: int = 20, top_k: int = 5) -> PerformanceScenario:
+    """
+    Query-time RAG latency: embed query -> FAISS search -> assemble context
+
+    The synthetic corpus is chunked and embedded once in setup into a
+    private FAISS index, so nothing is written to the shared vector store.
+    """
+
+    async def setup():
+        _require("numpy")
+        _require("faiss")
+        service, model = _local_embedder()
+        from backend.processors.multimodal_processors import ChunkingEngine
+        from backend.services.vector_store import FAISSBackend
+
+        chunks = []
+        for i in range(documents):
+            result = await ChunkingEngine.chunk_text(text=synthetic_text(8_192, seed=100 + i), chunk_size=512)
+            chunks.extend(result["chunks"])
+        chunk_ids = [f"bench_chunk_{i}" for i in range(len(chunks))]
+
+        vectors = [await service._generate_embedding(text, model) for text in chunks]
+        backend = FAISSBackend()
+        if not await backend.initialize({"dimensions": len(vectors[0])}):
+            raise ScenarioSkipped("faiss unavailable")
+        await backend.add_vectors(vectors, chunk_ids, [{} for _ in chunks])
+
+        rng = random.Random(5)
+        return {
+            "service": service,
+            "model": model,
+            "backend": backend,
+            "texts": dict(zip(chunk_ids, chunks)),
+            "queries": [" ".join(rng.choice(_WORDS) for _ in range(6)) + "?" for _ in range(queries)],
+        }
+
+    async def trial(state):
+        service, model, backend = state["service"], state["model"], state["backend"]
+        latencies = []
+        started = time.perf_counter()
+        for query in state["queries"]:
+            t0 = time.perf_counter()
+            vector = await service._generate_embedding(query, model)
+            hits = await backend.search(vector, top_k=top_k)
+            context = "\n\n".join(
+                f"[{n}] {state['texts'][hit['embedding_id']]}" for n, hit in enumerate(hits, 1)
+            )
+            if not context:
+                raise RuntimeError("RAG benchmark retrieved no context")
+            latencies.append((time.perf_counter() - t0) * 1000)
+        return _timed_ops_summary(latencies, time.perf_counter() - started, "queries_per_s")
+
+    return PerformanceScenario(
+        name="rag_end_to_end",
+        description=f"Embed, retrieve top-{top_k} and assemble context for {queries} queries",
+        setup=setup,
+        trial=trial,
+        requires=["numpy", "faiss", "sentence_transformers"],
+    )
+
+
+def default_scenarios(corpus_sizes=VECTOR_CORPUS_SIZES) -> List[PerformanceScenario]:
+    """The standard performance suite, cheapest scenarios first"""
+    return [
+        chunking_scenario(),
+        pii_scrub_scenario(),
+        trigger_mesh_scenario(),
+        immutable_log_scenario(),
+        htm_dispatch_scenario(),
+        *[vector_search_scenario(size) for size in corpus_sizes],
+        batch_embedding_scenario(),
+        rag_end_to_end_scenario(),
+    ]
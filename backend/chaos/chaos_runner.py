@@ -9,11 +9,13 @@ Features:
 - Auto-iteration loop with chaos ledger
 - Coverage tracking
 - Real tool usage (stress-ng, tc, etc.)
+- Load-profile mode: saturation curves under swept stress (see load_profile.py)
 """
 
 import asyncio
 import random
 import json
+import sys
 import time
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
@@ -79,6 +81,9 @@ class ChaosRunner:
         self.max_concurrent_incidents = 3  # Paired challenges
         self.active_incidents: Dict[str, ChaosIncident] = {}
         
+        # CPU stress processes per incident, so they can be stopped early
+        self.stress_processes: Dict[str, List[asyncio.subprocess.Process]] = {}
+        
         # Ledger
         self.ledger_file = Path(__file__).parent.parent.parent / 'chaos_ledger.json'
         self.ledger: List[ChaosLedgerEntry] = []
@@ -89,6 +94,11 @@ class ChaosRunner:
         
         # Stress mode
         self.stress_mode = False  # Multi-incident stress testing
+        
+        # Load-profile mode
+        self.load_profile_task: Optional[asyncio.Task] = None
+        self.last_load_profile: Optional[Dict] = None
+        self.load_profile_dir = Path(__file__).parent.parent.parent / 'logs' / 'chaos_load_profiles'
     
     async def start(self, stress_mode: bool = False):
         """Start chaos runner"""
@@ -330,23 +340,53 @@ class ChaosRunner:
             )
             
             incident.artifacts['stress_pid'] = str(process.pid)
+            self.stress_processes.setdefault(incident.incident_id, []).append(process)
             
             return True
         
         except FileNotFoundError:
-            # Fallback: Pure Python CPU stress
-            async def cpu_burn():
-                end_time = time.time() + duration
-                while time.time() < end_time:
-                    _ = sum(range(1000000))
-                    await asyncio.sleep(0)
-            
-            # Start stress tasks
-            tasks = [asyncio.create_task(cpu_burn()) for _ in range(cores)]
-            incident.artifacts['stress_tasks'] = str(len(tasks))
+            # Fallback: pure Python CPU burners, one process per core so the
+            # stress lands on the machine rather than on this event loop
+            burn = (
+                "import time\n"
+                f"end = time.time() + {float(duration)}\n"
+                "while time.time() < end:\n"
+                "    sum(range(1000000))\n"
+            )
+            processes = [
+                await asyncio.create_subprocess_exec(
+                    sys.executable, '-c', burn,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                for _ in range(cores)
+            ]
+            incident.artifacts['stress_pids'] = ','.join(str(p.pid) for p in processes)
+            self.stress_processes.setdefault(incident.incident_id, []).extend(processes)
             
             return True
     
+    async def _stop_cpu_stress(self, incident_id: str, grace_s: float = 5.0):
+        """Terminate and reap an incident's CPU stress processes"""
+        
+        processes = self.stress_processes.pop(incident_id, [])
+        for process in processes:
+            if process.returncode is None:
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+        for process in processes:
+            try:
+                await asyncio.wait_for(process.wait(), timeout=grace_s)
+            except asyncio.TimeoutError:
+                logger.warning(f"[CHAOS-RUNNER] Stress process {process.pid} ignored SIGTERM, killing it")
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+                await process.wait()
+    
     async def _inject_memory_stress(self, params: Dict, incident: ChaosIncident) -> bool:
         """Inject memory stress"""
         
@@ -780,6 +820,8 @@ class ChaosRunner:
     async def _rollback_incident(self, incident: ChaosIncident):
         """Rollback incident changes"""
         
+        await self._stop_cpu_stress(incident.incident_id)
+        
         try:
             # Restore backups
             backup_file = incident.artifacts.get('backup_file')
@@ -837,6 +879,116 @@ Action required: Fix the gap in detection/healing flow
         except Exception as e:
             logger.error(f"[CHAOS-RUNNER] Could not create backlog: {e}")
     
+    # ========== LOAD PROFILE MODE ==========
+    
+    async def run_load_profile(
+        self,
+        base_url: Optional[str] = None,
+        levels: Optional[List] = None,
+        rates: Optional[List[float]] = None,
+        duration_s: float = 30.0,
+        cooldown_s: float = 5.0,
+        request_mix: Optional[List] = None
+    ) -> Dict:
+        """
+        Sweep stress levels x offered rates against the app and build a saturation report
+        
+        Each stress level is injected with the runner's own CPU / memory /
+        queue-flood methods for exactly one measurement window. base_url
+        must be one of the configured load profile targets (default: the
+        local app); the request generator runs on its own loop.
+        """
+        
+        from .load_profile import LoadProfiler, check_limits, resolve_target
+        
+        base_url = resolve_target(base_url)
+        check_limits(rates, duration_s)
+        profiler = LoadProfiler(base_url=base_url, request_mix=request_mix)
+        
+        logger.info(f"[CHAOS-RUNNER] Load profile starting against {base_url}")
+        report = await profiler.sweep(
+            levels=levels,
+            rates=rates,
+            duration_s=duration_s,
+            cooldown_s=cooldown_s,
+            apply_stress=self._apply_load_stress
+        )
+        
+        report['report_file'] = self._save_load_profile(report)
+        self.last_load_profile = report
+        
+        logger.info(
+            f"[CHAOS-RUNNER] Load profile complete: baseline knee {report['baseline_knee_rps']} rps, "
+            f"stress knee at {report['stress_knee_level'] or 'none'}"
+        )
+        return report
+    
+    def start_load_profile(self, **kwargs) -> bool:
+        """Run a load profile in the background (False if one is already running)"""
+        
+        if self.load_profile_task and not self.load_profile_task.done():
+            return False
+        
+        self.load_profile_task = asyncio.create_task(self.run_load_profile(**kwargs))
+        return True
+    
+    def get_load_profile_status(self) -> Dict:
+        """State of the background load profile and the last report"""
+        
+        task = self.load_profile_task
+        error = None
+        if task and task.done() and not task.cancelled() and task.exception():
+            error = str(task.exception())
+        
+        return {
+            'running': bool(task and not task.done()),
+            'error': error,
+            'last_report': self.last_load_profile
+        }
+    
+    async def _apply_load_stress(self, level, duration_s: float):
+        """Hold a stress level for one window; returns an async release callback"""
+        
+        incident = ChaosIncident(
+            incident_id=f"load_profile_{int(datetime.utcnow().timestamp())}_{level.name}",
+            card_id=f"load_profile:{level.name}",
+            injected_at=datetime.utcnow(),
+            artifacts={}
+        )
+        background: List[asyncio.Task] = []
+        
+        if level.cpu_cores:
+            await self._inject_cpu_stress({'cores': level.cpu_cores, 'duration': int(duration_s) + 1}, incident)
+        if level.memory_mb:
+            background.append(asyncio.create_task(
+                self._inject_memory_stress({'size_mb': level.memory_mb, 'duration': duration_s}, incident)
+            ))
+        if level.queue_flood:
+            background.append(asyncio.create_task(
+                self._inject_queue_flood({'queue': 'load_profile', 'count': level.queue_flood}, incident)
+            ))
+        
+        async def release():
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            await self._stop_cpu_stress(incident.incident_id)
+        
+        return release
+    
+    def _save_load_profile(self, report: Dict) -> Optional[str]:
+        """Write the saturation report next to the other chaos results"""
+        
+        try:
+            self.load_profile_dir.mkdir(parents=True, exist_ok=True)
+            path = self.load_profile_dir / f"load_profile_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+            return str(path)
+        except Exception as e:
+            logger.error(f"[CHAOS-RUNNER] Could not save load profile: {e}")
+            return None
+    
     # ========== LEDGER & COVERAGE ==========
     
     async def _save_ledger(self):
@@ -928,6 +1080,7 @@ Action required: Fix the gap in detection/healing flow
             'stress_mode': self.stress_mode,
             'active_incidents': len(self.active_incidents),
             'total_incidents': len(self.ledger),
+            'load_profile_running': bool(self.load_profile_task and not self.load_profile_task.done()),
             'success_rate': sum(1 for e in self.ledger if e.success) / max(len(self.ledger), 1),
             'coverage': self.get_coverage_report()
         }
@@ -0,0 +1,448 @@
+"""
+Load Profile - open-loop load generation and saturation curves
+
+Drives a weighted, read-only request mix (chat, RAG search, ingestion
+stats, metrics) against the local app while the chaos runner holds a
+stress level, and records how throughput, tail latency, queue depths and
+error rate degrade.
+
+Open-loop means arrivals follow a Poisson schedule at the offered rate
+regardless of how fast responses come back, and latency is measured from
+the *scheduled* send time. A stalled server therefore shows up as latency
+instead of silently lowering the offered load (coordinated omission).
+The generator runs on its own event loop in a worker thread, so it
+neither competes with the app's loop for scheduling nor stops sending
+when that loop stalls.
+
+Targets are pinned: only base URLs listed in GRACE_LOAD_PROFILE_TARGETS
+(default: the local app) can be driven, at bounded rates and windows.
+
+Sweep: for every stress level, each offered rate is run for a fixed
+window. A point is saturated when achieved throughput falls below
+`min_throughput_ratio` of the rate actually sent, p99 exceeds `p99_factor` x the
+unstressed p99 at the same rate, or the error rate exceeds
+`max_error_rate`. The knee of a level is the highest rate before its
+first saturated point.
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestSpec:
+    """One entry of the request mix"""
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    json: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class StressLevel:
+    """Stress held by the chaos runner while a level is measured"""
+    name: str
+    cpu_cores: int = 0
+    memory_mb: int = 0
+    queue_flood: int = 0
+
+    @property
+    def is_baseline(self) -> bool:
+        return not (self.cpu_cores or self.memory_mb or self.queue_flood)
+
+
+DEFAULT_REQUEST_MIX = [
+    RequestSpec("chat", "POST", "/api/chat", 0.3,
+                json={"message": "Summarise the current system health", "session_id": "load_profile"}),
+    RequestSpec("rag_search", "GET", "/api/learning/search", 0.3,
+                params={"query": "self healing playbooks", "limit": 5}),
+    RequestSpec("ingestion_stats", "GET", "/api/ingestion/stats", 0.1),
+    RequestSpec("metrics", "GET", "/api/metrics/summary", 0.3),
+]
+
+DEFAULT_STRESS_LEVELS = [
+    StressLevel("baseline"),
+    StressLevel("light", cpu_cores=1, queue_flood=500),
+    StressLevel("moderate", cpu_cores=2, memory_mb=256, queue_flood=2000),
+    StressLevel("heavy", cpu_cores=4, memory_mb=512, queue_flood=5000),
+]
+
+DEFAULT_RATES = [5.0, 10.0, 20.0, 40.0]
+
+# Base URLs a load profile may target (comma separated)
+LOAD_PROFILE_TARGETS = [
+    url.strip().rstrip("/")
+    for url in os.getenv("GRACE_LOAD_PROFILE_TARGETS", "http://localhost:8000").split(",")
+    if url.strip()
+]
+MAX_OFFERED_RPS = float(os.getenv("GRACE_LOAD_PROFILE_MAX_RPS", "200"))
+MAX_WINDOW_SECONDS = float(os.getenv("GRACE_LOAD_PROFILE_MAX_WINDOW_S", "300"))
+
+
+def resolve_target(base_url: Optional[str] = None) -> str:
+    """The allowed target for base_url (default: the first configured one)"""
+    if not base_url:
+        if not LOAD_PROFILE_TARGETS:
+            raise ValueError("No load profile targets configured")
+        return LOAD_PROFILE_TARGETS[0]
+    target = base_url.strip().rstrip("/")
+    if target not in LOAD_PROFILE_TARGETS:
+        raise ValueError(f"{base_url} is not an allowed load profile target")
+    return target
+
+
+def check_limits(rates: Optional[List[float]], duration_s: float):
+    """Reject sweeps beyond MAX_OFFERED_RPS / MAX_WINDOW_SECONDS"""
+    if not 0 < duration_s <= MAX_WINDOW_SECONDS:
+        raise ValueError(f"duration_s must be in (0, {MAX_WINDOW_SECONDS:g}]")
+    for rate in rates or DEFAULT_RATES:
+        if not 0 < rate <= MAX_OFFERED_RPS:
+            raise ValueError(f"rates must be in (0, {MAX_OFFERED_RPS:g}]")
+
+
+@dataclass
+class LoadPoint:
+    """Measurements for one (stress level, offered rate) window"""
+    level: str
+    offered_rps: float
+    duration_s: float
+    sent: int = 0
+    completed: int = 0
+    errors: int = 0
+    dropped: int = 0
+    sent_rps: float = 0.0
+    achieved_rps: float = 0.0
+    error_rate: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    queue_depths: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    endpoints: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    status_codes: Dict[str, int] = field(default_factory=dict)
+    saturated: bool = False
+    saturation_reasons: List[str] = field(default_factory=list)
+
+
+def _percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def sample_queue_depths() -> Dict[str, int]:
+    """
+    In-process queue depths (meaningful when the profile runs inside the app)
+
+    Called from the generator thread; qsize() is a plain length read.
+    """
+    depths: Dict[str, int] = {}
+
+    try:
+        from backend.core.message_bus import message_bus
+        depths["message_bus"] = sum(q.qsize() for queues in message_bus.topics.values() for q in queues)
+    except Exception:
+        pass
+
+    try:
+        from backend.misc.trigger_mesh import trigger_mesh
+        depth = trigger_mesh.event_queue.qsize()
+        priority_queue = getattr(trigger_mesh, "priority_queue", None)
+        if priority_queue is not None:
+            depth += priority_queue.qsize()
+        depths["trigger_mesh"] = depth
+    except Exception:
+        pass
+
+    return depths
+
+
+class LoadProfiler:
+    """
+    Open-loop load generator against a running Grace API
+
+    Usage:
+        profiler = LoadProfiler("http://localhost:8000")
+        point = await profiler.run_point(rate=20, duration_s=30)
+        report = await profiler.sweep(levels, rates, duration_s=30, apply_stress=runner_hook)
+
+    With own_loop (the default) sweep() measures each window on a fresh
+    event loop in a worker thread; apply_stress still runs on the caller's
+    loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        request_mix: Optional[List[RequestSpec]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_in_flight: int = 256,
+        request_timeout_s: float = 30.0,
+        seed: Optional[int] = None,
+        own_loop: bool = True
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.request_mix = request_mix or DEFAULT_REQUEST_MIX
+        self.headers = headers or {}
+        self.max_in_flight = max_in_flight
+        self.request_timeout_s = request_timeout_s
+        self.rng = random.Random(seed)
+        self.own_loop = own_loop
+        self.in_flight = 0
+
+    async def _measure(self, rate: float, duration_s: float, level: str) -> LoadPoint:
+        if not self.own_loop:
+            return await self.run_point(rate, duration_s, level=level)
+        return await asyncio.to_thread(asyncio.run, self.run_point(rate, duration_s, level=level))
+
+    async def run_point(self, rate: float, duration_s: float, level: str = "baseline") -> LoadPoint:
+        """Offer `rate` requests/s for `duration_s` seconds and measure the outcome"""
+        import aiohttp
+
+        point = LoadPoint(level=level, offered_rps=rate, duration_s=duration_s)
+        latencies: List[float] = []
+        per_endpoint: Dict[str, List[float]] = {spec.name: [] for spec in self.request_mix}
+        endpoint_errors: Dict[str, int] = {spec.name: 0 for spec in self.request_mix}
+        weights = [spec.weight for spec in self.request_mix]
+        depth_samples: Dict[str, List[int]] = {"client_in_flight": []}
+        pending: set = set()
+        stop_sampling = asyncio.Event()
+        window = {"end": time.perf_counter() + duration_s, "completed": 0}
+
+        async def sampler():
+            while not stop_sampling.is_set():
+                depth_samples["client_in_flight"].append(self.in_flight)
+                for name, depth in sample_queue_depths().items():
+                    depth_samples.setdefault(name, []).append(depth)
+                try:
+                    await asyncio.wait_for(stop_sampling.wait(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    pass
+
+        async def fire(session, spec: RequestSpec, scheduled: float):
+            self.in_flight += 1
+            status = "error"
+            try:
+                async with session.request(
+                    spec.method,
+                    self.base_url + spec.path,
+                    json=spec.json,
+                    params=spec.params,
+                    headers=self.headers,
+                ) as response:
+                    await response.read()
+                    status = str(response.status)
+                    ok = response.status < 500 and response.status != 429
+            except asyncio.TimeoutError:
+                status, ok = "timeout", False
+            except Exception:
+                ok = False
+            finally:
+                self.in_flight -= 1
+
+            elapsed_ms = (time.perf_counter() - scheduled) * 1000
+            point.status_codes[status] = point.status_codes.get(status, 0) + 1
+            if ok:
+                point.completed += 1
+                if time.perf_counter() <= window["end"]:
+                    window["completed"] += 1
+                latencies.append(elapsed_ms)
+                per_endpoint[spec.name].append(elapsed_ms)
+            else:
+                point.errors += 1
+                endpoint_errors[spec.name] += 1
+
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout_s)
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            sampler_task = asyncio.create_task(sampler())
+            started = time.perf_counter()
+            next_send = started
+            end = window["end"] = started + duration_s
+
+            while True:
+                next_send += self.rng.expovariate(rate)
+                if next_send >= end:
+                    break
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                point.sent += 1
+                if self.in_flight >= self.max_in_flight:
+                    # Client-side saturation: count it, don't queue it
+                    point.dropped += 1
+                    continue
+                spec = self.rng.choices(self.request_mix, weights=weights)[0]
+                task = asyncio.create_task(fire(session, spec, next_send))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.wait(set(pending), timeout=self.request_timeout_s)
+            stop_sampling.set()
+            await sampler_task
+
+        # Throughput counts completions inside the window; stragglers only add latency
+        point.sent_rps = point.sent / duration_s
+        point.achieved_rps = window["completed"] / duration_s
+        point.error_rate = (point.errors + point.dropped) / point.sent if point.sent else 0.0
+        point.p50_ms = _percentile(latencies, 50)
+        point.p99_ms = _percentile(latencies, 99)
+        point.max_ms = max(latencies) if latencies else 0.0
+        point.queue_depths = {
+            name: {"mean": statistics.fmean(values), "max": max(values)}
+            for name, values in depth_samples.items() if values
+        }
+        point.endpoints = {
+            name: {
+                "completed": len(values),
+                "errors": endpoint_errors[name],
+                "p50_ms": _percentile(values, 50),
+                "p99_ms": _percentile(values, 99),
+            }
+            for name, values in per_endpoint.items()
+        }
+        return point
+
+    async def sweep(
+        self,
+        levels: Optional[List[StressLevel]] = None,
+        rates: Optional[List[float]] = None,
+        duration_s: float = 30.0,
+        cooldown_s: float = 5.0,
+        warmup_s: float = 5.0,
+        apply_stress: Optional[Callable[[StressLevel, float], Awaitable[Callable[[], Awaitable[None]]]]] = None,
+        min_throughput_ratio: float = 0.9,
+        p99_factor: float = 3.0,
+        max_error_rate: float = 0.01
+    ) -> Dict[str, Any]:
+        """
+        Measure every (stress level, offered rate) point and build the saturation report
+
+        Args:
+            warmup_s: Unrecorded run at the lowest rate first (connections, caches)
+            apply_stress: async (level, duration_s) -> async release(); holds the
+                level's stress for one window
+        """
+        levels = levels or DEFAULT_STRESS_LEVELS
+        rates = sorted(rates or DEFAULT_RATES)
+        started_at = datetime.utcnow()
+        points: List[LoadPoint] = []
+        baseline_p99: Dict[float, float] = {}
+
+        if warmup_s:
+            await self._measure(rates[0], warmup_s, level="warmup")
+
+        for level in levels:
+            for rate in rates:
+                release = None
+                if apply_stress and not level.is_baseline:
+                    release = await apply_stress(level, duration_s)
+                try:
+                    point = await self._measure(rate, duration_s, level=level.name)
+                finally:
+                    if release:
+                        await release()
+
+                if level.is_baseline:
+                    baseline_p99.setdefault(rate, point.p99_ms)
+                self._classify(point, baseline_p99.get(rate), min_throughput_ratio, p99_factor, max_error_rate)
+                points.append(point)
+
+                logger.info(
+                    f"[LOAD-PROFILE] {level.name} @ {rate:g} rps: {point.achieved_rps:.1f} rps, "
+                    f"p50 {point.p50_ms:.0f} ms, p99 {point.p99_ms:.0f} ms, "
+                    f"errors {point.error_rate:.1%}{' SATURATED' if point.saturated else ''}"
+                )
+                if cooldown_s:
+                    await asyncio.sleep(cooldown_s)
+
+        return self._report(levels, rates, points, started_at, duration_s)
+
+    def _classify(
+        self,
+        point: LoadPoint,
+        baseline_p99: Optional[float],
+        min_throughput_ratio: float,
+        p99_factor: float,
+        max_error_rate: float
+    ):
+        reasons = []
+        if point.achieved_rps < point.sent_rps * min_throughput_ratio:
+            reasons.append("throughput")
+        if baseline_p99 and point.p99_ms > baseline_p99 * p99_factor:
+            reasons.append("p99")
+        if point.error_rate > max_error_rate:
+            reasons.append("errors")
+        point.saturated = bool(reasons)
+        point.saturation_reasons = reasons
+
+    def _report(
+        self,
+        levels: List[StressLevel],
+        rates: List[float],
+        points: List[LoadPoint],
+        started_at: datetime,
+        duration_s: float
+    ) -> Dict[str, Any]:
+        curves = {}
+        for level in levels:
+            level_points = [p for p in points if p.level == level.name]
+            knee = None
+            for p in level_points:
+                if p.saturated:
+                    break
+                knee = p.offered_rps
+            first_saturated = next((p for p in level_points if p.saturated), None)
+            curves[level.name] = {
+                "stress": asdict(level),
+                "knee_rps": knee,
+                "saturated_at_rps": first_saturated.offered_rps if first_saturated else None,
+                "saturation_reasons": first_saturated.saturation_reasons if first_saturated else [],
+                "points": [
+                    {
+                        "offered_rps": p.offered_rps,
+                        "achieved_rps": round(p.achieved_rps, 2),
+                        "p50_ms": round(p.p50_ms, 1),
+                        "p99_ms": round(p.p99_ms, 1),
+                        "error_rate": round(p.error_rate, 4),
+                        "max_queue_depths": {k: v["max"] for k, v in p.queue_depths.items()},
+                        "saturated": p.saturated,
+                    }
+                    for p in level_points
+                ],
+            }
+
+        baseline_knee = curves.get(levels[0].name, {}).get("knee_rps") if levels else None
+        stress_knee = None
+        for level in levels[1:]:
+            knee = curves[level.name]["knee_rps"]
+            if knee is None or (baseline_knee is not None and knee < baseline_knee):
+                stress_knee = level.name
+                break
+
+        return {
+            "base_url": self.base_url,
+            "started_at": started_at.isoformat(),
+            "completed_at": datetime.utcnow().isoformat(),
+            "window_seconds": duration_s,
+            "rates": rates,
+            "request_mix": [asdict(spec) for spec in self.request_mix],
+            "curves": curves,
+            "baseline_knee_rps": baseline_knee,
+            "stress_knee_level": stress_knee,
+            "points": [asdict(p) for p in points],
+        }
@@ -7,6 +7,7 @@ from backend.misc.code_memory import (
     CodePattern,
     CodeContext,
     CodeSymbol,
+    CodeIndexManifest,
     CodeMemoryEngine,
     code_memory,
 )
@@ -15,6 +16,7 @@ __all__ = [
     'CodePattern',
     'CodeContext',
     'CodeSymbol',
+    'CodeIndexManifest',
     'CodeMemoryEngine',
     'code_memory',
 ]
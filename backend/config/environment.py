@@ -31,6 +31,28 @@ class GraceEnvironment:
         except ValueError:
             return 8000
     
+    @staticmethod
+    def get_app_profile() -> str:
+        """
+        Get the API process profile from GRACE_APP_PROFILE
+
+        full    - every router plus background subsystems (learning, ingestion,
+                  chaos, reminders, ...)
+        minimal - request-serving only; background subsystems are left to a
+                  dedicated full-profile process. World model, domain system
+                  and infrastructure init move to the first request of a
+                  router that declares them (router_registry `requires`);
+                  chat initializes RAG and the world model on demand
+        """
+        profile = os.getenv("GRACE_APP_PROFILE", "full").lower()
+        return profile if profile in ("full", "minimal") else "full"
+
+    @staticmethod
+    def get_router_loading() -> str:
+        """Get router loading mode from GRACE_ROUTER_LOADING (lazy or eager)"""
+        mode = os.getenv("GRACE_ROUTER_LOADING", "lazy").lower()
+        return mode if mode in ("lazy", "eager") else "lazy"
+
     @staticmethod
     def should_skip_external_calls() -> bool:
         """Should skip external API calls (offline or CI mode)"""
@@ -44,6 +66,8 @@ class GraceEnvironment:
             "dry_run": GraceEnvironment.is_dry_run(),
             "ci_mode": GraceEnvironment.is_ci_mode(),
             "grace_port": GraceEnvironment.get_port(),
+            "app_profile": GraceEnvironment.get_app_profile(),
+            "router_loading": GraceEnvironment.get_router_loading(),
             "skip_external_calls": GraceEnvironment.should_skip_external_calls()
         }
 
@@ -52,5 +76,7 @@ OFFLINE_MODE = GraceEnvironment.is_offline_mode()
 DRY_RUN = GraceEnvironment.is_dry_run()
 CI_MODE = GraceEnvironment.is_ci_mode()
 GRACE_PORT = GraceEnvironment.get_port()
+APP_PROFILE = GraceEnvironment.get_app_profile()
+ROUTER_LOADING = GraceEnvironment.get_router_loading()
 
 
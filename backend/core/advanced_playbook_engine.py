@@ -8,6 +8,8 @@ Features:
 - Coding agent integration (generate_patch, add_tests, run_lint)
 - Learned templates from successful remediations
 - Simulation harness for validation
+- Dependency-aware (DAG) step execution: independent steps run concurrently
+- Compiled, indexed, hot-reloaded playbook registry (playbook_registry.py)
 - Real tools: ruff, pytest, mypy, psutil, httpx, sqlalchemy
 - Organized by failure domain
 - Action primitives from control plane APIs
@@ -15,14 +17,16 @@ Features:
 
 import asyncio
 import json
-import yaml
+import time
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, Set
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .playbook_registry import PlaybookRegistry, compile_condition
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,12 +50,19 @@ class Severity(Enum):
 
 @dataclass
 class PlaybookStep:
-    """Single playbook step with real execution"""
+    """Single playbook step with real execution
+
+    depends_on=None keeps the classic behaviour (run after the previous step);
+    a list names the steps (by id, or action name) that must finish first, so
+    [] means the step can start immediately.
+    """
     action: str
     params: Dict[str, Any] = field(default_factory=dict)
     conditional: Optional[str] = None
     timeout: int = 60
     retry_count: int = 3
+    id: Optional[str] = None
+    depends_on: Optional[List[str]] = None
 
 
 @dataclass
@@ -63,6 +74,8 @@ class Playbook:
     steps: List[PlaybookStep]
     adaptive_branches: Dict[Severity, List[PlaybookStep]] = field(default_factory=dict)
     learned_template: Optional[str] = None
+    # Start the SLO simulation while the final (sink) steps are still running
+    overlap_simulation: bool = False
 
 
 @dataclass
@@ -82,10 +95,14 @@ class AdvancedPlaybookEngine:
     Production playbook engine with real tool integration
     """
     
-    def __init__(self):
-        self.playbooks: Dict[str, Playbook] = {}
+    def __init__(self, max_parallel_steps: int = 4):
+        self.playbook_dir = Path(__file__).parent.parent.parent / 'playbooks'
+        self.registry = PlaybookRegistry(self.playbook_dir, self._parse_playbook)
         self.templates: Dict[str, RemediationTemplate] = {}
-        self.template_dir = Path(__file__).parent.parent.parent / 'playbooks' / 'templates'
+        # issue_pattern -> template ids (avoids scanning every template per execution)
+        self._template_index: Dict[str, List[str]] = {}
+        self.max_parallel_steps = max_parallel_steps
+        self.template_dir = self.playbook_dir / 'templates'
         self.template_dir.mkdir(parents=True, exist_ok=True)
         
         self.execution_history: List[Dict] = []
@@ -94,6 +111,11 @@ class AdvancedPlaybookEngine:
         # Action primitives registry
         self.action_primitives = self._register_action_primitives()
     
+    @property
+    def playbooks(self) -> Dict[str, Playbook]:
+        """Current playbooks (swapped atomically on hot reload)"""
+        return self.registry.playbooks
+    
     def _register_action_primitives(self) -> Dict[str, Any]:
         """Register all action primitives (real implementations)"""
         
@@ -143,45 +165,28 @@ class AdvancedPlaybookEngine:
         
         logger.info(f"[PLAYBOOK-ENGINE] Started with {len(self.playbooks)} playbooks, {len(self.templates)} templates")
     
-    async def _load_playbooks(self):
-        """Load playbooks organized by failure domain"""
-        
-        playbook_dir = Path(__file__).parent.parent.parent / 'playbooks'
-        
-        # Load domain-specific playbooks
-        domains = [
-            'boot_readiness.yaml',
-            'kernel_runtime.yaml',
-            'api_contract.yaml',
-            'model_integrity.yaml',
-            'infra_resource.yaml',
-            'security.yaml',
-            'advanced_self_healing.yaml'
-        ]
-        
-        for domain_file in domains:
-            file_path = playbook_dir / domain_file
-            if file_path.exists():
-                await self._load_playbook_file(file_path)
+    async def stop(self):
+        """Stop playbook engine (and the playbook directory watcher)"""
+        
+        self.running = False
+        await self.registry.stop()
     
-    async def _load_playbook_file(self, file_path: Path):
-        """Load playbooks from YAML file"""
+    async def _load_playbooks(self):
+        """Load and compile every playbook in playbooks/, then watch for changes"""
         
-        try:
-            with open(file_path) as f:
-                data = yaml.safe_load(f)
-            
-            playbooks = data.get('playbooks', [])
-            
-            for pb_data in playbooks:
-                playbook = self._parse_playbook(pb_data)
-                if playbook:
-                    self.playbooks[playbook.name] = playbook
+        await self.registry.start()
+    
+    def find_playbooks(
+        self,
+        issue: Optional[str] = None,
+        domain: Optional[FailureDomain] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[Playbook]:
+        """Playbooks triggered by issue / in domain whose preconditions hold for context"""
         
-        except Exception as e:
-            logger.error(f"[PLAYBOOK-ENGINE] Could not load {file_path}: {e}")
+        return self.registry.match(issue=issue, domain=domain, context=context)
     
-    def _parse_playbook(self, data: Dict) -> Optional[Playbook]:
+    def _parse_playbook(self, data: Dict, source: Optional[Path] = None) -> Optional[Playbook]:
         """Parse playbook from data"""
         
         try:
@@ -189,33 +194,62 @@ class AdvancedPlaybookEngine:
                 PlaybookStep(
                     action=step.get('action'),
                     params=step,
-                    conditional=step.get('if')
+                    conditional=step.get('if', step.get('condition')),
+                    timeout=int(step.get('timeout', 60)),
+                    retry_count=int(step.get('retry_count', 3)),
+                    id=step.get('id', step.get('name')),
+                    depends_on=self._as_list(step['depends_on']) if 'depends_on' in step else None
                 )
                 for step in data.get('steps', [])
             ]
             
-            # Determine domain from trigger conditions
+            # Explicit domain, else the file name (boot_readiness.yaml, ...)
             domain = FailureDomain.KERNEL_RUNTIME  # Default
+            for candidate in (data.get('domain'), source.stem if source else None):
+                try:
+                    domain = FailureDomain(candidate)
+                    break
+                except ValueError:
+                    continue
+            
+            triggers = [
+                t if isinstance(t, str) else str(t.get('pattern') or t.get('reason') or t.get('type'))
+                for t in data.get('trigger_on', []) or data.get('triggers', []) or []
+            ]
             
             return Playbook(
                 name=data['name'],
                 domain=domain,
-                trigger_conditions=data.get('trigger_on', []),
-                steps=steps
+                trigger_conditions=triggers,
+                steps=steps,
+                overlap_simulation=bool(data.get('overlap_simulation', False))
             )
         
         except Exception as e:
             logger.error(f"[PLAYBOOK-ENGINE] Could not parse playbook: {e}")
             return None
     
+    @staticmethod
+    def _as_list(value: Any) -> List[str]:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return [str(v) for v in value]
+    
     async def execute_playbook(
         self,
         playbook_name: str,
         context: Dict[str, Any],
-        severity: Severity = Severity.MODERATE
+        severity: Severity = Severity.MODERATE,
+        overlap_simulation: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Execute playbook with adaptive branching and validation
+        
+        Args:
+            overlap_simulation: Run the SLO simulation alongside the final steps
+                (default: the playbook's overlap_simulation setting)
         """
         
         playbook = self.playbooks.get(playbook_name)
@@ -240,28 +274,33 @@ class AdvancedPlaybookEngine:
             else:
                 steps = playbook.steps
         
-        # Execute each step
-        for step_idx, step in enumerate(steps):
-            # Check conditional
-            if step.conditional and not self._evaluate_conditional(step.conditional, context):
-                logger.debug(f"[PLAYBOOK-ENGINE] Skipping step {step_idx}: {step.conditional}")
-                continue
-            
-            # Execute action primitive
-            step_result = await self._execute_step(step, context)
-            results.append({
-                'step': step_idx,
-                'action': step.action,
-                'result': step_result
-            })
-            
-            # Stop on failure if critical
-            if not step_result.get('success') and severity == Severity.CRITICAL:
-                logger.error(f"[PLAYBOOK-ENGINE] Critical step failed: {step.action}")
-                break
+        if overlap_simulation is None:
+            overlap_simulation = playbook.overlap_simulation
+        
+        started = time.perf_counter()
+        simulation_task: Optional[asyncio.Task] = None
+        
+        def start_simulation():
+            nonlocal simulation_task
+            if simulation_task is None:
+                simulation_task = asyncio.create_task(self._run_simulation_harness(playbook.domain, context))
+        
+        # Execute steps (independent steps concurrently)
+        try:
+            results = await self._execute_steps(
+                steps, context, severity,
+                on_final_steps=start_simulation if overlap_simulation else None
+            )
+        except BaseException:
+            if simulation_task:
+                simulation_task.cancel()
+            raise
         
         # Run simulation harness to verify SLOs
-        simulation_result = await self._run_simulation_harness(playbook.domain, context)
+        if simulation_task is not None:
+            simulation_result = await simulation_task
+        else:
+            simulation_result = await self._run_simulation_harness(playbook.domain, context)
         
         # Learn from success
         all_successful = all(r['result'].get('success') for r in results)
@@ -278,6 +317,7 @@ class AdvancedPlaybookEngine:
             'steps_executed': len(results),
             'success': all_successful,
             'slo_met': simulation_result['slo_met'],
+            'wall_clock_ms': round((time.perf_counter() - started) * 1000, 1),
             'results': results
         }
         
@@ -302,29 +342,169 @@ class AdvancedPlaybookEngine:
             'execution_id': execution_id,
             'steps_executed': len(results),
             'slo_met': simulation_result['slo_met'],
+            'wall_clock_ms': execution_record['wall_clock_ms'],
             'results': results
         }
     
-    def _evaluate_conditional(self, condition: str, context: Dict) -> bool:
-        """Evaluate conditional expression"""
+    def _step_dependencies(self, steps: List[PlaybookStep]) -> List[Set[int]]:
+        """
+        Resolve each step's prerequisites to step indices
+        
+        Steps without depends_on follow the previous step. Unknown references
+        are ignored; a dependency cycle falls back to sequential order.
+        """
+        
+        by_name: Dict[str, int] = {}
+        for idx, step in enumerate(steps):
+            by_name.setdefault(step.action, idx)
+        for idx, step in enumerate(steps):
+            if step.id:
+                by_name[step.id] = idx
+        
+        deps: List[Set[int]] = []
+        for idx, step in enumerate(steps):
+            if step.depends_on is None:
+                deps.append({idx - 1} if idx > 0 else set())
+                continue
+            resolved = set()
+            for ref in step.depends_on:
+                if ref in by_name and by_name[ref] != idx:
+                    resolved.add(by_name[ref])
+                else:
+                    logger.warning(f"[PLAYBOOK-ENGINE] Step {idx} ({step.action}): unknown dependency '{ref}'")
+            deps.append(resolved)
+        
+        # Cycle check (Kahn)
+        remaining = {i: set(d) for i, d in enumerate(deps)}
+        ready = [i for i, d in remaining.items() if not d]
+        seen = 0
+        while ready:
+            node = ready.pop()
+            seen += 1
+            for i, d in remaining.items():
+                if node in d:
+                    d.discard(node)
+                    if not d:
+                        ready.append(i)
+        if seen != len(steps):
+            logger.error("[PLAYBOOK-ENGINE] Step dependency cycle, running sequentially")
+            return [{i - 1} if i > 0 else set() for i in range(len(steps))]
+        
+        return deps
+    
+    async def _execute_steps(
+        self,
+        steps: List[PlaybookStep],
+        context: Dict,
+        severity: Severity,
+        on_final_steps: Optional[Callable[[], None]] = None
+    ) -> List[Dict]:
+        """
+        Run steps as a dependency graph, up to max_parallel_steps at a time
+        
+        A step that names its prerequisites (depends_on) is skipped when one
+        of them failed or was skipped that way; steps that just follow the
+        previous one still run after a failure, as in sequential mode. At
+        CRITICAL severity no further steps are started after a failure.
+        on_final_steps is called once every non-final step has finished, i.e.
+        only steps nothing depends on are left.
+        
+        Each finished step's outputs are kept apart from context, under
+        steps.<id> and as bare names, and only step conditions read them:
+        "stale_count > 0" can see what an earlier step found, but step
+        params stay built from the caller's context alone.
+        """
+        
+        outputs: Dict[str, Any] = {'steps': {}}
+        deps = self._step_dependencies(steps)
+        has_dependents = set().union(*deps) if deps else set()
+        
+        pending = set(range(len(steps)))
+        done: Set[int] = set()
+        failed: Set[int] = set()
+        results: Dict[int, Dict] = {}
+        running: Dict[asyncio.Task, int] = {}
+        stop = False
+        final_notified = on_final_steps is None
         
         try:
-            # Simple evaluation (production would use safe eval)
-            for key, value in context.items():
-                condition = condition.replace(f"${key}", str(value))
-            
-            # Check common patterns
-            if 'restart_count > 3' in condition:
-                restart_count = context.get('restart_count', 0)
-                return restart_count > 3
-            
-            if 'if_code_issue' in condition:
-                return context.get('issue_type') in ['syntax_error', 'import_error']
-            
-            return True  # Default to execute
+            while True:
+                # Start everything whose prerequisites are done
+                progressed = True
+                while progressed and not stop:
+                    progressed = False
+                    for idx in sorted(pending):
+                        if len(running) >= self.max_parallel_steps:
+                            break
+                        if not deps[idx] <= done:
+                            continue
+                        pending.discard(idx)
+                        progressed = True
+                        step = steps[idx]
+                        if step.depends_on is not None and deps[idx] & failed:
+                            logger.info(f"[PLAYBOOK-ENGINE] Skipping step {idx} ({step.action}): a prerequisite failed")
+                            done.add(idx)
+                            failed.add(idx)
+                            continue
+                        if step.conditional and not self._evaluate_conditional(step.conditional, {**context, **outputs}):
+                            logger.debug(f"[PLAYBOOK-ENGINE] Skipping step {idx}: {step.conditional}")
+                            done.add(idx)
+                            continue
+                        running[asyncio.create_task(self._timed_step(step, context))] = idx
+                
+                if not final_notified and has_dependents <= done:
+                    final_notified = True
+                    on_final_steps()
+                
+                if not running:
+                    break
+                
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    idx = running.pop(task)
+                    step_result, duration_ms = task.result()
+                    results[idx] = {
+                        'step': idx,
+                        'action': steps[idx].action,
+                        'result': step_result,
+                        'duration_ms': duration_ms
+                    }
+                    done.add(idx)
+                    self._record_step_outputs(steps[idx], step_result, outputs)
+                    if not step_result.get('success'):
+                        failed.add(idx)
+                    
+                    # Stop on failure if critical
+                    if idx in failed and severity == Severity.CRITICAL:
+                        logger.error(f"[PLAYBOOK-ENGINE] Critical step failed: {steps[idx].action}")
+                        stop = True
+        finally:
+            for task in running:
+                task.cancel()
+        
+        return [results[idx] for idx in sorted(results)]
+    
+    @staticmethod
+    def _record_step_outputs(step: PlaybookStep, result: Dict, outputs: Dict) -> None:
+        """Keep a finished step's outputs for the conditions of the steps that follow it"""
         
-        except Exception:
-            return True
+        if not isinstance(result, dict):
+            return
+        if step.id:
+            outputs['steps'][step.id] = result
+        for key, value in result.items():
+            if key not in ('success', 'error', 'steps'):
+                outputs[key] = value
+    
+    async def _timed_step(self, step: PlaybookStep, context: Dict):
+        started = time.perf_counter()
+        result = await self._execute_step(step, context)
+        return result, round((time.perf_counter() - started) * 1000, 1)
+    
+    def _evaluate_conditional(self, condition: str, context: Dict) -> bool:
+        """Evaluate conditional expression (compiled once per distinct condition)"""
+        
+        return compile_condition(condition)(context)
     
     async def _execute_step(self, step: PlaybookStep, context: Dict) -> Dict:
         """Execute single playbook step using action primitive"""
@@ -932,11 +1112,11 @@ class AdvancedPlaybookEngine:
         """
         
         try:
-            # Run smoke tests
-            smoke_result = await self._action_run_smoke_tests({})
-            
-            # Verify SLO
-            slo_result = await self._action_verify_slo({})
+            # Smoke tests and SLO probe are independent
+            smoke_result, slo_result = await asyncio.gather(
+                self._action_run_smoke_tests({}),
+                self._action_verify_slo({})
+            )
             
             slo_met = smoke_result.get('smoke_passed') and slo_result.get('slo_met')
             
@@ -984,6 +1164,7 @@ class AdvancedPlaybookEngine:
             )
             
             self.templates[template.template_id] = template
+            self._index_template(template)
             
             logger.info(f"[PLAYBOOK-ENGINE] Learned new template: {template.template_id}")
         
@@ -998,16 +1179,25 @@ class AdvancedPlaybookEngine:
         
         return f"{issue_type}_{severity}"
     
+    def _index_template(self, template: RemediationTemplate):
+        """Add template to the issue-pattern index"""
+        
+        ids = self._template_index.setdefault(template.issue_pattern, [])
+        if template.template_id not in ids:
+            ids.append(template.template_id)
+    
     def _find_matching_template(self, context: Dict) -> Optional[RemediationTemplate]:
-        """Find matching learned template"""
+        """Find matching learned template (highest confidence for the pattern)"""
         
         pattern = self._create_issue_pattern(context)
         
-        for template in self.templates.values():
-            if template.issue_pattern == pattern and template.confidence > 0.6:
-                return template
+        best = None
+        for template_id in self._template_index.get(pattern, ()):
+            template = self.templates.get(template_id)
+            if template and template.confidence > 0.6 and (best is None or template.confidence > best.confidence):
+                best = template
         
-        return None
+        return best
     
     async def _save_template(self, template: RemediationTemplate):
         """Save learned template to disk"""
@@ -1020,7 +1210,13 @@ class AdvancedPlaybookEngine:
                 'domain': template.domain.value,
                 'issue_pattern': template.issue_pattern,
                 'steps': [
-                    {'action': s.action, 'params': s.params}
+                    {
+                        'action': s.action,
+                        'params': s.params,
+                        'timeout': s.timeout,
+                        'id': s.id,
+                        'depends_on': s.depends_on
+                    }
                     for s in template.steps
                 ],
                 'success_count': template.success_count,
@@ -1043,7 +1239,13 @@ class AdvancedPlaybookEngine:
                     data = json.load(f)
                 
                 steps = [
-                    PlaybookStep(action=s['action'], params=s.get('params', {}))
+                    PlaybookStep(
+                        action=s['action'],
+                        params=s.get('params', {}),
+                        timeout=s.get('timeout', 60),
+                        id=s.get('id'),
+                        depends_on=s.get('depends_on')
+                    )
                     for s in data.get('steps', [])
                 ]
                 
@@ -1058,6 +1260,7 @@ class AdvancedPlaybookEngine:
                 )
                 
                 self.templates[template.template_id] = template
+                self._index_template(template)
             
             logger.info(f"[PLAYBOOK-ENGINE] Loaded {len(self.templates)} learned templates")
         
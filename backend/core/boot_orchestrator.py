@@ -11,12 +11,15 @@ Features:
 - Structured telemetry & rollback
 - Progressive feature flags
 - Parallel validation harness
+- Eager DAG scheduling with critical-path / Chrome trace boot reports
 """
 
 import asyncio
+import os
 import random
 import json
 import sys
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from enum import Enum
@@ -116,10 +119,17 @@ class BootOrchestrator:
         # Advanced optimization state
         self.warm_cache_dir = Path(__file__).parent.parent.parent / '.grace_cache'
         self.warm_cache_dir.mkdir(exist_ok=True)
-        self.resource_semaphore = asyncio.Semaphore(3)  # Max 3 heavy tasks concurrently
+        # Max heavy (resource_intensive) kernels booting concurrently
+        self.heavy_kernel_parallelism = max(1, int(os.getenv('GRACE_BOOT_HEAVY_PARALLELISM', '3')))
+        self.resource_semaphore = asyncio.Semaphore(self.heavy_kernel_parallelism)
         self.heartbeat_streams: Dict[str, List[datetime]] = {}
         self.pre_warmed_resources: Dict[str, Any] = {}
         
+        # Boot timeline (seconds relative to boot_started_at)
+        self.boot_started_at: Optional[float] = None
+        self.kernel_timings: Dict[str, Dict[str, Any]] = {}
+        self.boot_trace_path = self.warm_cache_dir / 'boot_trace.json'
+        
         self._initialize_pre_flight_checks()
         self._initialize_kernel_graph()
         self._load_feature_flags()
@@ -532,6 +542,34 @@ class BootOrchestrator:
         # Boot kernels respecting dependencies
         booted = set()
         failed = set()
+        self.boot_started_at = time.monotonic()
+        self.kernel_timings = {}
+        
+        if self.feature_flags.get('enable_eager_dag_boot', True):
+            ok = await self._boot_dag_eager(control_plane, booted, failed)
+        else:
+            ok = await self._boot_in_waves(control_plane, booted, failed)
+        
+        self._write_boot_trace()
+        
+        if not ok:
+            return False
+        
+        print()
+        print(f"  [OK] Boot complete: {len(booted)} kernels, {len(failed)} failed")
+        print("=" * 80)
+        
+        # Save warm caches for next boot
+        if self.feature_flags.get('enable_warm_cache'):
+            await self._save_warm_caches()
+        
+        return len(failed) == 0 or all(not self.kernel_graph[f].critical for f in failed)
+    
+    async def _boot_in_waves(self, control_plane, booted: set, failed: set) -> bool:
+        """
+        Legacy wave scheduler: boot every ready kernel, wait for the whole wave.
+        Kept behind enable_eager_dag_boot=false for comparison.
+        """
         
         while len(booted) + len(failed) < len(self.kernel_graph):
             ready_to_boot = []
@@ -558,12 +596,13 @@ class BootOrchestrator:
                 pending = set(self.kernel_graph.keys()) - booted - failed
                 if pending:
                     print(f"  [WARN]  Circular dependency detected or all pending failed: {pending}")
-                    break
+                    if self._critical_unstartable(pending):
+                        return False
                 break
             
             # Boot ready kernels in parallel
             tasks = [
-                self._boot_kernel_with_timeout(k, control_plane)
+                self._boot_kernel_timed(k, control_plane)
                 for k in ready_to_boot
             ]
             
@@ -581,15 +620,244 @@ class BootOrchestrator:
                     booted.add(kernel.name)
                     kernel.ready = True
         
-        print()
-        print(f"  [OK] Boot complete: {len(booted)} kernels, {len(failed)} failed")
-        print("=" * 80)
+        return True
+    
+    async def _boot_dag_eager(self, control_plane, booted: set, failed: set) -> bool:
+        """
+        Event-driven DAG scheduler
         
-        # Save warm caches for next boot
-        if self.feature_flags.get('enable_warm_cache'):
-            await self._save_warm_caches()
+        Each kernel starts the moment its own dependencies are booted, so one
+        slow kernel only delays its dependents, not unrelated ones. Heavy
+        kernels still share resource_semaphore. Dependents of failed kernels
+        are reported as blocked instead of waiting forever; the boot fails if
+        a critical kernel fails or can never start.
+        """
         
-        return len(failed) == 0 or all(not self.kernel_graph[f].critical for f in failed)
+        pending: Dict[str, KernelDependency] = {}
+        for name, kernel in self.kernel_graph.items():
+            if kernel.feature_flag and not self.feature_flags.get(kernel.feature_flag):
+                print(f"  [?]  Skipping {name} (feature flag disabled)")
+                booted.add(name)
+                continue
+            pending[name] = kernel
+        
+        running: Dict[asyncio.Task, KernelDependency] = {}
+        blocked: set = set()
+        
+        def launch_ready():
+            for name, kernel in list(pending.items()):
+                if any(dep in failed or dep in blocked for dep in kernel.depends_on):
+                    blocked.add(name)
+                    del pending[name]
+                    self._record_kernel_timing(name, status='blocked')
+                    continue
+                
+                if all(dep in booted for dep in kernel.depends_on):
+                    del pending[name]
+                    task = asyncio.create_task(self._boot_kernel_timed(kernel, control_plane))
+                    running[task] = kernel
+        
+        async def abort():
+            for other in running:
+                other.cancel()
+            await asyncio.gather(*running.keys(), return_exceptions=True)
+            return False
+        
+        launch_ready()
+        if self._critical_unstartable(blocked):
+            return await abort()
+        
+        while running:
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                kernel = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception:
+                    result = False
+                
+                if result is False:
+                    failed.add(kernel.name)
+                    kernel.failed = True
+                    
+                    if kernel.critical:
+                        print(f"\n[ERROR] CRITICAL KERNEL FAILED: {kernel.name}")
+                        return await abort()
+                else:
+                    booted.add(kernel.name)
+                    kernel.ready = True
+            
+            # Propagate failures until no more kernels become blocked
+            while True:
+                before = len(blocked)
+                launch_ready()
+                if len(blocked) == before:
+                    break
+            
+            if self._critical_unstartable(blocked):
+                return await abort()
+        
+        if blocked:
+            print(f"  [WARN]  Blocked by failed dependencies: {sorted(blocked)}")
+        if pending:
+            print(f"  [WARN]  Circular or unknown dependencies: {sorted(pending)}")
+        
+        return not self._critical_unstartable(pending)
+    
+    def _critical_unstartable(self, names) -> bool:
+        """Report critical kernels among names that will never start"""
+        
+        critical = sorted(name for name in names if self.kernel_graph[name].critical)
+        if critical:
+            print(f"\n[ERROR] CRITICAL KERNELS CANNOT START: {critical}")
+        return bool(critical)
+    
+    async def _boot_kernel_timed(self, kernel: KernelDependency, control_plane) -> bool:
+        """Boot one kernel and record its start/finish on the boot timeline"""
+        
+        self._record_kernel_timing(kernel.name, start=True)
+        try:
+            result = await self._boot_kernel_with_timeout(kernel, control_plane)
+        except asyncio.CancelledError:
+            self._record_kernel_timing(kernel.name, status='cancelled')
+            raise
+        except Exception:
+            self._record_kernel_timing(kernel.name, status='failed')
+            raise
+        
+        status = 'failed' if result is False else ('degraded' if kernel.degraded else 'ready')
+        self._record_kernel_timing(kernel.name, status=status)
+        return result
+    
+    def _record_kernel_timing(self, name: str, start: bool = False, status: Optional[str] = None):
+        """Record kernel start (start=True) or finish (status=...) on the timeline"""
+        
+        now = time.monotonic() - (self.boot_started_at or time.monotonic())
+        timing = self.kernel_timings.setdefault(name, {
+            'kernel': name,
+            'tier': self.kernel_graph[name].tier if name in self.kernel_graph else 'unknown',
+            'start': None,
+            'finish': None,
+            'throttle_wait': 0.0,
+            'status': 'pending'
+        })
+        
+        if start:
+            timing['start'] = now
+            timing['status'] = 'booting'
+        if status:
+            timing['finish'] = now
+            timing['status'] = status
+    
+    def get_boot_timeline_report(self) -> Dict[str, Any]:
+        """
+        Per-kernel timings plus the critical path of the last boot
+        
+        The critical path is walked backwards from the last kernel to finish,
+        at each step following the dependency that finished last (the one
+        that actually gated the kernel's start).
+        """
+        
+        timings = {
+            name: t for name, t in self.kernel_timings.items()
+            if t['start'] is not None and t['finish'] is not None
+        }
+        
+        critical_path: List[Dict[str, Any]] = []
+        if timings:
+            current = max(timings.values(), key=lambda t: t['finish'])['kernel']
+            while current:
+                t = timings[current]
+                critical_path.append({
+                    'kernel': current,
+                    'start': round(t['start'], 3),
+                    'finish': round(t['finish'], 3),
+                    'duration': round(t['finish'] - t['start'], 3),
+                    'throttle_wait': round(t['throttle_wait'], 3),
+                    'status': t['status']
+                })
+                
+                deps = [d for d in self.kernel_graph[current].depends_on if d in timings]
+                current = max(deps, key=lambda d: timings[d]['finish']) if deps else None
+            
+            critical_path.reverse()
+        
+        total = max((t['finish'] for t in timings.values()), default=0.0)
+        
+        return {
+            'total_boot_seconds': round(total, 3),
+            'kernels_booted': len(timings),
+            'heavy_kernel_parallelism': self.heavy_kernel_parallelism,
+            'critical_path': critical_path,
+            'critical_path_seconds': round(sum(k['duration'] for k in critical_path), 3),
+            'slowest_kernels': sorted(
+                (
+                    {'kernel': t['kernel'], 'duration': round(t['finish'] - t['start'], 3)}
+                    for t in timings.values()
+                ),
+                key=lambda k: k['duration'],
+                reverse=True
+            )[:5],
+            'kernels': self.kernel_timings
+        }
+    
+    def get_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Boot timeline in Chrome trace event format
+        Load in chrome://tracing or https://ui.perfetto.dev
+        """
+        
+        critical = {k['kernel'] for k in self.get_boot_timeline_report()['critical_path']}
+        tiers = sorted({t['tier'] for t in self.kernel_timings.values()})
+        events = []
+        
+        for tid, tier in enumerate(tiers):
+            events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                'args': {'name': tier}
+            })
+        
+        for t in self.kernel_timings.values():
+            if t['start'] is None or t['finish'] is None:
+                continue
+            events.append({
+                'name': t['kernel'],
+                'cat': 'critical_path' if t['kernel'] in critical else 'kernel',
+                'ph': 'X',
+                'pid': 1,
+                'tid': tiers.index(t['tier']),
+                'ts': int(t['start'] * 1_000_000),
+                'dur': int((t['finish'] - t['start']) * 1_000_000),
+                'args': {
+                    'status': t['status'],
+                    'throttle_wait_s': round(t['throttle_wait'], 3),
+                    'depends_on': self.kernel_graph[t['kernel']].depends_on
+                    if t['kernel'] in self.kernel_graph else []
+                }
+            })
+        
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    
+    def _write_boot_trace(self):
+        """Persist the Chrome trace and print the critical path summary"""
+        
+        report = self.get_boot_timeline_report()
+        
+        try:
+            with open(self.boot_trace_path, 'w') as f:
+                json.dump(self.get_chrome_trace(), f)
+        except Exception as e:
+            logger.warning(f"Could not write boot trace: {e}")
+        
+        path = " -> ".join(f"{k['kernel']}({k['duration']:.1f}s)" for k in report['critical_path'])
+        print(f"  [TRACE] Boot {report['total_boot_seconds']:.1f}s, critical path: {path or 'n/a'}")
+        
+        self._log_event("boot_timeline", {
+            'total_boot_seconds': report['total_boot_seconds'],
+            'critical_path': report['critical_path'],
+            'trace_file': str(self.boot_trace_path)
+        })
     
     async def _boot_kernel_with_timeout(self, kernel: KernelDependency, control_plane) -> bool:
         """
@@ -618,7 +886,10 @@ class BootOrchestrator:
                 
                 # Resource throttling for heavy kernels
                 if kernel.resource_intensive:
+                    wait_started = time.monotonic()
                     async with self.resource_semaphore:
+                        if kernel.name in self.kernel_timings:
+                            self.kernel_timings[kernel.name]['throttle_wait'] += time.monotonic() - wait_started
                         success = await self._boot_kernel_attempt(
                             kernel, cp_kernel, control_plane, attempt
                         )
@@ -21,6 +21,7 @@ from collections import deque
 import heapq
 
 from backend.core.message_bus import message_bus, MessagePriority
+from backend.observability.tracing import request_tracer
 
 
 class TaskPriority(str, Enum):
@@ -71,6 +72,9 @@ class Task:
         self.result = None
         self.error = None
         self.retry_count = 0
+        
+        # Trace of whoever enqueued the task; workers continue it
+        self.trace_context: Dict[str, str] = request_tracer.inject({})
     
     def __lt__(self, other):
         """Comparison for heap queue (priority + deadline)"""
@@ -289,6 +293,18 @@ class HierarchicalTaskManager:
     async def _execute_task(self, task: Task, worker_id: int):
         """Execute a task"""
         
+        with request_tracer.span(
+            f"htm.execute {task.task_type}",
+            parent=request_tracer.extract(task.trace_context),
+            kind="consumer",
+            require_parent=True,
+            **{"htm.task_id": task.task_id, "htm.priority": task.priority.value, "htm.handler": task.handler}
+        ) as span:
+            if span is not None:
+                span.add_tag("htm.queue_wait_ms", round((datetime.utcnow() - task.created_at).total_seconds() * 1000, 2))
+            await self._run_task(task, worker_id)
+    
+    async def _run_task(self, task: Task, worker_id: int):
         print(f"[HTM] Worker {worker_id}: Executing {task.task_type} (priority: {task.priority.value})")
         
         task.status = TaskStatus.RUNNING
@@ -331,6 +347,10 @@ class HierarchicalTaskManager:
             task.status = TaskStatus.FAILED
             task.error = str(e)
             
+            span = request_tracer.current_span()
+            if span is not None:
+                span.set_error(e)
+            
             self.stats["tasks_failed"] += 1
             
             # Publish failure
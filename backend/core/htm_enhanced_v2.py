@@ -21,6 +21,7 @@ from collections import deque, defaultdict
 from dataclasses import dataclass, field
 
 from backend.core.message_bus import message_bus, MessagePriority
+from backend.observability.tracing import request_tracer
 from backend.models.htm_models import HTMTask, HTMTaskAttempt, HTMMetrics
 from backend.models.base_models import async_session
 from sqlalchemy import select, update, and_
@@ -105,6 +106,9 @@ class TrackedTask:
     # Intent linkage
     intent_id: Optional[str] = None
     
+    # Trace of the enqueuer (W3C traceparent), continued at dispatch
+    trace_context: Dict[str, str] = field(default_factory=lambda: request_tracer.inject({}))
+    
     def calculate_timings(self):
         """Calculate all timing metrics"""
         now = datetime.now(timezone.utc)
@@ -297,21 +301,28 @@ class HTMEnhancedV2:
                 # Persist assignment
                 await self._persist_task_update(tracked, ["status", "assigned_at", "assigned_worker"])
                 
-                # Dispatch to worker/kernel
-                await message_bus.publish(
-                    source="htm_v2",
-                    topic=f"htm.task.dispatch.{tracked.task_type}",
-                    payload={
-                        "task_id": task_id,
-                        "task_type": tracked.task_type,
-                        "payload": tracked.payload,
-                        "attempt_number": tracked.attempt_number,
-                        "priority": tracked.priority.value,
-                        "sla_deadline": tracked.sla_deadline.isoformat() if tracked.sla_deadline else None,
-                        "handler": tracked.handler
-                    },
-                    priority=MessagePriority.HIGH if tracked.priority in [TaskPriority.CRITICAL, TaskPriority.HIGH] else MessagePriority.NORMAL
-                )
+                # Dispatch to worker/kernel (bus message carries the enqueuer's trace)
+                with request_tracer.span(
+                    f"htm.dispatch {tracked.task_type}",
+                    parent=request_tracer.extract(tracked.trace_context),
+                    kind="producer",
+                    require_parent=True,
+                    **{"htm.task_id": task_id, "htm.attempt": tracked.attempt_number, "htm.queue_wait_ms": round((now - tracked.queued_at).total_seconds() * 1000, 2)}
+                ):
+                    await message_bus.publish(
+                        source="htm_v2",
+                        topic=f"htm.task.dispatch.{tracked.task_type}",
+                        payload={
+                            "task_id": task_id,
+                            "task_type": tracked.task_type,
+                            "payload": tracked.payload,
+                            "attempt_number": tracked.attempt_number,
+                            "priority": tracked.priority.value,
+                            "sla_deadline": tracked.sla_deadline.isoformat() if tracked.sla_deadline else None,
+                            "handler": tracked.handler
+                        },
+                        priority=MessagePriority.HIGH if tracked.priority in [TaskPriority.CRITICAL, TaskPriority.HIGH] else MessagePriority.NORMAL
+                    )
                 
                 # Move to running
                 self.running[task_id] = tracked
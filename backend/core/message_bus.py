@@ -13,6 +13,8 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
+from backend.observability.tracing import request_tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -155,7 +157,10 @@ class MessageBus:
             payload=payload,
             priority=priority,
             timestamp=datetime.utcnow(),
-            correlation_id=correlation_id
+            correlation_id=correlation_id,
+            # Trace context rides in metadata so queue subscribers can
+            # continue the publisher's trace (see trace_context())
+            metadata=request_tracer.inject({})
         )
         
         # Route to subscribers
@@ -170,7 +175,7 @@ class MessageBus:
         if topic in self.handlers:
             handler = self.handlers[topic]
             try:
-                asyncio.create_task(handler(message))
+                asyncio.create_task(self._run_handler(handler(message), message))
             except Exception as e:
                 logger.error(f"[MESSAGE-BUS] Handler error for {topic}: {e}")
         
@@ -178,6 +183,16 @@ class MessageBus:
         
         return msg_id
     
+    async def _run_handler(self, handler_call, message: BusMessage):
+        with request_tracer.span(
+            f"bus.handle {message.topic}",
+            parent=request_tracer.extract(message.metadata),
+            kind="consumer",
+            require_parent=True,
+            **{"bus.topic": message.topic, "bus.source": message.source}
+        ):
+            await handler_call
+    
     async def subscribe(
         self,
         subscriber: str,
@@ -220,6 +235,23 @@ class MessageBus:
         self.handlers[topic] = handler
         logger.info(f"[MESSAGE-BUS] Handler registered for {topic}")
     
+    @staticmethod
+    def trace_context(message: BusMessage, operation_name: Optional[str] = None):
+        """
+        Span continuing the publisher's trace, for queue subscribers:
+        
+            message = await queue.get()
+            with message_bus.trace_context(message):
+                ...
+        """
+        return request_tracer.span(
+            operation_name or f"bus.consume {message.topic}",
+            parent=request_tracer.extract(message.metadata),
+            kind="consumer",
+            require_parent=True,
+            **{"bus.topic": message.topic, "bus.source": message.source}
+        )
+    
     def _check_acl(self, kernel: str, topic: str, subscribe: bool = False) -> bool:
         """Check if kernel has access to topic"""
         
@@ -0,0 +1,533 @@
+"""
+Playbook Registry - Compiled, indexed, hot-reloadable playbooks
+
+Playbooks under playbooks/ are parsed once into an executable form:
+- step and playbook conditionals compiled from a safe expression AST into
+  closures (no eval, no per-run string substitution)
+- an index from failure domain, literal trigger (reason / command /
+  error type / trigger_on) and trigger regex to playbooks
+
+The directory is polled for changes; a changed file is re-parsed and a new
+snapshot is swapped in with a single assignment, so readers never see a
+half-loaded registry. A file that fails to parse keeps its last good
+version.
+"""
+
+import ast
+import asyncio
+import logging
+import operator
+import os
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+Condition = Callable[[Dict[str, Any]], bool]
+
+_CONSTANTS = {'true': True, 'false': False, 'null': None, 'none': None, 'True': True, 'False': False, 'None': None}
+
+# Named predicates kept from the original string-matching evaluator
+_PREDICATES: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'if_code_issue': lambda ctx: ctx.get('issue_type') in ('syntax_error', 'import_error'),
+}
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+}
+
+_PRIORITIES = {'critical': 0, 'high': 1, 'medium': 2, 'normal': 2, 'low': 3}
+_REGEX_META = set('.^$*+?{}[]()|\\')
+_REPEAT = re.compile(r'\{\d*(?:,\d*)?\}')
+
+
+def _class_end(pattern: str, start: int) -> int:
+    """Index just past the character class opening at pattern[start]"""
+    i = start + 1
+    if i < len(pattern) and pattern[i] == '^':
+        i += 1
+    if i < len(pattern) and pattern[i] == ']':
+        i += 1  # a leading ] is a literal member
+    while i < len(pattern):
+        if pattern[i] == '\\':
+            i += 2
+            continue
+        if pattern[i] == ']':
+            return i + 1
+        i += 1
+    return len(pattern)
+
+
+def _required_literal(pattern: str) -> str:
+    """
+    Longest literal run every match of pattern must contain ('' if none)
+
+    Conservative scan: top-level alternation gives up, groups/classes/
+    escapes break runs, a character made optional by ? * or a {m,n}
+    repeat is dropped from its run, and the repeat itself is skipped.
+    """
+    runs, run = [], []
+    i, depth = 0, 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            if nxt.isalnum() or depth:
+                runs.append(''.join(run))
+                run = []
+            else:
+                run.append(nxt)
+            i += 2
+            continue
+        if ch == '[':
+            runs.append(''.join(run))
+            run = []
+            i = _class_end(pattern, i)
+            continue
+        if ch == '{':
+            # {m,n} may repeat the previous item zero times; anything else
+            # ("{" on its own) is literal, which dropping it is safe for
+            if run:
+                run.pop()
+            runs.append(''.join(run))
+            run = []
+            repeat = _REPEAT.match(pattern, i)
+            i = repeat.end() if repeat else i + 1
+            continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            return ''
+        if depth or ch in _REGEX_META:
+            if ch in '?*' and run:
+                run.pop()
+            runs.append(''.join(run))
+            run = []
+        else:
+            run.append(ch)
+        i += 1
+    runs.append(''.join(run))
+    return max(runs, key=len).lower()
+
+
+def _compile_node(node: ast.AST) -> Callable[[Dict[str, Any]], Any]:
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda ctx: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in _CONSTANTS:
+            value = _CONSTANTS[name]
+            return lambda ctx: value
+        if name in _PREDICATES:
+            return _PREDICATES[name]
+        return lambda ctx: ctx.get(name)
+
+    if isinstance(node, ast.Attribute):
+        base = _compile_node(node.value)
+        attr = node.attr
+
+        def _attribute(ctx):
+            value = base(ctx)
+            if isinstance(value, dict):
+                return value.get(attr)
+            return None
+        return _attribute
+
+    if isinstance(node, ast.Subscript):
+        base = _compile_node(node.value)
+        key = _compile_node(node.slice)
+
+        def _subscript(ctx):
+            try:
+                return base(ctx)[key(ctx)]
+            except (KeyError, IndexError, TypeError):
+                return None
+        return _subscript
+
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        if all(isinstance(e, ast.Constant) for e in node.elts):
+            values = tuple(e.value for e in node.elts)
+            if isinstance(node, ast.Set):
+                values = frozenset(values)
+            return lambda ctx: values
+        elements = [_compile_node(e) for e in node.elts]
+        return lambda ctx: [e(ctx) for e in elements]
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(v) for v in node.values]
+        if isinstance(node.op, ast.And):
+            def _and(ctx):
+                for operand in operands:
+                    if not operand(ctx):
+                        return False
+                return True
+            return _and
+
+        def _or(ctx):
+            for operand in operands:
+                if operand(ctx):
+                    return True
+            return False
+        return _or
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile_node(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda ctx: not operand(ctx)
+        if isinstance(node.op, ast.USub):
+            def _neg(ctx):
+                try:
+                    return -operand(ctx)
+                except TypeError:
+                    return None
+            return _neg
+
+    if isinstance(node, ast.Compare):
+        left = _compile_node(node.left)
+        pairs = [(_COMPARE_OPS[type(op)], _compile_node(c)) for op, c in zip(node.ops, node.comparators)]
+
+        def _compare(ctx):
+            a = left(ctx)
+            for op, right in pairs:
+                b = right(ctx)
+                try:
+                    if not op(a, b):
+                        return False
+                except TypeError:
+                    # e.g. None > 3 when the context lacks the variable
+                    return False
+                a = b
+            return True
+        return _compare
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op = _BINARY_OPS[type(node.op)]
+        lhs, rhs = _compile_node(node.left), _compile_node(node.right)
+
+        def _binary(ctx):
+            try:
+                return op(lhs(ctx), rhs(ctx))
+            except (TypeError, ZeroDivisionError):
+                return None
+        return _binary
+
+    raise ValueError(f"unsupported expression: {type(node).__name__}")
+
+
+@lru_cache(maxsize=4096)
+def compile_condition(text: str) -> Condition:
+    """
+    Compile a playbook conditional into fn(context) -> bool
+
+    Supports comparisons, and/or/not, in, literals, $var / var lookups
+    (missing variables are None), dotted/indexed access into dicts and
+    "80%" percentages. An expression that can't be compiled always
+    evaluates True (the original default: run the step).
+    """
+    source = re.sub(r'\$(\w+)', r'\1', text.strip())
+    source = re.sub(r'(\d+(?:\.\d+)?)%', r'\1', source)
+    try:
+        fn = _compile_node(ast.parse(source, mode='eval').body)
+    except (SyntaxError, ValueError, KeyError) as e:
+        logger.warning(f"[PLAYBOOK-REGISTRY] Cannot compile condition {text!r} ({e}), defaulting to True")
+        return lambda ctx: True
+    return lambda ctx: bool(fn(ctx))
+
+
+class CompiledPlaybook:
+    """A parsed playbook plus its precompiled preconditions and triggers"""
+
+    __slots__ = ('playbook', 'source', 'priority', 'literal_triggers', 'trigger_patterns', 'preconditions')
+
+    def __init__(self, playbook: Any, data: Dict[str, Any], source: Path):
+        self.playbook = playbook
+        self.source = source
+        priority = data.get('priority', 'medium')
+        self.priority = priority if isinstance(priority, int) else _PRIORITIES.get(str(priority).lower(), 2)
+
+        literals = {str(t) for t in data.get('trigger_on', []) or [] if isinstance(t, str)}
+        patterns = []
+        for trigger in data.get('triggers', []) or []:
+            if not isinstance(trigger, dict):
+                continue
+            for key in ('reason', 'command', 'error_type', 'signature'):
+                if trigger.get(key):
+                    literals.add(str(trigger[key]))
+            if trigger.get('pattern'):
+                try:
+                    patterns.append(re.compile(str(trigger['pattern']), re.IGNORECASE))
+                except re.error as e:
+                    logger.warning(f"[PLAYBOOK-REGISTRY] {source.name}: bad trigger pattern: {e}")
+        self.literal_triggers = tuple(sorted(literals))
+        self.trigger_patterns = tuple(patterns)
+
+        checks = []
+        for condition in data.get('conditions', []) or []:
+            check = condition.get('check') if isinstance(condition, dict) else condition
+            if isinstance(check, str):
+                checks.append(compile_condition(check))
+        self.preconditions = tuple(checks)
+
+        # Compile step conditionals up front so the first run pays nothing
+        for step in playbook.steps:
+            if step.conditional:
+                compile_condition(step.conditional)
+
+    def applies(self, context: Dict[str, Any]) -> bool:
+        for check in self.preconditions:
+            if not check(context):
+                return False
+        return True
+
+
+class PlaybookSnapshot:
+    """Immutable view of every loaded playbook and its indexes"""
+
+    def __init__(self, compiled: List[CompiledPlaybook]):
+        self.compiled: Dict[str, CompiledPlaybook] = {}
+        for entry in compiled:
+            previous = self.compiled.get(entry.playbook.name)
+            if previous is not None and previous.source != entry.source:
+                logger.warning(
+                    f"[PLAYBOOK-REGISTRY] Playbook {entry.playbook.name} in {entry.source.name} "
+                    f"overrides {previous.source.name}"
+                )
+            self.compiled[entry.playbook.name] = entry
+
+        ordered = sorted(self.compiled.values(), key=lambda c: (c.priority, c.playbook.name))
+        self.playbooks = {c.playbook.name: c.playbook for c in ordered}
+        self.by_domain: Dict[Any, List[CompiledPlaybook]] = {}
+        self.by_trigger: Dict[str, List[CompiledPlaybook]] = {}
+        self.pattern_entries: List[Tuple[Any, CompiledPlaybook]] = []
+        for entry in ordered:
+            self.by_domain.setdefault(entry.playbook.domain, []).append(entry)
+            for literal in entry.literal_triggers:
+                self.by_trigger.setdefault(literal.lower(), []).append(entry)
+            for pattern in entry.trigger_patterns:
+                self.pattern_entries.append((pattern, entry))
+
+        # Trigram prefilter: each regex is filed under the rarest trigram of
+        # a literal it requires, so only plausible patterns get searched
+        literals = [
+            '' if p.flags & re.VERBOSE else _required_literal(p.pattern)
+            for p, _ in self.pattern_entries
+        ]
+        counts: Dict[str, int] = {}
+        for literal in literals:
+            for gram in {literal[i:i + 3] for i in range(len(literal) - 2)}:
+                counts[gram] = counts.get(gram, 0) + 1
+        self.trigram_index: Dict[str, List[Tuple[Any, CompiledPlaybook]]] = {}
+        self.unindexed: List[Tuple[Any, CompiledPlaybook]] = []
+        for literal, item in zip(literals, self.pattern_entries):
+            if len(literal) < 3:
+                self.unindexed.append(item)
+                continue
+            gram = min((literal[i:i + 3] for i in range(len(literal) - 2)), key=counts.__getitem__)
+            self.trigram_index.setdefault(gram, []).append(item)
+        self.loaded_at = time.time()
+
+    def pattern_candidates(self, issue: str) -> List[Tuple[Any, CompiledPlaybook]]:
+        text = issue.lower()
+        index = self.trigram_index
+        if len(text) < 4 * len(index):
+            grams = {text[i:i + 3] for i in range(len(text) - 2)}
+            hits = [item for gram in grams if gram in index for item in index[gram]]
+        else:
+            hits = [item for gram, items in index.items() if gram in text for item in items]
+        return hits + self.unindexed if self.unindexed else hits
+
+
+class PlaybookRegistry:
+    """
+    Hot-reloadable registry of compiled playbooks
+
+    parse(data, source) turns one playbook mapping into a Playbook (or
+    None); a YAML file holds either one playbook or a `playbooks:` list.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        parse: Callable[[Dict[str, Any], Path], Any],
+        poll_interval: float = 2.0
+    ):
+        self.directory = Path(directory)
+        self.parse = parse
+        self.poll_interval = poll_interval
+        self.snapshot = PlaybookSnapshot([])
+
+        # path -> ((mtime_ns, size), compiled playbooks from that file)
+        self._files: Dict[str, Tuple[Tuple[int, int], List[CompiledPlaybook]]] = {}
+        # path -> signature that failed to parse (retried once it changes)
+        self._failed: Dict[str, Tuple[int, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def playbooks(self) -> Dict[str, Any]:
+        return self.snapshot.playbooks
+
+    def _stat_files(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(('.yaml', '.yml')):
+                        stat = entry.stat()
+                        found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return found
+
+    def _compile_file(self, path: Path) -> List[CompiledPlaybook]:
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+        if not isinstance(data, dict):
+            return []
+        items = data.get('playbooks') if isinstance(data.get('playbooks'), list) else [data]
+
+        compiled = []
+        for item in items:
+            if not isinstance(item, dict) or 'name' not in item or 'steps' not in item:
+                continue
+            playbook = self.parse(item, path)
+            if playbook is not None:
+                compiled.append(CompiledPlaybook(playbook, item, path))
+        return compiled
+
+    def reload(self) -> bool:
+        """Re-parse changed files and swap in a new snapshot; True if anything changed"""
+        current = self._stat_files()
+        changed = False
+        files = dict(self._files)
+
+        for path in list(files):
+            if path not in current:
+                del files[path]
+                changed = True
+
+        for path, signature in current.items():
+            known = files.get(path)
+            if (known is not None and known[0] == signature) or self._failed.get(path) == signature:
+                continue
+            try:
+                files[path] = (signature, self._compile_file(Path(path)))
+                self._failed.pop(path, None)
+                changed = True
+            except Exception as e:
+                # Keep the last good version (e.g. file caught mid-write)
+                self._failed[path] = signature
+                self.last_error = f"{Path(path).name}: {e}"
+                logger.error(f"[PLAYBOOK-REGISTRY] Could not load {path}: {e}")
+
+        if changed or not self.reloads:
+            self._files = files
+            self.snapshot = PlaybookSnapshot([c for _, compiled in files.values() for c in compiled])
+            self.reloads += 1
+        return changed
+
+    async def start(self):
+        await asyncio.to_thread(self.reload)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch())
+        logger.info(f"[PLAYBOOK-REGISTRY] Loaded {len(self.playbooks)} playbooks from {self.directory}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await asyncio.to_thread(self.reload):
+                    logger.info(f"[PLAYBOOK-REGISTRY] Reloaded, {len(self.playbooks)} playbooks")
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"[PLAYBOOK-REGISTRY] Reload failed: {e}")
+
+    def get(self, name: str) -> Optional[Any]:
+        return self.snapshot.playbooks.get(name)
+
+    def for_domain(self, domain: Any) -> List[Any]:
+        return [c.playbook for c in self.snapshot.by_domain.get(domain, ())]
+
+    def match(
+        self,
+        issue: Optional[str] = None,
+        domain: Optional[Any] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """
+        Playbooks whose triggers match issue (literal or regex), optionally
+        limited to a failure domain and to playbooks whose preconditions
+        hold for context. Ordered by priority.
+        """
+        snapshot = self.snapshot
+        if issue is None:
+            candidates = snapshot.by_domain.get(domain, []) if domain is not None else list(snapshot.compiled.values())
+        else:
+            candidates = list(snapshot.by_trigger.get(issue.lower(), ()))
+            matched = False
+            seen = {id(c) for c in candidates}
+            for pattern, entry in snapshot.pattern_candidates(issue):
+                if id(entry) not in seen and pattern.search(issue):
+                    seen.add(id(entry))
+                    candidates.append(entry)
+                    matched = True
+            if matched:
+                candidates.sort(key=lambda c: (c.priority, c.playbook.name))
+            if domain is not None:
+                candidates = [c for c in candidates if c.playbook.domain == domain]
+
+        if context is not None:
+            candidates = [c for c in candidates if c.applies(context)]
+        return [c.playbook for c in candidates]
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            'directory': str(self.directory),
+            'files': len(self._files),
+            'playbooks': len(snapshot.playbooks),
+            'domains': {getattr(d, 'value', str(d)): len(v) for d, v in snapshot.by_domain.items()},
+            'trigger_keys': len(snapshot.by_trigger),
+            'trigger_patterns': len(snapshot.pattern_entries),
+            'unindexed_patterns': len(snapshot.unindexed),
+            'reloads': self.reloads,
+            'loaded_at': snapshot.loaded_at,
+            'last_error': self.last_error,
+            'watching': self._task is not None and not self._task.done(),
+        }
@@ -11,17 +11,20 @@ Architecture:
 - Dimensions: Time, Mission, Component, Tier, Actor
 - Facts: Verification executions, Error events, Approvals
 - ETL: Incremental batch load (5-minute intervals)
+- History: closed days compacted to date-partitioned Parquet
 - Engine: DuckDB for embedded analytics
 - API: REST endpoints for dashboards and ML pipelines
 """
 
 from .etl import cube_etl
 from .cube_engine import grace_cube
+from .columnar_store import columnar_store
 from .scheduler import start_cube_scheduler, stop_cube_scheduler
 
 __all__ = [
     'cube_etl',
     'grace_cube',
+    'columnar_store',
     'start_cube_scheduler',
     'stop_cube_scheduler'
 ]
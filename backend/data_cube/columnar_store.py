@@ -0,0 +1,388 @@
+"""
+Columnar History Store
+
+Compacts closed days of the cube fact tables and the immutable log into
+Parquet files partitioned by date, so long-range analytics (30/90 days)
+run as vectorized Arrow scans instead of row-by-row SQLite queries that
+hold the database lock.
+
+Layout:
+    storage/columnar/<dataset>/date=YYYYMMDD/part.parquet
+    storage/columnar/<dataset>/_manifest.json   (compacted days + row counts)
+
+SQLite stays the source of truth and keeps all rows; the Parquet copy is
+only ever read for days listed in the manifest. Recent (hot) days are
+always served from SQLite. A compacted day that receives late rows (e.g. an
+ETL catching up after downtime) is marked dirty: it is served from SQLite
+again until the next compaction rewrites its partition.
+
+Requires pyarrow; without it compaction is skipped and every query stays on
+SQLite.
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from backend.models import async_session
+from backend.data_cube.schema import date_key
+
+# Conditional import for pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = pc = ds = pq = None
+    PYARROW_AVAILABLE = False
+
+
+# Windows at least this long use the columnar path
+COLUMNAR_MIN_WINDOW_DAYS = 3
+
+
+@dataclass
+class ColumnarDataset:
+    """One compactable table"""
+    name: str
+    # SELECT returning `columns` in order for one day (:day_key, :day_start, :day_end bound)
+    day_query: str
+    # Earliest date key with data
+    first_day_query: str
+    columns: List[Tuple[str, str]]  # (name, arrow type: int64 | float64 | string | bool | timestamp)
+
+
+DATASETS: Dict[str, ColumnarDataset] = {
+    "fact_verification_executions": ColumnarDataset(
+        name="fact_verification_executions",
+        day_query="""
+            SELECT execution_key, time_key, tier_key, actor_key, mission_key,
+                   contract_id, action_type, playbook_id, duration_seconds, confidence_score,
+                   was_successful, was_rolled_back, created_snapshot, contract_status, created_at
+            FROM fact_verification_executions
+            WHERE time_key = :day_key
+        """,
+        first_day_query="SELECT MIN(time_key) FROM fact_verification_executions",
+        columns=[
+            ("execution_key", "int64"), ("time_key", "int64"), ("tier_key", "int64"),
+            ("actor_key", "int64"), ("mission_key", "int64"), ("contract_id", "string"),
+            ("action_type", "string"), ("playbook_id", "string"), ("duration_seconds", "float64"),
+            ("confidence_score", "float64"), ("was_successful", "bool"), ("was_rolled_back", "bool"),
+            ("created_snapshot", "bool"), ("contract_status", "string"), ("created_at", "timestamp"),
+        ],
+    ),
+    "fact_error_events": ColumnarDataset(
+        name="fact_error_events",
+        day_query="""
+            SELECT error_key, time_key, error_id, error_type, severity, source,
+                   was_auto_resolved, created_at
+            FROM fact_error_events
+            WHERE time_key = :day_key
+        """,
+        first_day_query="SELECT MIN(time_key) FROM fact_error_events",
+        columns=[
+            ("error_key", "int64"), ("time_key", "int64"), ("error_id", "string"),
+            ("error_type", "string"), ("severity", "string"), ("source", "string"),
+            ("was_auto_resolved", "bool"), ("created_at", "timestamp"),
+        ],
+    ),
+    "immutable_log": ColumnarDataset(
+        name="immutable_log",
+        day_query="""
+            SELECT id, sequence, actor, action, resource, subsystem, result, timestamp
+            FROM immutable_log
+            WHERE timestamp >= :day_start AND timestamp < :day_end
+        """,
+        first_day_query="SELECT CAST(strftime('%Y%m%d', MIN(timestamp)) AS INTEGER) FROM immutable_log",
+        columns=[
+            ("id", "int64"), ("sequence", "int64"), ("actor", "string"), ("action", "string"),
+            ("resource", "string"), ("subsystem", "string"), ("result", "string"),
+            ("timestamp", "timestamp"),
+        ],
+    ),
+}
+
+
+def key_to_date(key: int) -> date:
+    return date(key // 10000, key // 100 % 100, key % 100)
+
+
+def next_key(key: int) -> int:
+    return date_key(key_to_date(key) + timedelta(days=1))
+
+
+def _to_utc(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class ColumnarStore:
+    """
+    Date-partitioned Parquet copies of closed days
+
+    Usage:
+        await columnar_store.compact_closed_days()
+        table = await columnar_store.scan("immutable_log", from_key, to_key, columns=[...])
+    """
+
+    def __init__(self, root: Optional[str] = None, grace_days: int = 1, max_days_per_run: int = 31):
+        self.root = Path(root or os.getenv("GRACE_COLUMNAR_DIR", "storage/columnar"))
+        # Days younger than this may still receive late rows, so stay in SQLite
+        self.grace_days = grace_days
+        self.max_days_per_run = max_days_per_run
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def available(self) -> bool:
+        return PYARROW_AVAILABLE
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _manifest_path(self, dataset: str) -> Path:
+        return self.root / dataset / "_manifest.json"
+
+    def _manifest(self, dataset: str) -> Dict[str, Any]:
+        if dataset not in self._manifests:
+            path = self._manifest_path(dataset)
+            try:
+                self._manifests[dataset] = json.loads(path.read_text())
+            except (OSError, ValueError):
+                self._manifests[dataset] = {"partitions": {}}
+            self._manifests[dataset].setdefault("dirty", [])
+        return self._manifests[dataset]
+
+    def _save_manifest(self, dataset: str):
+        path = self._manifest_path(dataset)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._manifest(dataset), indent=2))
+        os.replace(tmp, path)
+
+    def compacted_keys(self, dataset: str) -> Set[int]:
+        """Days whose Parquet partition is current (dirty days excluded)"""
+        manifest = self._manifest(dataset)
+        return {int(k) for k in manifest["partitions"]} - self.dirty_keys(dataset)
+
+    def dirty_keys(self, dataset: str) -> Set[int]:
+        return {int(k) for k in self._manifest(dataset)["dirty"]}
+
+    def mark_dirty(self, dataset: str, from_key: int, to_key: int) -> Set[int]:
+        """
+        Flag compacted days in [from_key, to_key] as stale after new rows landed
+
+        Dirty days are read from SQLite until compaction rewrites them.
+        Returns the days newly marked.
+        """
+        manifest = self._manifest(dataset)
+        marked = {
+            int(k) for k in manifest["partitions"]
+            if from_key <= int(k) <= to_key
+        } - self.dirty_keys(dataset)
+        if marked:
+            manifest["dirty"] = sorted(self.dirty_keys(dataset) | marked)
+            self._save_manifest(dataset)
+        return marked
+
+    def hot_start_key(self, dataset: str, from_key: int) -> int:
+        """First date key at or after from_key that is not compacted (served by SQLite)"""
+        compacted = self.compacted_keys(dataset)
+        key = from_key
+        while key in compacted:
+            key = next_key(key)
+        return key
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    async def compact_closed_days(self) -> Dict[str, int]:
+        """Write Parquet partitions for closed days not yet compacted or dirty (oldest first)"""
+        if not self.available:
+            return {}
+
+        closed_before = date_key(datetime.now(timezone.utc).date() - timedelta(days=self.grace_days))
+        written: Dict[str, int] = {}
+
+        for dataset in DATASETS.values():
+            try:
+                rows = await self._compact_dataset(dataset, closed_before)
+            except Exception as e:
+                print(f"[WARN] Columnar compaction of {dataset.name} failed: {e}")
+                continue
+            if rows:
+                written[dataset.name] = rows
+
+        if written:
+            print(f"[OK] Columnar compaction wrote {written}")
+        return written
+
+    async def _compact_dataset(self, dataset: ColumnarDataset, closed_before: int) -> int:
+        compacted = self.compacted_keys(dataset.name)
+        async with async_session() as session:
+            first = (await session.execute(text(dataset.first_day_query))).scalar()
+        if not first:
+            return 0
+
+        key = int(first)
+        days = rows = 0
+        try:
+            while key < closed_before and days < self.max_days_per_run:
+                if key not in compacted:
+                    rows += await self._compact_day(dataset, key)
+                    days += 1
+                key = next_key(key)
+        finally:
+            # Keep whatever was written before a failure
+            if days:
+                self._save_manifest(dataset.name)
+        return rows
+
+    async def _compact_day(self, dataset: ColumnarDataset, key: int) -> int:
+        day_start = datetime.combine(key_to_date(key), datetime.min.time())
+        # Cleared before reading, so rows marked during the copy keep the day dirty
+        manifest = self._manifest(dataset.name)
+        manifest["dirty"] = [k for k in manifest["dirty"] if int(k) != key]
+        async with async_session() as session:
+            # Timestamps are stored as naive UTC text, so bind the bounds the same way
+            result = await session.execute(text(dataset.day_query), {
+                "day_key": key,
+                "day_start": day_start.isoformat(sep=" "),
+                "day_end": (day_start + timedelta(days=1)).isoformat(sep=" "),
+            })
+            rows = result.fetchall()
+
+        if rows:
+            await asyncio.to_thread(self._write_partition, dataset, key, rows)
+
+        manifest["partitions"][str(key)] = {
+            "rows": len(rows),
+            "compacted_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return len(rows)
+
+    def _write_partition(self, dataset: ColumnarDataset, key: int, rows: List[Tuple]):
+        arrays = []
+        for index, (name, kind) in enumerate(dataset.columns):
+            values = [row[index] for row in rows]
+            if kind == "timestamp":
+                arrays.append(pa.array([_to_utc(v) for v in values], type=pa.timestamp("us", tz="UTC")))
+            elif kind == "bool":
+                arrays.append(pa.array([None if v is None else bool(v) for v in values], type=pa.bool_()))
+            else:
+                arrays.append(pa.array(values, type=getattr(pa, kind)()))
+
+        table = pa.Table.from_arrays(arrays, names=[name for name, _ in dataset.columns])
+        partition_dir = self.root / dataset.name / f"date={key}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        tmp = partition_dir / "part.parquet.tmp"
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, partition_dir / "part.parquet")
+
+    # ------------------------------------------------------------------
+    # Scans
+    # ------------------------------------------------------------------
+
+    async def scan(
+        self,
+        dataset: str,
+        from_key: int,
+        to_key: int,
+        columns: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        time_column: str = "timestamp"
+    ):
+        """
+        Arrow table of compacted rows with date keys in [from_key, to_key)
+
+        Args:
+            dataset: Dataset name (see DATASETS)
+            from_key: First date key (inclusive)
+            to_key: Last date key (exclusive) - normally hot_start_key()
+            columns: Columns to read (projection pushdown)
+            since: Optional row-level lower bound on time_column
+        """
+        return await asyncio.to_thread(self._scan_sync, dataset, from_key, to_key, columns, since, time_column)
+
+    def _scan_sync(self, dataset, from_key, to_key, columns, since, time_column):
+        manifest = self._manifest(dataset)
+        wanted = [
+            str(self.root / dataset / f"date={key}" / "part.parquet")
+            for key in sorted(self.compacted_keys(dataset))
+            if from_key <= key < to_key and manifest["partitions"][str(key)]["rows"]
+        ]
+        schema_columns = [name for name, _ in DATASETS[dataset].columns]
+        if not wanted:
+            return pa.table({name: pa.array([]) for name in (columns or schema_columns)})
+
+        scan_columns = list(columns or schema_columns)
+        if since is not None and time_column not in scan_columns:
+            scan_columns.append(time_column)
+
+        dataset_files = ds.dataset(wanted, format="parquet")
+        row_filter = None
+        if since is not None:
+            row_filter = pc.field(time_column) >= pa.scalar(_to_utc(since), type=pa.timestamp("us", tz="UTC"))
+        table = dataset_files.to_table(columns=scan_columns, filter=row_filter)
+        return table.select(columns) if columns else table
+
+    def hot_start(self, dataset: str, since: datetime) -> Optional[datetime]:
+        """
+        Start of the SQLite-served range for a window beginning at `since`
+
+        None when the columnar path doesn't apply (caller queries SQLite
+        for the whole window).
+        """
+        window_days = (datetime.now(timezone.utc) - _to_utc(since)).total_seconds() / 86400
+        if not self.should_use(dataset, window_days):
+            return None
+        from_key = date_key(since)
+        hot_key = self.hot_start_key(dataset, from_key)
+        if hot_key == from_key:
+            return None
+        return datetime.combine(key_to_date(hot_key), datetime.min.time(), tzinfo=timezone.utc)
+
+    def should_use(self, dataset: str, window_days: float) -> bool:
+        """Columnar path applies: pyarrow present, long window, something compacted"""
+        return (
+            self.available
+            and window_days >= COLUMNAR_MIN_WINDOW_DAYS
+            and bool(self._manifest(dataset)["partitions"])
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "root": str(self.root),
+            "datasets": {
+                name: {
+                    "partitions": len(self._manifest(name)["partitions"]),
+                    "rows": sum(p["rows"] for p in self._manifest(name)["partitions"].values()),
+                    "dirty": len(self._manifest(name)["dirty"]),
+                }
+                for name in DATASETS
+            },
+        }
+
+
+def count_by(table, column: str) -> Dict[Any, int]:
+    """Vectorized GROUP BY column COUNT(*) over an Arrow table"""
+    if table.num_rows == 0:
+        return {}
+    counts = pc.value_counts(table.column(column).combine_chunks())
+    return {item["values"].as_py(): item["counts"].as_py() for item in counts}
+
+
+# Singleton
+columnar_store = ColumnarStore()
@@ -3,11 +3,31 @@ Grace Analytical Cube Engine
 
 Provides fast multi-dimensional slicing over pre-aggregated metrics.
 Uses the same underlying database but exposes analytical views.
+
+Queries read the daily/hourly rollup tables maintained by the ETL (see
+rollups.py), so cost scales with the number of days, not events. Results are
+cached per (query, parameters) until the ETL advances.
+
+Fact-level breakdowns the rollups don't cover read compacted days from the
+columnar store (columnar_store.py) and only the recent days from SQLite.
 """
 
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Tuple
 from sqlalchemy import text
 from backend.models import async_session
+from backend.data_cube.schema import date_key
+from backend.data_cube.columnar_store import columnar_store
+
+
+def _format_date_key(key: int) -> str:
+    return f"{key // 10000}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+def _since_key(days: int) -> int:
+    return date_key(datetime.utcnow() - timedelta(days=days))
 
 
 class GraceCube:
@@ -15,54 +35,122 @@ class GraceCube:
     Analytical cube for Grace metrics.
     Provides fast multi-dimensional slicing without complex joins.
     """
-    
+
+    def __init__(
+        self,
+        cache_ttl_seconds: float = 300.0,
+        max_cache_entries: int = 256,
+        generation_check_seconds: float = 5.0
+    ):
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.max_cache_entries = max_cache_entries
+        # ETL may run in another process; its progress is polled at most this often
+        self.generation_check_seconds = generation_check_seconds
+
+        self._cache: "OrderedDict[Tuple, Tuple[Any, float, Any]]" = OrderedDict()
+        self._local_generation = 0
+        self._etl_run_id: Optional[int] = None
+        self._etl_checked_at = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ------------------------------------------------------------------
+    # Result cache
+    # ------------------------------------------------------------------
+
+    def invalidate(self):
+        """Drop cached results (called by the ETL after each successful load)"""
+        self._local_generation += 1
+        self._cache.clear()
+
+    async def _generation(self) -> Tuple[int, Optional[int]]:
+        now = time.time()
+        if now - self._etl_checked_at >= self.generation_check_seconds:
+            self._etl_checked_at = now
+            try:
+                async with async_session() as session:
+                    result = await session.execute(text("""
+                        SELECT MAX(etl_run_id) FROM cube_etl_metadata WHERE status = 'success'
+                    """))
+                    self._etl_run_id = result.scalar()
+            except Exception:
+                self._etl_run_id = None
+        return (self._local_generation, self._etl_run_id)
+
+    async def _cached(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        key = (name, tuple(sorted(params.items())))
+        generation = await self._generation()
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            entry_generation, expires_at, value = entry
+            if entry_generation == generation and time.time() < expires_at:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return value
+
+        self.cache_misses += 1
+        value = await compute()
+        self._cache[key] = (generation, time.time() + self.cache_ttl_seconds, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+        return value
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "entries": len(self._cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "etl_run_id": self._etl_run_id,
+        }
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
     async def get_verification_success_rate(
-        self, 
-        tier: Optional[str] = None, 
+        self,
+        tier: Optional[str] = None,
         days: int = 7
     ) -> List[Dict[str, Any]]:
         """
         Get verification success rate, optionally filtered by tier
-        
+
         Args:
             tier: Filter by tier code (tier_1, tier_2, tier_3)
             days: Number of days to look back
-            
+
         Returns:
             List of metrics by tier
         """
-        
+        params = {"from_key": _since_key(days), "tier": tier}
+        return await self._cached("verification_success_rate", params,
+                                  lambda: self._query_verification_success_rate(**params))
+
+    async def _query_verification_success_rate(self, from_key: int, tier: Optional[str]) -> List[Dict[str, Any]]:
         async with async_session() as session:
-            if tier:
-                result = await session.execute(text("""
-                    SELECT 
-                        tier.tier_name,
-                        COUNT(*) AS total,
-                        SUM(CAST(was_successful AS INTEGER)) AS successful,
-                        ROUND(100.0 * SUM(CAST(was_successful AS INTEGER)) / COUNT(*), 2) AS success_rate_pct,
-                        AVG(confidence_score) AS avg_confidence
-                    FROM fact_verification_executions f
-                    JOIN dim_tier tier ON f.tier_key = tier.tier_key
-                    JOIN dim_time t ON f.time_key = t.time_key
-                    WHERE t.timestamp >= datetime('now', '-' || :days || ' days')
-                    AND tier.tier_code = :tier
-                    GROUP BY tier.tier_name
-                """), {"days": days, "tier": tier})
-            else:
-                result = await session.execute(text("""
-                    SELECT 
-                        tier.tier_name,
-                        COUNT(*) AS total,
-                        SUM(CAST(was_successful AS INTEGER)) AS successful,
-                        ROUND(100.0 * SUM(CAST(was_successful AS INTEGER)) / COUNT(*), 2) AS success_rate_pct,
-                        AVG(confidence_score) AS avg_confidence
-                    FROM fact_verification_executions f
-                    JOIN dim_tier tier ON f.tier_key = tier.tier_key
-                    JOIN dim_time t ON f.time_key = t.time_key
-                    WHERE t.timestamp >= datetime('now', '-' || :days || ' days')
-                    GROUP BY tier.tier_name
-                """), {"days": days})
-            
+            result = await session.execute(text(f"""
+                SELECT
+                    tier.tier_name,
+                    SUM(r.total) AS total,
+                    SUM(r.successful) AS successful,
+                    ROUND(100.0 * SUM(r.successful) / SUM(r.total), 2) AS success_rate_pct,
+                    SUM(r.confidence_sum) / NULLIF(SUM(r.confidence_count), 0) AS avg_confidence
+                FROM rollup_verification_daily r
+                JOIN dim_tier tier ON r.tier_key = tier.tier_key
+                WHERE r.time_key >= :from_key
+                {"AND tier.tier_code = :tier" if tier else ""}
+                GROUP BY tier.tier_name
+            """), {"from_key": from_key, "tier": tier})
+
             return [
                 {
                     "tier_name": row[0],
@@ -73,42 +161,32 @@ class GraceCube:
                 }
                 for row in result.fetchall()
             ]
-    
+
     async def get_mission_performance(
         self,
         mission_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get mission completion metrics"""
-        
+        params = {"mission_type": mission_type}
+        return await self._cached("mission_performance", params,
+                                  lambda: self._query_mission_performance(**params))
+
+    async def _query_mission_performance(self, mission_type: Optional[str]) -> List[Dict[str, Any]]:
         async with async_session() as session:
-            if mission_type:
-                result = await session.execute(text("""
-                    SELECT 
-                        m.mission_type,
-                        tier.tier_name,
-                        COUNT(DISTINCT m.mission_id) AS total_missions,
-                        COUNT(DISTINCT CASE WHEN m.final_status = 'success' THEN m.mission_id END) AS successful_missions,
-                        AVG(f.confidence_score) AS avg_confidence
-                    FROM dim_mission m
-                    JOIN fact_verification_executions f ON m.mission_key = f.mission_key
-                    JOIN dim_tier tier ON f.tier_key = tier.tier_key
-                    WHERE m.mission_type = :mission_type
-                    GROUP BY m.mission_type, tier.tier_name
-                """), {"mission_type": mission_type})
-            else:
-                result = await session.execute(text("""
-                    SELECT 
-                        m.mission_type,
-                        tier.tier_name,
-                        COUNT(DISTINCT m.mission_id) AS total_missions,
-                        COUNT(DISTINCT CASE WHEN m.final_status = 'success' THEN m.mission_id END) AS successful_missions,
-                        AVG(f.confidence_score) AS avg_confidence
-                    FROM dim_mission m
-                    JOIN fact_verification_executions f ON m.mission_key = f.mission_key
-                    JOIN dim_tier tier ON f.tier_key = tier.tier_key
-                    GROUP BY m.mission_type, tier.tier_name
-                """))
-            
+            result = await session.execute(text(f"""
+                SELECT
+                    m.mission_type,
+                    tier.tier_name,
+                    COUNT(DISTINCT m.mission_id) AS total_missions,
+                    COUNT(DISTINCT CASE WHEN m.final_status = 'success' THEN m.mission_id END) AS successful_missions,
+                    SUM(r.confidence_sum) / NULLIF(SUM(r.confidence_count), 0) AS avg_confidence
+                FROM rollup_mission_tier r
+                JOIN dim_mission m ON m.mission_key = r.mission_key
+                JOIN dim_tier tier ON r.tier_key = tier.tier_key
+                {"WHERE m.mission_type = :mission_type" if mission_type else ""}
+                GROUP BY m.mission_type, tier.tier_name
+            """), {"mission_type": mission_type})
+
             return [
                 {
                     "mission_type": row[0],
@@ -120,74 +198,179 @@ class GraceCube:
                 }
                 for row in result.fetchall()
             ]
-    
+
     async def get_error_trends(self, days: int = 7) -> List[Dict[str, Any]]:
         """Get error event trends over time"""
-        
+        params = {"from_key": _since_key(days)}
+        return await self._cached("error_trends", params,
+                                  lambda: self._query_error_trends(**params))
+
+    async def _query_error_trends(self, from_key: int) -> List[Dict[str, Any]]:
         async with async_session() as session:
             result = await session.execute(text("""
-                SELECT 
-                    t.year,
-                    t.month,
-                    t.day,
-                    e.severity,
-                    COUNT(*) AS error_count,
-                    SUM(CAST(was_auto_resolved AS INTEGER)) AS auto_resolved_count
-                FROM fact_error_events e
-                JOIN dim_time t ON e.time_key = t.time_key
-                WHERE t.timestamp >= datetime('now', '-' || :days || ' days')
-                GROUP BY t.year, t.month, t.day, e.severity
-                ORDER BY t.year, t.month, t.day
-            """), {"days": days})
-            
+                SELECT time_key, severity, error_count, auto_resolved_count
+                FROM rollup_error_daily
+                WHERE time_key >= :from_key
+                ORDER BY time_key
+            """), {"from_key": from_key})
+
             return [
                 {
-                    "date": f"{row[0]}-{row[1]:02d}-{row[2]:02d}",
-                    "severity": row[3],
-                    "error_count": row[4],
-                    "auto_resolved_count": row[5],
-                    "auto_resolve_rate_pct": round(100.0 * row[5] / row[4], 2) if row[4] > 0 else 0
+                    "date": _format_date_key(row[0]),
+                    "severity": row[1] or None,
+                    "error_count": row[2],
+                    "auto_resolved_count": row[3],
+                    "auto_resolve_rate_pct": round(100.0 * row[3] / row[2], 2) if row[2] > 0 else 0
                 }
                 for row in result.fetchall()
             ]
-    
+
     async def get_daily_rollup(self, days: int = 7) -> List[Dict[str, Any]]:
         """Get daily verification metrics rollup"""
-        
+        params = {"from_key": _since_key(days)}
+        return await self._cached("daily_rollup", params,
+                                  lambda: self._query_daily_rollup(**params))
+
+    async def _query_daily_rollup(self, from_key: int) -> List[Dict[str, Any]]:
         async with async_session() as session:
             result = await session.execute(text("""
-                SELECT 
-                    t.year,
-                    t.month,
-                    t.day,
+                SELECT
+                    r.time_key,
                     tier.tier_name,
-                    COUNT(*) AS total_executions,
-                    SUM(CAST(was_successful AS INTEGER)) AS successful_executions,
-                    AVG(confidence_score) AS avg_confidence,
-                    AVG(duration_seconds) AS avg_duration_seconds,
-                    SUM(CAST(was_rolled_back AS INTEGER)) AS rollbacks
-                FROM fact_verification_executions f
-                JOIN dim_time t ON f.time_key = t.time_key
-                JOIN dim_tier tier ON f.tier_key = tier.tier_key
-                WHERE t.timestamp >= datetime('now', '-' || :days || ' days')
-                GROUP BY t.year, t.month, t.day, tier.tier_name
-                ORDER BY t.year, t.month, t.day
-            """), {"days": days})
-            
+                    r.total,
+                    r.successful,
+                    r.confidence_sum / NULLIF(r.confidence_count, 0),
+                    r.duration_sum / NULLIF(r.duration_count, 0),
+                    r.rolled_back
+                FROM rollup_verification_daily r
+                JOIN dim_tier tier ON r.tier_key = tier.tier_key
+                WHERE r.time_key >= :from_key
+                ORDER BY r.time_key
+            """), {"from_key": from_key})
+
             return [
                 {
-                    "date": f"{row[0]}-{row[1]:02d}-{row[2]:02d}",
-                    "tier_name": row[3],
-                    "total_executions": row[4],
-                    "successful_executions": row[5],
-                    "success_rate_pct": round(100.0 * row[5] / row[4], 2) if row[4] > 0 else 0,
-                    "avg_confidence": round(row[6], 3) if row[6] else None,
-                    "avg_duration_seconds": round(row[7], 2) if row[7] else None,
-                    "rollbacks": row[8]
+                    "date": _format_date_key(row[0]),
+                    "tier_name": row[1],
+                    "total_executions": row[2],
+                    "successful_executions": row[3],
+                    "success_rate_pct": round(100.0 * row[3] / row[2], 2) if row[2] > 0 else 0,
+                    "avg_confidence": round(row[4], 3) if row[4] else None,
+                    "avg_duration_seconds": round(row[5], 2) if row[5] else None,
+                    "rollbacks": row[6]
                 }
                 for row in result.fetchall()
             ]
 
+    async def get_hourly_rollup(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Get hourly verification and error counts for the last N hours"""
+        since = datetime.utcnow() - timedelta(hours=hours)
+        params = {"from_hour": date_key(since) * 100 + since.hour}
+        return await self._cached("hourly_rollup", params,
+                                  lambda: self._query_hourly_rollup(**params))
+
+    async def _query_hourly_rollup(self, from_hour: int) -> List[Dict[str, Any]]:
+        async with async_session() as session:
+            result = await session.execute(text("""
+                SELECT hour_key, SUM(total), SUM(successful), SUM(rolled_back), 0
+                FROM rollup_verification_hourly
+                WHERE hour_key >= :from_hour
+                GROUP BY hour_key
+                UNION ALL
+                SELECT hour_key, 0, 0, 0, SUM(error_count)
+                FROM rollup_error_hourly
+                WHERE hour_key >= :from_hour
+                GROUP BY hour_key
+            """), {"from_hour": from_hour})
+
+            hours: Dict[int, Dict[str, Any]] = {}
+            for hour_key, total, successful, rolled_back, errors in result.fetchall():
+                bucket = hours.setdefault(hour_key, {
+                    "hour": f"{_format_date_key(hour_key // 100)}T{hour_key % 100:02d}:00",
+                    "total_executions": 0,
+                    "successful_executions": 0,
+                    "rollbacks": 0,
+                    "error_count": 0
+                })
+                bucket["total_executions"] += total
+                bucket["successful_executions"] += successful
+                bucket["rollbacks"] += rolled_back
+                bucket["error_count"] += errors
+
+            return [hours[key] for key in sorted(hours)]
+
+    async def get_action_type_breakdown(self, days: int = 30) -> List[Dict[str, Any]]:
+        """Verification outcomes per action type over the last N days"""
+        params = {"from_key": _since_key(days), "days": days}
+        return await self._cached("action_type_breakdown", params,
+                                  lambda: self._query_action_type_breakdown(**params))
+
+    async def _query_action_type_breakdown(self, from_key: int, days: int) -> List[Dict[str, Any]]:
+        dataset = "fact_verification_executions"
+        totals: Dict[str, List[float]] = {}  # action_type -> [total, successful, rolled_back, duration_sum, duration_count]
+
+        hot_key = from_key
+        if columnar_store.should_use(dataset, days):
+            hot_key = columnar_store.hot_start_key(dataset, from_key)
+            if hot_key > from_key:
+                table = await columnar_store.scan(
+                    dataset, from_key, hot_key,
+                    columns=["action_type", "was_successful", "was_rolled_back", "duration_seconds"]
+                )
+                if table.num_rows:
+                    import pyarrow as pa
+                    import pyarrow.compute as pc
+                    for flag in ("was_successful", "was_rolled_back"):
+                        index = table.schema.get_field_index(flag)
+                        table = table.set_column(index, flag, pc.cast(table.column(flag), pa.int64()))
+                    grouped = table.group_by("action_type").aggregate([
+                        ("action_type", "count", pc.CountOptions(mode="all")),
+                        ("was_successful", "sum"),
+                        ("was_rolled_back", "sum"),
+                        ("duration_seconds", "sum"),
+                        ("duration_seconds", "count"),
+                    ])
+                    for row in grouped.to_pylist():
+                        totals[row["action_type"]] = [
+                            row["action_type_count"],
+                            row["was_successful_sum"] or 0,
+                            row["was_rolled_back_sum"] or 0,
+                            row["duration_seconds_sum"] or 0.0,
+                            row["duration_seconds_count"],
+                        ]
+
+        async with async_session() as session:
+            result = await session.execute(text("""
+                SELECT
+                    action_type,
+                    COUNT(*),
+                    SUM(CASE WHEN was_successful THEN 1 ELSE 0 END),
+                    SUM(CASE WHEN was_rolled_back THEN 1 ELSE 0 END),
+                    SUM(duration_seconds),
+                    COUNT(duration_seconds)
+                FROM fact_verification_executions
+                WHERE time_key >= :hot_key
+                GROUP BY action_type
+            """), {"hot_key": hot_key})
+
+            for row in result.fetchall():
+                bucket = totals.setdefault(row[0], [0, 0, 0, 0.0, 0])
+                for index, value in enumerate(row[1:]):
+                    bucket[index] += value or 0
+
+        return [
+            {
+                "action_type": action_type,
+                "total_executions": total,
+                "successful_executions": successful,
+                "success_rate_pct": round(100.0 * successful / total, 2) if total > 0 else 0,
+                "rollbacks": rolled_back,
+                "avg_duration_seconds": round(duration_sum / duration_count, 2) if duration_count else None
+            }
+            for action_type, (total, successful, rolled_back, duration_sum, duration_count)
+            in sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+        ]
+
 
 # Singleton
 grace_cube = GraceCube()
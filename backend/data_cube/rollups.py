@@ -0,0 +1,140 @@
+"""
+Data Cube Rollups
+
+Daily and hourly pre-aggregates of the fact tables, maintained by the ETL.
+After each load the buckets the load window touched are recomputed from the
+facts (delete + INSERT ... SELECT over an indexed time_key range), so the
+work per run is bounded by the window, not the history.
+"""
+
+from typing import Optional
+from sqlalchemy import text
+from backend.data_cube.schema import ROLLUP_DDL
+
+HOUR_KEY_SQL = "CAST(strftime('%Y%m%d%H', {column}) AS INTEGER)"
+
+_VERIFICATION_MEASURES = """
+    COUNT(*),
+    SUM(CASE WHEN was_successful THEN 1 ELSE 0 END),
+    SUM(CASE WHEN was_rolled_back THEN 1 ELSE 0 END),
+    SUM(confidence_score),
+    COUNT(confidence_score),
+    SUM(duration_seconds),
+    COUNT(duration_seconds)
+"""
+
+_ERROR_MEASURES = """
+    COUNT(*),
+    SUM(CASE WHEN was_auto_resolved THEN 1 ELSE 0 END)
+"""
+
+
+async def ensure_rollup_tables(session):
+    """Create rollup tables if missing (idempotent)"""
+    for stmt in ROLLUP_DDL.split(';'):
+        if stmt.strip():
+            await session.execute(text(stmt))
+
+
+async def refresh_rollups(session, from_key: int, to_key: Optional[int] = None):
+    """
+    Recompute every rollup bucket for dates in [from_key, to_key]
+
+    Args:
+        session: Open session (caller commits)
+        from_key: First YYYYMMDD date key to rebuild (0 = everything)
+        to_key: Last date key to rebuild (None = open-ended)
+    """
+    to_key = to_key if to_key is not None else 99991231
+    params = {
+        "from_key": from_key,
+        "to_key": to_key,
+        "from_hour": from_key * 100,
+        "to_hour": to_key * 100 + 23,
+    }
+
+    # Daily verification buckets
+    await session.execute(text("""
+        DELETE FROM rollup_verification_daily WHERE time_key BETWEEN :from_key AND :to_key
+    """), params)
+    await session.execute(text(f"""
+        INSERT INTO rollup_verification_daily (
+            time_key, tier_key, total, successful, rolled_back,
+            confidence_sum, confidence_count, duration_sum, duration_count
+        )
+        SELECT time_key, COALESCE(tier_key, 0), {_VERIFICATION_MEASURES}
+        FROM fact_verification_executions
+        WHERE time_key BETWEEN :from_key AND :to_key
+        GROUP BY time_key, COALESCE(tier_key, 0)
+    """), params)
+
+    # Hourly verification buckets (time_key range keeps the scan on the index)
+    await session.execute(text("""
+        DELETE FROM rollup_verification_hourly WHERE hour_key BETWEEN :from_hour AND :to_hour
+    """), params)
+    await session.execute(text(f"""
+        INSERT INTO rollup_verification_hourly (
+            hour_key, tier_key, total, successful, rolled_back,
+            confidence_sum, confidence_count, duration_sum, duration_count
+        )
+        SELECT {HOUR_KEY_SQL.format(column='created_at')} AS hour_key, COALESCE(tier_key, 0),
+            {_VERIFICATION_MEASURES}
+        FROM fact_verification_executions
+        WHERE time_key BETWEEN :from_key AND :to_key AND created_at IS NOT NULL
+        GROUP BY hour_key, COALESCE(tier_key, 0)
+    """), params)
+
+    # Error buckets
+    await session.execute(text("""
+        DELETE FROM rollup_error_daily WHERE time_key BETWEEN :from_key AND :to_key
+    """), params)
+    await session.execute(text(f"""
+        INSERT INTO rollup_error_daily (time_key, severity, error_count, auto_resolved_count)
+        SELECT time_key, COALESCE(severity, ''), {_ERROR_MEASURES}
+        FROM fact_error_events
+        WHERE time_key BETWEEN :from_key AND :to_key
+        GROUP BY time_key, COALESCE(severity, '')
+    """), params)
+
+    await session.execute(text("""
+        DELETE FROM rollup_error_hourly WHERE hour_key BETWEEN :from_hour AND :to_hour
+    """), params)
+    await session.execute(text(f"""
+        INSERT INTO rollup_error_hourly (hour_key, severity, error_count, auto_resolved_count)
+        SELECT {HOUR_KEY_SQL.format(column='created_at')} AS hour_key, COALESCE(severity, ''),
+            {_ERROR_MEASURES}
+        FROM fact_error_events
+        WHERE time_key BETWEEN :from_key AND :to_key AND created_at IS NOT NULL
+        GROUP BY hour_key, COALESCE(severity, '')
+    """), params)
+
+    # Mission buckets aren't time-partitioned: rebuild missions with facts in range
+    await session.execute(text("""
+        DELETE FROM rollup_mission_tier WHERE mission_key IN (
+            SELECT DISTINCT mission_key FROM fact_verification_executions
+            WHERE time_key BETWEEN :from_key AND :to_key AND mission_key IS NOT NULL
+        )
+    """), params)
+    await session.execute(text("""
+        INSERT INTO rollup_mission_tier (
+            mission_key, tier_key, executions, confidence_sum, confidence_count
+        )
+        SELECT mission_key, COALESCE(tier_key, 0), COUNT(*), SUM(confidence_score), COUNT(confidence_score)
+        FROM fact_verification_executions
+        WHERE mission_key IN (
+            SELECT DISTINCT mission_key FROM fact_verification_executions
+            WHERE time_key BETWEEN :from_key AND :to_key AND mission_key IS NOT NULL
+        )
+        GROUP BY mission_key, COALESCE(tier_key, 0)
+    """), params)
+
+
+async def rollups_need_backfill(session) -> bool:
+    """True when facts exist but the rollups were never built"""
+    result = await session.execute(text("""
+        SELECT
+            EXISTS (SELECT 1 FROM fact_verification_executions) OR EXISTS (SELECT 1 FROM fact_error_events),
+            EXISTS (SELECT 1 FROM rollup_verification_daily) OR EXISTS (SELECT 1 FROM rollup_error_daily)
+    """))
+    has_facts, has_rollups = result.fetchone()
+    return bool(has_facts) and not bool(has_rollups)
@@ -15,6 +15,7 @@ except ImportError:
     SCHEDULER_AVAILABLE = False
 
 from backend.data_cube.etl import cube_etl
+from backend.data_cube.columnar_store import columnar_store
 
 
 async def run_incremental_etl():
@@ -26,6 +27,14 @@ async def run_incremental_etl():
         # TODO(FUTURE): Alert on failure
 
 
+async def run_columnar_compaction():
+    """Copy closed days of the fact tables and immutable log to Parquet"""
+    try:
+        await columnar_store.compact_closed_days()
+    except Exception as e:
+        print(f"Columnar compaction failed: {e}")
+
+
 def start_cube_scheduler():
     """Start scheduled ETL jobs"""
     
@@ -39,6 +48,16 @@ def start_cube_scheduler():
         replace_existing=True
     )
     
+    if columnar_store.available:
+        scheduler.add_job(
+            run_columnar_compaction,
+            'interval',
+            hours=1,
+            id='cube_columnar_compaction',
+            name='Cube columnar compaction (closed days)',
+            replace_existing=True
+        )
+    
     scheduler.start()
     print("[OK] Cube ETL scheduler started (5-minute intervals)")
 
@@ -13,7 +13,7 @@ from backend.models import async_session
 # Dimension table DDL
 DIM_TIME_DDL = """
 CREATE TABLE IF NOT EXISTS dim_time (
-    time_key INTEGER PRIMARY KEY AUTOINCREMENT,
+    time_key INTEGER PRIMARY KEY,  -- YYYYMMDD date key, see date_key()
     timestamp TIMESTAMP NOT NULL UNIQUE,
     minute INTEGER,
     hour INTEGER,
@@ -125,6 +125,7 @@ CREATE INDEX IF NOT EXISTS idx_fact_ver_mission ON fact_verification_executions(
 CREATE INDEX IF NOT EXISTS idx_fact_ver_tier ON fact_verification_executions(tier_key);
 CREATE INDEX IF NOT EXISTS idx_fact_ver_component ON fact_verification_executions(component_key);
 CREATE INDEX IF NOT EXISTS idx_fact_ver_created ON fact_verification_executions(created_at);
+CREATE INDEX IF NOT EXISTS idx_fact_ver_contract ON fact_verification_executions(contract_id);
 """
 
 FACT_ERROR_EVENTS_DDL = """
@@ -154,6 +155,7 @@ CREATE TABLE IF NOT EXISTS fact_error_events (
 
 CREATE INDEX IF NOT EXISTS idx_fact_err_time ON fact_error_events(time_key);
 CREATE INDEX IF NOT EXISTS idx_fact_err_severity ON fact_error_events(severity);
+CREATE INDEX IF NOT EXISTS idx_fact_err_error_id ON fact_error_events(error_id);
 """
 
 FACT_APPROVALS_DDL = """
@@ -198,6 +200,107 @@ CREATE TABLE IF NOT EXISTS cube_etl_metadata (
 """
 
 
+# Rollup tables - pre-aggregated facts so dashboards scan O(days), not O(events).
+# Sums and counts (not averages) are stored so buckets combine exactly.
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS rollup_verification_daily (
+    time_key INTEGER NOT NULL,
+    tier_key INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    successful INTEGER NOT NULL,
+    rolled_back INTEGER NOT NULL,
+    confidence_sum REAL,
+    confidence_count INTEGER NOT NULL,
+    duration_sum REAL,
+    duration_count INTEGER NOT NULL,
+    PRIMARY KEY (time_key, tier_key)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_verification_hourly (
+    hour_key INTEGER NOT NULL,
+    tier_key INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    successful INTEGER NOT NULL,
+    rolled_back INTEGER NOT NULL,
+    confidence_sum REAL,
+    confidence_count INTEGER NOT NULL,
+    duration_sum REAL,
+    duration_count INTEGER NOT NULL,
+    PRIMARY KEY (hour_key, tier_key)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_error_daily (
+    time_key INTEGER NOT NULL,
+    severity TEXT NOT NULL DEFAULT '',
+    error_count INTEGER NOT NULL,
+    auto_resolved_count INTEGER NOT NULL,
+    PRIMARY KEY (time_key, severity)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_error_hourly (
+    hour_key INTEGER NOT NULL,
+    severity TEXT NOT NULL DEFAULT '',
+    error_count INTEGER NOT NULL,
+    auto_resolved_count INTEGER NOT NULL,
+    PRIMARY KEY (hour_key, severity)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_mission_tier (
+    mission_key INTEGER NOT NULL,
+    tier_key INTEGER NOT NULL DEFAULT 0,
+    executions INTEGER NOT NULL,
+    confidence_sum REAL,
+    confidence_count INTEGER NOT NULL,
+    PRIMARY KEY (mission_key, tier_key)
+)
+"""
+
+# Smart date key: facts carry YYYYMMDD directly, so loads never join dim_time
+# and range filters on time_key are plain integer comparisons
+DATE_KEY_SQL = "CAST(strftime('%Y%m%d', {column}) AS INTEGER)"
+
+# Source-table indexes the incremental ETL range-scans on
+SOURCE_INDEXES_DDL = """
+CREATE INDEX IF NOT EXISTS idx_action_contracts_created ON action_contracts(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_immutable_log_timestamp ON immutable_log(timestamp)
+"""
+
+
+def date_key(value) -> int:
+    """YYYYMMDD integer key for a date/datetime"""
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+async def migrate_time_keys(session):
+    """
+    Convert surrogate (autoincrement) dim_time keys to YYYYMMDD date keys
+
+    Older cubes numbered dim_time rows 1, 2, 3...; facts are re-pointed
+    first, then the dimension rows are re-keyed. Idempotent.
+    """
+    legacy = await session.execute(text("SELECT COUNT(*) FROM dim_time WHERE time_key < 10000000"))
+    if not legacy.scalar():
+        return
+
+    print("  Migrating dim_time to integer date keys...")
+    for fact_table in ("fact_verification_executions", "fact_error_events", "fact_approvals"):
+        await session.execute(text(f"""
+            UPDATE {fact_table}
+            SET time_key = (
+                SELECT {DATE_KEY_SQL.format(column='t.timestamp')}
+                FROM dim_time t WHERE t.time_key = {fact_table}.time_key
+            )
+            WHERE time_key < 10000000
+        """))
+
+    # One row per date survives; UPDATE OR REPLACE resolves collisions
+    await session.execute(text(f"""
+        UPDATE OR REPLACE dim_time
+        SET time_key = {DATE_KEY_SQL.format(column='timestamp')}
+        WHERE time_key < 10000000
+    """))
+
+
 async def create_cube_schema():
     """
     Create all cube tables (dimensions, facts, metadata).
@@ -249,6 +352,14 @@ async def create_cube_schema():
             if stmt.strip():
                 await session.execute(text(stmt))
         
+        # Create rollups
+        print("  Creating rollup tables...")
+        for stmt in ROLLUP_DDL.split(';'):
+            if stmt.strip():
+                await session.execute(text(stmt))
+        
+        await migrate_time_keys(session)
+        
         await session.commit()
     
     # Seed static dimensions
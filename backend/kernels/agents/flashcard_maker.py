@@ -131,8 +131,8 @@ class FlashcardMaker:
                 })
             
             # Log flashcards
-            for card in flashcards:
-                self.registry.insert_row('memory_insights', {
+            await self.registry.insert_rows_async('memory_insights', [
+                {
                     'insight_type': 'flashcard',
                     'source': self.agent_id,
                     'content': card['question'],
@@ -143,7 +143,9 @@ class FlashcardMaker:
                         'flashcard_id': card['id']
                     },
                     'created_at': datetime.utcnow().isoformat()
-                })
+                }
+                for card in flashcards
+            ])
             
             logger.info(f"Logged {len(flashcards)} flashcards to memory_insights")
             
@@ -163,9 +163,9 @@ class IngestionRunner:
             return
         
         try:
-            # Insert chunks into memory_chunks table (if exists)
-            for chunk, embedding in zip(chunks, embeddings):
-                self.registry.insert_row('memory_chunks', {
+            # Insert chunks into memory_chunks table (if exists) - one batch
+            await self.registry.insert_rows_async('memory_chunks', [
+                {
                     'file_path': self.file_path,
                     'chunk_id': chunk['chunk_id'],
                     'content': chunk['content'],
@@ -175,7 +175,9 @@ class IngestionRunner:
                         **chunk.get('metadata', {})
                     },
                     'created_at': datetime.utcnow().isoformat()
-                })
+                }
+                for chunk, embedding in zip(chunks, embeddings)
+            ])
             
             logger.info(f"Inserted {len(chunks)} chunks into Memory Fusion")
             
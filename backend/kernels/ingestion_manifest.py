@@ -0,0 +1,254 @@
+"""
+Ingestion Manifest
+Durable record of what the Librarian already ingested, so startup only
+re-queues new, changed, failed or out-of-date files
+
+One SQLite table keyed by path: (size, mtime, content_hash,
+pipeline_version, status). Reconciliation stats the watched trees in
+parallel threads, compares against the manifest, and only hashes files
+whose size/mtime moved (to tell real edits from touches).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = os.getenv("GRACE_INGESTION_MANIFEST", "databases/ingestion_manifest.db")
+
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+def hash_file(path: str) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _scan_dir(root: str) -> Dict[str, Tuple[int, float]]:
+    """Recursive os.scandir walk: path -> (size, mtime)"""
+    found = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            found[entry.path] = (stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return found
+
+
+def scan_tree(roots: Iterable[Path], workers: int = 8) -> Dict[str, Tuple[int, float]]:
+    """Stat every file under roots, one thread per top-level subdirectory"""
+    files: Dict[str, Tuple[int, float]] = {}
+    subdirs: List[str] = []
+    for root in roots:
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            files[entry.path] = (stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    if subdirs:
+        with ThreadPoolExecutor(max_workers=min(workers, len(subdirs))) as pool:
+            for found in pool.map(_scan_dir, subdirs):
+                files.update(found)
+    return files
+
+
+class IngestionManifest:
+    """path -> last ingested (size, mtime, hash, pipeline version, status)"""
+
+    def __init__(self, db_path: str = MANIFEST_PATH):
+        self.db_path = db_path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingestion_manifest (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    content_hash TEXT,
+                    pipeline_version TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    updated_at TEXT NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT path, size, mtime, content_hash, pipeline_version, status FROM ingestion_manifest"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {
+            row[0]: {'size': row[1], 'mtime': row[2], 'hash': row[3], 'version': row[4], 'status': row[5]}
+            for row in rows
+        }
+
+    def record(self, entries: List[Dict[str, Any]]):
+        """Upsert {'path', 'size', 'mtime', 'hash', 'version', 'status', 'error'} rows"""
+        if not entries:
+            return
+        now = datetime.utcnow().isoformat()
+        conn = self._connect()
+        try:
+            conn.executemany(
+                """
+                INSERT INTO ingestion_manifest
+                    (path, size, mtime, content_hash, pipeline_version, status, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    size = excluded.size,
+                    mtime = excluded.mtime,
+                    content_hash = excluded.content_hash,
+                    pipeline_version = excluded.pipeline_version,
+                    status = excluded.status,
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                [
+                    (e['path'], e['size'], e['mtime'], e.get('hash'), e['version'],
+                     e['status'], e.get('error'), now)
+                    for e in entries
+                ]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def forget(self, paths: List[str]):
+        if not paths:
+            return
+        conn = self._connect()
+        try:
+            conn.executemany("DELETE FROM ingestion_manifest WHERE path = ?", [(p,) for p in paths])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def reconcile(self, roots: Iterable[Path], pipeline_version: str) -> Dict[str, Any]:
+        """
+        Compare the trees under roots with the manifest
+
+        Returns {'new', 'changed', 'failed', 'outdated', 'removed'} path
+        lists, 'unchanged' count and 'hashes' (path -> known content hash,
+        for seeding the watcher's no-op detection).
+        """
+        files = scan_tree(roots)
+        manifest = self.load()
+
+        new, changed, failed, outdated, suspects = [], [], [], [], []
+        for path, (size, mtime) in files.items():
+            known = manifest.get(path)
+            if known is None:
+                new.append(path)
+            elif known['status'] != STATUS_COMPLETED:
+                failed.append(path)
+            elif known['version'] != pipeline_version:
+                outdated.append(path)
+            elif known['size'] != size or known['mtime'] != mtime:
+                suspects.append(path)
+
+        # Size/mtime moved: only a hash tells an edit from a touch/copy
+        touched = []
+        if suspects:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                for path, digest in zip(suspects, pool.map(hash_file, suspects)):
+                    if digest is not None and digest == manifest[path]['hash']:
+                        size, mtime = files[path]
+                        touched.append({
+                            'path': path, 'size': size, 'mtime': mtime, 'hash': digest,
+                            'version': pipeline_version, 'status': STATUS_COMPLETED
+                        })
+                    else:
+                        changed.append(path)
+            self.record(touched)
+
+        roots = [str(Path(r)) for r in roots]
+        removed = [
+            path for path in manifest
+            if path not in files and any(path == r or path.startswith(r + os.sep) for r in roots)
+        ]
+        self.forget(removed)
+
+        return {
+            'new': new,
+            'changed': changed,
+            'failed': failed,
+            'outdated': outdated,
+            'removed': removed,
+            'unchanged': len(files) - len(new) - len(changed) - len(failed) - len(outdated),
+            'hashes': {
+                path: info['hash'] for path, info in manifest.items()
+                if info['hash'] and path in files and path not in changed
+            }
+        }
+
+    async def reconcile_async(self, roots: Iterable[Path], pipeline_version: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.reconcile, list(roots), pipeline_version)
+
+    async def mark(self, paths: List[str], pipeline_version: str, status: str, error: Optional[str] = None):
+        """Record the outcome of ingesting paths (stats/hashes them off-loop)"""
+        def _mark():
+            entries = []
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append({
+                    'path': path, 'size': stat.st_size, 'mtime': stat.st_mtime,
+                    'hash': hash_file(path), 'version': pipeline_version,
+                    'status': status, 'error': error
+                })
+            self.record(entries)
+
+        if paths:
+            await asyncio.to_thread(_mark)
+
+
+# Global instance
+ingestion_manifest = IngestionManifest()
@@ -4,69 +4,201 @@ Orchestrates memory workspace, schema management, ingestion, and trust curation
 """
 
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import asyncio
+import hashlib
 import logging
+import time
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
 from .base_kernel import BaseDomainKernel
+from .ingestion_manifest import ingestion_manifest, STATUS_COMPLETED, STATUS_FAILED
 from backend.memory_tables.trusted_sources_integration import TrustedSourcesValidator
 
 logger = logging.getLogger(__name__)
 
 
+BOOK_EXTENSIONS = ['.pdf', '.epub', '.txt', '.md', '.docx', '.doc', '.rtf']
+
+
+def is_book_file(path: str) -> bool:
+    file_path = Path(path)
+    return 'books' in str(file_path) and file_path.suffix.lower() in BOOK_EXTENSIONS
+
+
 class FileSystemWatcher(FileSystemEventHandler):
-    """Watches filesystem for changes"""
+    """
+    Watches filesystem for changes
+    
+    Raw watchdog callbacks (observer thread) are handed to the event loop
+    with call_soon_threadsafe and coalesced per path: a path is emitted once
+    it has been quiet for debounce_s (or after max_wait_s of continuous
+    churn), with created+modified* -> created, modified+deleted -> deleted,
+    created+deleted -> nothing. Created/modified files whose content hash is
+    unchanged are dropped as no-ops. Emitted events land on self.queue.
+    """
     
-    def __init__(self, kernel):
+    def __init__(self, kernel, debounce_s: float = 0.5, max_wait_s: float = 5.0):
         self.kernel = kernel
         self.queue = asyncio.Queue()
         self.loop = None  # Will be set when kernel starts
+        self.debounce_s = debounce_s
+        self.max_wait_s = max_wait_s
+        
+        # path -> {'kind', 'first_seen', 'last_seen', 'is_directory'}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._changed: Optional[asyncio.Event] = None
+        
+        self.stats = {
+            'raw_events': 0,
+            'coalesced': 0,
+            'noop_skipped': 0,
+            'emitted': 0
+        }
     
     def on_created(self, event: FileSystemEvent):
-        if not event.is_directory and self.loop:
-            # Check if it's a book file - expanded file types
-            file_path = Path(event.src_path)
-            book_extensions = ['.pdf', '.epub', '.txt', '.md', '.docx', '.doc', '.rtf']
-            is_book = 'books' in str(file_path) and file_path.suffix.lower() in book_extensions
-
-            # Schedule coroutine on the main event loop (thread-safe)
-            asyncio.run_coroutine_threadsafe(
-                self.queue.put({
-                    'type': 'file_created',
-                    'path': event.src_path,
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'is_book': is_book,
-                    'file_type': file_path.suffix.lower()
-                }),
-                self.loop
-            )
+        if not event.is_directory:
+            self._schedule('created', event.src_path)
     
     def on_modified(self, event: FileSystemEvent):
-        if not event.is_directory and self.loop:
-            # Schedule coroutine on the main event loop (thread-safe)
-            asyncio.run_coroutine_threadsafe(
-                self.queue.put({
-                    'type': 'file_modified',
-                    'path': event.src_path,
-                    'timestamp': datetime.utcnow().isoformat()
-                }),
-                self.loop
-            )
+        if not event.is_directory:
+            self._schedule('modified', event.src_path)
     
     def on_deleted(self, event: FileSystemEvent):
-        if self.loop:
-            # Schedule coroutine on the main event loop (thread-safe)
-            asyncio.run_coroutine_threadsafe(
-                self.queue.put({
-                    'type': 'file_deleted',
-                    'path': event.src_path,
-                    'timestamp': datetime.utcnow().isoformat()
-                }),
-                self.loop
-            )
+        self._schedule('deleted', event.src_path, event.is_directory)
+    
+    def on_moved(self, event: FileSystemEvent):
+        # Atomic saves (write temp + rename) and folder drops arrive as moves
+        if not event.is_directory:
+            self._schedule('deleted', event.src_path)
+            self._schedule('created', event.dest_path)
+    
+    def _schedule(self, kind: str, path: str, is_directory: bool = False):
+        """Observer thread -> event loop (no coroutine/future per raw event)"""
+        if self.loop is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._note, kind, path, is_directory)
+        except RuntimeError:
+            pass  # loop closed during shutdown
+    
+    def _note(self, kind: str, path: str, is_directory: bool = False):
+        now = time.monotonic()
+        self.stats['raw_events'] += 1
+        pending = self._pending.get(path)
+        
+        if pending is None:
+            self._pending[path] = {
+                'kind': kind,
+                'first_seen': now,
+                'last_seen': now,
+                'is_directory': is_directory
+            }
+            if self._changed is not None:
+                self._changed.set()
+            return
+        
+        self.stats['coalesced'] += 1
+        pending['last_seen'] = now
+        previous = pending['kind']
+        if previous == 'created' and kind == 'deleted':
+            # Transient file (editor temp, partial download): never happened
+            del self._pending[path]
+        elif previous == 'created':
+            pass  # created + modified* -> created
+        elif previous == 'deleted' and kind == 'created':
+            pending['kind'] = 'modified'  # replaced in place
+        else:
+            pending['kind'] = kind
+    
+    async def run(self):
+        """Emit settled paths; sleeps until the earliest deadline or new activity"""
+        self._changed = asyncio.Event()
+        while True:
+            if not self._pending:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            
+            now = time.monotonic()
+            ready = []
+            next_due = None
+            for path, pending in self._pending.items():
+                due = min(pending['last_seen'] + self.debounce_s, pending['first_seen'] + self.max_wait_s)
+                if due <= now:
+                    ready.append(path)
+                elif next_due is None or due < next_due:
+                    next_due = due
+            
+            if ready:
+                settled = {path: self._pending.pop(path) for path in ready}
+                try:
+                    await self._emit(settled)
+                except Exception as e:
+                    logger.error(f"Error emitting filesystem events: {e}")
+            if next_due is not None:
+                await asyncio.sleep(max(0.0, next_due - time.monotonic()))
+    
+    async def _emit(self, settled: Dict[str, Dict[str, Any]]):
+        to_hash = [path for path, pending in settled.items() if pending['kind'] != 'deleted']
+        hashes = await asyncio.to_thread(self._hash_files, to_hash) if to_hash else {}
+        timestamp = datetime.utcnow().isoformat()
+        
+        for path, pending in settled.items():
+            kind = pending['kind']
+            if kind != 'deleted':
+                digest = hashes.get(path)
+                if digest is None:
+                    # Gone (or unreadable) before it settled
+                    if path not in self._hashes:
+                        continue
+                    kind = 'deleted'
+                elif self._hashes.get(path) == digest:
+                    self.stats['noop_skipped'] += 1
+                    continue
+                else:
+                    self._hashes[path] = digest
+            if kind == 'deleted':
+                self._hashes.pop(path, None)
+            
+            event = {
+                'type': f'file_{kind}',
+                'path': path,
+                'timestamp': timestamp
+            }
+            if kind == 'created':
+                event['is_book'] = is_book_file(path)
+                event['file_type'] = Path(path).suffix.lower()
+            elif kind == 'modified':
+                event['content_hash'] = self._hashes[path]
+            
+            self.queue.put_nowait(event)
+            self.stats['emitted'] += 1
+    
+    @staticmethod
+    def _hash_files(paths) -> Dict[str, str]:
+        hashes = {}
+        for path in paths:
+            digest = hashlib.sha256()
+            try:
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(chunk)
+            except OSError:
+                continue
+            hashes[path] = digest.hexdigest()
+        return hashes
+    
+    def seed_hashes(self, hashes: Dict[str, str]):
+        """Known content hashes (from the ingestion manifest) for no-op detection"""
+        for path, digest in hashes.items():
+            self._hashes.setdefault(path, digest)
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, 'pending_paths': len(self._pending), 'tracked_hashes': len(self._hashes)}
 
 
 class LibrarianKernel(BaseDomainKernel):
@@ -105,6 +237,14 @@ class LibrarianKernel(BaseDomainKernel):
         self.ingestion_queue = asyncio.Queue()
         self.trust_audit_queue = asyncio.Queue()
         
+        # Set whenever work is queued or an agent slot frees up
+        self._work_available = asyncio.Event()
+        # (queue, type, path) keys waiting in a queue - drops duplicate jobs
+        self._queued_keys = set()
+        
+        # Durable record of ingested files (size, mtime, hash, version, status)
+        self.manifest = ingestion_manifest
+        
         # Trust validator
         self.trust_validator = TrustedSourcesValidator(registry) if registry else None
         
@@ -121,7 +261,11 @@ class LibrarianKernel(BaseDomainKernel):
             'max_concurrent_agents': 5,
             'schema_auto_approve_threshold': 0.8,
             'trust_audit_interval': 3600,  # 1 hour
-            'heartbeat_interval': 30  # 30 seconds
+            'heartbeat_interval': 30,  # 30 seconds
+            'fs_debounce_seconds': 0.5,  # quiet period before a path is processed
+            'fs_max_wait_seconds': 5.0,  # upper bound for continuously changing paths
+            'dispatch_batch_size': 25,  # files handed to one agent
+            'ingestion_pipeline_version': '1'  # bump to re-ingest everything on next boot
         }
     
     async def _initialize_watchers(self):
@@ -136,7 +280,11 @@ class LibrarianKernel(BaseDomainKernel):
             path.mkdir(parents=True, exist_ok=True)
         
         # Setup filesystem watcher
-        self.fs_handler = FileSystemWatcher(self)
+        self.fs_handler = FileSystemWatcher(
+            self,
+            debounce_s=self.config['fs_debounce_seconds'],
+            max_wait_s=self.config['fs_max_wait_seconds']
+        )
         self.fs_handler.loop = loop  # Set the event loop for thread-safe operations
         self.fs_observer = Observer()
         
@@ -151,7 +299,8 @@ class LibrarianKernel(BaseDomainKernel):
         
         self.fs_observer.start()
         
-        # Start filesystem event processor
+        # Start debounce flusher and filesystem event processor
+        self._watchers.append(asyncio.create_task(self.fs_handler.run()))
         self._watchers.append(
             asyncio.create_task(self._process_filesystem_events())
         )
@@ -162,6 +311,8 @@ class LibrarianKernel(BaseDomainKernel):
         """Load pending work from database queues"""
         logger.info("Loading pending work...")
         
+        await self._reconcile_manifest()
+        
         if not self.registry:
             return
         
@@ -174,7 +325,7 @@ class LibrarianKernel(BaseDomainKernel):
             )
             
             for schema in pending_schemas:
-                await self.schema_queue.put({
+                self._enqueue(self.schema_queue, {
                     'type': 'schema_proposal',
                     'data': schema.dict() if hasattr(schema, 'dict') else dict(schema)
                 })
@@ -189,7 +340,7 @@ class LibrarianKernel(BaseDomainKernel):
             )
             
             for file_doc in pending_files:
-                await self.ingestion_queue.put({
+                self._enqueue(self.ingestion_queue, {
                     'type': 'ingest_file',
                     'data': file_doc.dict() if hasattr(file_doc, 'dict') else dict(file_doc)
                 })
@@ -199,8 +350,70 @@ class LibrarianKernel(BaseDomainKernel):
         except Exception as e:
             logger.error(f"Error loading pending work: {e}")
     
+    async def _reconcile_manifest(self):
+        """Queue only new/changed/failed/out-of-date files under the watch paths"""
+        try:
+            result = await self.manifest.reconcile_async(
+                [path for path in self.watch_paths if path.exists()],
+                self.config['ingestion_pipeline_version']
+            )
+        except Exception as e:
+            logger.error(f"Ingestion manifest reconciliation failed: {e}")
+            return
+        
+        if self.fs_handler:
+            self.fs_handler.seed_hashes(result['hashes'])
+        
+        timestamp = datetime.utcnow().isoformat()
+        for key in ('new', 'changed', 'failed', 'outdated'):
+            for path in result[key]:
+                self._queue_new_file(path, is_book_file(path), Path(path).suffix.lower(), timestamp)
+        
+        logger.info(
+            f"Manifest reconciled: {len(result['new'])} new, {len(result['changed'])} changed, "
+            f"{len(result['failed'])} failed, {len(result['outdated'])} outdated, "
+            f"{len(result['removed'])} removed, {result['unchanged']} unchanged"
+        )
+    
+    async def _log_agent_completion(self, agent_id: str, success: bool, result: Any):
+        await super()._log_agent_completion(agent_id, success, result)
+        
+        agent_meta = self._sub_agents.get(agent_id) or {}
+        paths = self._ingested_paths(agent_meta.get('task_data') or {})
+        if not paths:
+            return
+        try:
+            await self.manifest.mark(
+                paths,
+                self.config['ingestion_pipeline_version'],
+                STATUS_COMPLETED if success else STATUS_FAILED,
+                error=None if success else str(result)[:500]
+            )
+        except Exception as e:
+            logger.warning(f"Could not update ingestion manifest: {e}")
+    
+    @staticmethod
+    def _ingested_paths(task_data: Dict[str, Any]) -> List[str]:
+        """Paths whose ingestion this job finishes (books: the book job, others: schema inference)"""
+        paths = []
+        for item in task_data.get('batch') or [task_data]:
+            path = item.get('path')
+            if not path:
+                continue
+            if item.get('type') in ('book_ingestion', 'ingest_file'):
+                paths.append(path)
+            elif item.get('type') == 'new_file' and not item.get('is_book'):
+                paths.append(path)
+        return paths
+    
     async def _coordinator_loop(self):
-        """Main coordination loop - processes queues and spawns agents"""
+        """
+        Main coordination loop - processes queues and spawns agents
+        
+        Event driven: sleeps until work is queued or an agent finishes
+        (heartbeat_interval at most), and hands up to dispatch_batch_size
+        queued items to each agent it spawns.
+        """
         logger.info("Starting coordinator loop...")
         
         while self._running:
@@ -208,6 +421,9 @@ class LibrarianKernel(BaseDomainKernel):
                 # Update heartbeat
                 self.last_heartbeat = datetime.utcnow()
                 
+                # Anything queued from here on sets the event again
+                self._work_available.clear()
+                
                 # Skip if paused
                 if self.status.value == 'paused':
                     await asyncio.sleep(1)
@@ -230,8 +446,7 @@ class LibrarianKernel(BaseDomainKernel):
                 while (not self.schema_queue.empty() and 
                        schema_agents < max_schema_agents and 
                        active_count < max_agents):
-                    item = await self.schema_queue.get()
-                    await self.spawn_agent('schema_scout', item, priority='high')
+                    await self.spawn_agent('schema_scout', self._take_batch(self.schema_queue), priority='high')
                     schema_agents += 1
                     active_count += 1
                 
@@ -239,8 +454,7 @@ class LibrarianKernel(BaseDomainKernel):
                 while (not self.ingestion_queue.empty() and 
                        ingestion_agents < max_ingestion_agents and 
                        active_count < max_agents):
-                    item = await self.ingestion_queue.get()
-                    await self.spawn_agent('ingestion_runner', item, priority='normal')
+                    await self.spawn_agent('ingestion_runner', self._take_batch(self.ingestion_queue), priority='normal')
                     ingestion_agents += 1
                     active_count += 1
                 
@@ -248,7 +462,7 @@ class LibrarianKernel(BaseDomainKernel):
                 while (not self.trust_audit_queue.empty() and 
                        trust_agents < max_trust_agents and 
                        active_count < max_agents):
-                    item = await self.trust_audit_queue.get()
+                    item = self.trust_audit_queue.get_nowait()
                     await self.spawn_agent('trust_auditor', item, priority='normal')
                     trust_agents += 1
                     active_count += 1
@@ -257,8 +471,14 @@ class LibrarianKernel(BaseDomainKernel):
                 if await self._should_run_trust_audit():
                     await self.schedule_trust_audit()
                 
-                # Wait before next iteration
-                await asyncio.sleep(1)
+                # Wait for new work or a free agent slot
+                try:
+                    await asyncio.wait_for(
+                        self._work_available.wait(),
+                        timeout=self.config.get('heartbeat_interval', 30)
+                    )
+                except asyncio.TimeoutError:
+                    pass
                 
             except asyncio.CancelledError:
                 logger.info("Coordinator loop cancelled")
@@ -268,6 +488,51 @@ class LibrarianKernel(BaseDomainKernel):
                 self.metrics['errors'] += 1
                 await asyncio.sleep(5)
     
+    def _enqueue(self, queue: asyncio.Queue, item: Dict[str, Any]) -> bool:
+        """Queue a work item unless the same (type, path) is already waiting"""
+        key = (id(queue), item.get('type'), item['path']) if item.get('path') else None
+        if key is not None:
+            if key in self._queued_keys:
+                return False
+            self._queued_keys.add(key)
+        queue.put_nowait(item)
+        self._work_available.set()
+        return True
+    
+    def _take_batch(self, queue: asyncio.Queue) -> Dict[str, Any]:
+        """
+        Pop up to dispatch_batch_size items for one agent
+        
+        A single item is passed through unchanged; several become
+        {'type', 'batch': [items], 'paths': [...]}.
+        """
+        items: List[Dict[str, Any]] = []
+        limit = max(1, self.config.get('dispatch_batch_size', 1))
+        while len(items) < limit and not queue.empty():
+            item = queue.get_nowait()
+            if item.get('path'):
+                self._queued_keys.discard((id(queue), item.get('type'), item['path']))
+            items.append(item)
+        
+        if len(items) == 1:
+            return items[0]
+        
+        types = {item.get('type') for item in items}
+        return {
+            'type': types.pop() if len(types) == 1 else 'batch',
+            'batch': items,
+            'paths': [item['path'] for item in items if item.get('path')],
+            'priority': 'high' if any(item.get('priority') == 'high' for item in items) else 'normal',
+            'timestamp': datetime.utcnow().isoformat()
+        }
+    
+    async def _run_agent(self, agent_id: str, agent: Any):
+        try:
+            await super()._run_agent(agent_id, agent)
+        finally:
+            # A slot freed up - let the coordinator dispatch more
+            self._work_available.set()
+    
     async def _create_agent(self, agent_type: str, agent_id: str, task_data: Dict) -> Any:
         """Create a sub-agent instance"""
         try:
@@ -309,23 +574,24 @@ class LibrarianKernel(BaseDomainKernel):
             self.ingestion_queue.get_nowait()
         while not self.trust_audit_queue.empty():
             self.trust_audit_queue.get_nowait()
+        self._queued_keys.clear()
         
         logger.info("Cleanup complete")
     
     async def _process_filesystem_events(self):
-        """Process filesystem events from watcher"""
+        """Process filesystem events from watcher (already debounced and coalesced)"""
         while self._running:
             try:
-                if self.fs_handler:
-                    event = await asyncio.wait_for(
-                        self.fs_handler.queue.get(),
-                        timeout=1.0
-                    )
-                    
+                if not self.fs_handler:
+                    break
+                events = [await self.fs_handler.queue.get()]
+                while not self.fs_handler.queue.empty():
+                    events.append(self.fs_handler.queue.get_nowait())
+                
+                for event in events:
                     await self._handle_filesystem_event(event)
+                    self.metrics['events_processed'] += 1
                     
-            except asyncio.TimeoutError:
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -341,26 +607,7 @@ class LibrarianKernel(BaseDomainKernel):
         logger.info(f"Filesystem event: {event_type} - {file_path} (book={is_book})")
         
         if event_type == 'file_created':
-            # Queue for schema inference
-            await self.schema_queue.put({
-                'type': 'new_file',
-                'path': file_path,
-                'timestamp': event.get('timestamp'),
-                'is_book': is_book,
-                'file_type': file_type
-            })
-            
-            # If it's a book, prioritize it for book ingestion pipeline
-            if is_book:
-                await self.ingestion_queue.put({
-                    'type': 'book_ingestion',
-                    'path': file_path,
-                    'pipeline': 'book_ingestion',
-                    'priority': 'high',
-                    'timestamp': event.get('timestamp')
-                })
-                
-                logger.info(f"Book detected, queued for specialized ingestion: {file_path}")
+            self._queue_new_file(file_path, is_book, file_type, event.get('timestamp'))
             
             await self._emit_event('file.created', {
                 'path': file_path,
@@ -369,13 +616,38 @@ class LibrarianKernel(BaseDomainKernel):
             })
         
         elif event_type == 'file_modified':
-            # Check if needs re-ingestion
-            await self._emit_event('file.modified', {'path': file_path})
+            # Content actually changed (no-op saves are filtered by the watcher)
+            await self._emit_event('file.modified', {
+                'path': file_path,
+                'content_hash': event.get('content_hash')
+            })
         
         elif event_type == 'file_deleted':
             # Update metadata
             await self._emit_event('file.deleted', {'path': file_path})
     
+    def _queue_new_file(self, file_path: str, is_book: bool, file_type: str, timestamp: Optional[str]):
+        """Queue schema inference, plus book ingestion for books"""
+        self._enqueue(self.schema_queue, {
+            'type': 'new_file',
+            'path': file_path,
+            'timestamp': timestamp,
+            'is_book': is_book,
+            'file_type': file_type
+        })
+        
+        # If it's a book, prioritize it for book ingestion pipeline
+        if is_book:
+            self._enqueue(self.ingestion_queue, {
+                'type': 'book_ingestion',
+                'path': file_path,
+                'pipeline': 'book_ingestion',
+                'priority': 'high',
+                'timestamp': timestamp
+            })
+            
+            logger.info(f"Book detected, queued for specialized ingestion: {file_path}")
+    
     async def _should_run_trust_audit(self) -> bool:
         """Check if it's time to run periodic trust audit"""
         # Implementation: check last audit time vs interval
@@ -383,7 +655,7 @@ class LibrarianKernel(BaseDomainKernel):
     
     async def schedule_trust_audit(self):
         """Schedule a trust audit job"""
-        await self.trust_audit_queue.put({
+        self._enqueue(self.trust_audit_queue, {
             'type': 'periodic_audit',
             'timestamp': datetime.utcnow().isoformat()
         })
@@ -392,14 +664,14 @@ class LibrarianKernel(BaseDomainKernel):
     
     async def submit_schema_proposal(self, schema_data: Dict):
         """Submit a schema proposal to Unified Logic"""
-        await self.schema_queue.put({
+        self._enqueue(self.schema_queue, {
             'type': 'schema_proposal',
             'data': schema_data
         })
     
     async def queue_ingestion(self, file_path: str, metadata: Dict = None):
         """Queue a file for ingestion"""
-        await self.ingestion_queue.put({
+        self._enqueue(self.ingestion_queue, {
             'type': 'ingest_file',
             'path': file_path,
             'metadata': metadata or {}
@@ -410,7 +682,8 @@ class LibrarianKernel(BaseDomainKernel):
         return {
             'schema_queue': self.schema_queue.qsize(),
             'ingestion_queue': self.ingestion_queue.qsize(),
-            'trust_audit_queue': self.trust_audit_queue.qsize()
+            'trust_audit_queue': self.trust_audit_queue.qsize(),
+            'fs_pending_paths': self.fs_handler.get_stats()['pending_paths'] if self.fs_handler else 0
         }
 
 
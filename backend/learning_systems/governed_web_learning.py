@@ -6,10 +6,13 @@ Implements whitelist-based web search, approval gates, sandbox testing, and lear
 import asyncio
 import logging
 import re
+import time
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple, Set
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
+from urllib.parse import urlsplit
 
 from backend.logging_system.immutable_log import immutable_log
 
@@ -41,20 +44,139 @@ class DomainWhitelistEntry:
         """Check if URL is allowed under this whitelist entry"""
         if self.permission == LearningPermission.BLOCKED:
             return False
+        return _CompiledEntry(self).path_allowed(_url_path(url))
 
-        # Check path restrictions
-        path = url.replace(f"https://{self.domain}", "").replace(f"http://{self.domain}", "")
 
-        # Check blocked paths
-        for blocked in self.blocked_paths:
-            if blocked in path:
-                return False
+def _url_path(url: str) -> str:
+    """Path plus query - the part of a URL path rules are matched against"""
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
 
-        # If allowed paths specified, must match one
-        if self.allowed_paths:
-            return any(allowed in path for allowed in self.allowed_paths)
 
-        return True
+class _PathRules:
+    """
+    One precompiled rule set
+
+    Rules are substrings of the path (the original semantics), "^/prefix"
+    for path prefixes, or "re:<pattern>" for regular expressions. All
+    substrings and regexes are folded into a single alternation.
+    """
+
+    __slots__ = ("prefixes", "pattern")
+
+    def __init__(self, rules: List[str]):
+        prefixes, patterns = [], []
+        for rule in rules:
+            if rule.startswith("re:"):
+                patterns.append(f"(?:{rule[3:]})")
+            elif rule.startswith("^"):
+                prefixes.append(rule[1:])
+            elif rule:
+                patterns.append(re.escape(rule))
+        self.prefixes = tuple(prefixes)
+        self.pattern = re.compile("|".join(patterns)) if patterns else None
+
+    def matches(self, path: str) -> bool:
+        if self.prefixes and path.startswith(self.prefixes):
+            return True
+        return self.pattern is not None and self.pattern.search(path) is not None
+
+
+class _CompiledEntry:
+    __slots__ = ("entry", "blocked", "allowed", "has_rules")
+
+    def __init__(self, entry: DomainWhitelistEntry):
+        self.entry = entry
+        self.blocked = _PathRules(entry.blocked_paths) if entry.blocked_paths else None
+        self.allowed = _PathRules(entry.allowed_paths) if entry.allowed_paths else None
+        self.has_rules = self.blocked is not None or self.allowed is not None
+
+    def path_allowed(self, path: str) -> bool:
+        if self.blocked is not None and self.blocked.matches(path):
+            return False
+        return self.allowed is None or self.allowed.matches(path)
+
+
+class _WhitelistDict(dict):
+    """domain -> entry dict that tells its owner when it changes"""
+
+    def __init__(self, on_change, *args):
+        super().__init__(*args)
+        self._on_change = on_change
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._on_change()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._on_change()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._on_change()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._on_change()
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+
+class WhitelistMatcher:
+    """
+    Reversed-label suffix trie over whitelist domains
+
+    "example.com" matches that host only; subdomains need an explicit
+    "*.example.com", which matches subdomains at any depth but not the bare
+    domain. The deepest match wins, so an entry for "api.example.com"
+    overrides one for "*.example.com".
+    """
+
+    _EXACT = ""
+    _WILDCARD = "*"
+
+    def __init__(self, whitelist: Dict[str, DomainWhitelistEntry]):
+        self.root: Dict[str, Any] = {}
+        for domain, entry in whitelist.items():
+            labels = domain.lower().strip(".").split(".")
+            marker = self._EXACT
+            if labels[0] == "*":
+                labels = labels[1:]
+                marker = self._WILDCARD
+            node = self.root
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            node[marker] = _CompiledEntry(entry)
+
+    def match(self, host: str) -> Optional[_CompiledEntry]:
+        labels = host.split(".")
+        node = self.root
+        best = None
+        remaining = len(labels)
+        for label in reversed(labels):
+            node = node.get(label)
+            if node is None:
+                break
+            remaining -= 1
+            if not remaining:
+                best = node.get(self._EXACT, best)
+            elif self._WILDCARD in node:
+                best = node[self._WILDCARD]
+        return best
 
 
 class DomainWhitelist:
@@ -63,13 +185,40 @@ class DomainWhitelist:
     Controls which domains Grace can learn from autonomously
     """
 
-    def __init__(self):
-        self.whitelist: Dict[str, DomainWhitelistEntry] = {}
+    def __init__(self, decision_cache_size: int = 8192, stats_flush_interval: float = 5.0):
+        self._whitelist = _WhitelistDict(self.invalidate)
         self.pending_approvals: Dict[str, Dict[str, Any]] = {}
 
+        # Compiled matcher, rebuilt lazily after any whitelist change
+        self._matcher: Optional[WhitelistMatcher] = None
+        self._hosts: Dict[str, Optional[_CompiledEntry]] = {}
+        self._decisions: OrderedDict = OrderedDict()
+        self.decision_cache_size = decision_cache_size
+
+        # Access stats are counted here and folded into entries in batches
+        self._pending_access: Dict[int, List[Any]] = {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self.stats_flush_interval = stats_flush_interval
+
         # Initialize with trusted domains
         self._initialize_trusted_domains()
 
+    @property
+    def whitelist(self) -> Dict[str, DomainWhitelistEntry]:
+        return self._whitelist
+
+    @whitelist.setter
+    def whitelist(self, value: Dict[str, DomainWhitelistEntry]):
+        self._whitelist = _WhitelistDict(self.invalidate, value)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop compiled rules; call after editing an entry's paths in place"""
+        self._matcher = None
+        self._hosts.clear()
+        self._decisions.clear()
+
     def _initialize_trusted_domains(self):
         """Initialize with pre-approved trusted domains"""
         trusted_domains = [
@@ -104,16 +253,24 @@ class DomainWhitelist:
         Returns:
             (allowed, reason, whitelist_entry)
         """
-        try:
-            domain = self._extract_domain(url)
-        except ValueError:
-            return False, "Invalid URL format", None
+        decisions = self._decisions
+        decision = decisions.get(url)
+        if decision is None:
+            decision = self._decide(url)
+            decisions[url] = decision
+            if len(decisions) > self.decision_cache_size:
+                decisions.popitem(last=False)
+        else:
+            decisions.move_to_end(url)
 
-        entry = self.whitelist.get(domain)
+        domain, entry, path_allowed = decision
+        if domain is None:
+            return False, "Invalid URL format", None
 
         if not entry:
             return False, f"Domain {domain} not in whitelist", None
 
+        # Permission is read live so changing it needs no invalidation
         if entry.permission == LearningPermission.BLOCKED:
             return False, f"Domain {domain} is blocked", entry
 
@@ -121,15 +278,54 @@ class DomainWhitelist:
             return False, f"Domain {domain} requires approval", entry
 
         # Check path restrictions
-        if not entry.allows_access(url):
+        if not path_allowed:
             return False, f"URL path not allowed for domain {domain}", entry
 
-        # Update access stats
-        entry.access_count += 1
-        entry.last_accessed = datetime.utcnow().isoformat()
-
+        self._record_access(entry)
         return True, None, entry
 
+    def _decide(self, url: str) -> Tuple[Optional[str], Optional[DomainWhitelistEntry], bool]:
+        try:
+            domain = self._extract_domain(url)
+        except ValueError:
+            return None, None, False
+
+        if domain in self._hosts:
+            compiled = self._hosts[domain]
+        else:
+            if self._matcher is None:
+                self._matcher = WhitelistMatcher(self._whitelist)
+            compiled = self._hosts[domain] = self._matcher.match(domain)
+            if len(self._hosts) > self.decision_cache_size:
+                self._hosts.clear()
+
+        if compiled is None:
+            return domain, None, False
+        if not compiled.has_rules:
+            return domain, compiled.entry, True
+        return domain, compiled.entry, compiled.path_allowed(_url_path(url))
+
+    def _record_access(self, entry: DomainWhitelistEntry):
+        now = time.time()
+        pending = self._pending_access.get(id(entry))
+        if pending is None:
+            self._pending_access[id(entry)] = [entry, 1, now]
+        else:
+            pending[1] += 1
+            pending[2] = now
+        self._pending_count += 1
+        if self._pending_count >= 1000 or time.monotonic() - self._last_flush >= self.stats_flush_interval:
+            self.flush_access_stats()
+
+    def flush_access_stats(self):
+        """Fold batched access counts into the whitelist entries"""
+        pending, self._pending_access = self._pending_access, {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        for entry, count, last in pending.values():
+            entry.access_count += count
+            entry.last_accessed = datetime.utcfromtimestamp(last).isoformat()
+
     def request_domain_approval(self, domain: str, requester: str, reason: str) -> str:
         """
         Request approval for a new domain
@@ -215,23 +411,25 @@ class DomainWhitelist:
 
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL"""
-        if not url.startswith(('http://', 'https://')):
+        parts = urlsplit(url)
+        if parts.scheme.lower() not in ('http', 'https'):
             raise ValueError("URL must start with http:// or https://")
 
-        # Remove protocol
-        domain_part = url.replace('http://', '').replace('https://', '')
+        # "https://github.com:1@evil.example/" is a request to evil.example
+        if '@' in parts.netloc:
+            raise ValueError("URL must not contain credentials")
 
-        # Extract domain (handle subdomains)
-        domain = domain_part.split('/')[0].split(':')[0]  # Remove port if present
+        domain = parts.hostname or ''
 
         # Basic validation
         if '.' not in domain or len(domain) < 4:
             raise ValueError("Invalid domain format")
 
-        return domain.lower()
+        return domain
 
     def get_whitelist_stats(self) -> Dict[str, Any]:
         """Get whitelist statistics"""
+        self.flush_access_stats()
         total_domains = len(self.whitelist)
         allowed = len([d for d in self.whitelist.values() if d.permission == LearningPermission.ALLOWED])
         requires_approval = len([d for d in self.whitelist.values() if d.permission == LearningPermission.REQUIRES_APPROVAL])
@@ -261,6 +459,9 @@ class LearningJob:
     approval_required: bool = False
     approved_by: Optional[str] = None
     approved_at: Optional[str] = None
+    seed_urls: List[str] = field(default_factory=list)
+    max_pages: int = 20
+    max_depth: int = 1
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -285,11 +486,16 @@ class LearningJobOrchestrator:
     Manages the lifecycle of web learning tasks
     """
 
-    def __init__(self):
+    def __init__(self, crawler=None):
         self.jobs: Dict[str, LearningJob] = {}
         self.active_jobs: Set[str] = set()
         self.max_concurrent_jobs = 3
 
+        # Runnable jobs wait here; max_concurrent_jobs workers drain it
+        self._job_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._crawler = crawler
+
         self.orchestrator_stats = {
             "total_jobs": 0,
             "completed_jobs": 0,
@@ -299,7 +505,8 @@ class LearningJobOrchestrator:
         }
 
     async def create_learning_job(self, query: str, domain_whitelist: List[str],
-                                requester: str) -> str:
+                                requester: str, seed_urls: Optional[List[str]] = None,
+                                max_pages: int = 20, max_depth: int = 1) -> str:
         """
         Create a new learning job
 
@@ -307,6 +514,9 @@ class LearningJobOrchestrator:
             query: Learning query
             domain_whitelist: Allowed domains
             requester: Who requested the job
+            seed_urls: Start URLs (default: the domains' front pages)
+            max_pages: Page budget for the crawl
+            max_depth: Link depth followed from the seeds
 
         Returns:
             Job ID
@@ -320,7 +530,10 @@ class LearningJobOrchestrator:
             job_id=job_id,
             query=query,
             domain_whitelist=domain_whitelist,
-            approval_required=approval_needed
+            approval_required=approval_needed,
+            seed_urls=list(seed_urls or []),
+            max_pages=max_pages,
+            max_depth=max_depth
         )
 
         self.jobs[job_id] = job
@@ -344,7 +557,7 @@ class LearningJobOrchestrator:
 
         # Auto-start if no approval needed
         if not approval_needed:
-            asyncio.create_task(self.start_job(job_id))
+            await self.start_job(job_id)
 
         return job_id
 
@@ -383,22 +596,37 @@ class LearningJobOrchestrator:
         )
 
         # Start the job
-        asyncio.create_task(self.start_job(job_id))
+        await self.start_job(job_id)
         return True
 
     async def start_job(self, job_id: str):
-        """Start a learning job"""
+        """Queue a learning job; it runs when one of the job workers is free"""
         if job_id not in self.jobs:
             return
 
-        job = self.jobs[job_id]
+        if self._job_queue is None:
+            self._job_queue = asyncio.Queue()
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_concurrent_jobs:
+            self._workers.append(asyncio.create_task(self._job_worker()))
 
-        # Check concurrency limit
         if len(self.active_jobs) >= self.max_concurrent_jobs:
-            logger.info(f"[JOB-ORCHESTRATOR] Delaying job {job_id} due to concurrency limit")
-            await asyncio.sleep(30)  # Wait and retry
-            asyncio.create_task(self.start_job(job_id))
-            return
+            logger.info(f"[JOB-ORCHESTRATOR] Queued job {job_id} (concurrency limit reached)")
+        self._job_queue.put_nowait(job_id)
+
+    async def _job_worker(self):
+        while True:
+            job_id = await self._job_queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"[JOB-ORCHESTRATOR] Worker error on {job_id}: {e}")
+            finally:
+                self._job_queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        """Run one learning job to completion"""
+        job = self.jobs[job_id]
 
         job.status = "running"
         job.started_at = datetime.utcnow().isoformat()
@@ -455,28 +683,57 @@ class LearningJobOrchestrator:
             self.active_jobs.discard(job_id)
 
     async def _execute_learning_job(self, job: LearningJob) -> List[Dict[str, Any]]:
-        """Execute the actual learning job"""
-        # This would integrate with web search and content extraction
-        # For now, return mock results
+        """Crawl the job's whitelisted domains and rank pages against the query"""
+        if self._crawler is None:
+            from backend.learning_systems.web_crawler import WebCrawler
+            self._crawler = WebCrawler(whitelist=domain_whitelist)
 
-        results = []
-        for i in range(3):  # Mock 3 results
-            result = {
-                "title": f"Learning Result {i+1} for '{job.query}'",
-                "url": f"https://example{i+1}.com/learn/{job.query.replace(' ', '_')}",
-                "snippet": f"This is a mock learning result about {job.query}...",
-                "domain": f"example{i+1}.com",
-                "content_type": "tutorial",
-                "relevance_score": 0.8 - (i * 0.1),
-                "extracted_at": datetime.utcnow().isoformat()
-            }
-            results.append(result)
-
-            # Simulate processing time
-            await asyncio.sleep(0.5)
+        seeds = job.seed_urls or re.findall(r'https?://\S+', job.query) or [
+            f"https://{domain}/" for domain in job.domain_whitelist
+        ]
+        allowed_domains = {d.lower() for d in job.domain_whitelist} or None
+        pages = await self._crawler.crawl(
+            seeds,
+            max_pages=job.max_pages,
+            max_depth=job.max_depth,
+            allowed_domains=allowed_domains
+        )
 
+        terms = [t for t in re.findall(r'\w+', job.query.lower()) if len(t) > 2]
+        results = []
+        for page in pages:
+            text = page.get("text", "")
+            lowered = text.lower()
+            hits = sum(lowered.count(t) for t in terms)
+            relevance = min(1.0, hits / (10 * len(terms))) if terms else 0.5
+            domain = (urlsplit(page["url"]).hostname or "").lower()
+            _, _, entry = domain_whitelist.check_domain_access(page["url"])
+
+            first = min((lowered.find(t) for t in terms if t in lowered), default=0)
+            results.append({
+                "title": page.get("title") or page["url"],
+                "url": page["url"],
+                "snippet": text[max(0, first - 100):first + 200].strip(),
+                "text": text,
+                "domain": domain,
+                "content_type": entry.content_types[0] if entry and entry.content_types else "web",
+                "relevance_score": round(relevance, 3),
+                "from_cache": page.get("from_cache", False),
+                "extracted_at": page.get("fetched_at") or datetime.utcnow().isoformat()
+            })
+
+        results.sort(key=lambda r: r["relevance_score"], reverse=True)
         return results
 
+    async def shutdown(self):
+        """Stop the job workers and close the crawler's HTTP session"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._crawler is not None:
+            await self._crawler.close()
+
     def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job status"""
         job = self.jobs.get(job_id)
@@ -488,7 +745,11 @@ class LearningJobOrchestrator:
 
     def get_orchestrator_stats(self) -> Dict[str, Any]:
         """Get orchestrator statistics"""
-        return self.orchestrator_stats
+        stats = dict(self.orchestrator_stats)
+        stats["queued_jobs"] = self._job_queue.qsize() if self._job_queue else 0
+        if self._crawler is not None:
+            stats["crawler"] = self._crawler.get_stats()
+        return stats
 
 
 class SandboxTester:
@@ -0,0 +1,400 @@
+"""
+Web Crawler - Fetch engine for governed web learning
+Concurrent, polite, cache-aware crawling behind the DomainWhitelist
+
+- one pooled aiohttp session (keep-alive, global connection cap)
+- per-domain concurrency and request-rate limits
+- conditional requests (If-None-Match / If-Modified-Since) against an
+  on-disk cache of extracted pages; 304s are served from the cache
+- HTML -> text extraction fed incrementally while the body streams in
+- every URL (seeds, discovered links and each redirect Location) goes
+  through DomainWhitelist.check_domain_access before it is fetched
+"""
+
+import asyncio
+import codecs
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urldefrag, urlsplit
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("GRACE_WEB_CACHE_DIR", "storage/web_cache")
+
+_SKIP_TAGS = {"script", "style", "noscript", "svg", "template", "iframe"}
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "li", "ul", "ol", "br", "tr", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote", "header", "footer"
+}
+_TEXT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class HTMLTextExtractor(HTMLParser):
+    """Incremental HTML -> (title, text, links); feed() chunks as they arrive"""
+
+    def __init__(self, base_url: str, max_chars: int = 200_000):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.max_chars = max_chars
+        self.title = ""
+        self.links: List[str] = []
+        self._parts: List[str] = []
+        self._chars = 0
+        self._skip_depth = 0
+        self._in_head = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        elif tag == "head":
+            self._in_head = True
+        elif tag == "body":
+            self._in_head = False  # </head> is optional
+        elif tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "a":
+            href = dict(attrs).get("href")
+            if href and not href.startswith(("javascript:", "mailto:", "#")):
+                self.links.append(urldefrag(urljoin(self.base_url, href))[0])
+        elif tag == "base":
+            href = dict(attrs).get("href")
+            if href:
+                self.base_url = urljoin(self.base_url, href)
+        if tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self._in_head = False
+        elif tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        if tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+            return
+        if self._skip_depth or self._in_head or self._chars >= self.max_chars:
+            return
+        self._parts.append(data)
+        self._chars += len(data)
+
+    @property
+    def text(self) -> str:
+        text = re.sub(r"[ \t\r\f\v]+", " ", "".join(self._parts))
+        return re.sub(r"\s*\n\s*", "\n", text).strip()[:self.max_chars]
+
+
+class ResponseCache:
+    """On-disk cache of extracted pages plus their validators (ETag/Last-Modified)"""
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _get(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _put(self, url: str, entry: Dict[str, Any]):
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, url)
+
+    async def put(self, url: str, entry: Dict[str, Any]):
+        await asyncio.to_thread(self._put, url, entry)
+
+
+class _DomainGate:
+    """Concurrency + minimum spacing between request starts for one domain"""
+
+    def __init__(self, concurrency: int, rate: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        if self.interval:
+            # Cancelled while spacing, __aexit__ never runs: give the slot back here
+            try:
+                async with self._lock:
+                    now = time.monotonic()
+                    wait = self._next_start - now
+                    self._next_start = max(now, self._next_start) + self.interval
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            except BaseException:
+                self.semaphore.release()
+                raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+class WebCrawler:
+    """
+    Concurrent, whitelist-governed crawler
+
+    fetch(url) fetches one page; crawl(seeds) runs a bounded frontier with
+    worker tasks. whitelist defaults to the global domain_whitelist.
+    """
+
+    def __init__(
+        self,
+        whitelist=None,
+        cache: Optional[ResponseCache] = None,
+        max_connections: int = 32,
+        per_domain_concurrency: int = 2,
+        per_domain_rate: float = 2.0,
+        timeout_s: float = 20.0,
+        max_bytes: int = 2_000_000,
+        max_redirects: int = 5,
+        user_agent: str = "GraceLearningBot/1.0 (+governed web learning)"
+    ):
+        if whitelist is None:
+            from backend.learning_systems.governed_web_learning import domain_whitelist
+            whitelist = domain_whitelist
+        self.whitelist = whitelist
+        self.cache = cache or ResponseCache()
+        self.max_connections = max_connections
+        self.per_domain_concurrency = per_domain_concurrency
+        self.per_domain_rate = per_domain_rate
+        self.timeout_s = timeout_s
+        self.max_bytes = max_bytes
+        self.max_redirects = max_redirects
+        self.user_agent = user_agent
+
+        self._session = None
+        self._gates: Dict[str, _DomainGate] = {}
+
+        self.stats = {
+            "fetched": 0,
+            "not_modified": 0,
+            "blocked": 0,
+            "errors": 0,
+            "bytes": 0
+        }
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_s),
+                headers={"User-Agent": self.user_agent}
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _gate(self, host: str) -> _DomainGate:
+        gate = self._gates.get(host)
+        if gate is None:
+            gate = self._gates[host] = _DomainGate(self.per_domain_concurrency, self.per_domain_rate)
+        return gate
+
+    def check(self, url: str) -> Tuple[bool, Optional[str]]:
+        allowed, reason, _ = self.whitelist.check_domain_access(url)
+        return allowed, reason
+
+    async def fetch(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch and extract one URL
+
+        Returns {'url', 'status', 'title', 'text', 'links', 'from_cache', ...};
+        status is the HTTP status, or 'blocked' / 'error'. Redirects are
+        followed by hand (at most max_redirects hops) so every Location is
+        checked against the whitelist before it is requested.
+        """
+        allowed, reason = self.check(url)
+        if not allowed:
+            self.stats["blocked"] += 1
+            return {"url": url, "status": "blocked", "reason": reason}
+
+        cached = await self.cache.get(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        session = await self._get_session()
+        current = url
+        hops = 0
+        try:
+            while True:
+                async with self._gate(urlsplit(current).hostname or ""):
+                    request_headers = headers if current == url else {}
+                    async with session.get(current, headers=request_headers, allow_redirects=False) as response:
+                        location = response.headers.get("Location")
+                        if response.status in _REDIRECT_STATUSES and location:
+                            target = urldefrag(urljoin(current, location))[0]
+                            if hops >= self.max_redirects:
+                                self.stats["errors"] += 1
+                                return {"url": url, "status": "error", "reason": f"more than {self.max_redirects} redirects"}
+                            allowed, reason = self.check(target)
+                            if not allowed:
+                                self.stats["blocked"] += 1
+                                return {"url": url, "status": "blocked", "reason": f"redirect to {target}: {reason}"}
+                            current = target
+                            hops += 1
+                            continue
+
+                        if response.status == 304 and cached:
+                            self.stats["not_modified"] += 1
+                            return {**cached["page"], "url": url, "status": 304, "from_cache": True}
+
+                        content_type = response.headers.get("Content-Type", "")
+                        page = {
+                            "url": url,
+                            "final_url": current,
+                            "status": response.status,
+                            "content_type": content_type.split(";")[0].strip(),
+                            "title": "",
+                            "text": "",
+                            "links": [],
+                            "from_cache": False,
+                            "fetched_at": datetime.utcnow().isoformat()
+                        }
+                        if response.status >= 400 or not content_type.startswith(_TEXT_TYPES):
+                            return page
+
+                        await self._extract(response, page)
+                        self.stats["fetched"] += 1
+                        break
+        except Exception as e:
+            self.stats["errors"] += 1
+            return {"url": url, "status": "error", "reason": f"{type(e).__name__}: {e}"}
+
+        # Validators belong to the URL that answered; only cache direct hits
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if (etag or last_modified) and current == url:
+            try:
+                await self.cache.put(url, {"etag": etag, "last_modified": last_modified, "page": page})
+            except OSError as e:
+                logger.warning(f"[CRAWLER] Could not cache {url}: {e}")
+        return page
+
+    async def _extract(self, response, page: Dict[str, Any]):
+        """Stream the body through the extractor, stopping at max_bytes"""
+        extractor = HTMLTextExtractor(page["final_url"])
+        encoding = response.charset or "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        is_html = not page["content_type"].startswith("text/plain")
+        received = 0
+        plain = []
+
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            if is_html:
+                extractor.feed(text)
+            else:
+                plain.append(text)
+            if received >= self.max_bytes:
+                page["truncated"] = True
+                break
+        self.stats["bytes"] += received
+
+        if is_html:
+            extractor.close()
+            page["title"] = extractor.title.strip()
+            page["text"] = extractor.text
+            page["links"] = list(dict.fromkeys(extractor.links))
+        else:
+            page["text"] = "".join(plain)
+
+    async def crawl(
+        self,
+        seeds: List[str],
+        max_pages: int = 20,
+        max_depth: int = 1,
+        allowed_domains: Optional[Set[str]] = None,
+        workers: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Breadth-first crawl from seeds
+
+        Links are followed up to max_depth, only on allowed_domains (if
+        given) and only when the whitelist allows them. Returns successfully
+        extracted pages (at most max_pages).
+        """
+        frontier: asyncio.Queue = asyncio.Queue()
+        seen: Set[str] = set()
+        pages: List[Dict[str, Any]] = []
+        scheduled = 0
+
+        def _enqueue(url: str, depth: int):
+            nonlocal scheduled
+            if url in seen or scheduled >= max_pages:
+                return
+            host = (urlsplit(url).hostname or "").lower()
+            if allowed_domains and not any(host == d or host.endswith("." + d) for d in allowed_domains):
+                return
+            if not self.check(url)[0]:
+                return
+            seen.add(url)
+            scheduled += 1
+            frontier.put_nowait((url, depth))
+
+        for url in seeds:
+            _enqueue(url, 0)
+
+        async def _worker():
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    page = await self.fetch(url)
+                    if page.get("text"):
+                        page["depth"] = depth
+                        pages.append(page)
+                    if depth < max_depth:
+                        for link in page.get("links", []):
+                            _enqueue(link, depth + 1)
+                finally:
+                    frontier.task_done()
+
+        tasks = [asyncio.create_task(_worker()) for _ in range(max(1, workers))]
+        try:
+            await frontier.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return pages
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "domains": len(self._gates)}
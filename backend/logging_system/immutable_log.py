@@ -1,13 +1,122 @@
 import json
 import asyncio
-from typing import List, Optional
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from backend.models.base_models import ImmutableLogEntry, async_session
 
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = "0" * 64
+CHECKPOINT_PATH = Path(os.getenv("GRACE_IMMUTABLE_LOG_CHECKPOINT", "storage/immutable_log/verification_checkpoint.json"))
+
+
+def _convert_datetime(obj):
+    """Convert datetime objects to ISO format strings"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@dataclass
+class _PendingAppend:
+    """Entry waiting for the writer to assign its sequence"""
+    actor: str
+    action: str
+    resource: str
+    subsystem: str
+    payload_str: str
+    result: str
+    future: asyncio.Future
+    queued_at: float = field(default_factory=time.perf_counter)
+
+
 class ImmutableLog:
-    """Append-only log with cryptographic chain"""
+    """
+    Append-only log with cryptographic chain
+    
+    Appends go through a single writer task per event loop: it keeps the
+    chain tail (sequence, hash) in memory, chains a whole batch of queued
+    entries and commits them in one transaction, resolving each caller's
+    future with its entry id. Under load that turns N select+insert+commit
+    round trips (and N SQLite write locks) into one.
+    
+    Another process writing the same table shows up as a UNIQUE conflict on
+    sequence; the writer then reloads the tail and re-chains the batch.
+    """
+    
+    def __init__(self, max_batch: int = 500, max_retries: int = 5, session_factory=None):
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        # async_sessionmaker to write through; a private one gives a private log
+        self._session_factory = session_factory or async_session
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tail: Optional[Tuple[int, str]] = None  # (sequence, entry_hash) of the last committed entry
+        
+        self.stats = {
+            "entries_written": 0,
+            "batches_committed": 0,
+            "largest_batch": 0,
+            "conflict_retries": 0,
+            "failed_entries": 0,
+            "last_batch_ms": 0.0,
+        }
+    
+    # ------------------------------------------------------------------
+    # Append path
+    # ------------------------------------------------------------------
+    
+    def submit(
+        self,
+        actor: str,
+        action: str,
+        resource: str,
+        subsystem: str,
+        payload: dict,
+        result: str,
+        signature: Optional[str] = None
+    ) -> asyncio.Future:
+        """
+        Queue an entry for the batch writer without waiting for the commit.
+        
+        Returns:
+            Future resolving to the entry id (-1 if it could not be written)
+        """
+        self._ensure_writer()
+        future = self._loop.create_future()
+        
+        # Add signature to payload if provided
+        if signature:
+            payload["_signature"] = signature
+        
+        # Serialized now so later mutation of `payload` can't change what is hashed
+        try:
+            payload_str = json.dumps(payload, sort_keys=True, default=_convert_datetime)
+        except (TypeError, ValueError) as e:
+            logger.error(f"ImmutableLog append rejected unserializable payload: {e}")
+            self.stats["failed_entries"] += 1
+            future.set_result(-1)
+            return future
+        
+        self._queue.put_nowait(_PendingAppend(
+            actor=actor,
+            action=action,
+            resource=resource,
+            subsystem=subsystem,
+            payload_str=payload_str,
+            result=result,
+            future=future
+        ))
+        return future
     
     async def append(
         self,
@@ -22,7 +131,7 @@ class ImmutableLog:
     ) -> int:
         """
         Append entry to immutable log with optional signature.
-        Retries on sequence conflicts (handles concurrent writes).
+        Waits for the batch containing the entry to commit.
         
         Args:
             actor: Who performed the action
@@ -32,86 +141,209 @@ class ImmutableLog:
             payload: Additional data (dict)
             result: Outcome of the action
             signature: Optional cryptographic signature for audit trail
-            max_retries: Maximum retry attempts on conflict
+            max_retries: Kept for compatibility; the writer retries conflicts
         
         Returns:
-            Entry ID
+            Entry ID (-1 on failure)
         """
+        future = self.submit(actor, action, resource, subsystem, payload, result, signature)
+        # Shielded: a cancelled caller must not cancel an entry already in a batch
+        return await asyncio.shield(future)
+    
+    async def flush(self):
+        """Wait until everything queued so far is committed"""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+    
+    async def stop(self):
+        """Flush and stop the writer task"""
+        await self.flush()
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+    
+    def _ensure_writer(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._writer_task is None or self._writer_task.done():
+            if self._loop is not loop:
+                self._queue = asyncio.Queue()
+                self._tail = None
+            self._loop = loop
+            self._writer_task = loop.create_task(self._writer(), name="immutable_log.writer")
+    
+    async def _writer(self):
+        while True:
+            first = await self._queue.get()
+            batch = [first]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                await self._commit_batch(batch)
+            except Exception as e:
+                # Isolate the bad entry instead of failing its whole batch
+                logger.error(f"ImmutableLog batch of {len(batch)} failed: {e}")
+                for item in batch:
+                    if item.future.done():
+                        continue
+                    try:
+                        await self._commit_batch([item])
+                    except Exception as item_error:
+                        logger.error(f"ImmutableLog append failed after {self.max_retries} retries: {item_error}")
+                        self.stats["failed_entries"] += 1
+                        item.future.set_result(-1)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _commit_batch(self, batch: List[_PendingAppend]):
+        started = time.perf_counter()
         
-        for attempt in range(max_retries):
+        for attempt in range(self.max_retries):
             try:
-                async with async_session() as session:
-                    last_result = await session.execute(
-                        select(ImmutableLogEntry)
-                        .order_by(ImmutableLogEntry.sequence.desc())
-                        .limit(1)
-                    )
-                    last_entry = last_result.scalar_one_or_none()
-                    
-                    sequence = (last_entry.sequence + 1) if last_entry else 1
-                    previous_hash = last_entry.entry_hash if last_entry else "0" * 64
-                    
-                    # Add signature to payload if provided
-                    if signature:
-                        payload["_signature"] = signature
-                    
-                    # Convert datetime objects to ISO format strings
-                    def convert_datetime(obj):
-                        if isinstance(obj, datetime):
-                            return obj.isoformat()
-                        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
-                    
-                    payload_str = json.dumps(payload, sort_keys=True, default=convert_datetime)
-                    
-                    entry_hash = ImmutableLogEntry.compute_hash(
-                        sequence, actor, action, resource, payload_str, result, previous_hash
-                    )
+                async with self._session_factory() as session:
+                    if self._tail is None:
+                        self._tail = await self._load_tail(session)
+                    sequence, previous_hash = self._tail
                     
-                    entry = ImmutableLogEntry(
-                        sequence=sequence,
-                        actor=actor,
-                        action=action,
-                        resource=resource,
-                        subsystem=subsystem,
-                        payload=payload_str,
-                        result=result,
-                        entry_hash=entry_hash,
-                        previous_hash=previous_hash
-                    )
+                    entries = []
+                    for item in batch:
+                        sequence += 1
+                        entry_hash = ImmutableLogEntry.compute_hash(
+                            sequence, item.actor, item.action, item.resource,
+                            item.payload_str, item.result, previous_hash
+                        )
+                        entries.append(ImmutableLogEntry(
+                            sequence=sequence,
+                            actor=item.actor,
+                            action=item.action,
+                            resource=item.resource,
+                            subsystem=item.subsystem,
+                            payload=item.payload_str,
+                            result=item.result,
+                            entry_hash=entry_hash,
+                            previous_hash=previous_hash
+                        ))
+                        previous_hash = entry_hash
                     
-                    session.add(entry)
+                    session.add_all(entries)
+                    await session.flush()  # assigns ids
+                    ids = [entry.id for entry in entries]
                     await session.commit()
-                    await session.refresh(entry)
-                    
-                    return entry.id
+                
+                self._tail = (sequence, previous_hash)
+                for item, entry_id in zip(batch, ids):
+                    if not item.future.done():
+                        item.future.set_result(entry_id)
+                
+                self.stats["entries_written"] += len(batch)
+                self.stats["batches_committed"] += 1
+                self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+                self.stats["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                return
+            
             except (IntegrityError, Exception) as e:
                 error_msg = str(e)
-                if ("UNIQUE constraint failed: immutable_log.sequence" in error_msg or 
-                    "database is locked" in error_msg) and attempt < max_retries - 1:
-                    # Retry with exponential backoff
-                    await asyncio.sleep(0.1 * (2 ** attempt))
+                # Someone else (another process) appended: reload the tail and re-chain
+                self._tail = None
+                if ("UNIQUE constraint failed: immutable_log" in error_msg or
+                    "database is locked" in error_msg) and attempt < self.max_retries - 1:
+                    self.stats["conflict_retries"] += 1
+                    await asyncio.sleep(0.05 * (2 ** attempt))
                     continue
-                # If all retries failed, log but don't crash
-                import logging
-                logging.error(f"ImmutableLog append failed after {max_retries} retries: {e}")
-                return -1  # Return error code instead of raising
+                raise
     
-    async def verify_integrity(self, start_seq: int = 1, end_seq: int = None) -> dict:
-        """Verify hash chain integrity"""
-        async with async_session() as session:
-            query = select(ImmutableLogEntry).order_by(ImmutableLogEntry.sequence)
-            if end_seq:
-                query = query.where(
-                    ImmutableLogEntry.sequence >= start_seq,
-                    ImmutableLogEntry.sequence <= end_seq
-                )
-            else:
-                query = query.where(ImmutableLogEntry.sequence >= start_seq)
+    @staticmethod
+    async def _load_tail(session) -> Tuple[int, str]:
+        last_result = await session.execute(
+            select(ImmutableLogEntry.sequence, ImmutableLogEntry.entry_hash)
+            .order_by(ImmutableLogEntry.sequence.desc())
+            .limit(1)
+        )
+        row = last_result.first()
+        return (row.sequence, row.entry_hash) if row else (0, GENESIS_HASH)
+    
+    def get_writer_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "writer_running": bool(self._writer_task and not self._writer_task.done()),
+            "tail_sequence": self._tail[0] if self._tail else None,
+        }
+    
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+    
+    async def verify_integrity(
+        self,
+        start_seq: int = 1,
+        end_seq: int = None,
+        window: int = 5000,
+        resume: bool = False,
+        save_checkpoint: bool = False,
+        checkpoint_path: Optional[Path] = None
+    ) -> dict:
+        """
+        Verify hash chain integrity
+        
+        Streams the range in keyset-paginated windows (sequence > last seen),
+        so memory stays flat however long the log is. Each entry's link to
+        its predecessor is checked across window boundaries too.
+        
+        Args:
+            start_seq: First sequence to verify
+            end_seq: Last sequence to verify (default: end of log)
+            window: Rows fetched per query
+            resume: Continue from the saved checkpoint instead of start_seq
+            save_checkpoint: Record progress after each verified window, so
+                an interrupted or periodic run picks up where it stopped
+            checkpoint_path: Override the checkpoint file location
+        """
+        path = Path(checkpoint_path) if checkpoint_path else CHECKPOINT_PATH
+        
+        last_seq = start_seq - 1
+        # The first entry links to GENESIS_HASH; an arbitrary start's predecessor is unknown
+        expected_previous: Optional[str] = GENESIS_HASH if start_seq <= 1 else None
+        resumed_from = None
+        if resume:
+            checkpoint = self.load_checkpoint(path)
+            if checkpoint and checkpoint["sequence"] >= last_seq:
+                last_seq = checkpoint["sequence"]
+                expected_previous = checkpoint["entry_hash"]
+                resumed_from = last_seq
+        
+        verified = 0
+        windows = 0
+        first_seq = None
+        columns = (
+            ImmutableLogEntry.id,
+            ImmutableLogEntry.sequence,
+            ImmutableLogEntry.actor,
+            ImmutableLogEntry.action,
+            ImmutableLogEntry.resource,
+            ImmutableLogEntry.payload,
+            ImmutableLogEntry.result,
+            ImmutableLogEntry.entry_hash,
+            ImmutableLogEntry.previous_hash,
+        )
+        
+        while True:
+            async with self._session_factory() as session:
+                query = select(*columns).where(ImmutableLogEntry.sequence > last_seq)
+                if end_seq:
+                    query = query.where(ImmutableLogEntry.sequence <= end_seq)
+                query = query.order_by(ImmutableLogEntry.sequence).limit(window)
+                rows = (await session.execute(query)).all()
             
-            result = await session.execute(query)
-            entries = result.scalars().all()
+            if not rows:
+                break
+            windows += 1
             
-            for i, entry in enumerate(entries):
+            for entry in rows:
                 expected_hash = ImmutableLogEntry.compute_hash(
                     entry.sequence,
                     entry.actor,
@@ -127,21 +359,58 @@ class ImmutableLog:
                         "valid": False,
                         "corrupted_at": entry.sequence,
                         "entry_id": entry.id,
-                        "message": "Hash mismatch detected"
+                        "message": "Hash mismatch detected",
+                        "entries_verified": verified
                     }
                 
-                if i > 0 and entry.previous_hash != entries[i-1].entry_hash:
+                if expected_previous is not None and entry.previous_hash != expected_previous:
                     return {
                         "valid": False,
                         "broken_chain_at": entry.sequence,
-                        "message": "Chain broken - previous hash mismatch"
+                        "message": "Chain broken - previous hash mismatch",
+                        "entries_verified": verified
                     }
+                
+                expected_previous = entry.entry_hash
+                if first_seq is None:
+                    first_seq = entry.sequence
+                verified += 1
             
-            return {
-                "valid": True,
-                "entries_verified": len(entries),
-                "sequence_range": f"{entries[0].sequence}-{entries[-1].sequence}" if entries else "empty"
-            }
+            last_seq = rows[-1].sequence
+            if save_checkpoint:
+                self.save_checkpoint(last_seq, expected_previous, path)
+            if len(rows) < window:
+                break
+        
+        return {
+            "valid": True,
+            "entries_verified": verified,
+            "sequence_range": f"{first_seq}-{last_seq}" if verified else "empty",
+            "windows": windows,
+            "resumed_from": resumed_from
+        }
+    
+    @staticmethod
+    def load_checkpoint(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+        path = Path(path) if path else CHECKPOINT_PATH
+        try:
+            data = json.loads(path.read_text())
+            return data if "sequence" in data and "entry_hash" in data else None
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def save_checkpoint(sequence: int, entry_hash: str, path: Optional[Path] = None):
+        """Record that the chain is verified up to `sequence` (atomic replace)"""
+        path = Path(path) if path else CHECKPOINT_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "sequence": sequence,
+            "entry_hash": entry_hash,
+            "verified_at": datetime.utcnow().isoformat()
+        }))
+        os.replace(tmp, path)
     
     async def replay_cycle(self, cycle_id: str) -> List[dict]:
         """
@@ -155,7 +424,7 @@ class ImmutableLog:
         
         Returns chronological list of all signed entries for the cycle.
         """
-        async with async_session() as session:
+        async with self._session_factory() as session:
             result = await session.execute(
                 select(ImmutableLogEntry)
                 .where(ImmutableLogEntry.payload.contains(f'"cycle_id": "{cycle_id}"'))
@@ -190,7 +459,7 @@ class ImmutableLog:
         limit: int = 100
     ) -> List[dict]:
         """Get signed execution outcomes for learning"""
-        async with async_session() as session:
+        async with self._session_factory() as session:
             cutoff = datetime.utcnow() - timedelta(hours=hours_back)
             
             result = await session.execute(
@@ -232,7 +501,7 @@ class ImmutableLog:
         limit: int = 100
     ) -> List[dict]:
         """Query log entries"""
-        async with async_session() as session:
+        async with self._session_factory() as session:
             query = select(ImmutableLogEntry).order_by(ImmutableLogEntry.sequence.desc())
             
             if actor:
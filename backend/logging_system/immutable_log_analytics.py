@@ -27,6 +27,15 @@ except ImportError:
     trigger_mesh = None
     TriggerEvent = None
 
+# Columnar history (Parquet) for long windows; optional
+try:
+    from backend.data_cube.columnar_store import columnar_store, count_by
+except ImportError:
+    columnar_store = None
+    count_by = None
+
+FAILURE_RESULTS = ["failed", "error", "violated", "rolled_back"]
+
 
 class ImmutableLogAnalytics:
     """
@@ -188,6 +197,28 @@ class ImmutableLogAnalytics:
         
         return report
     
+    async def _columnar_history(self, cutoff: datetime, columns: list):
+        """
+        Compacted rows since cutoff for long windows
+
+        Returns (arrow table, start of the range still to be read from SQLite),
+        or (None, cutoff) when the whole window should come from SQLite.
+        """
+        if columnar_store is None:
+            return None, cutoff
+        hot_start = columnar_store.hot_start("immutable_log", cutoff)
+        if hot_start is None:
+            return None, cutoff
+        try:
+            from backend.data_cube.schema import date_key
+            table = await columnar_store.scan(
+                "immutable_log", date_key(cutoff), date_key(hot_start), columns=columns, since=cutoff
+            )
+        except Exception as e:
+            print(f"[WARN] Columnar log scan failed, using SQLite: {e}")
+            return None, cutoff
+        return table, hot_start
+    
     async def check_subsystem_gaps(self, hours_back: int = 24) -> Dict[str, Any]:
         """
         Check for subsystems that haven't logged recently.
@@ -202,6 +233,7 @@ class ImmutableLogAnalytics:
         """
         
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        history, hot_start = await self._columnar_history(cutoff, ["subsystem", "id", "timestamp"])
         
         async with async_session() as session:
             # Get logging frequency by subsystem
@@ -210,7 +242,7 @@ class ImmutableLogAnalytics:
                 func.count(LogEntry.id).label("count"),
                 func.max(LogEntry.timestamp).label("last_logged")
             ).where(
-                LogEntry.timestamp >= cutoff
+                LogEntry.timestamp >= hot_start
             ).group_by(LogEntry.subsystem)
             
             result = await session.execute(query)
@@ -222,6 +254,16 @@ class ImmutableLogAnalytics:
                 for row in result.all()
             }
         
+        if history is not None and history.num_rows:
+            grouped = history.group_by("subsystem").aggregate([("id", "count"), ("timestamp", "max")])
+            for row in grouped.to_pylist():
+                stats = subsystem_stats.setdefault(row["subsystem"], {
+                    "count": 0,
+                    # Hot rows are always newer than compacted ones
+                    "last_logged": row["timestamp_max"]
+                })
+                stats["count"] += row["id_count"]
+        
         # Expected subsystems (that should log regularly)
         expected_subsystems = [
             "agentic",
@@ -288,6 +330,7 @@ class ImmutableLogAnalytics:
         """
         
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        history, hot_start = await self._columnar_history(cutoff, ["actor", "action", "subsystem"])
         
         async with async_session() as session:
             # Activity by actor
@@ -295,7 +338,7 @@ class ImmutableLogAnalytics:
                 LogEntry.actor,
                 func.count(LogEntry.id).label("count")
             ).where(
-                LogEntry.timestamp >= cutoff
+                LogEntry.timestamp >= hot_start
             ).group_by(LogEntry.actor)
             
             result = await session.execute(actor_query)
@@ -306,7 +349,7 @@ class ImmutableLogAnalytics:
                 LogEntry.action,
                 func.count(LogEntry.id).label("count")
             ).where(
-                LogEntry.timestamp >= cutoff
+                LogEntry.timestamp >= hot_start
             ).group_by(LogEntry.action)
             
             result = await session.execute(action_query)
@@ -317,7 +360,7 @@ class ImmutableLogAnalytics:
                 LogEntry.subsystem,
                 func.count(LogEntry.id).label("count")
             ).where(
-                LogEntry.timestamp >= cutoff
+                LogEntry.timestamp >= hot_start
             ).group_by(LogEntry.subsystem)
             
             result = await session.execute(subsystem_query)
@@ -326,10 +369,17 @@ class ImmutableLogAnalytics:
             # Total entries
             total = await session.scalar(
                 select(func.count(LogEntry.id)).where(
-                    LogEntry.timestamp >= cutoff
+                    LogEntry.timestamp >= hot_start
                 )
             )
         
+        # Add compacted history (vectorized counts over Parquet)
+        if history is not None:
+            total = (total or 0) + history.num_rows
+            for counts, column in ((by_actor, "actor"), (by_action, "action"), (by_subsystem, "subsystem")):
+                for value, count in count_by(history, column).items():
+                    counts[value] = counts.get(value, 0) + count
+        
         return {
             "total_entries": total or 0,
             "by_actor": by_actor,
@@ -351,31 +401,52 @@ class ImmutableLogAnalytics:
         """
         
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        history, hot_start = await self._columnar_history(
+            cutoff, ["id", "actor", "action", "subsystem", "result", "timestamp"]
+        )
         
         async with async_session() as session:
             # Get failed entries
             query = select(LogEntry).where(
                 and_(
-                    LogEntry.timestamp >= cutoff,
-                    LogEntry.result.in_(["failed", "error", "violated", "rolled_back"])
+                    LogEntry.timestamp >= hot_start,
+                    LogEntry.result.in_(FAILURE_RESULTS)
                 )
             ).order_by(desc(LogEntry.timestamp))
             
             result = await session.execute(query)
-            failures = list(result.scalars().all())
+            failures = [
+                {
+                    "id": entry.id,
+                    "actor": entry.actor,
+                    "action": entry.action,
+                    "subsystem": entry.subsystem,
+                    "result": entry.result,
+                    "timestamp": entry.timestamp
+                }
+                for entry in result.scalars().all()
+            ]
+        
+        # Older failures from compacted history (newest first, after the hot rows)
+        if history is not None and history.num_rows:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            mask = pc.is_in(history.column("result"), value_set=pa.array(FAILURE_RESULTS))
+            older = history.filter(mask).sort_by([("timestamp", "descending")])
+            failures.extend(older.to_pylist())
         
         # Group by subsystem
         by_subsystem = {}
         for failure in failures:
-            if failure.subsystem not in by_subsystem:
-                by_subsystem[failure.subsystem] = []
+            if failure["subsystem"] not in by_subsystem:
+                by_subsystem[failure["subsystem"]] = []
             
-            by_subsystem[failure.subsystem].append({
-                "id": failure.id,
-                "actor": failure.actor,
-                "action": failure.action,
-                "result": failure.result,
-                "timestamp": failure.timestamp.isoformat()
+            by_subsystem[failure["subsystem"]].append({
+                "id": failure["id"],
+                "actor": failure["actor"],
+                "action": failure["action"],
+                "result": failure["result"],
+                "timestamp": failure["timestamp"].isoformat()
             })
         
         return {
@@ -3,19 +3,44 @@ Backend Main Entry Point - Minimal Grace API
 """
 
 import os
+
+if os.getenv("GRACE_IMPORT_PROFILE", "false").lower() in ("true", "1", "yes"):
+    # Installed first so every backend import below is attributed
+    from backend.observability.import_profiler import import_profiler
+    import_profiler.install()
+
+import functools
+import sys
 from typing import Optional
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, UploadFile, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 import uuid
 
-try:
-    from backend.learning_systems.advanced_learning import advanced_learning_supervisor
-except ImportError as e:
-    print(f"[WARN] Advanced learning system unavailable: {e}")
+from backend.config.environment import APP_PROFILE, ROUTER_LOADING
+from backend.routes.router_registry import router_registry
+
+if APP_PROFILE == "full":
+    try:
+        from backend.learning_systems.advanced_learning import advanced_learning_supervisor
+    except ImportError as e:
+        print(f"[WARN] Advanced learning system unavailable: {e}")
+        advanced_learning_supervisor = None
+else:
+    # Background learning runs in the full-profile process only
     advanced_learning_supervisor = None
 
+
+def full_profile_only(startup_hook):
+    """Skip a background-subsystem startup hook in the minimal worker profile"""
+    @functools.wraps(startup_hook)
+    async def wrapper():
+        if APP_PROFILE != "full":
+            return
+        return await startup_hook()
+    return wrapper
+
 # Track degraded features for Layer 2
 app = FastAPI(title="Grace API", version="2.0.0")
 
@@ -28,515 +53,139 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Register core routers with resilience
-try:
-    from backend.routes.operator_dashboard import router as operator_router
-    app.include_router(operator_router)
-except ImportError as e:
-    print(f"[WARN] Operator dashboard disabled: {e}")
-
-try:
-    from backend.routes.remote_access_api import router as remote_access_router
-    app.include_router(remote_access_router)
-except ImportError as e:
-    print(f"[WARN] Remote access disabled: {e}")
-
-try:
-    from backend.routes.autonomous_learning_api import router as learning_router
-    app.include_router(learning_router)
-except ImportError as e:
-    print(f"[WARN] Autonomous learning API disabled: {e}")
-
+# Distributed tracing: a server span per request, continued through the
+# message bus, trigger mesh, HTM and LLM calls (GRACE_TRACING=0 disables)
+TRACING_ENABLED = os.getenv("GRACE_TRACING", "1") == "1"
+if TRACING_ENABLED:
+    from backend.observability.instrumentation import TracingMiddleware
+    app.add_middleware(TracingMiddleware)
+
+# Register core routers with resilience (see backend/routes/router_registry.py).
+# Declaration order is route precedence; with GRACE_ROUTER_LOADING=lazy each
+# module is imported on the first request it serves (or by the warm-up task).
+# `requires` names what startup_unified_llm initializes in the full profile;
+# minimal-profile workers run it on the first request that needs it instead.
+WORLD_MODEL_INIT = "backend.world_model:initialize_world_model"
+DOMAIN_SYSTEM_INIT = "backend.domains:initialize_domain_system"
+INFRASTRUCTURE_INIT = "backend.infrastructure:initialize_infrastructure"
+router_registry.declare("Operator dashboard", "backend.routes.operator_dashboard")
+router_registry.declare("Remote access", "backend.routes.remote_access_api")
+router_registry.declare("Autonomous learning API", "backend.routes.autonomous_learning_api")
 # Register Learning API (Phase 3 - Gap Detection)
-try:
-    from backend.routes.learning_api import router as learning_api_router
-    app.include_router(learning_api_router)
-except ImportError as e:
-    print(f"[WARN] Learning API disabled: {e}")
-
+router_registry.declare("Learning API", "backend.routes.learning_api")
 # Register Learning Hub API (Phase 3 - Unified Dashboard)
-try:
-    from backend.routes.learning_hub_api import router as learning_hub_router
-    app.include_router(learning_hub_router)
-except ImportError as e:
-    print(f"[WARN] Learning Hub API disabled: {e}")
-
+router_registry.declare("Learning Hub API", "backend.routes.learning_hub_api")
 # Register Mentor API (Local model roundtables)
-try:
-    from backend.routes.mentor_api import router as mentor_router
-    app.include_router(mentor_router)
-except ImportError as e:
-    print(f"[WARN] Mentor API disabled: {e}")
-
+router_registry.declare("Mentor API", "backend.routes.mentor_api")
 # Register Task Registry API (Unified task tracking across all subsystems)
-try:
-    from backend.routes.task_registry_api import router as task_registry_router
-    app.include_router(task_registry_router)
-except ImportError as e:
-    print(f"[WARN] Task Registry API disabled: {e}")
-
+router_registry.declare("Task Registry API", "backend.routes.task_registry_api")
 # Register Copilot API (Phase 4 - Interactive AI Assistant)
-try:
-    from backend.routes.copilot_api import router as copilot_router
-    app.include_router(copilot_router)
-except ImportError as e:
-    print(f"[WARN] Copilot API disabled: {e}")
-
+router_registry.declare("Copilot API", "backend.routes.copilot_api")
 # Register Copilot Pipeline API (Phase 4 - Autonomous Coding Pipeline)
-try:
-    from backend.routes.copilot_pipeline_api import router as copilot_pipeline_router
-    app.include_router(copilot_pipeline_router)
-except ImportError as e:
-    print(f"[WARN] Copilot Pipeline API disabled: {e}")
-
-try:
-    from backend.routes.mission_control_api import router as mission_control_router
-    app.include_router(mission_control_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Mission control disabled: {e}")
-
-try:
-    from backend.routes.cleanup_api import router as cleanup_router
-    app.include_router(cleanup_router)
-except ImportError as e:
-    print(f"[WARN] Cleanup API disabled: {e}")
-
-try:
-    from backend.routes.unified_status_api import router as unified_status_router
-    app.include_router(unified_status_router)
-except ImportError as e:
-    print(f"[WARN] Unified Status API disabled: {e}")
-
-try:
-    from backend.routes.auth import router as auth_router
-    app.include_router(auth_router)
-except ImportError as e:
-    print(f"[WARN] Auth routes disabled: {e}")
-
-try:
-    from backend.routes.port_manager_api import router as port_manager_router
-    app.include_router(port_manager_router)
-except ImportError as e:
-    print(f"[WARN] Port manager disabled: {e}")
-
-try:
-    from backend.routes.guardian_api import router as guardian_router
-    app.include_router(guardian_router)
-except ImportError as e:
-    print(f"[WARN] Guardian API disabled: {e}")
-
-try:
-    from backend.routes.chat_api import router as chat_router
-    app.include_router(chat_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Chat API disabled: {e}")
-
-try:
-    from backend.routes.unified_chat_api import router as unified_chat_router
-    app.include_router(unified_chat_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Unified Chat API disabled: {e}")
-
-try:
-    from backend.routes.metrics_api import router as metrics_router
-    app.include_router(metrics_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Metrics API disabled: {e}")
-
-try:
-    from backend.routes.governance_api import router as governance_router
-    app.include_router(governance_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Governance API disabled: {e}")
-
-try:
-    from backend.routes.voice_api import router as voice_router
-    app.include_router(voice_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Voice API disabled: {e}")
-
-try:
-    from backend.routes.voice_stream_api import router as voice_stream_router
-    app.include_router(voice_stream_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Voice Stream API disabled: {e}")
-
-try:
-    from backend.routes.vision_api import router as vision_router
-    app.include_router(vision_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Vision API disabled: {e}")
-
-try:
-    from backend.routes.remote_cockpit_api import router as remote_cockpit_router
-    app.include_router(remote_cockpit_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Remote Cockpit API disabled: {e}")
-
-try:
-    from backend.routes.notifications_api import router as notifications_router
-    app.include_router(notifications_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Notifications API disabled: {e}")
-
-try:
-    from backend.api.guardian_stats import router as guardian_stats_router
-    app.include_router(guardian_stats_router)
-except ImportError as e:
-    print(f"[WARN] Guardian Stats API disabled: {e}")
-
-try:
-    from backend.routes.learning_visibility_api import router as learning_visibility_router
-    app.include_router(learning_visibility_router)
-except ImportError as e:
-    print(f"[WARN] Learning visibility disabled: {e}")
-
-try:
-    from backend.routes import (
-    chat as chat_router_v2, metrics as metrics_router_v2, reflections as reflections_router, tasks as tasks_router_v2, history as history_router, causal as causal_router, goals as goals_router, knowledge as knowledge_router,
-    evaluation as evaluation_router, summaries as summaries_router, sandbox as sandbox_router, executor as executor_router, governance as governance_router_v2, hunter as hunter_router, memory_api as memory_api_router_v2,
-    guardian_api as guardian_api_router_v2, learning_api as learning_api_router_v2, coding_pipeline_api as coding_pipeline_api_router, enterprise_api as enterprise_api_router, health_routes as health_routes_router,
-    execution as execution_router, temporal_api as temporal_api_router, causal_graph_api as causal_graph_api_router, speech_api as speech_api_router, parliament_api as parliament_api_router,
-    coding_agent_api as coding_agent_api_router, constitutional_api as constitutional_api_router, book_dashboard as book_dashboard_router, file_organizer_api as file_organizer_api_router,
-    builder_api as builder_api_router, orchestrator_api as orchestrator_api_router, models_api as models_api_router  # New AGI APIs
-)
-    app.include_router(chat_router_v2)
-    app.include_router(metrics_router_v2)
-    app.include_router(reflections_router)
-    app.include_router(tasks_router_v2)
-    app.include_router(history_router)
-    app.include_router(causal_router)
-    app.include_router(goals_router)
-    app.include_router(knowledge_router)
-    app.include_router(evaluation_router)
-    app.include_router(summaries_router)
-    app.include_router(sandbox_router)
-    app.include_router(executor_router)
-    app.include_router(governance_router_v2)
-    app.include_router(hunter_router)
-    app.include_router(memory_api_router_v2)
-    app.include_router(guardian_api_router_v2)
-    app.include_router(learning_api_router_v2)
-    app.include_router(coding_pipeline_api_router)
-    app.include_router(enterprise_api_router)
-    app.include_router(health_routes_router)
-    app.include_router(execution_router)
-    app.include_router(temporal_api_router)
-    app.include_router(causal_graph_api_router)
-    app.include_router(speech_api_router)
-    app.include_router(parliament_api_router)
-    app.include_router(coding_agent_api_router)
-    app.include_router(constitutional_api_router)
-    app.include_router(book_dashboard_router)
-    app.include_router(file_organizer_api_router)
-    app.include_router(builder_api_router)
-    app.include_router(orchestrator_api_router)
-    app.include_router(models_api_router)
-except ImportError as e:
-    print(f"[WARN] AGI API routers disabled: {e}")
-
-try:
-    from backend.routes.ingest import router as ingest_router
-    app.include_router(ingest_router)
-except ImportError as e:
-    print(f"[WARN] Ingestion API disabled: {e}")
-
+router_registry.declare("Copilot Pipeline API", "backend.routes.copilot_pipeline_api")
+router_registry.declare("Mission control", "backend.routes.mission_control_api", prefix="/api")
+router_registry.declare("Cleanup API", "backend.routes.cleanup_api")
+router_registry.declare("Unified Status API", "backend.routes.unified_status_api")
+router_registry.declare("Auth routes", "backend.routes.auth")
+router_registry.declare("Port manager", "backend.routes.port_manager_api")
+router_registry.declare("Guardian API", "backend.routes.guardian_api")
+router_registry.declare("Chat API", "backend.routes.chat_api", prefix="/api", requires=[WORLD_MODEL_INIT])
+router_registry.declare("Unified Chat API", "backend.routes.unified_chat_api", prefix="/api")
+router_registry.declare("Metrics API", "backend.routes.metrics_api", prefix="/api")
+router_registry.declare("Governance API", "backend.routes.governance_api", prefix="/api")
+router_registry.declare("Voice API", "backend.routes.voice_api", prefix="/api")
+router_registry.declare("Voice Stream API", "backend.routes.voice_stream_api", prefix="/api")
+router_registry.declare("Vision API", "backend.routes.vision_api", prefix="/api")
+router_registry.declare("Remote Cockpit API", "backend.routes.remote_cockpit_api", prefix="/api")
+router_registry.declare("Notifications API", "backend.routes.notifications_api", prefix="/api")
+router_registry.declare("Guardian Stats API", "backend.api.guardian_stats")
+router_registry.declare("Learning visibility", "backend.routes.learning_visibility_api")
+router_registry.declare("AGI API routers", [
+    "backend.routes.chat", "backend.routes.metrics", "backend.routes.reflections", "backend.routes.tasks",
+    "backend.routes.history", "backend.routes.causal", "backend.routes.goals", "backend.routes.knowledge",
+    "backend.routes.evaluation", "backend.routes.summaries", "backend.routes.sandbox", "backend.routes.executor",
+    "backend.routes.governance", "backend.routes.hunter", "backend.routes.memory_api", "backend.routes.guardian_api",
+    "backend.routes.learning_api", "backend.routes.coding_pipeline_api", "backend.routes.enterprise_api", "backend.routes.health_routes",
+    "backend.routes.execution", "backend.routes.temporal_api", "backend.routes.causal_graph_api", "backend.routes.speech_api",
+    "backend.routes.parliament_api", "backend.routes.coding_agent_api", "backend.routes.constitutional_api", "backend.routes.book_dashboard",
+    "backend.routes.file_organizer_api", "backend.routes.builder_api", "backend.routes.orchestrator_api", "backend.routes.models_api",
+])
+router_registry.declare("Ingestion API", "backend.routes.ingest")
 # Register Ingestion API (file stats and management)
-try:
-    from backend.routes.ingestion_api import router as ingestion_router
-    app.include_router(ingestion_router)
-except ImportError as e:
-    print(f"[WARN] Ingestion API disabled: {e}")
-
+router_registry.declare("Ingestion API", "backend.routes.ingestion_api")
 # Register Self-Healing API
-try:
-    from backend.routes.self_healing_api import router as self_healing_router
-    app.include_router(self_healing_router)
-except ImportError as e:
-    print(f"[WARN] Self-Healing API disabled: {e}")
-
+router_registry.declare("Self-Healing API", "backend.routes.self_healing_api")
 # Register Comprehensive API (all panels data)
-try:
-    from backend.routes.comprehensive_api import router as comprehensive_router
-    app.include_router(comprehensive_router)
-except ImportError as e:
-    print(f"[WARN] Comprehensive API disabled: {e}")
-
-try:
-    from backend.routes.vault_api import router as vault_router
-    app.include_router(vault_router)
-except ImportError as e:
-    print(f"[WARN] Vault API disabled: {e}")
-
-try:
-    from backend.routes.memory_api import router as memory_router
-    app.include_router(memory_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Memory API disabled: {e}")
-
+router_registry.declare("Comprehensive API", "backend.routes.comprehensive_api")
+router_registry.declare("Vault API", "backend.routes.vault_api")
+router_registry.declare("Memory API", "backend.routes.memory_api", prefix="/api")
 # Register Memory Files API (file browser & operations)
-try:
-    from backend.routes.memory_files_api import router as memory_files_router
-    app.include_router(memory_files_router)
-except ImportError as e:
-    print(f"[WARN] Memory Files API disabled: {e}")
-
-try:
-    from backend.routes.remote_api import router as remote_api_router
-    app.include_router(remote_api_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Remote API disabled: {e}")
-
-try:
-    from backend.routes.screen_share_api import router as screen_share_router
-    app.include_router(screen_share_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Screen Share API disabled: {e}")
-
-try:
-    from backend.routes.tasks_api import router as tasks_router
-    app.include_router(tasks_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Tasks API disabled: {e}")
-
-try:
-    from backend.routes.cockpit_api import router as cockpit_router
-    app.include_router(cockpit_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Cockpit API disabled: {e}")
-
-try:
-    from backend.routes.learning_query_api import router as learning_query_router
-    app.include_router(learning_query_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Learning Query API disabled: {e}")
-
-try:
-    from backend.routes.reminders_api import router as reminders_router
-    app.include_router(reminders_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Reminders API disabled: {e}")
-
-try:
-    from backend.routes.background_tasks_api import router as background_tasks_router
-    app.include_router(background_tasks_router, prefix="/api")
-except ImportError as e:
-    print(f"[WARN] Background Tasks API disabled: {e}")
-
-try:
-    from backend.routes.chat import router as chat_router
-    app.include_router(chat_router)
-except ImportError as e:
-    print(f"[WARN] Chat API disabled: {e}")
-
-try:
-    from backend.routes.learning_control_api import router as learning_control_router
-    app.include_router(learning_control_router)
-except ImportError as e:
-    print(f"[WARN] Learning control disabled: {e}")
-
-try:
-    from backend.routes.agentic_api import router as agentic_router
-    app.include_router(agentic_router)
-except ImportError as e:
-    print(f"[WARN] Agentic API disabled: {e}")
-
-try:
-    from backend.routes.chaos_api import router as chaos_router
-    app.include_router(chaos_router)
-except ImportError as e:
-    print(f"[WARN] Chaos API disabled: {e}")
-
+router_registry.declare("Memory Files API", "backend.routes.memory_files_api")
+router_registry.declare("Remote API", "backend.routes.remote_api", prefix="/api")
+router_registry.declare("Screen Share API", "backend.routes.screen_share_api", prefix="/api")
+router_registry.declare("Tasks API", "backend.routes.tasks_api", prefix="/api")
+router_registry.declare("Cockpit API", "backend.routes.cockpit_api", prefix="/api")
+router_registry.declare("Learning Query API", "backend.routes.learning_query_api", prefix="/api")
+router_registry.declare("Reminders API", "backend.routes.reminders_api", prefix="/api")
+router_registry.declare("Background Tasks API", "backend.routes.background_tasks_api", prefix="/api")
+router_registry.declare("Chat API", "backend.routes.chat")
+router_registry.declare("Learning control", "backend.routes.learning_control_api")
+router_registry.declare("Agentic API", "backend.routes.agentic_api")
+router_registry.declare("Chaos API", "backend.routes.chaos_api")
 # Register Elite Systems API (Elite Self-Healing & Coding Agent)
-try:
-    from backend.routes.elite_systems_api import router as elite_systems_router
-    app.include_router(elite_systems_router)
-except ImportError as e:
-    print(f"[WARN] Elite Systems API disabled: {e}")
-
+router_registry.declare("Elite Systems API", "backend.routes.elite_systems_api")
 # Register autonomous web learning (NEW - unrestricted internet access)
-try:
-    from backend.routes.autonomous_web_learning import router as web_learning_router
-    app.include_router(web_learning_router)
-except ImportError:
-    pass  # Web learning optional
-
+router_registry.declare("Web learning", "backend.routes.autonomous_web_learning", quiet=True)
 # Register proactive learning API (Always-on autonomous learning)
-try:
-    from backend.routes.proactive_learning_api import router as proactive_learning_router
-    app.include_router(proactive_learning_router)
-    print("[OK] Proactive Learning API registered (Always-on autonomous learning)")
-except ImportError as e:
-    print(f"[WARN] Proactive Learning API disabled: {e}")
-
+router_registry.declare("Proactive Learning API", "backend.routes.proactive_learning_api", ok_message="Proactive Learning API registered (Always-on autonomous learning)")
 # Register snapshot management API (Boot snapshots with 3-retention policy)
-try:
-    from backend.routes.snapshot_api import router as snapshot_router
-    app.include_router(snapshot_router)
-    print("[OK] Snapshot API registered (Boot rollback capability)")
-except ImportError as e:
-    print(f"[WARN] Snapshot API disabled: {e}")
-
+router_registry.declare("Snapshot API", "backend.routes.snapshot_api", ok_message="Snapshot API registered (Boot rollback capability)")
 # Register autonomous web navigator (Grace's decision-making for web searches)
-try:
-    from backend.routes.autonomous_navigator_api import router as navigator_router
-    app.include_router(navigator_router)
-except ImportError:
-    pass  # Navigator optional
-
+router_registry.declare("Navigator", "backend.routes.autonomous_navigator_api", quiet=True)
 # Register future projects learning (proactive domain mastery)
-try:
-    from backend.routes.future_projects_api import router as future_projects_router
-    app.include_router(future_projects_router)
-except ImportError:
-    pass  # Future projects optional
-
+router_registry.declare("Future projects", "backend.routes.future_projects_api", quiet=True)
 # Register storage tracking (monitor TB of learning data)
-try:
-    from backend.routes.storage_api import router as storage_router
-    from backend.routes.session_management_api import router as session_mgmt_router
-    app.include_router(storage_router)
-    app.include_router(session_mgmt_router)
-except ImportError:
-    pass  # Storage tracking optional
-
+router_registry.declare("Storage tracking", ["backend.routes.storage_api", "backend.routes.session_management_api"], quiet=True)
 # Register competitor tracking (monitor competitor campaigns)
-try:
-    from backend.routes.competitor_api import router as competitor_router
-    app.include_router(competitor_router)
-except ImportError:
-    pass  # Competitor tracking optional
-
+router_registry.declare("Competitor tracking", "backend.routes.competitor_api", quiet=True)
 # Register crypto trading APIs
-try:
-    from backend.routes.crypto_api import router as crypto_router
-    app.include_router(crypto_router)
-except ImportError:
-    pass  # Crypto APIs optional
-
+router_registry.declare("Crypto APIs", "backend.routes.crypto_api", quiet=True)
 # Register SaaS builder (autonomous SaaS app builder)
-try:
-    from backend.routes.saas_builder_api import router as saas_builder_router
-    app.include_router(saas_builder_router)
-except ImportError:
-    pass  # SaaS builder optional
-
+router_registry.declare("SaaS builder", "backend.routes.saas_builder_api", quiet=True)
 # Register curriculum orchestrator API
-try:
-    from backend.routes.curriculum_api import router as curriculum_router
-    app.include_router(curriculum_router)
-except ImportError:
-    pass  # Curriculum API optional
-
+router_registry.declare("Curriculum API", "backend.routes.curriculum_api", quiet=True)
 # Register Console UI APIs (NEW - for Unified Console)
-try:
-    from backend.routes.logs_api import router as logs_router
-    from backend.routes.console_api import router as console_router
-    app.include_router(logs_router)
-    app.include_router(console_router)
-except ImportError:
-    pass  # Console APIs optional
-
+router_registry.declare("Console APIs", ["backend.routes.logs_api", "backend.routes.console_api"], quiet=True)
 # Register TRUST framework API
-try:
-    from backend.routes.trust_framework_api import router as trust_router
-    app.include_router(trust_router)
-except ImportError:
-    pass  # TRUST framework routes not critical for basic operation
-
+router_registry.declare("TRUST framework", "backend.routes.trust_framework_api", quiet=True)
 # Register Domain System (NEW - Synergistic Architecture)
-try:
-    from backend.routes.domain_system_api import router as domain_system_router
-    app.include_router(domain_system_router)
-except ImportError:
-    pass  # Domain system optional for now
-
+router_registry.declare("Domain system", "backend.routes.domain_system_api", quiet=True, requires=[DOMAIN_SYSTEM_INIT])
 # Register Infrastructure Layer (NEW - Service Mesh, Gateway, Load Balancer, Discovery)
-try:
-    from backend.routes.infrastructure_api import router as infrastructure_router
-    app.include_router(infrastructure_router)
-except ImportError:
-    pass  # Infrastructure layer optional for now
-
+router_registry.declare("Infrastructure layer", "backend.routes.infrastructure_api", quiet=True, requires=[INFRASTRUCTURE_INIT])
 # Register World Model (NEW - Grace's internal knowledge with RAG + MCP)
-try:
-    from backend.routes.world_model_api import router as world_model_router
-    app.include_router(world_model_router)
-except ImportError:
-    pass  # World model optional for now
-
+router_registry.declare("World model", "backend.routes.world_model_api", quiet=True, requires=[WORLD_MODEL_INIT])
 # Register World Model Hub (NEW - Phase 1: Unified command center)
-try:
-    from backend.routes.world_model_hub_api import router as world_model_hub_router
-    app.include_router(world_model_hub_router)
-except ImportError:
-    pass  # World Model Hub optional for now
-
+router_registry.declare("World Model Hub", "backend.routes.world_model_hub_api", quiet=True, requires=[WORLD_MODEL_INIT])
 # Add vector API router
-try:
-    from backend.routes.vector_api import router as vector_router
-    app.include_router(vector_router)
-    print("[OK] Vector API routes loaded")
-except Exception as e:
-    print(f"[WARN] Vector API disabled: {e}")
-
+router_registry.declare("Vector API", "backend.routes.vector_api", ok_message="Vector API routes loaded")
 # Register Phase 6 API (Enterprise API Management & Scale)
-try:
-    from backend.routes.phase6_api import router as phase6_router
-    app.include_router(phase6_router)
-except ImportError as e:
-    print(f"[WARN] Phase 6 API disabled: {e}")
-
+router_registry.declare("Phase 6 API", "backend.routes.phase6_api")
 # Register Phase 7 API (SaaS Readiness & Business Workflows)
-try:
-    from backend.routes.phase7_api import router as phase7_router
-    app.include_router(phase7_router)
-except ImportError as e:
-    print(f"[WARN] Phase 7 API disabled: {e}")
-
+router_registry.declare("Phase 7 API", "backend.routes.phase7_api")
 # Register Phase 8 API (E2E Testing & Production Readiness)
-try:
-    from backend.routes.phase8_api import router as phase8_router
-    app.include_router(phase8_router)
-except ImportError as e:
-    print(f"[WARN] Phase 8 API disabled: {e}")
-
+router_registry.declare("Phase 8 API", "backend.routes.phase8_api")
 # Register Books API
-try:
-    from backend.routes.book_dashboard import router as books_router
-    app.include_router(books_router, prefix="/api/books")
-except ImportError as e:
-    print(f"[WARN] Books API disabled: {e}")
-
+router_registry.declare("Books API", "backend.routes.book_dashboard", prefix="/api/books")
 # Register Librarian API
-try:
-    from backend.routes.librarian_api import router as librarian_router
-    app.include_router(librarian_router)
-except ImportError as e:
-    print(f"[WARN] Librarian API disabled: {e}")
-
+router_registry.declare("Librarian API", "backend.routes.librarian_api")
 # Register Metrics API
-try:
-    from backend.routes.metrics_api import router as metrics_router
-    app.include_router(metrics_router)
-except ImportError as e:
-    print(f"[WARN] Metrics API disabled: {e}")
-
+router_registry.declare("Metrics API", "backend.routes.metrics_api")
 # Register Developer API (Senior Dev Mode - Full-Stack Software Development)
-try:
-    from backend.routes.developer_api import router as developer_router
-    app.include_router(developer_router)
-    print("[OK] Developer API registered (Senior Dev Mode with approval gates)")
-except ImportError as e:
-    print(f"[WARN] Developer API disabled: {e}")
-
+router_registry.declare("Developer API", "backend.routes.developer_api", ok_message="Developer API registered (Senior Dev Mode with approval gates)")
 # Register Health Monitoring APIs (Google Search health disabled - quota exhausted)
-try:
-    from backend.routes.remote_health_api import router as remote_health_router
-    app.include_router(remote_health_router)
-    print("[OK] Health monitoring APIs registered (remote)")
-except ImportError as e:
-    print(f"[WARN] Health monitoring APIs disabled: {e}")
+router_registry.declare("Health monitoring APIs", "backend.routes.remote_health_api", ok_message="Health monitoring APIs registered (remote)")
+
+router_registry.mount(app, lazy=ROUTER_LOADING == "lazy", init_requirements=APP_PROFILE != "full")
 
 @app.get("/health")
 async def health_check():
@@ -550,6 +199,114 @@ async def root():
     return resp
 
 @app.on_event("startup")
+async def startup_router_warmup():
+    """Load deferred routers in the background once the server is accepting requests"""
+    router_registry.start_warmup()
+
+@app.on_event("shutdown")
+async def shutdown_router_warmup():
+    await router_registry.stop_warmup()
+
+@app.on_event("shutdown")
+async def shutdown_immutable_log():
+    """Commit audit entries still queued in the immutable log's batch writer"""
+    module = sys.modules.get("backend.logging_system.immutable_log")
+    if module is not None:
+        await module.immutable_log.stop()
+
+@app.on_event("shutdown")
+async def shutdown_learning_jobs():
+    """Stop learning job workers and close the web crawler session"""
+    module = sys.modules.get("backend.learning_systems.governed_web_learning")
+    if module is not None:
+        await module.learning_job_orchestrator.shutdown()
+
+@app.get("/api/system/routers")
+async def system_routers():
+    """Router load state, import cost and worker profile"""
+    return {"profile": APP_PROFILE, **router_registry.get_status()}
+
+@app.get("/api/system/import-profile")
+async def system_import_profile(top: int = 25, prefix: Optional[str] = None):
+    """Per-module import cost (requires GRACE_IMPORT_PROFILE=1)"""
+    from backend.observability.import_profiler import import_profiler
+    
+    if not import_profiler.installed and not import_profiler.records:
+        return {"enabled": False, "hint": "Start the API with GRACE_IMPORT_PROFILE=1"}
+    return import_profiler.get_report(top=top, prefix=prefix)
+
+@app.on_event("startup")
+async def startup_tracing():
+    """Instrument DB/httpx clients and start the batched span exporter"""
+    if not TRACING_ENABLED:
+        return
+    from backend.observability.instrumentation import instrument_sqlalchemy, instrument_httpx
+    from backend.observability.trace_export import trace_exporter
+    
+    instrument_sqlalchemy()
+    instrument_httpx()
+    await trace_exporter.start()
+
+@app.on_event("shutdown")
+async def shutdown_tracing():
+    if TRACING_ENABLED:
+        from backend.observability.trace_export import trace_exporter
+        await trace_exporter.stop()
+
+@app.get("/api/system/tracing")
+async def system_tracing():
+    """Sampling/export counters and the most recent kept traces"""
+    from backend.observability.tracing import request_tracer
+    return {"enabled": TRACING_ENABLED, **request_tracer.get_stats()}
+
+@app.on_event("startup")
+async def startup_loop_profiler():
+    """Sample the event loop from boot when GRACE_LOOP_PROFILE=1"""
+    if os.getenv("GRACE_LOOP_PROFILE", "0") == "1":
+        from backend.observability.loop_profiler import loop_profiler
+        from backend.observability.tracing import request_tracer
+        loop_profiler.attach_tracer(request_tracer)
+        loop_profiler.start(
+            hz=int(os.getenv("GRACE_LOOP_PROFILE_HZ", "100")),
+            stall_threshold_ms=float(os.getenv("GRACE_LOOP_STALL_MS", "100")),
+        )
+
+@app.on_event("shutdown")
+async def shutdown_loop_profiler():
+    from backend.observability.loop_profiler import loop_profiler
+    loop_profiler.stop()
+
+@app.get("/api/system/loop-profile")
+async def system_loop_profile(top: int = 25):
+    """Event-loop time per subsystem/task/span and recent stalls"""
+    from backend.observability.loop_profiler import loop_profiler
+    return loop_profiler.get_report(top=top)
+
+@app.post("/api/system/loop-profile/start")
+async def system_loop_profile_start(hz: int = 100, stall_ms: float = 100.0, reset: bool = False):
+    """Start the sampling profiler at runtime"""
+    from backend.observability.loop_profiler import loop_profiler
+    from backend.observability.tracing import request_tracer
+    loop_profiler.attach_tracer(request_tracer)
+    if reset:
+        loop_profiler.reset()
+    loop_profiler.start(hz=hz, stall_threshold_ms=stall_ms)
+    return {"running": loop_profiler.running, "hz": loop_profiler.hz, "stall_threshold_ms": loop_profiler.stall_threshold_ms}
+
+@app.post("/api/system/loop-profile/stop")
+async def system_loop_profile_stop():
+    from backend.observability.loop_profiler import loop_profiler
+    loop_profiler.stop()
+    return {"running": loop_profiler.running, "samples": loop_profiler.get_report(top=0)["samples"]}
+
+@app.get("/api/system/loop-profile/flamegraph", response_class=PlainTextResponse)
+async def system_loop_profile_flamegraph(subsystem: Optional[str] = None):
+    """Collapsed stacks - pipe into flamegraph.pl or load in speedscope"""
+    from backend.observability.loop_profiler import loop_profiler
+    return PlainTextResponse(loop_profiler.export_collapsed(subsystem=subsystem))
+
+@app.on_event("startup")
+@full_profile_only
 async def startup_unified_llm():
     """Initialize unified LLM and model capability system in non-fatal way"""
     try:
@@ -657,6 +414,7 @@ async def startup_agentic_organism():
         traceback.print_exc()
 
 @app.on_event("startup")
+@full_profile_only
 async def startup_ingestion_pipeline():
     """Initialize auto-ingestion pipeline"""
     try:
@@ -667,6 +425,7 @@ async def startup_ingestion_pipeline():
         print(f"[WARN] Auto-ingestion pipeline initialization failed: {e}")
 
 @app.on_event("startup")
+@full_profile_only
 async def startup_reminder_service():
     """Start reminder service background checker"""
     try:
@@ -678,6 +437,7 @@ async def startup_reminder_service():
         print(f"[WARN] Reminder service initialization failed: {e}")
 
 @app.on_event("startup")
+@full_profile_only
 async def startup_guardian_metrics():
     """Start Guardian metrics publisher"""
     # Skip background jobs in CI/test environments
@@ -696,6 +456,7 @@ async def startup_guardian_metrics():
         print(f"[WARN] Guardian metrics auto-publish disabled: {e}")
 
 @app.on_event("startup")
+@full_profile_only
 async def startup_chaos_agent():
     """Start Chaos Agent (controlled mode)"""
     try:
@@ -713,6 +474,7 @@ async def startup_chaos_agent():
         print(f"[WARN] Chaos Agent initialization degraded: {e}")
 
 @app.on_event("startup")
+@full_profile_only
 async def startup_advanced_learning():
     """Starts the advanced learning supervisor and its sub-agents."""
     # Skip background jobs in CI/test environments
@@ -1154,6 +916,75 @@ async def models_available():
         "recommendation": "Install: ollama pull qwen2.5:32b && ollama pull deepseek-coder-v2:16b"
     }
 
+@app.post("/api/models/chat/stream")
+async def models_chat_stream(request: dict):
+    """
+    Stream a chat response as Server-Sent Events.
+    Each event is a JSON object: token chunks, then a final "done" event.
+    """
+    import json
+    from fastapi.responses import StreamingResponse
+    from backend.unified_llm import unified_llm
+    
+    async def event_source():
+        async for event in unified_llm.stream_chat(
+            message=request.get("message", ""),
+            context=request.get("context"),
+            use_memory=request.get("use_memory", True)
+        ):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+@app.websocket("/ws/models/chat")
+async def models_chat_websocket(websocket: WebSocket):
+    """WebSocket variant of the streaming chat: one JSON request in, token events out"""
+    from fastapi import WebSocketDisconnect
+    from backend.unified_llm import unified_llm
+    
+    await websocket.accept()
+    try:
+        while True:
+            request = await websocket.receive_json()
+            async for event in unified_llm.stream_chat(
+                message=request.get("message", ""),
+                context=request.get("context"),
+                use_memory=request.get("use_memory", True)
+            ):
+                await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+
+@app.on_event("shutdown")
+async def shutdown_model_clients():
+    """Close the pooled Ollama HTTP client"""
+    from backend.model_orchestrator import model_orchestrator
+    
+    await model_orchestrator.aclose()
+
+@app.get("/api/models/cache/stats")
+async def models_cache_stats():
+    """LLM response cache size and hit-rate metrics"""
+    from backend.services.llm_response_cache import llm_response_cache
+    
+    return llm_response_cache.get_stats()
+
+@app.post("/api/models/cache/clear")
+async def models_cache_clear():
+    """Drop all cached LLM responses"""
+    from backend.services.llm_response_cache import llm_response_cache
+    
+    llm_response_cache.clear()
+    return {"success": True, "stats": llm_response_cache.get_stats()}
+
 @app.get("/api/models/performance")
 async def models_performance():
     """Grace's learned insights about model performance"""
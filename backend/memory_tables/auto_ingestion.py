@@ -245,11 +245,11 @@ class AutoIngestionService:
         row_data['notes'] = f"Auto-ingested on {datetime.now().isoformat()}"
         row_data['ingestion_pipeline_id'] = f"auto_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        # Insert
-        inserted = self.registry.insert_row(table_name, row_data)
+        # Upsert off the event loop (re-ingesting a changed file updates its row)
+        written = await self.registry.upsert_rows_async(table_name, [row_data])
         
-        if inserted:
-            logger.info(f"✅ Inserted row into {table_name}: {inserted.id}")
+        if written:
+            logger.info(f"✅ Upserted row into {table_name}: {file_path}")
         else:
             raise Exception(f"Failed to insert row into {table_name}")
     
@@ -285,7 +285,7 @@ class AutoIngestionService:
                 'tags': ['failed_ingestion', 'auto_ingest']
             }
             
-            self.registry.insert_row('memory_insights', row_data)
+            await self.registry.insert_rows_async('memory_insights', [row_data])
             
         except Exception as e:
             logger.error(f"Could not log failed ingestion: {e}")
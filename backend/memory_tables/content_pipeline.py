@@ -4,6 +4,7 @@ Content Analysis Pipeline
 Extracts features from files for schema inference and table population
 """
 
+import asyncio
 import logging
 from pathlib import Path
 from typing import Dict, Any
@@ -231,59 +232,29 @@ class DatasetExtractor:
         
         ext = file_path.suffix.lower()
         
-        if ext == '.csv':
+        if ext in ('.csv', '.tsv'):
             features.update(await self._extract_csv(file_path))
-        elif ext == '.json':
+        elif ext in ('.json', '.jsonl'):
             features.update(await self._extract_json(file_path))
         
         return features
     
     async def _extract_csv(self, file_path: Path) -> Dict[str, Any]:
-        """Extract from CSV files"""
+        """Extract from CSV/TSV files (streamed - bounded memory for any size)"""
         try:
-            import csv
+            from backend.memory_tables.dataset_profiler import dataset_profiler
             
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-                
-                if not rows:
-                    return {}
-                
-                # Assume first row is headers
-                headers = rows[0]
-                data_rows = rows[1:]
-                
-                return {
-                    'rows': len(data_rows),
-                    'columns': len(headers),
-                    'column_names': headers,
-                    'has_headers': True,
-                    'sample_data': data_rows[:5]
-                }
+            return await asyncio.to_thread(dataset_profiler.profile, file_path)
         except Exception as e:
             logger.error(f"CSV extraction failed: {e}")
             return {}
     
     async def _extract_json(self, file_path: Path) -> Dict[str, Any]:
-        """Extract from JSON files"""
+        """Extract from JSON arrays / JSONL files (decoded incrementally)"""
         try:
-            import json
+            from backend.memory_tables.dataset_profiler import dataset_profiler
             
-            data = json.loads(file_path.read_text(encoding='utf-8'))
-            
-            if isinstance(data, list):
-                rows = len(data)
-                if data and isinstance(data[0], dict):
-                    columns = list(data[0].keys())
-                    return {
-                        'rows': rows,
-                        'columns': len(columns),
-                        'column_names': columns,
-                        'sample_data': data[:5]
-                    }
-            
-            return {'format': 'json', 'rows': 1}
+            return await asyncio.to_thread(dataset_profiler.profile, file_path)
         except Exception as e:
             logger.error(f"JSON extraction failed: {e}")
             return {}
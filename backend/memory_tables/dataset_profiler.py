@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Streaming Dataset Profiler
+Bounded-memory profiling of CSV/TSV, JSON and JSONL files
+
+One pass over the file:
+- row count from a buffered newline scan (exact rows when the parse pass
+  reaches the end of the file)
+- column types inferred from a reservoir sample
+- per-column null rate, HyperLogLog cardinality estimate, min and max
+- JSON arrays decoded element by element, JSONL line by line
+
+Memory stays O(columns x reservoir) regardless of file size.
+"""
+
+import csv
+import json
+import logging
+import math
+import random
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+NULL_TOKENS = {'', 'null', 'NULL', 'Null', 'None', 'none', 'NA', 'N/A', 'n/a', 'nan', 'NaN'}
+BOOL_TOKENS = {'true', 'false', 'True', 'False', 'TRUE', 'FALSE'}
+_READ_CHUNK = 1 << 20
+# A decode that stops this close to the end of the buffer may just be a value cut at the chunk edge
+_EDGE = 8
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count estimator (2^p one-byte registers)"""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+        self._shift = 64 - p
+        self._mask = (1 << self._shift) - 1
+
+    def add(self, value: str):
+        # str hash is SipHash (well mixed) and stable within one process run
+        h = hash(value) & 0xFFFFFFFFFFFFFFFF
+        index = h >> self._shift
+        rank = self._shift - (h & self._mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))  # linear counting
+        return int(round(raw))
+
+
+class Reservoir:
+    """Uniform sample of k items from a stream (Algorithm L: O(1) per skipped item)"""
+
+    def __init__(self, k: int, seed: int = 0):
+        self.k = k
+        self.items: List[Any] = []
+        self.seen = 0
+        self._random = random.Random(seed)
+        self._w = 1.0
+        self._next = 0
+
+    def add(self, item: Any):
+        self.seen += 1
+        if len(self.items) < self.k:
+            self.items.append(item)
+            if len(self.items) == self.k:
+                self._w = math.exp(math.log(self._random.random()) / self.k)
+                self._skip()
+        elif self.seen == self._next:
+            self.items[self._random.randrange(self.k)] = item
+            self._w *= math.exp(math.log(self._random.random()) / self.k)
+            self._skip()
+
+    def _skip(self):
+        gap = math.floor(math.log(self._random.random()) / math.log(1 - self._w)) if self._w < 1 else 0
+        self._next = self.seen + gap + 1
+
+
+def _infer_type(values: List[Any]) -> str:
+    """Narrowest type all sampled non-null values fit"""
+    if not values:
+        return 'unknown'
+    if all(isinstance(v, bool) or (isinstance(v, str) and v in BOOL_TOKENS) for v in values):
+        return 'boolean'
+    if all(isinstance(v, (dict, list)) for v in values):
+        return 'json'
+
+    def _all(parse) -> bool:
+        for v in values:
+            if isinstance(v, (dict, list, bool)):
+                return False
+            try:
+                parse(v)
+            except (TypeError, ValueError):
+                return False
+        return True
+
+    if _all(lambda v: v if isinstance(v, int) else int(v) if isinstance(v, str) else int('x')):
+        return 'integer'
+    if _all(float):
+        return 'float'
+    if _all(lambda v: datetime.fromisoformat(v) if isinstance(v, str) else int('x')):
+        return 'datetime'
+    return 'string'
+
+
+class _Column:
+    __slots__ = ('non_null', 'hll', 'reservoir', 'num_min', 'num_max', 'str_min', 'str_max')
+
+    def __init__(self, reservoir_size: int, hll_precision: int):
+        self.non_null = 0
+        self.hll = HyperLogLog(hll_precision)
+        self.reservoir = Reservoir(reservoir_size)
+        self.num_min = self.num_max = None
+        self.str_min = self.str_max = None
+
+    def add(self, value: Any):
+        if value is None or (isinstance(value, str) and value in NULL_TOKENS):
+            return
+        self.non_null += 1
+        self.reservoir.add(value)
+
+        if isinstance(value, bool):
+            text = 'true' if value else 'false'
+        elif isinstance(value, (int, float)):
+            text = repr(value)
+            self._add_number(value)
+        elif isinstance(value, str):
+            text = value
+            if value[0] in '-+.0123456789':
+                try:
+                    self._add_number(float(value))
+                except ValueError:
+                    pass
+        else:
+            text = json.dumps(value, sort_keys=True, default=str)
+        self.hll.add(text)
+
+        if self.str_min is None or text < self.str_min:
+            self.str_min = text
+        if self.str_max is None or text > self.str_max:
+            self.str_max = text
+
+    def _add_number(self, number: float):
+        if number != number:  # NaN
+            return
+        if self.num_min is None or number < self.num_min:
+            self.num_min = number
+        if self.num_max is None or number > self.num_max:
+            self.num_max = number
+
+    def summary(self, rows: int) -> Dict[str, Any]:
+        column_type = _infer_type(self.reservoir.items)
+        if column_type in ('integer', 'float') and self.num_min is not None:
+            low, high = self.num_min, self.num_max
+            if column_type == 'integer':
+                low, high = int(low), int(high)
+        elif column_type in ('string', 'datetime', 'boolean'):
+            low, high = self.str_min, self.str_max
+        else:
+            low = high = None
+        return {
+            'type': column_type,
+            'null_rate': round(1 - self.non_null / rows, 4) if rows else 0.0,
+            'distinct_estimate': min(self.hll.estimate(), self.non_null),
+            'min': low,
+            'max': high
+        }
+
+
+def count_lines(file_path: Path) -> int:
+    """Newline count via buffered byte scan (counts an unterminated last line)"""
+    lines = 0
+    last = b'\n'
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                break
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    return lines + (0 if last == b'\n' else 1)
+
+
+class _NotJSONArray(ValueError):
+    """The document's top level is not an array"""
+
+
+def iter_json_array(file_path: Path, max_element_chars: int = 64 * _READ_CHUNK) -> Iterator[Any]:
+    """
+    Yield elements of a top-level JSON array without loading the file
+
+    More input is read only when decoding stops at the edge of the buffer
+    (a value cut in half by a chunk boundary). A syntax error anywhere else,
+    a missing closing ']' and an element longer than max_element_chars raise
+    ValueError (json.JSONDecodeError for syntax errors) instead of buffering
+    the rest of the file.
+    """
+    decoder = json.JSONDecoder()
+    skip = re.compile(r'[\s,]*')
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        buffer = f.read(_READ_CHUNK).lstrip('\ufeff \t\r\n')
+        if not buffer.startswith('['):
+            raise _NotJSONArray('not a JSON array')
+        pos = 1
+        eof = False
+        while True:
+            pos = skip.match(buffer, pos).end()
+            if buffer.startswith(']', pos):
+                return
+
+            truncated = pos >= len(buffer)
+            if not truncated:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    # A value ending at the edge may continue (e.g. a number)
+                    truncated = len(buffer) - end <= _EDGE
+                except json.JSONDecodeError as e:
+                    cut = len(buffer) - e.pos <= _EDGE or e.msg.startswith('Unterminated string')
+                    if eof or not cut:
+                        raise
+                    truncated = True
+
+            if truncated and not eof:
+                if len(buffer) - pos > max_element_chars:
+                    raise ValueError(f'JSON array element longer than {max_element_chars} characters')
+                more = f.read(_READ_CHUNK)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+
+            if pos >= len(buffer):
+                raise json.JSONDecodeError('Unterminated array', buffer, pos)
+            yield item
+            pos = end
+
+
+def iter_jsonl(file_path: Path) -> Iterator[Any]:
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+class DatasetProfiler:
+    """
+    Streaming profiler for tabular files
+
+    max_profile_rows caps the per-row stats pass for very large files (None
+    = whole file); the row count still covers the whole file.
+    """
+
+    def __init__(
+        self,
+        reservoir_size: int = 1000,
+        sample_rows: int = 5,
+        hll_precision: int = 12,
+        max_profile_rows: Optional[int] = 2_000_000,
+        max_columns: int = 500
+    ):
+        self.reservoir_size = reservoir_size
+        self.sample_rows = sample_rows
+        self.hll_precision = hll_precision
+        self.max_profile_rows = max_profile_rows
+        self.max_columns = max_columns
+
+    def profile(self, file_path: Path) -> Dict[str, Any]:
+        ext = file_path.suffix.lower()
+        if ext in ('.csv', '.tsv'):
+            return self.profile_csv(file_path, delimiter='\t' if ext == '.tsv' else ',')
+        if ext == '.jsonl':
+            return self._profile_records(iter_jsonl(file_path), file_path, line_rows=True)
+        if ext == '.json':
+            return self.profile_json(file_path)
+        return {}
+
+    def profile_csv(self, file_path: Path, delimiter: str = ',') -> Dict[str, Any]:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            headers = next(reader, None)
+            if headers is None:
+                return {}
+            headers = headers[:self.max_columns]
+            columns = [_Column(self.reservoir_size, self.hll_precision) for _ in headers]
+            width = len(headers)
+            samples = []
+            rows = 0
+            complete = True
+
+            for row in reader:
+                if not row:
+                    continue
+                if self.max_profile_rows is not None and rows >= self.max_profile_rows:
+                    complete = False
+                    break
+                rows += 1
+                if len(samples) < self.sample_rows:
+                    samples.append(row)
+                for column, value in zip(columns, row[:width]):
+                    column.add(value)
+
+        if not complete:
+            # Stats cover the first max_profile_rows; count the rest cheaply
+            rows_total = max(count_lines(file_path) - 1, rows)
+        else:
+            rows_total = rows
+
+        return self._result(headers, columns, rows, rows_total, samples, complete, has_headers=True)
+
+    def profile_json(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Profile a top-level JSON array
+
+        Any other JSON document yields {}; a malformed or truncated array
+        raises ValueError.
+        """
+        try:
+            return self._profile_records(iter_json_array(file_path), file_path, line_rows=False)
+        except _NotJSONArray:
+            return {}
+
+    def _profile_records(self, records: Iterator[Any], file_path: Path, line_rows: bool) -> Dict[str, Any]:
+        columns: Dict[str, _Column] = {}
+        samples = []
+        rows = 0
+        complete = True
+        scalar_rows = 0
+
+        for record in records:
+            if self.max_profile_rows is not None and rows >= self.max_profile_rows:
+                complete = False
+                break
+            rows += 1
+            if len(samples) < self.sample_rows:
+                samples.append(record)
+            if not isinstance(record, dict):
+                scalar_rows += 1
+                continue
+            for key, value in record.items():
+                column = columns.get(key)
+                if column is None:
+                    if len(columns) >= self.max_columns:
+                        continue
+                    column = columns[key] = _Column(self.reservoir_size, self.hll_precision)
+                column.add(value)
+
+        if not complete and line_rows:
+            rows_total = max(count_lines(file_path), rows)
+        else:
+            # JSON arrays have no cheap row delimiter: report what was read
+            rows_total = rows
+
+        result = self._result(list(columns), list(columns.values()), rows, rows_total, samples, complete)
+        if scalar_rows:
+            result['non_object_rows'] = scalar_rows
+        return result
+
+    def _result(self, names, columns, rows, rows_total, samples, complete, has_headers=False) -> Dict[str, Any]:
+        stats = {name: column.summary(rows) for name, column in zip(names, columns)}
+        return {
+            'rows': rows_total,
+            'columns': len(names),
+            'column_names': list(names),
+            'column_types': {name: s['type'] for name, s in stats.items()},
+            'column_stats': stats,
+            'has_headers': has_headers,
+            'sample_data': samples,
+            'profiled_rows': rows,
+            'rows_exact': complete
+        }
+
+
+# Global profiler instance
+dataset_profiler = DatasetProfiler()
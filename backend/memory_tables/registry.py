@@ -5,14 +5,15 @@ Loads YAML schemas and generates SQLModel classes dynamically
 """
 
 import yaml
+import asyncio
 import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Type
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, JSON, insert, update, bindparam
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import uuid
 from sqlmodel import SQLModel, Field, create_engine, Session, select
-from sqlalchemy import Column, JSON
 
 logger = logging.getLogger(__name__)
 
@@ -313,6 +314,227 @@ class SchemaRegistry:
             logger.error(f"Failed to update row in {table_name}: {e}")
             return False
     
+    # ------------------------------------------------------------------
+    # Bulk, async-native row operations
+    #
+    # Rows are normalized through the model (defaults, generated ids) and
+    # written with Core executemany statements, batch_size rows per
+    # transaction, on a worker thread so the event loop never blocks on
+    # SQLite. A batch that violates a constraint is retried row by row, so
+    # only the offending rows are rejected (and logged). Upserts use the
+    # dialect's INSERT ... ON CONFLICT DO UPDATE keyed by the columns the
+    # YAML schema declares unique.
+    # ------------------------------------------------------------------
+    
+    def unique_columns(self, table_name: str) -> List[str]:
+        """Schema-declared unique (non primary key) columns"""
+        schema = self.get_schema(table_name) or {}
+        return [
+            f['name'] for f in schema.get('fields', [])
+            if f.get('unique') and not f.get('primary_key')
+        ]
+    
+    def _prepare_rows(self, model, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply model defaults/ids; keep only real columns"""
+        columns = [c.name for c in model.__table__.columns]
+        prepared = []
+        for data in rows:
+            instance = model(**data)
+            prepared.append({name: getattr(instance, name, None) for name in columns})
+        return prepared
+    
+    @staticmethod
+    def _group_by_keys(rows: List[Dict[str, Any]], provided: List[frozenset]):
+        """executemany needs one statement shape per group of provided keys"""
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row, keys in zip(rows, provided):
+            groups.setdefault(keys, []).append(row)
+        return groups
+    
+    def _dialect_insert(self, table):
+        dialect = self.engine.dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            return None
+        return dialect_insert(table)
+    
+    def _execute_batch(self, table_name: str, action: str, stmt, batch: List[Dict[str, Any]],
+                       count_matched: bool = False) -> int:
+        """
+        executemany one batch in a transaction; returns rows written
+        (or matched, with count_matched)
+        
+        On a constraint violation the batch is rolled back and retried one
+        row per transaction, so a single bad row doesn't lose the rest.
+        """
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(stmt, batch)
+            return max(result.rowcount, 0) if count_matched else len(batch)
+        except IntegrityError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to bulk {action} {len(batch)} rows in {table_name}: {e}")
+            return 0
+        
+        written = 0
+        with self.engine.connect() as conn:
+            for row in batch:
+                try:
+                    with conn.begin():
+                        result = conn.execute(stmt, [row])
+                    written += max(result.rowcount, 0) if count_matched else 1
+                except IntegrityError as e:
+                    row_id = row.get('_id', row.get('id'))
+                    logger.error(f"Rejected {action} of row {row_id} in {table_name}: {e.orig}")
+        return written
+    
+    def insert_rows(self, table_name: str, rows: List[Dict[str, Any]], batch_size: int = 500) -> int:
+        """Insert many rows, batch_size per transaction; returns rows inserted"""
+        model = self.get_model(table_name)
+        if not model or not self.engine or not rows:
+            return 0
+        
+        table = model.__table__
+        prepared = self._prepare_rows(model, rows)
+        inserted = 0
+        for start in range(0, len(prepared), batch_size):
+            inserted += self._execute_batch(table_name, 'insert', insert(table), prepared[start:start + batch_size])
+        return inserted
+    
+    def upsert_rows(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        conflict_columns: Optional[List[str]] = None,
+        batch_size: int = 500
+    ) -> int:
+        """
+        Insert or update many rows with INSERT ... ON CONFLICT DO UPDATE
+        
+        Args:
+            table_name: Table to write
+            rows: Row data
+            conflict_columns: Unique key (default: the schema's unique column)
+            batch_size: Rows per transaction
+        
+        Returns:
+            Rows written (inserted or updated)
+        
+        Only the keys a row actually provides are updated on conflict; id and
+        created_at of existing rows are kept. Rows that lack the conflict
+        column can't be matched natively and go through the per-row path.
+        """
+        model = self.get_model(table_name)
+        if not model or not self.engine or not rows:
+            return 0
+        
+        table = model.__table__
+        if not conflict_columns:
+            conflict_columns = [c for c in self.unique_columns(table_name) if any(c in r for r in rows)][:1]
+        if not conflict_columns or self._dialect_insert(table) is None:
+            logger.warning(
+                f"No native upsert for {table_name} "
+                f"({'no unique column provided' if not conflict_columns else self.engine.dialect.name}); "
+                f"upserting {len(rows)} rows one at a time"
+            )
+            return self._upsert_one_by_one(table_name, rows)
+        
+        keyless = [data for data in rows if not all(c in data for c in conflict_columns)]
+        written = 0
+        if keyless:
+            logger.warning(
+                f"{len(keyless)} of {len(rows)} rows for {table_name} lack {conflict_columns}; "
+                f"upserting them one at a time"
+            )
+            written += self._upsert_one_by_one(table_name, keyless)
+            rows = [data for data in rows if all(c in data for c in conflict_columns)]
+        
+        # Last write wins within a call (Postgres rejects touching a row twice)
+        latest: Dict[tuple, Dict[str, Any]] = {}
+        for data in rows:
+            latest[tuple(data.get(c) for c in conflict_columns)] = data
+        rows = list(latest.values())
+        
+        prepared = self._prepare_rows(model, rows)
+        provided = [frozenset(k for k in data if k in table.c) for data in rows]
+        groups = self._group_by_keys(prepared, provided)
+        
+        for keys, group in groups.items():
+            stmt = self._dialect_insert(table)
+            update_columns = [k for k in keys if k not in ('id', 'created_at') and k not in conflict_columns]
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={k: stmt.excluded[k] for k in update_columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+            
+            for start in range(0, len(group), batch_size):
+                written += self._execute_batch(table_name, 'upsert', stmt, group[start:start + batch_size])
+        return written
+    
+    def _upsert_one_by_one(self, table_name: str, rows: List[Dict[str, Any]]) -> int:
+        return sum(1 for data in rows if self.insert_row(table_name, data, upsert=True) is not None)
+    
+    def update_rows(self, table_name: str, updates: List[Dict[str, Any]], batch_size: int = 500) -> int:
+        """Update many rows by id ({'id': ..., **changes}); returns rows matched"""
+        model = self.get_model(table_name)
+        if not model or not self.engine or not updates:
+            return 0
+        
+        table = model.__table__
+        rows, provided = [], []
+        for data in updates:
+            row_id = data.get('id')
+            if isinstance(row_id, str):
+                try:
+                    row_id = uuid.UUID(row_id)
+                except ValueError:
+                    logger.error(f"Invalid UUID string for {table_name}: {row_id}")
+                    continue
+            if not row_id:
+                continue
+            changes = {k: v for k, v in data.items() if k != 'id' and k in table.c}
+            if changes:
+                rows.append({'_id': row_id, **changes})
+                provided.append(frozenset(changes))
+        
+        matched = 0
+        for keys, group in self._group_by_keys(rows, provided).items():
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam('_id'))
+                .values({k: bindparam(k) for k in keys})
+            )
+            for start in range(0, len(group), batch_size):
+                matched += self._execute_batch(
+                    table_name, 'update', stmt, group[start:start + batch_size], count_matched=True
+                )
+        return matched
+    
+    async def insert_rows_async(self, table_name: str, rows: List[Dict[str, Any]], batch_size: int = 500) -> int:
+        return await asyncio.to_thread(self.insert_rows, table_name, rows, batch_size)
+    
+    async def upsert_rows_async(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        conflict_columns: Optional[List[str]] = None,
+        batch_size: int = 500
+    ) -> int:
+        return await asyncio.to_thread(self.upsert_rows, table_name, rows, conflict_columns, batch_size)
+    
+    async def update_rows_async(self, table_name: str, updates: List[Dict[str, Any]], batch_size: int = 500) -> int:
+        return await asyncio.to_thread(self.update_rows, table_name, updates, batch_size)
+    
+    async def query_rows_async(self, table_name: str, filters: Dict[str, Any] = None, limit: int = 100) -> List[Any]:
+        return await asyncio.to_thread(self.query_rows, table_name, filters, limit)
+    
     def propose_schema(self, table_name: str, fields: List[Dict[str, Any]], description: str = "") -> Dict[str, Any]:
         """
         Create a schema proposal (for LLM-driven schema creation)
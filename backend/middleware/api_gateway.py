@@ -3,67 +3,58 @@ API Gateway Middleware
 Rate limiting, quotas, authentication, and request logging
 """
 
-from fastapi import Request, HTTPException
+from fastapi import Request
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict
+import math
 import time
 
+from backend.scaling.rate_limit_engine import RateLimitDecision, get_rate_limit_engine
+
 class RateLimiter:
-    """Token bucket rate limiter"""
+    """Per-client rate limiter backed by the shared gateway RateLimitEngine"""
     
     def __init__(
         self,
         requests_per_minute: int = 60,
-        burst_size: int = 10
+        burst_size: int = 10,
+        namespace: str = "middleware"
     ):
         self.requests_per_minute = requests_per_minute
         self.burst_size = burst_size
-        self.buckets: Dict[str, Dict[str, Any]] = defaultdict(self._new_bucket)
-        
-    def _new_bucket(self) -> Dict[str, Any]:
-        """Create a new token bucket"""
-        return {
-            "tokens": self.burst_size,
-            "last_refill": time.time()
-        }
-    
-    def _refill_bucket(self, bucket: Dict[str, Any]):
-        """Refill tokens based on elapsed time"""
-        now = time.time()
-        elapsed = now - bucket["last_refill"]
-        
-        # Add tokens based on rate (requests per second)
-        tokens_to_add = elapsed * (self.requests_per_minute / 60.0)
-        
-        bucket["tokens"] = min(
-            self.burst_size,
-            bucket["tokens"] + tokens_to_add
-        )
-        bucket["last_refill"] = now
+        self.namespace = namespace
+        self.engine = get_rate_limit_engine()
     
     def check_rate_limit(self, key: str) -> bool:
         """Check if request is allowed under rate limit"""
-        bucket = self.buckets[key]
-        self._refill_bucket(bucket)
-        
-        if bucket["tokens"] >= 1:
-            bucket["tokens"] -= 1
-            return True
-        else:
-            return False
+        return self.check(key).allowed
+    
+    def check(self, key: str) -> RateLimitDecision:
+        """Consume one request for key and return the full decision"""
+        return self.engine.check(
+            f"{self.namespace}:{key}",
+            self.requests_per_minute / 60.0,
+            self.burst_size
+        )
     
     def get_bucket_status(self, key: str) -> Dict[str, Any]:
         """Get current bucket status"""
-        bucket = self.buckets[key]
-        self._refill_bucket(bucket)
-        
+        decision = self.engine.status(
+            f"{self.namespace}:{key}",
+            self.requests_per_minute / 60.0,
+            self.burst_size
+        )
         return {
-            "tokens_available": bucket["tokens"],
+            "tokens_available": decision.remaining,
             "max_tokens": self.burst_size,
             "refill_rate_per_min": self.requests_per_minute
         }
+    
+    def active_clients(self) -> int:
+        """Keys currently tracked by the engine (idle keys are evicted)"""
+        return self.engine.store.size()
 
 class APIGatewayMiddleware(BaseHTTPMiddleware):
     """API Gateway with rate limiting and request logging"""
@@ -89,10 +80,12 @@ class APIGatewayMiddleware(BaseHTTPMiddleware):
         client_id = self._get_client_id(request)
         
         # Check rate limit
-        if not self.rate_limiter.check_rate_limit(client_id):
-            return HTTPException(
+        decision = self.rate_limiter.check(client_id)
+        if not decision.allowed:
+            return JSONResponse(
                 status_code=429,
-                detail="Rate limit exceeded"
+                content={"detail": "Rate limit exceeded", "retry_after": decision.retry_after},
+                headers={"Retry-After": str(max(1, math.ceil(decision.retry_after or 1)))}
             )
         
         # Log request
@@ -110,9 +103,8 @@ class APIGatewayMiddleware(BaseHTTPMiddleware):
                 self.error_count += 1
             
             # Add rate limit headers
-            bucket_status = self.rate_limiter.get_bucket_status(client_id)
-            response.headers["X-RateLimit-Remaining"] = str(int(bucket_status["tokens_available"]))
-            response.headers["X-RateLimit-Limit"] = str(bucket_status["max_tokens"])
+            response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+            response.headers["X-RateLimit-Limit"] = str(decision.limit)
             
             # Add latency header
             latency_ms = (time.time() - start_time) * 1000
@@ -144,7 +136,7 @@ class APIGatewayMiddleware(BaseHTTPMiddleware):
                 self.error_count / self.request_count * 100
                 if self.request_count > 0 else 0
             ),
-            "active_clients": len(self.rate_limiter.buckets)
+            "active_clients": self.rate_limiter.active_clients()
         }
 
 class QuotaManager:
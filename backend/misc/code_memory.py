@@ -5,10 +5,19 @@ for intelligent code completion and generation.
 """
 
 import ast
+import asyncio
+import hashlib
+import math
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, select, or_
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Text, JSON, Float, UniqueConstraint,
+    select, or_, insert, update, delete, text
+)
 from sqlalchemy.sql import func
 from backend.models.base_models import Base, async_session
 
@@ -103,6 +112,269 @@ class CodeSymbol(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class CodeIndexManifest(Base):
+    """Per-file fingerprint of the last indexed version (drives incremental re-indexing)"""
+    __tablename__ = "code_index_manifest"
+    __table_args__ = (UniqueConstraint("project", "file_path", name="uq_code_index_manifest_file"),)
+    
+    id = Column(Integer, primary_key=True)
+    project = Column(String(128), nullable=False, index=True)
+    file_path = Column(String(512), nullable=False)
+    language = Column(String(32), nullable=False)
+    mtime = Column(Float, nullable=False)
+    size = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    patterns = Column(Integer, default=0)
+    symbols = Column(Integer, default=0)
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Directory names never indexed (matched per path component)
+IGNORED_DIRS = {
+    '__pycache__', 'node_modules', '.git', 'venv', 'env', '.venv',
+    '.pytest_cache', 'dist', 'build', '.mypy_cache', '.tox'
+}
+
+# Below this many changed files a process pool costs more than it saves
+_PROCESS_POOL_MIN_FILES = 64
+_STORE_BATCH_FILES = 200
+
+
+def generate_tags(name: str, description: str) -> List[str]:
+    """Generate tags from name and description"""
+    
+    tags = []
+    
+    # Extract from name (snake_case or camelCase)
+    name_parts = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\d|\W|$)|\d+', name)
+    tags.extend([part.lower() for part in name_parts if len(part) > 2])
+    
+    # Common patterns
+    if 'create' in name.lower() or 'new' in name.lower():
+        tags.append('creation')
+    if 'delete' in name.lower() or 'remove' in name.lower():
+        tags.append('deletion')
+    if 'update' in name.lower() or 'edit' in name.lower():
+        tags.append('modification')
+    if 'get' in name.lower() or 'fetch' in name.lower() or 'retrieve' in name.lower():
+        tags.append('retrieval')
+    if 'api' in name.lower() or 'endpoint' in name.lower():
+        tags.append('api')
+    if 'test' in name.lower():
+        tags.append('testing')
+    
+    # Extract from description
+    if description:
+        desc_lower = description.lower()
+        if 'auth' in desc_lower:
+            tags.append('authentication')
+        if 'database' in desc_lower or 'db' in desc_lower:
+            tags.append('database')
+        if 'api' in desc_lower or 'endpoint' in desc_lower:
+            tags.append('api')
+        if 'validate' in desc_lower or 'validation' in desc_lower:
+            tags.append('validation')
+    
+    return list(set(tags))  # Remove duplicates
+
+
+def _unparse(node, fallback: str = "Any") -> str:
+    try:
+        return ast.unparse(node)
+    except Exception:
+        return fallback
+
+
+def extract_python_patterns(content: str, file_path: str, project: str) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Extract function/class patterns and symbols from Python source
+    
+    Pure (no DB, no self) so it can run in a worker process. Returns plain
+    dicts shaped like CodePattern / CodeSymbol rows.
+    """
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return [], []
+    
+    module = Path(file_path).stem
+    source_lines = content.split('\n')
+    imports = []
+    defs = []
+    
+    # Single AST traversal to extract imports, functions, and classes
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                imports.append(node.module)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            defs.append(node)
+    
+    imports = list(dict.fromkeys(imports))
+    patterns = []
+    symbols = []
+    
+    for node in sorted(defs, key=lambda n: n.lineno):
+        lines = source_lines[node.lineno - 1:node.end_lineno]
+        description = ast.get_docstring(node) or ""
+        tags = generate_tags(node.name, description)
+        
+        if isinstance(node, ast.ClassDef):
+            bases = [_unparse(base) for base in node.bases]
+            signature = f"class {node.name}({', '.join(bases)})" if bases else f"class {node.name}"
+            tags.append("class")
+            pattern_type = "class"
+            parameters = []
+            return_type = None
+            meta_data = {"bases": bases}
+        else:
+            prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+            signature = f"{prefix} {node.name}({', '.join(arg.arg for arg in node.args.args)})"
+            pattern_type = "function"
+            parameters = []
+            for arg in node.args.args:
+                param_info = {"name": arg.arg}
+                if arg.annotation:
+                    param_info["type"] = _unparse(arg.annotation)
+                parameters.append(param_info)
+            return_type = _unparse(node.returns) if node.returns else None
+            meta_data = {"parameters": parameters, "return_type": return_type}
+        
+        patterns.append({
+            "pattern_type": pattern_type,
+            "language": "python",
+            "name": node.name,
+            "signature": signature,
+            "code_snippet": '\n'.join(lines),
+            "file_path": file_path,
+            "project": project,
+            "module": module,
+            "description": description,
+            "tags": tags,
+            "dependencies": imports,
+            "lines_of_code": len(lines),
+            "parameters": parameters,
+            "return_type": return_type,
+            "confidence_score": 1.0,
+        })
+        symbols.append({
+            "symbol": node.name,
+            "symbol_type": pattern_type,
+            "language": "python",
+            "file_path": file_path,
+            "project": project,
+            "signature": signature,
+            "docstring": description,
+            "tags": sorted({t for t in tags if t}),
+            "references": imports,
+            "meta_data": meta_data,
+        })
+    
+    function_names = [p["name"] for p in patterns if p["pattern_type"] == "function"]
+    class_names = [p["name"] for p in patterns if p["pattern_type"] == "class"]
+    symbols.append({
+        "symbol": module,
+        "symbol_type": "module",
+        "language": "python",
+        "file_path": file_path,
+        "project": project,
+        "signature": f"module {module}",
+        "docstring": "",
+        "tags": sorted(set(function_names + class_names + imports)),
+        "references": imports,
+        "meta_data": {"functions": function_names, "classes": class_names},
+    })
+    
+    return patterns, symbols
+
+
+def scan_file(file_path: str, language: str, project: str, known_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Fingerprint and (if its content changed) parse one file - runs in a worker
+    
+    Returns {"path", "language", "mtime", "size", "hash", "unchanged",
+    "patterns", "symbols", "error"}.
+    """
+    result = {"path": file_path, "language": language, "unchanged": False,
+              "patterns": [], "symbols": [], "error": None}
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+    
+    result["mtime"] = stat.st_mtime
+    result["size"] = stat.st_size
+    result["hash"] = hashlib.sha256(raw).hexdigest()
+    if known_hash == result["hash"]:
+        result["unchanged"] = True  # touched, not edited
+        return result
+    
+    if language == 'python':
+        try:
+            content = raw.decode('utf-8')
+        except UnicodeDecodeError as e:
+            result["error"] = str(e)
+            return result
+        result["patterns"], result["symbols"] = extract_python_patterns(content, file_path, project)
+    # Other languages: fingerprinted only until they get a parser
+    return result
+
+
+def _scan_chunk(jobs: List[Tuple[str, str, Optional[str]]], project: str) -> List[Dict[str, Any]]:
+    return [scan_file(path, language, project, known_hash) for path, language, known_hash in jobs]
+
+
+# SQLite FTS5 shadow indexes: external content (no copy of the text), kept in
+# sync by triggers. bm25 weights follow column order - names dominate.
+_FTS_INDEXES = {
+    "code_patterns": ("code_patterns_fts", ("name", "signature", "description", "tags"), (10.0, 3.0, 2.0, 4.0)),
+    "code_symbols": ("code_symbols_fts", ("symbol", "signature", "docstring", "tags"), (10.0, 3.0, 2.0, 4.0)),
+}
+
+
+def _fts_ddl(table: str) -> List[str]:
+    fts, columns, _ = _FTS_INDEXES[table]
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', prefix='3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        # Only reindex when indexed text changes, not on usage-counter bumps
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def fts_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression
+    
+    Words plus their snake/camelCase parts, each quoted (so FTS syntax in
+    the input is inert) and prefix-matched, OR-ed so bm25 rewards rows that
+    match more of them.
+    """
+    terms = []
+    for word in re.findall(r'[A-Za-z0-9]+', query or ""):
+        terms.append(word.lower())
+        terms.extend(part.lower() for part in re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+', word))
+    terms = [t for t in dict.fromkeys(terms) if len(t) > 1]
+    if not terms:
+        return None
+    return " OR ".join(f'"{t}"*' if len(t) >= 3 else f'"{t}"' for t in terms[:32])
+
+
 class CodeMemoryEngine:
     """Parse code, extract patterns, store in memory"""
     
@@ -117,25 +389,37 @@ class CodeMemoryEngine:
             '.c': 'c',
             '.rs': 'rust'
         }
+        self._fts_ready: Optional[bool] = None
+        self._fts_lock: Optional[asyncio.Lock] = None
     
     async def parse_codebase(
         self,
         root_path: str,
         project_name: str = "grace_2",
-        language_filter: Optional[List[str]] = None
+        language_filter: Optional[List[str]] = None,
+        full: bool = False,
+        workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        Parse entire codebase and extract patterns
+        Incrementally index a codebase
+        
+        Files whose (mtime, size) match the manifest are skipped without being
+        read; the rest are hashed and - if the content really changed - parsed
+        in a process pool and upserted per file. Files that disappeared are
+        removed from the index.
         
         Args:
             root_path: Root directory to parse
             project_name: Name of the project
             language_filter: Only parse these languages (e.g., ['python'])
+            full: Ignore the manifest and re-parse everything
+            workers: Process pool size (default: CPU count)
         
         Returns:
-            Summary of patterns extracted
+            Summary of patterns extracted from changed files plus file counts
         """
         
+        started = time.perf_counter()
         root = Path(root_path)
         patterns_extracted = {
             'functions': 0,
@@ -144,30 +428,52 @@ class CodeMemoryEngine:
             'snippets': 0
         }
         
-        # Find all code files
-        for ext, lang in self.supported_languages.items():
-            if language_filter and lang not in language_filter:
+        extensions = {
+            ext: lang for ext, lang in self.supported_languages.items()
+            if not language_filter or lang in language_filter
+        }
+        files = await asyncio.to_thread(self._walk, root, extensions)
+        await self._ensure_fts()
+        manifest = await self._load_manifest(project_name, str(root), set(extensions.values()))
+        
+        # Cheap change detection: stat only
+        jobs = []
+        for path, (language, mtime, size) in files.items():
+            known = manifest.get(path)
+            if known and not full and known["mtime"] == mtime and known["size"] == size:
                 continue
-            
-            for file_path in root.rglob(f'*{ext}'):
-                # Skip common ignore patterns
-                if any(skip in str(file_path) for skip in [
-                    '__pycache__', 'node_modules', '.git', 'venv', 'env',
-                    '.pytest_cache', 'dist', 'build'
-                ]):
-                    continue
-                
-                try:
-                    patterns = await self.parse_file(file_path, lang, project_name)
-                    for pattern_type in patterns:
-                        patterns_extracted[pattern_type] += len(patterns[pattern_type])
-                except Exception as e:
-                    print(f"Error parsing {file_path}: {e}")
+            jobs.append((path, language, None if full or not known else known["hash"]))
+        
+        removed = [path for path in manifest if path not in files]
+        
+        results = await self._scan(jobs, project_name, workers)
+        changed = [r for r in results if not r["error"] and not r["unchanged"]]
+        touched = [r for r in results if not r["error"] and r["unchanged"]]
+        errors = [r for r in results if r["error"]]
+        for r in errors:
+            print(f"Error parsing {r['path']}: {r['error']}")
+        
+        for i in range(0, len(changed), _STORE_BATCH_FILES):
+            await self._store_results(changed[i:i + _STORE_BATCH_FILES], project_name)
+        if touched:
+            await self._store_results(touched, project_name, fingerprint_only=True)
+        if removed:
+            await self._remove_files(removed, project_name)
+        
+        for r in changed:
+            for p in r["patterns"]:
+                patterns_extracted['functions' if p["pattern_type"] == "function" else 'classes'] += 1
         
         return {
             'project': project_name,
             'patterns_extracted': patterns_extracted,
-            'total': sum(patterns_extracted.values())
+            'total': sum(patterns_extracted.values()),
+            'files_scanned': len(files),
+            'files_changed': len(changed),
+            'files_unchanged': len(files) - len(changed) - len(errors),
+            'files_removed': len(removed),
+            'files_failed': len(errors),
+            'duration_s': round(time.perf_counter() - started, 2)
         }
     
     async def parse_file(
@@ -188,336 +494,232 @@ class CodeMemoryEngine:
             Dict of pattern types and their instances
         """
         
-        if language == 'python':
-            return await self._parse_python_file(file_path, project)
-        elif language in ['javascript', 'typescript']:
-            return await self._parse_js_file(file_path, project)
-        else:
-            # Generic parser for other languages
-            return await self._parse_generic_file(file_path, language, project)
-    
-    async def _parse_python_file(
-        self,
-        file_path: Path,
-        project: str
-    ) -> Dict[str, List]:
-        """Parse Python file using AST"""
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        try:
-            tree = ast.parse(content)
-        except SyntaxError:
-            return {'functions': [], 'classes': [], 'modules': [], 'snippets': []}
-        
-        functions = []
-        classes = []
-        imports = []
+        result = await asyncio.to_thread(scan_file, str(file_path), language, project)
+        if result["error"]:
+            raise OSError(result["error"])
+        await self._store_results([result], project)
         
-        # Single AST traversal to extract imports, functions, and classes (performance optimization)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imports.append(node.module)
-            elif isinstance(node, ast.FunctionDef):
-                func_pattern = await self._extract_python_function(
-                    node, file_path, project, content, imports
-                )
-                functions.append(func_pattern)
-            elif isinstance(node, ast.ClassDef):
-                class_pattern = await self._extract_python_class(
-                    node, file_path, project, content, imports
-                )
-                classes.append(class_pattern)
-
-        function_names = [getattr(p, "name", None) for p in functions if getattr(p, "name", None)]
-        class_names = [getattr(p, "name", None) for p in classes if getattr(p, "name", None)]
-
-        await self._record_symbol(
-            symbol=file_path.stem,
-            symbol_type="module",
-            language="python",
-            file_path=str(file_path),
-            project=project,
-            signature=f"module {file_path.stem}",
-            docstring="",
-            tags=list(set(function_names + class_names + imports)),
-            references=imports,
-            metadata={
-                "functions": function_names,
-                "classes": class_names,
-            },
-        )
+        async with async_session() as session:
+            rows = (await session.execute(
+                select(CodePattern)
+                .where(CodePattern.project == project, CodePattern.file_path == str(file_path))
+                .order_by(CodePattern.id)
+            )).scalars().all()
         
         return {
-            'functions': functions,
-            'classes': classes,
+            'functions': [p for p in rows if p.pattern_type == "function"],
+            'classes': [p for p in rows if p.pattern_type == "class"],
             'modules': [],
             'snippets': []
         }
     
-    async def _extract_python_function(
-        self,
-        node: ast.FunctionDef,
-        file_path: Path,
-        project: str,
-        full_content: str,
-        imports: List[str]
-    ) -> CodePattern:
-        """Extract Python function as a pattern"""
-        
-        # Get function source
-        source_lines = full_content.split('\n')
-        func_lines = source_lines[node.lineno - 1:node.end_lineno]
-        code_snippet = '\n'.join(func_lines)
-        
-        # Build signature
-        args = []
-        for arg in node.args.args:
-            args.append(arg.arg)
-        signature = f"def {node.name}({', '.join(args)})"
-        
-        # Extract docstring
-        description = ast.get_docstring(node) or ""
-        
-        # Extract parameters
-        parameters = []
-        for arg in node.args.args:
-            param_info = {"name": arg.arg}
-            if arg.annotation:
+    def _walk(self, root: Path, extensions: Dict[str, str]) -> Dict[str, Tuple[str, float, int]]:
+        """One pruned walk for all extensions: path -> (language, mtime, size)"""
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+            for name in filenames:
+                language = extensions.get(os.path.splitext(name)[1])
+                if not language:
+                    continue
+                path = os.path.join(dirpath, name)
                 try:
-                    param_info["type"] = ast.unparse(arg.annotation)
-                except:
-                    param_info["type"] = "Any"
-            parameters.append(param_info)
-        
-        # Extract return type
-        return_type = None
-        if node.returns:
-            try:
-                return_type = ast.unparse(node.returns)
-            except:
-                return_type = "Any"
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files[path] = (language, stat.st_mtime, stat.st_size)
+        return files
+    
+    async def _scan(self, jobs: List[Tuple[str, str, Optional[str]]], project: str, workers: Optional[int]) -> List[Dict[str, Any]]:
+        """Hash/parse changed files, fanned out to a process pool when worth it"""
+        if not jobs:
+            return []
+        if len(jobs) < _PROCESS_POOL_MIN_FILES:
+            return await asyncio.to_thread(_scan_chunk, jobs, project)
+        
+        workers = workers or os.cpu_count() or 2
+        chunk_size = max(8, len(jobs) // (workers * 4))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        loop = asyncio.get_running_loop()
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = await asyncio.gather(*[
+                    loop.run_in_executor(pool, _scan_chunk, chunk, project) for chunk in chunks
+                ])
+        except (OSError, RuntimeError) as e:
+            # No process support (sandboxed / frozen runtime): stay in-process
+            print(f"[WARN] Code index process pool unavailable ({e}), parsing in-process")
+            return await asyncio.to_thread(_scan_chunk, jobs, project)
+        return [r for part in parts for r in part]
+    
+    async def _load_manifest(self, project: str, root: str, languages: set) -> Dict[str, Dict[str, Any]]:
+        prefix = root.rstrip(os.sep) + os.sep
+        async with async_session() as session:
+            rows = (await session.execute(
+                select(
+                    CodeIndexManifest.file_path,
+                    CodeIndexManifest.language,
+                    CodeIndexManifest.mtime,
+                    CodeIndexManifest.size,
+                    CodeIndexManifest.content_hash
+                ).where(CodeIndexManifest.project == project)
+            )).all()
+        return {
+            row.file_path: {"mtime": row.mtime, "size": row.size, "hash": row.content_hash}
+            for row in rows
+            if row.language in languages and (row.file_path.startswith(prefix) or root in (".", ""))
+        }
+    
+    async def _store_results(self, results: List[Dict[str, Any]], project: str, fingerprint_only: bool = False):
+        """
+        Bulk upsert one batch of scanned files in a single transaction
         
-        # Generate tags from function name and docstring
-        tags = self._generate_tags(node.name, description)
+        Patterns/symbols are matched to existing rows by (file, type, name,
+        occurrence) so recall/usage counters survive re-indexing; rows whose
+        definition disappeared are deleted.
+        """
+        paths = [r["path"] for r in results]
         
-        # Store pattern
         async with async_session() as session:
-            pattern = CodePattern(
-                pattern_type="function",
-                language="python",
-                name=node.name,
-                signature=signature,
-                code_snippet=code_snippet,
-                file_path=str(file_path),
-                project=project,
-                module=file_path.stem,
-                description=description,
-                tags=tags,
-                dependencies=imports,
-                lines_of_code=len(func_lines),
-                parameters=parameters,
-                return_type=return_type,
-                confidence_score=1.0
-            )
+            manifest_ids = dict((await session.execute(
+                select(CodeIndexManifest.file_path, CodeIndexManifest.id)
+                .where(CodeIndexManifest.project == project, CodeIndexManifest.file_path.in_(paths))
+            )).all())
             
-            session.add(pattern)
-            await session.commit()
-            await session.refresh(pattern)
+            if not fingerprint_only:
+                await self._upsert_rows(
+                    session, CodePattern, project, paths,
+                    key_columns=(CodePattern.file_path, CodePattern.pattern_type, CodePattern.name),
+                    new_rows=[p for r in results for p in r["patterns"]],
+                    key_of=lambda row: (row["file_path"], row["pattern_type"], row["name"])
+                )
+                await self._upsert_rows(
+                    session, CodeSymbol, project, paths,
+                    key_columns=(CodeSymbol.file_path, CodeSymbol.symbol_type, CodeSymbol.symbol),
+                    new_rows=[s for r in results for s in r["symbols"]],
+                    key_of=lambda row: (row["file_path"], row["symbol_type"], row["symbol"])
+                )
+            
+            updates, inserts = [], []
+            for r in results:
+                row = {
+                    "project": project,
+                    "file_path": r["path"],
+                    "language": r["language"],
+                    "mtime": r["mtime"],
+                    "size": r["size"],
+                    "content_hash": r["hash"],
+                }
+                if not fingerprint_only:
+                    row["patterns"] = len(r["patterns"])
+                    row["symbols"] = len(r["symbols"])
+                if r["path"] in manifest_ids:
+                    updates.append({"id": manifest_ids[r["path"]], **row})
+                else:
+                    inserts.append(row)
+            if updates:
+                await session.execute(update(CodeIndexManifest), updates)
+            if inserts:
+                await session.execute(insert(CodeIndexManifest), inserts)
             
-        await self._record_symbol(
-            symbol=node.name,
-            symbol_type="function",
-            language="python",
-            file_path=str(file_path),
-            project=project,
-            signature=signature,
-            docstring=description,
-            tags=tags,
-            references=imports,
-            metadata={
-                "parameters": parameters,
-                "return_type": return_type,
-            },
+            await session.commit()
+    
+    @staticmethod
+    async def _upsert_rows(session, model, project: str, paths: List[str], key_columns, new_rows: List[Dict], key_of):
+        existing: Dict[tuple, List[int]] = {}
+        result = await session.execute(
+            select(model.id, *key_columns)
+            .where(model.project == project, model.file_path.in_(paths))
+            .order_by(model.id)
         )
-
-        return pattern
+        for row in result.all():
+            existing.setdefault(tuple(row[1:]), []).append(row[0])
+        
+        updates, inserts = [], []
+        for row in new_rows:
+            ids = existing.get(key_of(row))
+            if ids:
+                updates.append({"id": ids.pop(0), **row})
+            else:
+                inserts.append(row)
+        stale = [row_id for ids in existing.values() for row_id in ids]
+        
+        if stale:
+            await session.execute(delete(model).where(model.id.in_(stale)))
+        if updates:
+            await session.execute(update(model), updates)
+        if inserts:
+            await session.execute(insert(model), inserts)
     
-    async def _extract_python_class(
-        self,
-        node: ast.ClassDef,
-        file_path: Path,
-        project: str,
-        full_content: str,
-        imports: List[str]
-    ) -> CodePattern:
-        """Extract Python class as a pattern"""
-        
-        # Get class source
-        source_lines = full_content.split('\n')
-        class_lines = source_lines[node.lineno - 1:node.end_lineno]
-        code_snippet = '\n'.join(class_lines)
-        
-        # Build signature
-        bases = [ast.unparse(base) for base in node.bases] if node.bases else []
-        signature = f"class {node.name}({', '.join(bases)})" if bases else f"class {node.name}"
-        
-        # Extract docstring
-        description = ast.get_docstring(node) or ""
-        
-        # Generate tags
-        tags = self._generate_tags(node.name, description)
-        tags.append("class")
-        
-        # Store pattern
+    async def _remove_files(self, paths: List[str], project: str):
+        """Garbage-collect index rows for files that no longer exist"""
         async with async_session() as session:
-            pattern = CodePattern(
-                pattern_type="class",
-                language="python",
-                name=node.name,
-                signature=signature,
-                code_snippet=code_snippet,
-                file_path=str(file_path),
-                project=project,
-                module=file_path.stem,
-                description=description,
-                tags=tags,
-                dependencies=imports,
-                lines_of_code=len(class_lines),
-                confidence_score=1.0
-            )
-            
-            session.add(pattern)
+            for i in range(0, len(paths), 500):
+                chunk = paths[i:i + 500]
+                for model in (CodePattern, CodeSymbol, CodeIndexManifest):
+                    await session.execute(
+                        delete(model).where(model.project == project, model.file_path.in_(chunk))
+                    )
             await session.commit()
-            await session.refresh(pattern)
-            
-        await self._record_symbol(
-            symbol=node.name,
-            symbol_type="class",
-            language="python",
-            file_path=str(file_path),
-            project=project,
-            signature=signature,
-            docstring=description,
-            tags=tags,
-            references=imports,
-            metadata={
-                "bases": bases,
-            },
-        )
-
-        return pattern
     
-    async def _parse_js_file(self, file_path: Path, project: str) -> Dict[str, List]:
-        """Parse JavaScript/TypeScript file (basic regex-based)"""
-        # TODO: Implement with proper JS parser (esprima, babel, etc.)
-        return {'functions': [], 'classes': [], 'modules': [], 'snippets': []}
+    async def _ensure_fts(self) -> bool:
+        """Create the FTS5 indexes/triggers once (SQLite only); False = use scans"""
+        if self._fts_ready is not None:
+            return self._fts_ready
+        if self._fts_lock is None:
+            self._fts_lock = asyncio.Lock()
+        
+        async with self._fts_lock:
+            if self._fts_ready is not None:
+                return self._fts_ready
+            try:
+                async with async_session() as session:
+                    if session.bind.dialect.name != "sqlite":
+                        self._fts_ready = False
+                        return False
+                    for table, (fts, _, _) in _FTS_INDEXES.items():
+                        exists = (await session.execute(
+                            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                            {"name": fts}
+                        )).first()
+                        for statement in _fts_ddl(table):
+                            await session.execute(text(statement))
+                        if not exists:
+                            # Index rows written before the triggers existed
+                            await session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+                    await session.commit()
+                self._fts_ready = True
+            except Exception as e:
+                print(f"[WARN] Code memory full-text index unavailable ({e}), using table scans")
+                self._fts_ready = False
+        return self._fts_ready
     
-    async def _parse_generic_file(
-        self,
-        file_path: Path,
-        language: str,
-        project: str
-    ) -> Dict[str, List]:
-        """Generic parser for languages without AST support"""
-        # TODO: Implement regex-based pattern extraction
-        return {'functions': [], 'classes': [], 'modules': [], 'snippets': []}
+    async def _fts_search(self, session, table: str, query: str, language: str, limit: int) -> List[Tuple[int, float]]:
+        """(row id, relevance in (0, 1]) best first; bm25 normalized to the top hit"""
+        fts, _, weights = _FTS_INDEXES[table]
+        rows = (await session.execute(
+            text(
+                f"SELECT t.id, bm25({fts}, {', '.join(str(w) for w in weights)}) AS rank "
+                f"FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+                f"WHERE {fts} MATCH :query AND t.language = :language "
+                f"ORDER BY rank LIMIT :limit"
+            ),
+            {"query": query, "language": language, "limit": limit}
+        )).all()
+        if not rows:
+            return []
+        best = rows[0].rank or -1.0  # bm25 is negative, more negative = better
+        return [(row.id, (row.rank / best) if best else 1.0) for row in rows]
+    
+    @staticmethod
+    def _usage_weight(pattern: "CodePattern") -> float:
+        """Existing success_rate/times_used ordering as a multiplicative prior"""
+        return (pattern.success_rate or 0.0) * (1.0 + 0.1 * math.log1p(pattern.times_used or 0))
     
     def _generate_tags(self, name: str, description: str) -> List[str]:
         """Generate tags from name and description"""
-        
-        tags = []
-        
-        # Extract from name (snake_case or camelCase)
-        name_parts = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\d|\W|$)|\d+', name)
-        tags.extend([part.lower() for part in name_parts if len(part) > 2])
-        
-        # Common patterns
-        if 'create' in name.lower() or 'new' in name.lower():
-            tags.append('creation')
-        if 'delete' in name.lower() or 'remove' in name.lower():
-            tags.append('deletion')
-        if 'update' in name.lower() or 'edit' in name.lower():
-            tags.append('modification')
-        if 'get' in name.lower() or 'fetch' in name.lower() or 'retrieve' in name.lower():
-            tags.append('retrieval')
-        if 'api' in name.lower() or 'endpoint' in name.lower():
-            tags.append('api')
-        if 'test' in name.lower():
-            tags.append('testing')
-        
-        # Extract from description
-        if description:
-            desc_lower = description.lower()
-            if 'auth' in desc_lower:
-                tags.append('authentication')
-            if 'database' in desc_lower or 'db' in desc_lower:
-                tags.append('database')
-            if 'api' in desc_lower or 'endpoint' in desc_lower:
-                tags.append('api')
-            if 'validate' in desc_lower or 'validation' in desc_lower:
-                tags.append('validation')
-        
-        return list(set(tags))  # Remove duplicates
+        return generate_tags(name, description)
     
-    async def _record_symbol(
-        self,
-        *,
-        symbol: str,
-        symbol_type: str,
-        language: str,
-        file_path: str,
-        project: Optional[str],
-        signature: Optional[str],
-        docstring: Optional[str],
-        tags: Optional[List[str]],
-        references: Optional[List[str]],
-        metadata: Optional[Dict[str, Any]] = None,
-    ) -> None:
-        """Upsert symbol entry for deep search."""
-
-        tags = list({t for t in (tags or []) if t})
-        references = list({r for r in (references or []) if r})
-
-        async with async_session() as session:
-            result = await session.execute(
-                select(CodeSymbol).where(
-                    CodeSymbol.symbol == symbol,
-                    CodeSymbol.file_path == file_path,
-                    CodeSymbol.language == language,
-                )
-            )
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                existing.signature = signature or existing.signature
-                existing.docstring = docstring or existing.docstring
-                existing.tags = list({*(existing.tags or []), *tags})
-                existing.references = references or existing.references
-                existing.metadata = metadata or existing.metadata or {}
-                existing.project = project or existing.project
-            else:
-                entry = CodeSymbol(
-                    symbol=symbol,
-                    symbol_type=symbol_type,
-                    language=language,
-                    file_path=file_path,
-                    project=project,
-                    signature=signature,
-                    docstring=docstring,
-                    tags=tags,
-                    references=references,
-                    metadata=metadata or {},
-                )
-                session.add(entry)
-
-            await session.commit()
-
     async def recall_patterns(
         self,
         intent: str,
@@ -528,6 +730,9 @@ class CodeMemoryEngine:
         """
         Recall relevant patterns based on intent and context
         
+        Uses the FTS5 index (bm25 relevance x success_rate/times_used) when
+        available, otherwise the tag scan.
+        
         Args:
             intent: What the user is trying to do
             context: Current coding context
@@ -538,6 +743,19 @@ class CodeMemoryEngine:
             List of relevant patterns with confidence scores
         """
         
+        match = fts_query(intent)
+        if match and await self._ensure_fts():
+            async with async_session() as session:
+                hits = await self._fts_search(session, "code_patterns", match, language, limit * 5)
+                rows = await self._load_rows(session, CodePattern, [row_id for row_id, _ in hits])
+            
+            ranked = sorted(
+                ((rows[row_id], relevance) for row_id, relevance in hits if row_id in rows),
+                key=lambda item: (item[1] * self._usage_weight(item[0]), item[0].success_rate, item[0].times_used),
+                reverse=True
+            )[:limit]
+            return [self._pattern_result(p, relevance) for p, relevance in ranked]
+        
         # Generate search tags from intent
         search_tags = self._generate_tags(intent, intent)
         
@@ -561,20 +779,31 @@ class CodeMemoryEngine:
             result = await session.execute(query)
             patterns = result.scalars().all()
             
-            return [
-                {
-                    'id': p.id,
-                    'name': p.name,
-                    'type': p.pattern_type,
-                    'signature': p.signature,
-                    'code': p.code_snippet,
-                    'description': p.description,
-                    'tags': p.tags,
-                    'confidence': p.confidence_score * p.success_rate,
-                    'file_path': p.file_path
-                }
-                for p in patterns
-            ]
+            return [self._pattern_result(p) for p in patterns]
+    
+    @staticmethod
+    def _pattern_result(p: "CodePattern", relevance: Optional[float] = None) -> Dict[str, Any]:
+        result = {
+            'id': p.id,
+            'name': p.name,
+            'type': p.pattern_type,
+            'signature': p.signature,
+            'code': p.code_snippet,
+            'description': p.description,
+            'tags': p.tags,
+            'confidence': p.confidence_score * p.success_rate,
+            'file_path': p.file_path
+        }
+        if relevance is not None:
+            result['relevance'] = round(relevance, 4)
+        return result
+    
+    @staticmethod
+    async def _load_rows(session, model, ids: List[int]) -> Dict[int, Any]:
+        if not ids:
+            return {}
+        rows = (await session.execute(select(model).where(model.id.in_(ids)))).scalars().all()
+        return {row.id: row for row in rows}
 
     async def deep_search(
         self,
@@ -585,6 +814,57 @@ class CodeMemoryEngine:
     ) -> List[Dict[str, Any]]:
         """Return combined matches from patterns and symbols."""
 
+        match = fts_query(query)
+        if match and await self._ensure_fts():
+            async with async_session() as session:
+                pattern_hits = await self._fts_search(session, "code_patterns", match, language, limit * 3)
+                symbol_hits = await self._fts_search(session, "code_symbols", match, language, limit)
+                pattern_rows = await self._load_rows(session, CodePattern, [i for i, _ in pattern_hits])
+                symbol_rows = await self._load_rows(session, CodeSymbol, [i for i, _ in symbol_hits])
+            pattern_matches = [
+                (pattern_rows[i], relevance * self._usage_weight(pattern_rows[i]) * pattern_rows[i].confidence_score)
+                for i, relevance in pattern_hits if i in pattern_rows
+            ]
+            symbol_matches = [(symbol_rows[i], relevance * 0.75) for i, relevance in symbol_hits if i in symbol_rows]
+        else:
+            pattern_matches, symbol_matches = await self._deep_search_scan(query, language, limit)
+
+        matches: List[Dict[str, Any]] = []
+        for row, score in pattern_matches:
+            matches.append(
+                {
+                    "type": "pattern",
+                    "name": row.name,
+                    "symbol_type": row.pattern_type,
+                    "file_path": row.file_path,
+                    "signature": row.signature,
+                    "description": row.description,
+                    "tags": row.tags,
+                    "score": float(score),
+                }
+            )
+
+        for row, score in symbol_matches:
+            matches.append(
+                {
+                    "type": "symbol",
+                    "name": row.symbol,
+                    "symbol_type": row.symbol_type,
+                    "file_path": row.file_path,
+                    "signature": row.signature,
+                    "description": row.docstring,
+                    "tags": row.tags,
+                    "score": float(score),
+                    "metadata": row.meta_data,
+                }
+            )
+
+        matches.sort(key=lambda item: item.get("score", 0), reverse=True)
+        return matches[:limit]
+
+    async def _deep_search_scan(self, query: str, language: str, limit: int):
+        """LIKE/tag scan used when no full-text index is available"""
+
         search_tags = self._generate_tags(query, query)
 
         pattern_conditions = [
@@ -614,37 +894,9 @@ class CodeMemoryEngine:
             symbol_query = symbol_query.limit(limit)
             symbol_rows = (await session.execute(symbol_query)).scalars().all()
 
-        matches: List[Dict[str, Any]] = []
-        for row in pattern_rows:
-            matches.append(
-                {
-                    "type": "pattern",
-                    "name": row.name,
-                    "symbol_type": row.pattern_type,
-                    "file_path": row.file_path,
-                    "signature": row.signature,
-                    "description": row.description,
-                    "tags": row.tags,
-                    "score": float(row.success_rate * row.confidence_score),
-                }
-            )
-
-        for row in symbol_rows:
-            matches.append(
-                {
-                    "type": "symbol",
-                    "name": row.symbol,
-                    "symbol_type": row.symbol_type,
-                    "file_path": row.file_path,
-                    "signature": row.signature,
-                    "description": row.docstring,
-                    "tags": row.tags,
-                    "score": 0.75,
-                    "metadata": row.metadata,
-                }
-            )
-
-        matches.sort(key=lambda item: item.get("score", 0), reverse=True)
-        return matches[:limit]
+        return (
+            [(row, row.success_rate * row.confidence_score) for row in pattern_rows],
+            [(row, 0.75) for row in symbol_rows],
+        )
 
 code_memory = CodeMemoryEngine()
@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
 
+from backend.observability.tracing import request_tracer
+
 @dataclass
 class TriggerEvent:
     """Event flowing through the mesh"""
@@ -15,6 +17,7 @@ class TriggerEvent:
     timestamp: datetime = field(default_factory=datetime.utcnow)
     event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     subsystem: str = ""  # Subsystem identifier for metrics tracking
+    trace_context: dict = field(default_factory=dict)  # W3C traceparent of the publisher
 
 class TriggerMesh:
     """Event bus connecting all Grace subsystems"""
@@ -43,6 +46,8 @@ class TriggerMesh:
     
     async def publish(self, event: TriggerEvent):
         """Publish event to mesh"""
+        if not event.trace_context:
+            request_tracer.inject(event.trace_context)
         await self.event_queue.put(event)
         
         # Log to immutable log
@@ -76,13 +81,19 @@ class TriggerMesh:
             while self._running:
                 event = await self.event_queue.get()
                 
-                for pattern, handlers in self.subscribers.items():
-                    if self._matches_pattern(event.event_type, pattern):
-                        for handler in handlers:
-                            try:
-                                await handler(event)
-                            except Exception as e:
-                                print(f"✗ Event handler error: {e}")
+                with request_tracer.span(
+                    f"trigger.dispatch {event.event_type}",
+                    parent=request_tracer.extract(event.trace_context),
+                    kind="consumer",
+                    require_parent=True
+                ):
+                    for pattern, handlers in self.subscribers.items():
+                        if self._matches_pattern(event.event_type, pattern):
+                            for handler in handlers:
+                                try:
+                                    await handler(event)
+                                except Exception as e:
+                                    print(f"✗ Event handler error: {e}")
                 
                 self.event_queue.task_done()
         except asyncio.CancelledError:
@@ -3,12 +3,27 @@ Model Orchestrator - Manages 15+ LLM models with learning
 Grace watches, learns, and optimizes model selection
 """
 
+import asyncio
+import importlib.util
+import json
 import httpx
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
 from enum import Enum
 
+# How long the Ollama /api/tags listing is trusted before re-fetching
+MODEL_LIST_TTL_SECONDS = 30.0
+# A failed listing is only remembered briefly (Ollama may just be starting)
+MODEL_LIST_FAILURE_TTL_SECONDS = 2.0
+
+# Shared connection pool limits for all Ollama traffic
+OLLAMA_POOL_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=16,
+    keepalive_expiry=120.0,
+)
+
 class ModelType(Enum):
     CONVERSATION = "conversation"
     CODING = "coding"
@@ -26,6 +41,16 @@ class ModelOrchestrator:
     def __init__(self):
         self.ollama_url = "http://localhost:11434"
         
+        # Long-lived HTTP client, created lazily and bound to the loop using it
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # TTL cache of installed model names from /api/tags
+        self._installed_models: Optional[List[str]] = None
+        self._installed_models_at: float = 0.0
+        self._installed_models_ttl: float = MODEL_LIST_TTL_SECONDS
+        self._installed_models_lock: Optional[asyncio.Lock] = None
+        
         # All available models
         self.models = {
             # Conversation models
@@ -269,89 +294,284 @@ class ModelOrchestrator:
         
         return best_model
     
-    async def _check_model_available(self, model: str) -> bool:
-        """Check if model is pulled and ready"""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.ollama_url}/api/tags", timeout=5.0)
+    def get_http_client(self) -> httpx.AsyncClient:
+        """
+        Shared keep-alive client for Ollama calls.
+        One connection pool per event loop instead of one per request; a
+        client made on another loop (a previous asyncio.run, a worker
+        thread) is retired rather than reused, since its connections belong
+        to that loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop not in (None, loop):
+            self._retire_client()
+        
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.ollama_url,
+                limits=OLLAMA_POOL_LIMITS,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                http2=importlib.util.find_spec("h2") is not None,
+            )
+        self._client_loop = loop
+        return self._client
+    
+    def _retire_client(self):
+        """Drop the client; close it on its own loop if that loop is still running"""
+        client, loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is not None and not client.is_closed and loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    
+    async def aclose(self):
+        """Close the shared HTTP client (called on shutdown)"""
+        if self._client_loop not in (None, asyncio.get_running_loop()):
+            self._retire_client()
+            return
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+    
+    async def get_installed_models(self, force_refresh: bool = False) -> List[str]:
+        """
+        Installed Ollama model names, cached for MODEL_LIST_TTL_SECONDS.
+        Concurrent callers share a single /api/tags request. A failed fetch
+        is cached for MODEL_LIST_FAILURE_TTL_SECONDS only.
+        """
+        now = time.monotonic()
+        if (
+            not force_refresh
+            and self._installed_models is not None
+            and now - self._installed_models_at < self._installed_models_ttl
+        ):
+            return self._installed_models
+        
+        if self._installed_models_lock is None:
+            self._installed_models_lock = asyncio.Lock()
+        
+        async with self._installed_models_lock:
+            # Another caller may have refreshed while we waited
+            if (
+                not force_refresh
+                and self._installed_models is not None
+                and time.monotonic() - self._installed_models_at < self._installed_models_ttl
+            ):
+                return self._installed_models
+            
+            installed: Optional[List[str]] = None
+            try:
+                response = await self.get_http_client().get("/api/tags", timeout=5.0)
                 if response.status_code == 200:
                     data = response.json()
-                    available_models = [m["name"] for m in data.get("models", [])]
-                    return any(model in m for m in available_models)
-        except:
-            pass
-        return False
+                    installed = [m["name"] for m in data.get("models", [])]
+            except Exception:
+                pass
+            
+            if installed is None:
+                # Keep serving the last good list if Ollama hiccups, but
+                # retry soon rather than trusting the failure for the full TTL
+                installed = self._installed_models or []
+                self._installed_models_ttl = MODEL_LIST_FAILURE_TTL_SECONDS
+            else:
+                self._installed_models_ttl = MODEL_LIST_TTL_SECONDS
+            
+            self._installed_models = installed
+            self._installed_models_at = time.monotonic()
+            return installed
+    
+    def invalidate_model_cache(self):
+        """Forget the cached model list (e.g. after `ollama pull`)"""
+        self._installed_models = None
+        self._installed_models_at = 0.0
     
     async def chat_with_learning(
         self,
         message: str,
         context: Optional[List[Dict]] = None,
-        user_preference: Optional[str] = None
+        user_preference: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Chat with automatic model selection and performance learning
         Grace observes and learns which models work best
-        """
         
-        start_time = time.time()
+        Repeated prompts are answered from the LLM response cache
+        (exact or embedding-similar) unless use_cache is False.
+        """
         
         # Step 1: Select best model (Grace's intelligence)
         selected_model = user_preference or await self.select_best_model(message, context)
         
-        # Step 2: Call the model
+        if not use_cache:
+            return await self._chat_with_model(message, context, selected_model)
+        
+        from backend.services.llm_response_cache import llm_response_cache
+        
+        messages = self._build_chat_messages(message, context, selected_model)
+        return await llm_response_cache.get_or_generate(
+            model=selected_model,
+            prompt="\n".join(f"{m['role']}: {m['content']}" for m in messages),
+            temperature=self._chat_options()["temperature"],
+            generate=lambda: self._chat_with_model(message, context, selected_model),
+            # A fallback answer is cached under its own model by the retry in _try_alternative_model
+            cacheable=lambda r: r.get("provider") == "ollama" and r.get("model") == selected_model,
+            # Multi-turn prompts are exact-only (history changes the answer)
+            question=None if context else message,
+            prefix=messages[0]["content"]
+        )
+    
+    async def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        use_cache: bool = True,
+        corpus_dependent: bool = True,
+        question: Optional[str] = None,
+        prefix: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Single-prompt completion (Ollama /api/generate)
+        
+        Used by the world model, reflection loops and RAG Q&A. Goes through
+        the LLM response cache; pass corpus_dependent=False for prompts that
+        don't embed RAG context so corpus updates don't evict them.
+        
+        Pass the bare user question embedded in the prompt as question (and
+        the prompt's fixed instruction as prefix) to let similar questions
+        share an answer; without it only identical prompts hit the cache.
+        """
+        
+        selected_model = model or await self.select_best_model(prompt)
+        
+        if not use_cache:
+            return await self._generate_with_model(prompt, selected_model, max_tokens, temperature)
+        
+        from backend.services.llm_response_cache import llm_response_cache
+        
+        return await llm_response_cache.get_or_generate(
+            model=f"{selected_model}#{max_tokens}",
+            prompt=prompt,
+            temperature=temperature,
+            generate=lambda: self._generate_with_model(prompt, selected_model, max_tokens, temperature),
+            corpus_dependent=corpus_dependent,
+            cacheable=lambda r: r.get("provider") == "ollama" and r.get("model") == selected_model and bool(r.get("text")),
+            question=question,
+            prefix=prefix
+        )
+    
+    async def _generate_with_model(
+        self,
+        prompt: str,
+        selected_model: str,
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Call Ollama /api/generate and record performance"""
+        
+        start_time = time.time()
+        
         try:
-            async with httpx.AsyncClient() as client:
-                messages = [
-                    {
-                        "role": "system",
-                        "content": f"You are Grace, an autonomous AI with 20 kernels. Current model: {selected_model}. Be conversational and helpful."
+            response = await self.get_http_client().post(
+                "/api/generate",
+                json={
+                    "model": selected_model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": {
+                        "temperature": temperature,
+                        "num_predict": max_tokens
                     }
-                ]
-                
-                if context:
-                    messages.extend(context[-10:])  # Up to 10 exchanges for context
-                
-                messages.append({"role": "user", "content": message})
+                },
+                timeout=60.0
+            )
+            response.raise_for_status()
+            response_text = response.json().get("response", "")
+            response_time = time.time() - start_time
+            
+            await self._record_performance(
+                model=selected_model,
+                task_type=self._classify_task(prompt),
+                success=True,
+                response_time=response_time,
+                message_length=len(prompt),
+                response_length=len(response_text)
+            )
+            
+            return {
+                "text": response_text,
+                "model": selected_model,
+                "provider": "ollama",
+                "response_time": response_time,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            await self._record_performance(
+                model=selected_model,
+                task_type=self._classify_task(prompt),
+                success=False,
+                response_time=time.time() - start_time,
+                error=str(e)
+            )
+            return {
+                "text": "",
+                "model": selected_model,
+                "provider": "error",
+                "error": str(e)
+            }
+    
+    async def _chat_with_model(
+        self,
+        message: str,
+        context: Optional[List[Dict]],
+        selected_model: str
+    ) -> Dict[str, Any]:
+        """Call Ollama /api/chat with a specific model, falling back on failure"""
+        
+        start_time = time.time()
+        
+        # Step 2: Call the model
+        try:
+            messages = self._build_chat_messages(message, context, selected_model)
+            
+            response = await self.get_http_client().post(
+                "/api/chat",
+                json={
+                    "model": selected_model,
+                    "messages": messages,
+                    "stream": False,
+                    "options": self._chat_options()
+                },
+                timeout=20.0  # Shorter timeout (20s instead of 90s)
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                response_text = result["message"]["content"]
+                response_time = time.time() - start_time
                 
-                response = await client.post(
-                    f"{self.ollama_url}/api/chat",
-                    json={
-                        "model": selected_model,
-                        "messages": messages,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.8,
-                            "num_predict": 500,  # Shorter for faster response
-                            "top_k": 40,
-                            "top_p": 0.9
-                        }
-                    },
-                    timeout=20.0  # Shorter timeout (20s instead of 90s)
+                # Step 3: Grace learns from this interaction
+                await self._record_performance(
+                    model=selected_model,
+                    task_type=self._classify_task(message),
+                    success=True,
+                    response_time=response_time,
+                    message_length=len(message),
+                    response_length=len(response_text)
                 )
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    response_text = result["message"]["content"]
-                    response_time = time.time() - start_time
-                    
-                    # Step 3: Grace learns from this interaction
-                    await self._record_performance(
-                        model=selected_model,
-                        task_type=self._classify_task(message),
-                        success=True,
-                        response_time=response_time,
-                        message_length=len(message),
-                        response_length=len(response_text)
-                    )
-                    
-                    return {
-                        "text": response_text,
-                        "model": selected_model,
-                        "provider": "ollama",
-                        "response_time": response_time,
-                        "performance_score": await self._calculate_performance_score(response_time, len(response_text)),
-                        "timestamp": datetime.now().isoformat()
-                    }
+                return {
+                    "text": response_text,
+                    "model": selected_model,
+                    "provider": "ollama",
+                    "response_time": response_time,
+                    "performance_score": await self._calculate_performance_score(response_time, len(response_text)),
+                    "timestamp": datetime.now().isoformat()
+                }
                     
         except Exception as e:
             # Model failed, Grace learns from failure
@@ -375,6 +595,124 @@ class ModelOrchestrator:
             "error": "No models available"
         }
     
+    async def stream_chat(
+        self,
+        message: str,
+        context: Optional[List[Dict]] = None,
+        user_preference: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of chat_with_learning.
+        
+        Yields {"type": "token", "text": ...} chunks as Ollama produces them,
+        then a final {"type": "done", ...} event with timing metadata
+        (including time_to_first_token). Errors are yielded as
+        {"type": "error", ...} so SSE/WebSocket consumers can close cleanly.
+        """
+        
+        start_time = time.time()
+        selected_model = user_preference or await self.select_best_model(message, context)
+        messages = self._build_chat_messages(message, context, selected_model)
+        
+        first_token_at: Optional[float] = None
+        parts: List[str] = []
+        
+        try:
+            async with self.get_http_client().stream(
+                "POST",
+                "/api/chat",
+                json={
+                    "model": selected_model,
+                    "messages": messages,
+                    "stream": True,
+                    "options": {**self._chat_options(), **(options or {})}
+                },
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            ) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"Ollama returned HTTP {response.status_code}")
+                
+                # Ollama streams newline-delimited JSON objects
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    
+                    token = chunk.get("message", {}).get("content", "")
+                    if token:
+                        if first_token_at is None:
+                            first_token_at = time.time()
+                        parts.append(token)
+                        yield {"type": "token", "text": token, "model": selected_model}
+                    
+                    if chunk.get("done"):
+                        break
+        
+        except Exception as e:
+            await self._record_performance(
+                model=selected_model,
+                task_type=self._classify_task(message),
+                success=False,
+                response_time=time.time() - start_time,
+                error=str(e)
+            )
+            yield {"type": "error", "error": str(e), "model": selected_model}
+            return
+        
+        response_text = "".join(parts)
+        response_time = time.time() - start_time
+        
+        await self._record_performance(
+            model=selected_model,
+            task_type=self._classify_task(message),
+            success=True,
+            response_time=response_time,
+            message_length=len(message),
+            response_length=len(response_text)
+        )
+        
+        yield {
+            "type": "done",
+            "text": response_text,
+            "model": selected_model,
+            "provider": "ollama",
+            "response_time": response_time,
+            "time_to_first_token": (first_token_at - start_time) if first_token_at else None,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _build_chat_messages(
+        self,
+        message: str,
+        context: Optional[List[Dict]],
+        selected_model: str
+    ) -> List[Dict[str, str]]:
+        """Build the Ollama chat message list"""
+        messages = [
+            {
+                "role": "system",
+                "content": f"You are Grace, an autonomous AI with 20 kernels. Current model: {selected_model}. Be conversational and helpful."
+            }
+        ]
+        
+        if context:
+            messages.extend(context[-10:])  # Up to 10 exchanges for context
+        
+        messages.append({"role": "user", "content": message})
+        return messages
+    
+    def _chat_options(self) -> Dict[str, Any]:
+        """Default sampling options for chat"""
+        return {
+            "temperature": 0.8,
+            "num_predict": 500,  # Shorter for faster response
+            "top_k": 40,
+            "top_p": 0.9
+        }
+    
     async def _try_alternative_model(self, message: str, context: Any, failed_model: str) -> Dict[str, Any]:
         """Try alternative models when one fails"""
         
@@ -402,17 +740,9 @@ class ModelOrchestrator:
         }
     
     async def _check_model_available(self, model: str) -> bool:
-        """Check if model is pulled"""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.ollama_url}/api/tags", timeout=5.0)
-                if response.status_code == 200:
-                    data = response.json()
-                    available = [m["name"] for m in data.get("models", [])]
-                    return any(model.split(":")[0] in m for m in available)
-        except:
-            pass
-        return False
+        """Check if model is pulled (served from the TTL model cache)"""
+        available = await self.get_installed_models()
+        return any(model.split(":")[0] in m for m in available)
     
     def _classify_task(self, message: str) -> str:
         """Classify what type of task this is"""
@@ -588,30 +918,26 @@ class ModelOrchestrator:
         available_models = []
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.ollama_url}/api/tags", timeout=5.0)
-                if response.status_code == 200:
-                    data = response.json()
-                    installed = [m["name"] for m in data.get("models", [])]
+            installed = await self.get_installed_models()
+            if installed:
+                for model_name, model_info in self.models.items():
+                    is_installed = any(model_name.split(":")[0] in m for m in installed)
                     
-                    for model_name, model_info in self.models.items():
-                        is_installed = any(model_name.split(":")[0] in m for m in installed)
-                        
-                        model_data = {
-                            "name": model_name,
-                            "installed": is_installed,
-                            "type": model_info["type"].value,
-                            "size": model_info["size"],
-                            "quality": model_info["quality"],
-                            "speed": model_info["speed"],
-                            "specialties": model_info["specialties"]
-                        }
-                        
-                        # Add performance data if available
-                        if model_name in self.model_success_rates:
-                            model_data["performance"] = self.model_success_rates[model_name]
-                        
-                        available_models.append(model_data)
+                    model_data = {
+                        "name": model_name,
+                        "installed": is_installed,
+                        "type": model_info["type"].value,
+                        "size": model_info["size"],
+                        "quality": model_info["quality"],
+                        "speed": model_info["speed"],
+                        "specialties": model_info["specialties"]
+                    }
+                    
+                    # Add performance data if available
+                    if model_name in self.model_success_rates:
+                        model_data["performance"] = self.model_success_rates[model_name]
+                    
+                    available_models.append(model_data)
                         
         except Exception as e:
             print(f"Failed to list models: {e}")
@@ -3,12 +3,17 @@ Observability - Golden signals, metrics, and monitoring
 """
 
 from .metrics import MetricsCollector, GoldenSignals
-from .tracing import RequestTracer
+from .tracing import RequestTracer, SpanContext, request_tracer
 from .health import HealthChecker
+from .loop_profiler import LoopProfiler, loop_profiler
 
 __all__ = [
     "MetricsCollector",
     "GoldenSignals",
     "RequestTracer",
+    "SpanContext",
+    "request_tracer",
     "HealthChecker",
+    "LoopProfiler",
+    "loop_profiler",
 ]
@@ -0,0 +1,202 @@
+"""
+Import Profiler - Attribute startup time to the modules that cost it
+
+Like `python -X importtime`, but collected in-process so the report can be
+served from the running API and grouped by package.
+
+Usage:
+    GRACE_IMPORT_PROFILE=1 uvicorn backend.main:app
+    python -m backend.observability.import_profiler backend.main
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class ImportRecord:
+    """Timing for one module import"""
+    module: str
+    cumulative_ms: float  # including nested imports
+    self_ms: float        # excluding nested imports
+    parent: Optional[str]
+    started_at: float
+
+
+class _TimingLoader:
+    """Wraps a loader so exec_module is timed"""
+
+    def __init__(self, loader, profiler: "ImportProfiler", name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        # Hand the real loader back to the module so introspection
+        # (pkgutil, importlib.resources, isinstance checks) is unaffected
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+
+        self._profiler._enter(self._name)
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name, started)
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+
+class ImportProfiler:
+    """
+    sys.meta_path hook recording cumulative and self time per imported module
+    """
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self._stack: List[List[Any]] = []  # [module, child_seconds]
+        self._installed = False
+        self._installed_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # meta_path finder protocol
+    # ------------------------------------------------------------------
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, self, name)
+            return spec
+        return None
+
+    def _enter(self, name: str):
+        self._stack.append([name, 0.0])
+
+    def _exit(self, name: str, started: float):
+        elapsed = time.perf_counter() - started
+        _, child_seconds = self._stack.pop()
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent[1] += elapsed
+        self.records.append(ImportRecord(
+            module=name,
+            cumulative_ms=elapsed * 1000,
+            self_ms=max(0.0, elapsed - child_seconds) * 1000,
+            parent=parent[0] if parent else None,
+            started_at=started,
+        ))
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def install(self):
+        """Start profiling imports (idempotent)"""
+        if not self._installed:
+            sys.meta_path.insert(0, self)
+            self._installed = True
+            self._installed_at = time.perf_counter()
+
+    def uninstall(self):
+        """Stop profiling imports; collected records are kept"""
+        if self._installed:
+            try:
+                sys.meta_path.remove(self)
+            except ValueError:
+                pass
+            self._installed = False
+
+    @property
+    def installed(self) -> bool:
+        return self._installed
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_report(self, top: int = 25, prefix: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Summarize collected imports
+
+        Args:
+            top: Number of modules to list per ranking
+            prefix: Only rank modules under this dotted prefix (e.g. "backend")
+        """
+        records = self.records
+        if prefix:
+            records = [r for r in records if r.module == prefix or r.module.startswith(prefix + ".")]
+
+        # Top-level imports (no profiled parent) sum to the wall time spent importing
+        total_ms = sum(r.cumulative_ms for r in self.records if r.parent is None)
+
+        by_package: Dict[str, float] = {}
+        for record in self.records:
+            package = ".".join(record.module.split(".")[:2]) if record.module.startswith("backend.") \
+                else record.module.split(".")[0]
+            by_package[package] = by_package.get(package, 0.0) + record.self_ms
+
+        def _row(r: ImportRecord) -> Dict[str, Any]:
+            return {
+                "module": r.module,
+                "cumulative_ms": round(r.cumulative_ms, 2),
+                "self_ms": round(r.self_ms, 2),
+                "imported_by": r.parent,
+            }
+
+        return {
+            "enabled": self._installed,
+            "modules_imported": len(self.records),
+            "total_import_ms": round(total_ms, 2),
+            "top_cumulative": [_row(r) for r in sorted(records, key=lambda r: r.cumulative_ms, reverse=True)[:top]],
+            "top_self": [_row(r) for r in sorted(records, key=lambda r: r.self_ms, reverse=True)[:top]],
+            "by_package_self_ms": dict(
+                sorted(((k, round(v, 2)) for k, v in by_package.items()), key=lambda kv: kv[1], reverse=True)[:top]
+            ),
+        }
+
+    def format_report(self, top: int = 25, prefix: Optional[str] = None) -> str:
+        """Human-readable version of get_report()"""
+        report = self.get_report(top=top, prefix=prefix)
+        lines = [
+            f"Imported {report['modules_imported']} modules in {report['total_import_ms']:.1f} ms",
+            "",
+            f"{'cumulative ms':>14} {'self ms':>10}  module",
+        ]
+        for row in report["top_cumulative"]:
+            lines.append(f"{row['cumulative_ms']:>14.1f} {row['self_ms']:>10.1f}  {row['module']}")
+        lines += ["", f"{'self ms':>14}  package"]
+        for package, self_ms in report["by_package_self_ms"].items():
+            lines.append(f"{self_ms:>14.1f}  {package}")
+        return "\n".join(lines)
+
+
+# Global instance
+import_profiler = ImportProfiler()
+
+
+if __name__ == "__main__":
+    import importlib
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "backend.main"
+    import_profiler.install()
+    try:
+        importlib.import_module(target)
+    finally:
+        import_profiler.uninstall()
+    print(import_profiler.format_report(top=40))
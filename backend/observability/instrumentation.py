@@ -0,0 +1,166 @@
+"""
+Auto-instrumentation - Spans for HTTP requests, DB statements and outbound HTTP
+
+- TracingMiddleware: pure ASGI middleware; continues an incoming
+  `traceparent` or starts a trace per request and returns the id in
+  X-Trace-Id. Pure ASGI (not BaseHTTPMiddleware) so the span's context is
+  the one the endpoint runs in.
+- instrument_sqlalchemy(): cursor-execute listeners on every Engine; one
+  client span per statement inside a traced request
+- instrument_httpx(): wraps httpx.AsyncClient.send; one client span per
+  outbound call with the traceparent header injected (covers Ollama and
+  the OpenAI/Anthropic SDKs, which are built on httpx)
+
+Instrumentation spans use require_parent, so background loops that are
+not part of a trace record nothing.
+"""
+
+import time
+from typing import Optional
+
+from .tracing import RequestTracer, SpanContext, TRACEPARENT, request_tracer
+
+_EXCLUDED_PATHS = ("/health", "/metrics", "/api/system/tracing", "/api/system/loop-profile")
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request"""
+
+    def __init__(self, app, tracer: Optional[RequestTracer] = None, excluded_paths=_EXCLUDED_PATHS):
+        self.app = app
+        self.tracer = tracer or request_tracer
+        self.excluded_paths = tuple(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path", "").startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        parent = SpanContext.from_traceparent(headers.get(TRACEPARENT))
+        method = scope.get("method", "GET")
+
+        with self.tracer.span(
+            f"{method} {scope.get('path', '')}",
+            parent=parent,
+            kind="server",
+            **{"http.method": method, "http.target": scope.get("path", "")}
+        ) as span:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    status = message.get("status", 200)
+                    span.add_tag("http.status_code", status)
+                    if status >= 500:
+                        span.status = "error"
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"x-trace-id", span.trace_id.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Starlette stores the matched route: name the span by
+                # template (/api/tasks/{id}) rather than raw path
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    span.operation_name = f"{method} {route.path}"
+
+
+_sqlalchemy_instrumented = False
+_httpx_instrumented = False
+
+
+def instrument_sqlalchemy(tracer: Optional[RequestTracer] = None) -> bool:
+    """Record a span per SQL statement on every SQLAlchemy engine"""
+    global _sqlalchemy_instrumented
+    if _sqlalchemy_instrumented:
+        return True
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+    except ImportError:
+        return False
+
+    tracer = tracer or request_tracer
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.open_span(
+            "db.query",
+            kind="client",
+            require_parent=True,
+            **{
+                "db.system": conn.dialect.name,
+                "db.statement": statement[:300],
+                "db.operation": statement.lstrip().split(" ", 1)[0].upper(),
+            }
+        )
+        conn.info.setdefault("_grace_spans", []).append(span)
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_grace_spans")
+        span = stack.pop() if stack else None
+        if span is not None:
+            if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.add_tag("db.rowcount", cursor.rowcount)
+            tracer.close_span(span)
+
+    def handle_error(exception_context):
+        stack = exception_context.connection.info.get("_grace_spans") if exception_context.connection else None
+        span = stack.pop() if stack else None
+        if span is not None:
+            span.set_error(exception_context.original_exception)
+            tracer.close_span(span)
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(Engine, "handle_error", handle_error)
+    _sqlalchemy_instrumented = True
+    return True
+
+
+def instrument_httpx(tracer: Optional[RequestTracer] = None) -> bool:
+    """Wrap httpx.AsyncClient.send with a client span and traceparent injection"""
+    global _httpx_instrumented
+    if _httpx_instrumented:
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+
+    tracer = tracer or request_tracer
+    original_send = httpx.AsyncClient.send
+
+    async def send(self, request, *args, **kwargs):
+        span = tracer.open_span(
+            f"HTTP {request.method}",
+            kind="client",
+            require_parent=True,
+            **{
+                "http.method": request.method,
+                "http.url": str(request.url.copy_with(query=None)),
+                "net.peer.name": request.url.host,
+            }
+        )
+        if span is None:
+            return await original_send(self, request, *args, **kwargs)
+
+        request.headers[TRACEPARENT] = span.context().to_traceparent()
+        started = time.perf_counter()
+        try:
+            response = await original_send(self, request, *args, **kwargs)
+            span.add_tag("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.status = "error"
+            return response
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            span.add_tag("http.client_ms", round((time.perf_counter() - started) * 1000, 2))
+            tracer.close_span(span)
+
+    send.__wrapped__ = original_send
+    httpx.AsyncClient.send = send
+    _httpx_instrumented = True
+    return True
@@ -0,0 +1,475 @@
+"""
+Loop Profiler - Sampling profiler and stall detector for the asyncio event loop
+
+A daemon thread samples the event-loop thread's stack at a fixed rate and
+charges each sample's wall time (and, on Linux, the loop thread's CPU time)
+to whatever was running:
+- the asyncio task (named task, or its coroutine's qualified name)
+- the subsystem that task belongs to (HTM, trigger mesh, metrics, ...)
+- the request span it is serving, when a RequestTracer is attached
+
+Stall detection: a heartbeat coroutine ticks on the loop; when the sampler
+sees no tick for longer than the threshold it captures the loop thread's
+stack at that moment - the code that is actually blocking - and the
+heartbeat records the full stall duration once the loop resumes.
+
+Samples export as collapsed stacks ("subsystem;task;frame;frame N"), the
+input format of flamegraph.pl / speedscope / inferno.
+
+Usage:
+    GRACE_LOOP_PROFILE=1 uvicorn backend.main:app
+    POST /api/system/loop-profile/start?hz=100&stall_ms=100
+"""
+
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_DEFAULT_TASK_NAME = re.compile(r"^Task-\d+$")
+_MAX_STACK_DEPTH = 64
+_MAX_UNIQUE_STACKS = 20000
+
+# Ordered (module prefix, subsystem) rules; first match wins, otherwise the
+# backend package name is used
+SUBSYSTEM_RULES: List[Tuple[str, str]] = [
+    ("backend.core.htm", "htm"),
+    ("backend.core.message_bus", "message_bus"),
+    ("backend.routing.trigger_mesh", "trigger_mesh"),
+    ("backend.misc.trigger_mesh", "trigger_mesh"),
+    ("backend.observability", "metrics"),
+    ("backend.monitoring", "metrics"),
+    ("backend.metrics", "metrics"),
+    ("backend.self_heal", "self_heal"),
+    ("backend.meta", "meta_loops"),
+    ("backend.learning", "learning"),
+    ("backend.logging_system", "immutable_log"),
+    ("backend.routes", "api"),
+    ("backend.routers", "api"),
+    ("backend.chaos", "chaos"),
+    ("uvicorn", "api"),
+    ("starlette", "api"),
+    ("fastapi", "api"),
+]
+
+
+@dataclass
+class LoopStall:
+    """One period where the event loop didn't run the heartbeat"""
+    detected_at: float
+    duration_ms: float
+    task: str
+    subsystem: str
+    span: Optional[str]
+    stack: List[str] = field(default_factory=list)
+    finished: bool = False
+
+
+@dataclass
+class _Bucket:
+    samples: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+
+
+def module_name(filename: str) -> str:
+    """Dotted module name for a source file (best effort)"""
+    path = os.path.abspath(filename)
+    if path.startswith(_REPO_ROOT + os.sep):
+        rel = path[len(_REPO_ROOT) + 1:]
+    else:
+        # Site-packages / stdlib: keep the path below the last package root
+        marker = f"{os.sep}site-packages{os.sep}"
+        rel = path.split(marker, 1)[1] if marker in path else os.path.basename(path)
+    if rel.endswith(".py"):
+        rel = rel[:-3]
+    if rel.endswith(os.sep + "__init__"):
+        rel = rel[:-len("__init__") - 1]
+    return rel.replace(os.sep, ".")
+
+
+def subsystem_for(module: str) -> str:
+    for prefix, label in SUBSYSTEM_RULES:
+        if module.startswith(prefix):
+            return label
+    if module.startswith("backend."):
+        return module.split(".")[1]
+    return "other"
+
+
+class LoopProfiler:
+    """
+    Sampling profiler bound to one event loop
+
+    Thread model: the sampler thread only reads frames and writes the
+    aggregates under a lock; reports are built by copying under that lock.
+    """
+
+    def __init__(self):
+        self.hz = 100
+        self.stall_threshold_ms = 100.0
+        self.running = False
+        self.started_at: Optional[float] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._cpu_clock: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._last_tick = 0.0
+        self._lock = threading.Lock()
+
+        self._stacks: Dict[Tuple[str, ...], int] = {}
+        self._by_subsystem: Dict[str, _Bucket] = {}
+        self._by_task: Dict[Tuple[str, str], _Bucket] = {}
+        self._by_span: Dict[str, _Bucket] = {}
+        self._total = _Bucket()
+        self._dropped_stacks = 0
+        self._sampler_cost_s = 0.0
+
+        self.stalls: Deque[LoopStall] = deque(maxlen=100)
+        self._open_stall: Optional[LoopStall] = None
+        self._open_stall_spans: List[Any] = []
+        self._tracers: List[Any] = []
+        self._code_labels: Dict[Any, Tuple[str, str]] = {}
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def attach_tracer(self, tracer):
+        """Attribute samples to the tracer's active spans and log stalls on them"""
+        if tracer not in self._tracers:
+            self._tracers.append(tracer)
+
+    def start(self, hz: Optional[int] = None, stall_threshold_ms: Optional[float] = None):
+        """Start sampling the running loop (call from inside the loop)"""
+        if self.running:
+            return
+        if hz:
+            self.hz = max(1, min(int(hz), 1000))
+        if stall_threshold_ms:
+            self.stall_threshold_ms = max(1.0, float(stall_threshold_ms))
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        try:
+            self._cpu_clock = time.pthread_getcpuclockid(self._loop_thread_id)
+        except (AttributeError, OSError):
+            self._cpu_clock = None
+
+        self.running = True
+        self.started_at = time.time()
+        self._last_tick = time.perf_counter()
+        self._stop.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat(), name="loop_profiler.heartbeat")
+        self._thread = threading.Thread(target=self._sample_loop, name="loop-profiler", daemon=True)
+        self._thread.start()
+        print(f"[OK] Loop profiler sampling at {self.hz} Hz (stall threshold {self.stall_threshold_ms:.0f} ms)")
+
+    def stop(self):
+        """Stop sampling; aggregates are kept until reset()"""
+        if not self.running:
+            return
+        self.running = False
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self._by_subsystem.clear()
+            self._by_task.clear()
+            self._by_span.clear()
+            self._total = _Bucket()
+            self._dropped_stacks = 0
+            self._sampler_cost_s = 0.0
+            self.stalls.clear()
+            self._open_stall = None
+            self._open_stall_spans = []
+
+    # ------------------------------------------------------------------
+    # Loop side
+    # ------------------------------------------------------------------
+
+    async def _heartbeat(self):
+        interval = min(0.05, self.stall_threshold_ms / 4000)
+        try:
+            while self.running:
+                expected = time.perf_counter() + interval
+                await asyncio.sleep(interval)
+                now = time.perf_counter()
+                lag_ms = (now - expected) * 1000
+                self._last_tick = now
+
+                with self._lock:
+                    stall, spans = self._open_stall, self._open_stall_spans
+                    self._open_stall, self._open_stall_spans = None, []
+                if stall is not None:
+                    stall.duration_ms = max(stall.duration_ms, lag_ms)
+                    stall.finished = True
+                    self._report_stall(stall, spans)
+                elif lag_ms > self.stall_threshold_ms:
+                    # Stall shorter than one sampling period: duration known, culprit not
+                    stall = LoopStall(
+                        detected_at=time.time(), duration_ms=lag_ms, task="(unsampled)",
+                        subsystem="unknown", span=None, finished=True,
+                    )
+                    self.stalls.append(stall)
+                    self._report_stall(stall)
+        except asyncio.CancelledError:
+            pass
+
+    def _report_stall(self, stall: LoopStall, spans: Optional[List[Any]] = None):
+        print(
+            f"[WARN] Event loop stalled {stall.duration_ms:.0f} ms in {stall.subsystem} "
+            f"({stall.task}){' at ' + stall.stack[-1] if stall.stack else ''}"
+        )
+        fields = {
+            "duration_ms": round(stall.duration_ms, 1),
+            "culprit_task": stall.task,
+            "culprit_subsystem": stall.subsystem,
+        }
+        if spans:
+            # Spans open when the stall was caught - some may have finished since
+            for span in spans:
+                span.log("event_loop_stall", **fields)
+            return
+        for tracer in self._tracers:
+            try:
+                tracer.annotate_active_spans("event_loop_stall", **fields)
+            except Exception:
+                pass
+
+    # ------------------------------------------------------------------
+    # Sampler thread
+    # ------------------------------------------------------------------
+
+    def _sample_loop(self):
+        period = 1.0 / self.hz
+        last_wall = time.perf_counter()
+        last_cpu = self._cpu_time()
+
+        while not self._stop.wait(period):
+            began = time.perf_counter()
+            cpu = self._cpu_time()
+            wall_delta = began - last_wall
+            cpu_delta = (cpu - last_cpu) if cpu is not None and last_cpu is not None else 0.0
+            last_wall, last_cpu = began, cpu
+            try:
+                self._take_sample(began, wall_delta, cpu_delta)
+            except Exception:
+                pass
+            self._sampler_cost_s += time.perf_counter() - began
+
+    def _cpu_time(self) -> Optional[float]:
+        if self._cpu_clock is None:
+            return None
+        try:
+            return time.clock_gettime(self._cpu_clock)
+        except OSError:
+            return None
+
+    def _take_sample(self, now: float, wall_delta: float, cpu_delta: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+
+        task = self._current_task()
+        stack = self._stack(frame)
+        idle = False
+        if task is None and self._in_select(frame):
+            # The sampler mostly gets the GIL when the loop releases it in
+            # select(); with callbacks already queued that's a busy turn, so
+            # charge it to the task about to resume rather than to idle
+            task = self._next_ready_task()
+            if task is not None:
+                stack = self._coro_stack(task)
+            else:
+                idle = True
+
+        if idle:
+            task_label, subsystem = "(idle)", "idle"
+        elif task is not None:
+            task_label, subsystem = self._task_label(task)
+        else:
+            task_label = "(loop callbacks)"
+            subsystem = next(
+                (subsystem_for(f.split(":", 1)[0]) for f in stack if f.startswith("backend.")), "loop"
+            )
+        span = self._span_for(task) if task is not None else None
+
+        with self._lock:
+            for bucket in (
+                self._total,
+                self._by_subsystem.setdefault(subsystem, _Bucket()),
+                self._by_task.setdefault((task_label, subsystem), _Bucket()),
+                self._by_span.setdefault(span, _Bucket()) if span else None,
+            ):
+                if bucket is not None:
+                    bucket.samples += 1
+                    bucket.wall_s += wall_delta
+                    bucket.cpu_s += cpu_delta
+
+            if not idle:
+                key = (subsystem, task_label, *stack)
+                if key in self._stacks:
+                    self._stacks[key] += 1
+                elif len(self._stacks) < _MAX_UNIQUE_STACKS:
+                    self._stacks[key] = 1
+                else:
+                    self._dropped_stacks += 1
+
+            # Stall: heartbeat overdue -> capture the blocking stack once
+            overdue_ms = (now - self._last_tick) * 1000
+            if overdue_ms > self.stall_threshold_ms and self._open_stall is None and not idle:
+                self._open_stall = LoopStall(
+                    detected_at=time.time(),
+                    duration_ms=overdue_ms,
+                    task=task_label,
+                    subsystem=subsystem,
+                    span=span,
+                    stack=list(stack),
+                )
+                self.stalls.append(self._open_stall)
+                self._open_stall_spans = [
+                    span for tracer in self._tracers for span in list(tracer.active_spans.values())
+                ]
+            elif self._open_stall is not None:
+                self._open_stall.duration_ms = max(self._open_stall.duration_ms, overdue_ms)
+
+    def _current_task(self) -> Optional[asyncio.Task]:
+        current = getattr(asyncio.tasks, "_current_tasks", None)
+        return current.get(self._loop) if current is not None else None
+
+    def _task_label(self, task: asyncio.Task) -> Tuple[str, str]:
+        coro = task.get_coro()
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+        if code is not None and code in self._code_labels:
+            qualname, subsystem = self._code_labels[code]
+        else:
+            qualname = getattr(coro, "__qualname__", type(coro).__name__)
+            module = module_name(code.co_filename) if code is not None else ""
+            subsystem = subsystem_for(module)
+            if code is not None:
+                self._code_labels[code] = (qualname, subsystem)
+
+        name = task.get_name()
+        return (qualname if _DEFAULT_TASK_NAME.match(name) else name), subsystem
+
+    def _span_for(self, task: asyncio.Task) -> Optional[str]:
+        task_id = id(task)
+        for tracer in self._tracers:
+            for span in list(tracer.active_spans.values()):
+                if getattr(span, "task_id", None) == task_id:
+                    return span.operation_name
+        return None
+
+    @staticmethod
+    def _stack(frame) -> Tuple[str, ...]:
+        frames = []
+        while frame is not None and len(frames) < _MAX_STACK_DEPTH:
+            code = frame.f_code
+            frames.append(f"{module_name(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        frames.reverse()
+        return tuple(frames)
+
+    def _next_ready_task(self) -> Optional[asyncio.Task]:
+        ready = getattr(self._loop, "_ready", None)
+        if not ready:
+            return None
+        for handle in list(ready)[:32]:
+            owner = getattr(getattr(handle, "_callback", None), "__self__", None)
+            if isinstance(owner, asyncio.Task):
+                return owner
+        return None
+
+    @staticmethod
+    def _coro_stack(task: asyncio.Task) -> Tuple[str, ...]:
+        """Suspended coroutine chain of a task (outermost first)"""
+        frames = []
+        coro = task.get_coro()
+        while coro is not None and len(frames) < _MAX_STACK_DEPTH:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+            if frame is None:
+                break
+            frames.append(f"{module_name(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+        return tuple(frames)
+
+    @staticmethod
+    def _in_select(frame) -> bool:
+        code = frame.f_code
+        return code.co_name in ("select", "poll", "_run_once") and code.co_filename.endswith(
+            ("selectors.py", "base_events.py")
+        )
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def get_report(self, top: int = 25) -> Dict[str, Any]:
+        """Time per subsystem / task / span plus recent stalls"""
+        with self._lock:
+            total = _Bucket(self._total.samples, self._total.wall_s, self._total.cpu_s)
+            subsystems = {k: _Bucket(**asdict(v)) for k, v in self._by_subsystem.items()}
+            tasks = {k: _Bucket(**asdict(v)) for k, v in self._by_task.items()}
+            spans = {k: _Bucket(**asdict(v)) for k, v in self._by_span.items()}
+            stalls = [asdict(s) for s in self.stalls]
+
+        def _row(bucket: _Bucket) -> Dict[str, Any]:
+            return {
+                "samples": bucket.samples,
+                "wall_ms": round(bucket.wall_s * 1000, 1),
+                "cpu_ms": round(bucket.cpu_s * 1000, 1) if self._cpu_clock is not None else None,
+                "wall_pct": round(100.0 * bucket.wall_s / total.wall_s, 2) if total.wall_s else 0.0,
+            }
+
+        elapsed = (time.time() - self.started_at) if self.started_at else 0.0
+        return {
+            "running": self.running,
+            "hz": self.hz,
+            "stall_threshold_ms": self.stall_threshold_ms,
+            "profiled_seconds": round(elapsed, 1),
+            "samples": total.samples,
+            "cpu_time_available": self._cpu_clock is not None,
+            "sampler_overhead_pct": round(100.0 * self._sampler_cost_s / elapsed, 3) if elapsed else 0.0,
+            "by_subsystem": {
+                k: _row(v) for k, v in sorted(subsystems.items(), key=lambda kv: kv[1].wall_s, reverse=True)
+            },
+            "top_tasks": [
+                {"task": task, "subsystem": subsystem, **_row(v)}
+                for (task, subsystem), v in sorted(tasks.items(), key=lambda kv: kv[1].wall_s, reverse=True)[:top]
+            ],
+            "by_span": {
+                k: _row(v) for k, v in sorted(spans.items(), key=lambda kv: kv[1].wall_s, reverse=True)[:top]
+            },
+            "stalls": stalls[-top:],
+            "dropped_stacks": self._dropped_stacks,
+        }
+
+    def export_collapsed(self, subsystem: Optional[str] = None) -> str:
+        """Collapsed stacks for flamegraph.pl / speedscope ("a;b;c count" per line)"""
+        with self._lock:
+            items = list(self._stacks.items())
+        lines = [
+            ";".join(part.replace(";", ":").replace(" ", "_") for part in key) + f" {count}"
+            for key, count in items
+            if subsystem is None or key[0] == subsystem
+        ]
+        return "\n".join(sorted(lines)) + ("\n" if lines else "")
+
+
+# Global instance
+loop_profiler = LoopProfiler()
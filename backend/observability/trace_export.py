@@ -0,0 +1,206 @@
+"""
+Trace Export - Batched OTLP/JSON export of kept spans
+
+Drains RequestTracer.export_buffer in batches and writes each batch as one
+OTLP `ExportTraceServiceRequest` JSON document:
+- appended as a line to logs/traces/otlp-YYYYMMDD.jsonl (the local
+  stand-in for a collector - `otelcol` can replay it with a filelog/otlpjson
+  receiver), or
+- POSTed to an OTLP/HTTP collector when GRACE_OTLP_ENDPOINT is set
+  (e.g. http://localhost:4318/v1/traces), falling back to the file on error
+
+Flushes every interval_s, or sooner once batch_size spans are waiting.
+"""
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .tracing import RequestTracer, Span, request_tracer
+
+_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3, "producer": 4, "consumer": 5}
+_STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+
+def _attr_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": value if isinstance(value, str) else str(value)}
+
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _attr_value(v)} for k, v in values.items() if v is not None]
+
+
+def span_to_otlp(span: Span) -> Dict[str, Any]:
+    end_time = span.end_time or span.start_time
+    doc = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.operation_name,
+        "kind": _SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(int(span.start_time * 1e9)),
+        "endTimeUnixNano": str(int(end_time * 1e9)),
+        "attributes": _attributes(span.tags),
+        "events": [
+            {
+                "timeUnixNano": str(int(entry.get("timestamp", end_time) * 1e9)),
+                "name": str(entry.get("message", "log")),
+                "attributes": _attributes({k: v for k, v in entry.items() if k not in ("timestamp", "message")}),
+            }
+            for entry in span.logs
+        ],
+        "status": {"code": _STATUS_CODES.get(span.status, 0)},
+    }
+    if span.parent_span_id:
+        doc["parentSpanId"] = span.parent_span_id
+    if span.status == "error" and "error.message" in span.tags:
+        doc["status"]["message"] = span.tags["error.message"]
+    return doc
+
+
+def to_otlp(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """Wrap spans in an OTLP ExportTraceServiceRequest (JSON encoding)"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _attributes({
+                "service.name": service_name,
+                "host.name": os.uname().nodename if hasattr(os, "uname") else None,
+                "process.pid": os.getpid(),
+            })},
+            "scopeSpans": [{
+                "scope": {"name": "grace.observability.tracing"},
+                "spans": [span_to_otlp(s) for s in spans],
+            }],
+        }]
+    }
+
+
+class OTLPJsonExporter:
+    """Background batch exporter for one RequestTracer"""
+
+    def __init__(
+        self,
+        tracer: RequestTracer,
+        directory: Optional[Path] = None,
+        endpoint: Optional[str] = None,
+        batch_size: int = 512,
+        interval_s: float = 5.0,
+        service_name: str = "grace-backend"
+    ):
+        self.tracer = tracer
+        self.directory = Path(directory or os.getenv("GRACE_TRACE_DIR", "logs/traces"))
+        self.endpoint = endpoint if endpoint is not None else os.getenv("GRACE_OTLP_ENDPOINT")
+        self.batch_size = batch_size
+        self.interval_s = interval_s
+        self.service_name = service_name
+
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.running = False
+
+        self.batches_exported = 0
+        self.spans_exported = 0
+        self.export_errors = 0
+        self.last_error: Optional[str] = None
+        self.last_export_at: Optional[float] = None
+
+    async def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._wake = asyncio.Event()
+        self.tracer.exporter = self
+        self._task = asyncio.create_task(self._run(), name="trace_exporter")
+        target = self.endpoint or str(self.directory)
+        print(f"[OK] Trace exporter started (OTLP/JSON -> {target}, sample rate {self.tracer.sample_rate})")
+
+    async def stop(self):
+        """Stop and flush whatever is still buffered"""
+        if not self.running:
+            return
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        if self.tracer.exporter is self:
+            self.tracer.exporter = None
+
+    def notify(self, buffered: int):
+        """Called by the tracer when spans are buffered"""
+        if self._wake is not None and buffered >= self.batch_size:
+            self._wake.set()
+
+    async def _run(self):
+        while self.running:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                self.export_errors += 1
+                self.last_error = str(e)
+
+    async def flush(self) -> int:
+        """Export everything currently buffered; returns spans exported"""
+        exported = 0
+        while True:
+            batch = self.tracer.drain(self.batch_size)
+            if not batch:
+                return exported
+            await self._export(to_otlp(batch, self.service_name))
+            exported += len(batch)
+            self.batches_exported += 1
+            self.spans_exported += len(batch)
+            self.last_export_at = time.time()
+
+    async def _export(self, document: Dict[str, Any]):
+        if self.endpoint:
+            try:
+                import httpx
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.post(self.endpoint, json=document)
+                    response.raise_for_status()
+                return
+            except Exception as e:
+                self.export_errors += 1
+                self.last_error = f"collector: {e}"
+        await asyncio.to_thread(self._append_file, json.dumps(document, separators=(",", ":")))
+
+    def _append_file(self, line: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"otlp-{datetime.utcnow().strftime('%Y%m%d')}.jsonl"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "target": self.endpoint or str(self.directory),
+            "batch_size": self.batch_size,
+            "interval_s": self.interval_s,
+            "batches_exported": self.batches_exported,
+            "spans_exported": self.spans_exported,
+            "export_errors": self.export_errors,
+            "last_error": self.last_error,
+            "last_export_at": self.last_export_at,
+        }
+
+
+# Global instance
+trace_exporter = OTLPJsonExporter(request_tracer)
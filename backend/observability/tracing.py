@@ -1,12 +1,78 @@
 """
 Request Tracing - Distributed tracing for request flows
+
+Spans can be managed by hand (start_trace / start_span / finish_span) or
+through the context-propagating API:
+
+    with request_tracer.span("rag.retrieve", top_k=5):
+        ...
+
+The active span lives in a contextvar, so it follows nested calls and
+asyncio tasks (create_task copies the context) without being passed
+around. To cross a queue (message bus, trigger mesh, HTM) the producer
+calls inject(carrier) and the consumer opens its span with
+parent=extract(carrier); the carrier holds a W3C `traceparent` string.
+
+Sampling:
+- head: a new trace is sampled with probability sample_rate and the flag
+  travels with its context
+- tail: spans are buffered per trace until every open span of that trace
+  has finished; unsampled traces are still kept when a span was slower
+  than slow_threshold_ms or failed
+
+Kept spans go to a bounded buffer that trace_export.OTLPJsonExporter
+drains in batches.
 """
 
+import asyncio
+import functools
+import os
+import random
 import time
 import uuid
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Any, Deque, Set, Union
 from dataclasses import dataclass, field
-from datetime import datetime
+
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("grace_current_span", default=None)
+
+TRACEPARENT = "traceparent"
+
+
+def _new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _new_span_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@dataclass
+class SpanContext:
+    """The part of a span that crosses process / queue boundaries"""
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+    
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+    
+    @classmethod
+    def from_traceparent(cls, value: Any) -> Optional["SpanContext"]:
+        """Parse a W3C traceparent header; None when missing or malformed"""
+        if not isinstance(value, str):
+            return None
+        parts = value.strip().split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        try:
+            flags = int(parts[3], 16)
+        except ValueError:
+            return None
+        return cls(trace_id=parts[1], span_id=parts[2], sampled=bool(flags & 1))
 
 
 @dataclass
@@ -21,6 +87,10 @@ class Span:
     duration_ms: Optional[float] = None
     tags: Dict[str, Any] = field(default_factory=dict)
     logs: List[Dict[str, Any]] = field(default_factory=list)
+    task_id: Optional[int] = None  # id() of the asyncio task that opened the span
+    kind: str = "internal"  # internal | server | client | producer | consumer
+    sampled: bool = True
+    status: str = "unset"  # unset | ok | error
     
     def finish(self):
         """Mark span as finished"""
@@ -38,6 +108,15 @@ class Span:
             "message": message,
             **fields
         })
+    
+    def set_error(self, error: BaseException):
+        """Mark the span failed (failed traces survive tail sampling)"""
+        self.status = "error"
+        self.tags["error.type"] = type(error).__name__
+        self.tags["error.message"] = str(error)[:500]
+    
+    def context(self) -> SpanContext:
+        return SpanContext(trace_id=self.trace_id, span_id=self.span_id, sampled=self.sampled)
 
 
 @dataclass
@@ -48,6 +127,7 @@ class Trace:
     start_time: float = field(default_factory=time.time)
     end_time: Optional[float] = None
     duration_ms: Optional[float] = None
+    sampled: bool = True
     
     def add_span(self, span: Span):
         """Add a span to the trace"""
@@ -59,18 +139,67 @@ class Trace:
         self.duration_ms = (self.end_time - self.start_time) * 1000
 
 
+@dataclass
+class _PendingTrace:
+    """Spans of one trace held back until the sampling decision"""
+    open_span_ids: Set[str] = field(default_factory=set)
+    sampled: bool = False
+    spans: List[Span] = field(default_factory=list)
+    truncated: int = 0
+
+
 class RequestTracer:
     """Manage distributed tracing for requests"""
     
-    def __init__(self):
-        self.traces: Dict[str, Trace] = {}
+    def __init__(
+        self,
+        sample_rate: Optional[float] = None,
+        slow_threshold_ms: Optional[float] = None,
+        buffer_size: int = 10000,
+        max_traces: int = 1000,
+        max_pending_traces: int = 2000,
+        max_spans_per_trace: int = 512
+    ):
+        self.traces: "OrderedDict[str, Trace]" = OrderedDict()
         self.active_spans: Dict[str, Span] = {}
+        
+        self.sample_rate = sample_rate if sample_rate is not None else float(
+            os.getenv("GRACE_TRACE_SAMPLE_RATE", "0.1")
+        )
+        self.slow_threshold_ms = slow_threshold_ms if slow_threshold_ms is not None else float(
+            os.getenv("GRACE_TRACE_SLOW_MS", "1000")
+        )
+        self.max_traces = max_traces
+        self.max_pending_traces = max_pending_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        
+        self._pending: "OrderedDict[str, _PendingTrace]" = OrderedDict()
+        self._decisions: "OrderedDict[str, bool]" = OrderedDict()
+        self.export_buffer: Deque[Span] = deque(maxlen=buffer_size)
+        self.recent_traces: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self.exporter = None
+        
+        self.stats = {
+            "spans_started": 0,
+            "traces_kept_head": 0,
+            "traces_kept_tail": 0,
+            "traces_dropped": 0,
+            "pending_evicted": 0,
+            "spans_truncated": 0,
+            "buffer_overflow": 0,
+        }
+    
+    # ------------------------------------------------------------------
+    # Manual API
+    # ------------------------------------------------------------------
     
     def start_trace(self, operation_name: str = "request") -> Trace:
         """Start a new trace"""
-        trace_id = str(uuid.uuid4())
-        trace = Trace(trace_id=trace_id)
+        trace_id = _new_trace_id()
+        trace = Trace(trace_id=trace_id, sampled=self._head_sample())
         self.traces[trace_id] = trace
+        while len(self.traces) > self.max_traces:
+            self.traces.popitem(last=False)
         
         root_span = self.start_span(
             trace_id=trace_id,
@@ -86,28 +215,23 @@ class RequestTracer:
         parent_span_id: Optional[str] = None
     ) -> Span:
         """Start a new span within a trace"""
-        span_id = str(uuid.uuid4())
-        span = Span(
-            span_id=span_id,
+        trace = self.traces.get(trace_id)
+        span = self._open(
             trace_id=trace_id,
             parent_span_id=parent_span_id,
-            operation_name=operation_name,
-            start_time=time.time()
+            sampled=trace.sampled if trace else True,
+            operation_name=operation_name
         )
         
-        self.active_spans[span_id] = span
-        
-        if trace_id in self.traces:
-            self.traces[trace_id].add_span(span)
+        if trace is not None:
+            trace.add_span(span)
         
         return span
     
     def finish_span(self, span_id: str):
         """Finish a span"""
         if span_id in self.active_spans:
-            span = self.active_spans[span_id]
-            span.finish()
-            del self.active_spans[span_id]
+            self.close_span(self.active_spans[span_id])
     
     def finish_trace(self, trace_id: str):
         """Finish a trace"""
@@ -126,3 +250,243 @@ class RequestTracer:
     def get_span(self, span_id: str) -> Optional[Span]:
         """Get a span by ID"""
         return self.active_spans.get(span_id)
+    
+    def annotate_active_spans(self, message: str, **fields):
+        """Log an event on every open span (e.g. an event-loop stall they sat through)"""
+        for span in list(self.active_spans.values()):
+            span.log(message, **fields)
+    
+    # ------------------------------------------------------------------
+    # Context propagation
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        """Span active in the calling task / context"""
+        return _current_span.get()
+    
+    def open_span(
+        self,
+        operation_name: str,
+        parent: Union[Span, SpanContext, None] = None,
+        kind: str = "internal",
+        require_parent: bool = False,
+        **tags
+    ) -> Optional[Span]:
+        """
+        Start a span under `parent` (default: the current span)
+        
+        With require_parent=True nothing is recorded outside a trace - used
+        by instrumentation so background traffic doesn't start traces.
+        """
+        if parent is None:
+            parent = _current_span.get()
+        if isinstance(parent, Span):
+            parent = parent.context()
+        
+        if parent is None:
+            if require_parent:
+                return None
+            return self._open(_new_trace_id(), None, self._head_sample(), operation_name, kind, tags)
+        return self._open(parent.trace_id, parent.span_id, parent.sampled, operation_name, kind, tags)
+    
+    def close_span(self, span: Span):
+        """Finish a span opened with open_span()"""
+        span.finish()
+        self.active_spans.pop(span.span_id, None)
+        
+        pending = self._pending.get(span.trace_id)
+        if pending is None:
+            return  # evicted while open
+        if len(pending.spans) < self.max_spans_per_trace:
+            pending.spans.append(span)
+        else:
+            pending.truncated += 1
+        pending.open_span_ids.discard(span.span_id)
+        if not pending.open_span_ids:
+            del self._pending[span.trace_id]
+            self._decide(span.trace_id, pending)
+    
+    @contextmanager
+    def span(
+        self,
+        operation_name: str,
+        parent: Union[Span, SpanContext, None] = None,
+        kind: str = "internal",
+        require_parent: bool = False,
+        **tags
+    ):
+        """Open a span, make it current for the block, finish it on exit"""
+        span = self.open_span(operation_name, parent=parent, kind=kind, require_parent=require_parent, **tags)
+        if span is None:
+            yield None
+            return
+        
+        token = _current_span.set(span)
+        try:
+            yield span
+        except (asyncio.CancelledError, GeneratorExit):
+            span.add_tag("cancelled", True)
+            raise
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.close_span(span)
+    
+    def traced(self, operation_name: Optional[str] = None, kind: str = "internal", require_parent: bool = True, **tags):
+        """Decorator form of span() for sync and async functions"""
+        def decorator(func):
+            name = operation_name or func.__qualname__
+            
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name, kind=kind, require_parent=require_parent, **tags):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+            
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, kind=kind, require_parent=require_parent, **tags):
+                    return func(*args, **kwargs)
+            return wrapper
+        
+        return decorator
+    
+    def inject(self, carrier: Dict[str, Any], span: Optional[Span] = None) -> Dict[str, Any]:
+        """Write the current (or given) span context into a carrier dict"""
+        span = span or _current_span.get()
+        if span is not None:
+            carrier[TRACEPARENT] = span.context().to_traceparent()
+        return carrier
+    
+    @staticmethod
+    def extract(carrier: Optional[Dict[str, Any]]) -> Optional[SpanContext]:
+        """Read a span context from a carrier dict (None if absent)"""
+        if not carrier:
+            return None
+        return SpanContext.from_traceparent(carrier.get(TRACEPARENT))
+    
+    # ------------------------------------------------------------------
+    # Sampling and export buffer
+    # ------------------------------------------------------------------
+    
+    def _head_sample(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+    
+    def _open(
+        self,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        sampled: bool,
+        operation_name: str,
+        kind: str = "internal",
+        tags: Optional[Dict[str, Any]] = None
+    ) -> Span:
+        span = Span(
+            span_id=_new_span_id(),
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+            operation_name=operation_name,
+            start_time=time.time(),
+            tags=dict(tags) if tags else {},
+            task_id=self._current_task_id(),
+            kind=kind,
+            sampled=sampled
+        )
+        
+        self.active_spans[span.span_id] = span
+        self.stats["spans_started"] += 1
+        
+        pending = self._pending.get(trace_id)
+        if pending is None:
+            pending = self._pending[trace_id] = _PendingTrace()
+            while len(self._pending) > self.max_pending_traces:
+                _, evicted = self._pending.popitem(last=False)
+                # Its spans are discarded; don't keep them alive as "active"
+                for span_id in evicted.open_span_ids:
+                    self.active_spans.pop(span_id, None)
+                self.stats["pending_evicted"] += 1
+        pending.open_span_ids.add(span.span_id)
+        pending.sampled = pending.sampled or sampled
+        
+        return span
+    
+    def _decide(self, trace_id: str, pending: _PendingTrace):
+        """Tail decision once a trace has no open spans in this process"""
+        spans = pending.spans
+        slowest = max((s.duration_ms or 0.0 for s in spans), default=0.0)
+        errored = any(s.status == "error" for s in spans)
+        
+        if pending.sampled or self._decisions.get(trace_id):
+            reason = "head"
+        elif slowest >= self.slow_threshold_ms or errored:
+            reason = "error" if errored else "latency"
+        else:
+            reason = None
+        
+        # A later segment of a kept trace (e.g. a bus handler that outlived
+        # the request) is kept too
+        self._decisions[trace_id] = reason is not None
+        self._decisions.move_to_end(trace_id)
+        while len(self._decisions) > 10000:
+            self._decisions.popitem(last=False)
+        
+        if reason is None:
+            self.stats["traces_dropped"] += 1
+            return
+        
+        self.stats["traces_kept_head" if reason == "head" else "traces_kept_tail"] += 1
+        self.stats["spans_truncated"] += pending.truncated
+        for span in spans:
+            if len(self.export_buffer) == self.export_buffer.maxlen:
+                self.stats["buffer_overflow"] += 1
+            self.export_buffer.append(span)
+        
+        root = next((s for s in spans if s.parent_span_id is None), spans[-1] if spans else None)
+        self.recent_traces.append({
+            "trace_id": trace_id,
+            "root": root.operation_name if root else None,
+            "duration_ms": round(root.duration_ms or 0.0, 2) if root else 0.0,
+            "slowest_ms": round(slowest, 2),
+            "spans": len(spans),
+            "error": errored,
+            "kept_by": reason,
+        })
+        
+        if self.exporter is not None:
+            self.exporter.notify(len(self.export_buffer))
+    
+    def drain(self, max_spans: int) -> List[Span]:
+        """Pop up to max_spans finished, kept spans for export"""
+        batch = []
+        while self.export_buffer and len(batch) < max_spans:
+            batch.append(self.export_buffer.popleft())
+        return batch
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "active_spans": len(self.active_spans),
+            "pending_traces": len(self._pending),
+            "buffered_spans": len(self.export_buffer),
+            "buffer_capacity": self.export_buffer.maxlen,
+            **self.stats,
+            "exporter": self.exporter.get_stats() if self.exporter is not None else None,
+            "recent_traces": list(self.recent_traces)[-20:],
+        }
+    
+    @staticmethod
+    def _current_task_id() -> Optional[int]:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return None
+        return id(task) if task is not None else None
+
+
+# Global instance
+request_tracer = RequestTracer()
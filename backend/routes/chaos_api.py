@@ -24,6 +24,17 @@ class ChaosRequest(BaseModel):
     approved_by: str
 
 
+class LoadProfileRequest(BaseModel):
+    """Request to run a load-profile sweep (target must be a configured one)"""
+    base_url: Optional[str] = None
+    rates: Optional[List[float]] = None
+    levels: Optional[List[Dict[str, Any]]] = None
+    duration_s: float = 30.0
+    cooldown_s: float = 5.0
+    environment: str = 'staging'
+    approved_by: str
+
+
 @router.get("/status")
 async def get_chaos_status():
     """Get chaos agent status"""
@@ -162,6 +173,66 @@ async def halt_chaos():
         raise HTTPException(status_code=503, detail=f"Message bus not available: {e}")
 
 
+@router.post("/load-profile")
+async def start_load_profile(request: LoadProfileRequest):
+    """
+    Start a load-profile sweep in the background
+    
+    Drives an open-loop, read-only request mix at each offered rate while
+    the chaos runner holds each stress level; poll GET /load-profile for
+    the report. Only configured targets (GRACE_LOAD_PROFILE_TARGETS, default
+    the local app) can be profiled, every run needs approved_by, and rates
+    and window length are capped.
+    """
+    try:
+        from backend.chaos.chaos_runner import chaos_runner
+        from backend.chaos.load_profile import StressLevel, check_limits, resolve_target
+        
+        if not request.approved_by.strip():
+            raise HTTPException(status_code=403, detail="Load profiling requires approval")
+        
+        try:
+            base_url = resolve_target(request.base_url)
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        
+        try:
+            check_limits(request.rates, request.duration_s)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        try:
+            levels = [StressLevel(**level) for level in request.levels] if request.levels else None
+        except TypeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid stress level: {e}")
+        
+        started = chaos_runner.start_load_profile(
+            base_url=base_url,
+            levels=levels,
+            rates=request.rates,
+            duration_s=request.duration_s,
+            cooldown_s=request.cooldown_s
+        )
+        if not started:
+            raise HTTPException(status_code=409, detail="A load profile is already running")
+        
+        logger.info(f"[CHAOS-API] Load profile against {base_url} approved by {request.approved_by}")
+        return {"status": "started", "base_url": base_url, "approved_by": request.approved_by}
+    except ImportError as e:
+        raise HTTPException(status_code=503, detail=f"Chaos runner not available: {e}")
+
+
+@router.get("/load-profile")
+async def get_load_profile():
+    """Status of the current load profile and the last saturation report"""
+    try:
+        from backend.chaos.chaos_runner import chaos_runner
+        
+        return chaos_runner.get_load_profile_status()
+    except ImportError as e:
+        raise HTTPException(status_code=503, detail=f"Chaos runner not available: {e}")
+
+
 @router.get("/resilience")
 async def get_resilience_rankings():
     """Get components ranked by resilience"""
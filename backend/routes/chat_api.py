@@ -23,6 +23,7 @@ from backend.action_gateway import action_gateway, GovernanceTier
 from backend.reflection_loop import reflection_loop
 from backend.event_bus import event_bus, Event, EventType
 from backend.core.unified_event_publisher import publish_event_obj
+from backend.observability.tracing import request_tracer
 
 router = APIRouter()
 
@@ -193,12 +194,13 @@ async def chat_with_grace(msg: ChatMessage) -> ChatResponse:
         rag_service = RAGService()
         await rag_service.initialize()
         
-        rag_results = await rag_service.retrieve(
-            query=msg.message,
-            top_k=5,
-            similarity_threshold=0.7,
-            requested_by=msg.user_id
-        )
+        with request_tracer.span("chat.rag_retrieve", require_parent=True, top_k=5):
+            rag_results = await rag_service.retrieve(
+                query=msg.message,
+                top_k=5,
+                similarity_threshold=0.7,
+                requested_by=msg.user_id
+            )
         
         rag_context = [
             {
@@ -214,10 +216,11 @@ async def chat_with_grace(msg: ChatMessage) -> ChatResponse:
         from backend.world_model.grace_world_model import grace_world_model
         await grace_world_model.initialize()
         
-        knowledge_items = await grace_world_model.query(
-            query=msg.message,
-            top_k=5
-        )
+        with request_tracer.span("chat.world_model_query", require_parent=True, top_k=5):
+            knowledge_items = await grace_world_model.query(
+                query=msg.message,
+                top_k=5
+            )
         
         world_model_facts = {
             "facts": [
@@ -66,6 +66,13 @@ async def _decide_approval_db(*, request_id: int, decision: str, reason: str, cu
         req.decided_at = func.now()
         await session.commit()
         await session.refresh(req)
+        if req.status == "approved":
+            # Self-heal runs waiting on this request become claimable
+            try:
+                from ..self_heal.runner import runner
+                await runner.approve_runs(session, approval_request_id=req.id, approved_by=current_user)
+            except Exception as e:
+                print(f"[WARN] Approval {req.id}: self-heal runs not released: {e}")
         return {
             "id": req.id,
             "status": req.status,
@@ -1388,7 +1388,8 @@ async def ask_with_rag(
         for item in context_result.get('results', [])
     ])
     
-    prompt = f"""Based on the following context, answer the question.
+    instruction = "Based on the following context, answer the question."
+    prompt = f"""{instruction}
 
 Context:
 {context_text}
@@ -1401,7 +1402,9 @@ Answer (cite sources):"""
     response = await model_orchestrator.generate(
         model=model,
         prompt=prompt,
-        max_tokens=500
+        max_tokens=500,
+        question=question,
+        prefix=instruction
     )
     
     return {
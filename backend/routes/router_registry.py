@@ -0,0 +1,466 @@
+"""
+Router Registry - Declarative, optionally lazy router mounting for backend.main
+
+Importing every route module at startup pulls in most of the backend
+(ML libraries, kernels, DB models) before the API can accept a connection,
+and every worker process pays that again. The registry keeps the same
+ordered list of routers main.py used to include inline, but can defer each
+import until a request needs it.
+
+Lazy mode:
+- Route paths are read from each module's source (AST only, no import) so a
+  request can be matched to the router that serves it
+- The first request under a router's paths imports and mounts it; the
+  import runs in a worker thread so the event loop keeps serving, and a
+  router's own startup handlers (router.on_event("startup")) run on mount
+- /docs and /openapi.json load everything so the schema stays complete
+- A background warm-up loads the rest after startup
+- Modules whose paths can't be read statically are loaded eagerly
+
+Routes are always inserted at their declared position, so precedence is the
+same as eager mounting.
+
+Requirements: a router may name the subsystem initializers its handlers
+assume ("backend.world_model:initialize_world_model"). The full profile runs
+those in its startup hooks; the minimal profile skips them, so there the
+registry runs each one on the first request to a router that needs it
+(once per process, shared by every router naming it). Until an initializer
+succeeds those routes answer 503, and a failure is retried after
+REQUIREMENT_RETRY_SECONDS.
+"""
+
+import ast
+import asyncio
+import importlib
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+
+# Repository root (parent of the backend package)
+_REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+_HTTP_DECORATORS = {"get", "post", "put", "patch", "delete", "head", "options", "api_route", "websocket", "route"}
+_DOC_PATHS = ("/docs", "/redoc", "/openapi.json")
+REQUIREMENT_RETRY_SECONDS = 30.0
+
+
+@dataclass
+class RouterSpec:
+    """One entry of the router table (a group loads all-or-nothing)"""
+    label: str
+    modules: List[str]
+    prefix: str = ""
+    quiet: bool = False
+    ok_message: Optional[str] = None
+    order: int = 0
+    requires: List[str] = field(default_factory=list)  # "module:initializer"
+
+    state: str = "pending"  # pending | loaded | failed
+    route_count: int = 0
+    load_ms: float = 0.0
+    error: Optional[str] = None
+    path_prefixes: Optional[List[str]] = None  # None = unknown, load eagerly
+    loaded_by: Optional[str] = None
+    loaded_at: Optional[float] = field(default=None, repr=False)
+
+
+class RouterRegistry:
+    """
+    Ordered table of routers mounted onto the FastAPI app
+
+    Usage:
+        router_registry.declare("Operator dashboard", "backend.routes.operator_dashboard")
+        router_registry.declare("Chat API", "backend.routes.chat_api", prefix="/api")
+        router_registry.mount(app, lazy=True)
+    """
+
+    def __init__(self):
+        self.specs: List[RouterSpec] = []
+        self.app = None
+        self.lazy = False
+        self._base_index = 0
+        self._mounted_at: Optional[float] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        self.init_requirements = False
+        self._ready: Set[str] = set()
+        self._failed_at: Dict[str, float] = {}
+        self._init_locks: Dict[str, asyncio.Lock] = {}
+        self._load_locks: Dict[int, asyncio.Lock] = {}
+
+    # ------------------------------------------------------------------
+    # Declaration
+    # ------------------------------------------------------------------
+
+    def declare(
+        self,
+        label: str,
+        modules: Union[str, Sequence[str]],
+        prefix: str = "",
+        quiet: bool = False,
+        ok_message: Optional[str] = None,
+        requires: Sequence[str] = ()
+    ) -> RouterSpec:
+        """
+        Add a router (or a group of routers) to the table
+
+        Args:
+            label: Name used in the "[WARN] <label> disabled" message
+            modules: Dotted module path(s) exposing a module-level `router`
+            prefix: Prefix passed to app.include_router
+            quiet: Don't print anything when the import fails (optional features)
+            ok_message: Printed once the router is mounted
+            requires: "module:function" async initializers the handlers
+                assume have run (see init_requirements in mount)
+        """
+        spec = RouterSpec(
+            label=label,
+            modules=[modules] if isinstance(modules, str) else list(modules),
+            prefix=prefix,
+            quiet=quiet,
+            ok_message=ok_message,
+            order=len(self.specs),
+            requires=list(requires),
+        )
+        self.specs.append(spec)
+        return spec
+
+    # ------------------------------------------------------------------
+    # Mounting
+    # ------------------------------------------------------------------
+
+    def mount(self, app, lazy: bool = True, init_requirements: bool = False):
+        """
+        Attach the registry to the app
+
+        Eager mode imports every router now. Lazy mode only imports routers
+        whose paths can't be determined from source; the rest load on demand.
+        init_requirements runs each router's `requires` on first use - for
+        processes whose startup hooks don't (the minimal profile).
+        """
+        self.app = app
+        self.lazy = lazy
+        self.init_requirements = init_requirements
+        self._base_index = len(app.router.routes)
+        self._mounted_at = time.perf_counter()
+
+        if lazy:
+            app.add_middleware(LazyRouterMiddleware, registry=self)
+
+        for spec in self.specs:
+            if lazy:
+                spec.path_prefixes = self._discover_prefixes(spec)
+                if spec.path_prefixes is not None:
+                    continue
+            self._load_now(spec, reason="startup")
+
+        if lazy:
+            counts = self.get_status()["counts"]
+            print(
+                f"[OK] Router registry: {counts.get('loaded', 0)} routers mounted, "
+                f"{counts.get('pending', 0)} deferred, {counts.get('failed', 0)} unavailable"
+            )
+
+    def has_pending(self) -> bool:
+        return any(spec.state == "pending" for spec in self.specs)
+
+    async def ensure_for_path(self, path: str):
+        """Load every pending router that could serve this path"""
+        if path in _DOC_PATHS:
+            await self.load_all(reason=path)
+            return
+        for spec in self.specs:
+            if spec.state != "pending" or not spec.path_prefixes:
+                continue
+            if any(path.startswith(p) for p in spec.path_prefixes):
+                await self._load(spec, reason=path)
+
+    async def load_all(self, reason: str = "load_all"):
+        for spec in self.specs:
+            if spec.state == "pending":
+                await self._load(spec, reason=reason)
+
+    def _load_now(self, spec: RouterSpec, reason: str):
+        """Synchronous load, for mount() before the event loop serves requests"""
+        started = time.perf_counter()
+        modules_before = len(sys.modules)
+        try:
+            routers = [importlib.import_module(name).router for name in spec.modules]
+        except Exception as e:
+            self._fail(spec, e, started)
+            return
+        self._include(spec, routers, reason, started, modules_before)
+
+    async def _load(self, spec: RouterSpec, reason: str):
+        """Import off the event loop (once per spec), mount, then run the routers' startup handlers"""
+        lock = self._load_locks.setdefault(spec.order, asyncio.Lock())
+        async with lock:
+            if spec.state != "pending":
+                return
+            started = time.perf_counter()
+            modules_before = len(sys.modules)
+            try:
+                modules = [await asyncio.to_thread(importlib.import_module, name) for name in spec.modules]
+                routers = [module.router for module in modules]
+            except Exception as e:
+                self._fail(spec, e, started)
+                return
+            if self._include(spec, routers, reason, started, modules_before):
+                await self._run_startup_handlers(spec, routers)
+
+    async def _run_startup_handlers(self, spec: RouterSpec, routers: List[Any]):
+        # The app's startup already ran; handlers added by include_router would never fire
+        for router in routers:
+            for handler in getattr(router, "on_startup", []):
+                try:
+                    result = handler()
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    print(f"[WARN] {spec.label}: startup handler {getattr(handler, '__name__', handler)} failed: {e}")
+
+    def _fail(self, spec: RouterSpec, error: Exception, started: float):
+        spec.state = "failed"
+        spec.error = str(error)
+        spec.load_ms = (time.perf_counter() - started) * 1000
+        if not spec.quiet:
+            print(f"[WARN] {spec.label} disabled: {error}")
+
+    def _include(self, spec: RouterSpec, routers: List[Any], reason: str, started: float, modules_before: int) -> bool:
+        app = self.app
+        before = len(app.router.routes)
+        try:
+            options: Dict[str, Any] = {}
+            if spec.prefix:
+                options["prefix"] = spec.prefix
+            if self.init_requirements and spec.requires:
+                from fastapi import Depends
+                options["dependencies"] = [Depends(self._requirements_dependency(spec.requires))]
+            for router in routers:
+                app.include_router(router, **options)
+            new_routes = app.router.routes[before:]
+            del app.router.routes[before:]
+        except Exception as e:
+            # Groups are all-or-nothing: drop anything a partial include added
+            del app.router.routes[before:]
+            self._fail(spec, e, started)
+            return False
+
+        # Keep declaration order: earlier specs' routes come first
+        index = self._base_index + sum(
+            s.route_count for s in self.specs if s.order < spec.order and s.state == "loaded"
+        )
+        app.router.routes[index:index] = new_routes
+
+        spec.state = "loaded"
+        spec.route_count = len(new_routes)
+        spec.load_ms = (time.perf_counter() - started) * 1000
+        spec.loaded_by = reason
+        spec.loaded_at = time.time()
+        # Schema must be regenerated to include the new routes
+        app.openapi_schema = None
+
+        if spec.ok_message:
+            print(f"[OK] {spec.ok_message}")
+        if self.lazy and reason != "startup":
+            print(
+                f"[ROUTERS] Loaded {spec.label} on demand ({reason}) in {spec.load_ms:.0f} ms, "
+                f"{len(sys.modules) - modules_before} new modules"
+            )
+        return True
+
+    # ------------------------------------------------------------------
+    # Requirements
+    # ------------------------------------------------------------------
+
+    def _requirements_dependency(self, requires: List[str]):
+        async def ensure_requirements():
+            for requirement in requires:
+                await self.ensure_requirement(requirement)
+        return ensure_requirements
+
+    async def ensure_requirement(self, requirement: str):
+        """Run a "module:function" initializer once; 503 while it is unavailable"""
+        if requirement in self._ready:
+            return
+        from fastapi import HTTPException
+
+        lock = self._init_locks.setdefault(requirement, asyncio.Lock())
+        async with lock:
+            if requirement in self._ready:
+                return
+            failed_at = self._failed_at.get(requirement)
+            if failed_at is not None and time.monotonic() - failed_at < REQUIREMENT_RETRY_SECONDS:
+                raise HTTPException(status_code=503, detail=f"{requirement} unavailable in this worker")
+
+            module, _, name = requirement.partition(":")
+            started = time.perf_counter()
+            try:
+                initializer = getattr(await asyncio.to_thread(importlib.import_module, module), name)
+                await initializer()
+            except Exception as e:
+                self._failed_at[requirement] = time.monotonic()
+                print(f"[WARN] {requirement} failed to initialize on demand: {e}")
+                raise HTTPException(status_code=503, detail=f"{requirement} unavailable in this worker: {e}")
+            self._ready.add(requirement)
+            self._failed_at.pop(requirement, None)
+            print(f"[ROUTERS] Initialized {requirement} on demand in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    def start_warmup(self, delay_seconds: float = 2.0, pause_seconds: float = 0.05):
+        """Load deferred routers in the background so later requests don't pay for it"""
+        if not self.lazy or not self.has_pending():
+            return
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self._warmup(delay_seconds, pause_seconds))
+
+    async def _warmup(self, delay_seconds: float, pause_seconds: float):
+        await asyncio.sleep(delay_seconds)
+        started = time.perf_counter()
+        for spec in self.specs:
+            if spec.state == "pending":
+                await self._load(spec, reason="warmup")
+                # Let queued requests run between imports
+                await asyncio.sleep(pause_seconds)
+        print(f"[OK] Router warm-up complete in {(time.perf_counter() - started):.1f}s")
+
+    async def stop_warmup(self):
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Static path discovery
+    # ------------------------------------------------------------------
+
+    def _discover_prefixes(self, spec: RouterSpec) -> Optional[List[str]]:
+        prefixes: List[str] = []
+        for module in spec.modules:
+            paths = _router_paths(module)
+            if paths is None:
+                return None
+            for path in paths:
+                prefixes.append(_static_prefix(spec.prefix + path))
+        return sorted(set(prefixes)) or None
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def get_status(self) -> Dict[str, Any]:
+        """Per-router load state and cost"""
+        counts: Dict[str, int] = {}
+        for spec in self.specs:
+            counts[spec.state] = counts.get(spec.state, 0) + 1
+        return {
+            "mode": "lazy" if self.lazy else "eager",
+            "routers": len(self.specs),
+            "counts": counts,
+            "total_load_ms": round(sum(s.load_ms for s in self.specs), 1),
+            "initialized_on_demand": sorted(self._ready),
+            "specs": [
+                {
+                    "label": s.label,
+                    "modules": s.modules,
+                    "prefix": s.prefix,
+                    "state": s.state,
+                    "routes": s.route_count,
+                    "load_ms": round(s.load_ms, 1),
+                    "loaded_by": s.loaded_by,
+                    "error": s.error,
+                    "requires": s.requires,
+                }
+                for s in sorted(self.specs, key=lambda s: s.load_ms, reverse=True)
+            ],
+        }
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that mounts deferred routers before routing a request"""
+
+    def __init__(self, app, registry: RouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.registry.has_pending():
+            await self.registry.ensure_for_path(scope.get("path", ""))
+        await self.app(scope, receive, send)
+
+
+def _module_source(module: str) -> Optional[Path]:
+    base = _REPO_ROOT.joinpath(*module.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _router_paths(module: str, attr: str = "router") -> Optional[List[str]]:
+    """
+    Full paths declared on `<module>.router`, read from source
+
+    Returns None when they can't be determined statically (non-literal
+    prefix, nested include_router, add_api_route, ...).
+    """
+    source = _module_source(module)
+    if source is None:
+        return None
+    try:
+        tree = ast.parse(source.read_text(encoding="utf-8"), filename=str(source))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+
+    router_prefix: Optional[str] = None
+    paths: List[str] = []
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+            if any(isinstance(t, ast.Name) and t.id == attr for t in node.targets):
+                func = node.value.func
+                name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+                if name != "APIRouter":
+                    return None
+                router_prefix = ""
+                for kw in node.value.keywords:
+                    if kw.arg == "prefix":
+                        if not (isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str)):
+                            return None
+                        router_prefix = kw.value.value
+
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            owner = node.func.value
+            if isinstance(owner, ast.Name) and owner.id == attr:
+                if node.func.attr in ("include_router", "add_api_route", "add_api_websocket_route", "mount"):
+                    return None
+                if node.func.attr in _HTTP_DECORATORS:
+                    if not node.args:
+                        path_kw = next((kw.value for kw in node.keywords if kw.arg == "path"), None)
+                    else:
+                        path_kw = node.args[0]
+                    if not (isinstance(path_kw, ast.Constant) and isinstance(path_kw.value, str)):
+                        return None
+                    paths.append(path_kw.value)
+
+    if router_prefix is None or not paths:
+        return None
+    return [router_prefix + path for path in paths]
+
+
+def _static_prefix(path: str) -> str:
+    """Literal part of a route path before its first path parameter"""
+    brace = path.find("{")
+    if brace == -1:
+        return path.rstrip("/") or "/"
+    return path[:path.rfind("/", 0, brace) + 1]
+
+
+# Global instance
+router_registry = RouterRegistry()
@@ -257,6 +257,33 @@ async def get_self_healing_metrics() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/runner")
+async def get_runner_metrics() -> Dict[str, Any]:
+    """Execution runner queue depth, concurrency and time-to-remediate"""
+    try:
+        from backend.self_heal.runner import runner
+        return runner.get_metrics()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/runs/{run_id}/approve")
+async def approve_run(run_id: int) -> Dict[str, Any]:
+    """Approve a proposed playbook run so the execution runner picks it up"""
+    try:
+        from backend.models import async_session
+        from backend.self_heal.runner import runner
+
+        async with async_session() as session:
+            approved = await runner.approve_runs(session, run_ids=[run_id], approved_by="api")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not approved:
+        raise HTTPException(status_code=409, detail=f"Run {run_id} not found or not awaiting approval")
+    return {"run_id": run_id, "status": "approved"}
+
+
 @router.get("/incidents")
 async def get_incidents(status: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
     """Get self-healing incidents"""
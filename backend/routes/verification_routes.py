@@ -22,7 +22,7 @@ from ..schemas import (
     ContractListResponse, ContractDetailResponse, SnapshotListResponse, SnapshotDetailResponse,
     SnapshotRestoreResponse, GoldenSnapshotResponse, BenchmarkRunListResponse, BenchmarkRunDetailResponse,
     BenchmarkGoldenResponse, MissionStartResponse, MissionCompleteResponse, MissionHistoryResponse,
-    VerificationSmokeTestResponse, VerificationRegressionResponse
+    VerificationSmokeTestResponse, VerificationRegressionResponse, VerificationPerformanceResponse
 )
 from ..schemas_extended import (
     VerificationCurrentMissionResponse, VerificationStatusResponseExtended
@@ -233,6 +233,34 @@ async def run_regression_suite(
     return result
 
 
+@router.post("/benchmarks/performance", response_model=VerificationPerformanceResponse)
+async def run_performance_suite(
+    triggered_by: Optional[str] = None,
+    compare_to_baseline: bool = True,
+    scenarios: Optional[str] = None,
+    trials: int = 5
+):
+    """Run hot-path performance scenarios (comma-separated `scenarios` filter)"""
+    
+    try:
+        result = await benchmark_suite.run_performance_suite(
+            triggered_by=triggered_by,
+            compare_to_baseline=compare_to_baseline,
+            scenarios=[s.strip() for s in scenarios.split(",") if s.strip()] if scenarios else None,
+            trials=max(2, min(trials, 50))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@router.get("/benchmarks/scenarios")
+async def list_performance_scenarios():
+    """List available performance scenarios"""
+    
+    return {"scenarios": benchmark_suite.list_performance_scenarios()}
+
+
 @router.get("/benchmarks", response_model=BenchmarkRunListResponse)
 async def list_benchmark_runs(limit: int = 20):
     """List recent benchmark runs"""
@@ -12,6 +12,8 @@ from datetime import datetime
 from pathlib import Path
 import uuid
 
+from backend.observability.tracing import request_tracer
+
 
 @dataclass
 class TriggerEvent:
@@ -26,6 +28,7 @@ class TriggerEvent:
     subsystem: str = ""
     trust_score: float = 1.0
     requires_validation: bool = False
+    trace_context: Dict[str, str] = field(default_factory=dict)  # W3C traceparent of the emitter
 
 
 @dataclass
@@ -226,6 +229,9 @@ class TriggerMesh:
             await self._log_blocked_event(event, "insufficient_trust")
             return
         
+        if not event.trace_context:
+            request_tracer.inject(event.trace_context)
+        
         # Route event based on priority
         routing_rules = self._lookup_routes(event)
         
@@ -416,6 +422,16 @@ class TriggerMesh:
             routes: Routing rules to apply
         """
         
+        with request_tracer.span(
+            f"trigger.dispatch {event.event_type}",
+            parent=request_tracer.extract(event.trace_context),
+            kind="consumer",
+            require_parent=True,
+            **{"trigger.event_type": event.event_type, "trigger.source": event.source}
+        ):
+            await self._dispatch_to_handlers(event, routes)
+    
+    async def _dispatch_to_handlers(self, event: TriggerEvent, routes: List[RoutingRule]):
         dispatched_to = set()
         
         # Dispatch to component handlers via routing rules
@@ -1,9 +1,10 @@
 """
-Horizontal Scaling - Worker configuration and job queue
+Horizontal Scaling - Worker configuration, job queue and shared rate limits
 """
 
 from .worker_config import WorkerConfig, get_worker_config
 from .job_queue import JobQueue, Job, JobStatus, JobPriority
+from .rate_limit_engine import RateLimitEngine, MemoryStore, SQLiteStore, get_rate_limit_engine
 
 __all__ = [
     "WorkerConfig",
@@ -12,4 +13,8 @@ __all__ = [
     "Job",
     "JobStatus",
     "JobPriority",
+    "RateLimitEngine",
+    "MemoryStore",
+    "SQLiteStore",
+    "get_rate_limit_engine",
 ]
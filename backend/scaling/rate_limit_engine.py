@@ -0,0 +1,345 @@
+"""
+Rate Limit Engine - GCRA rate limiting with pluggable, bounded storage
+
+GCRA (generic cell rate algorithm) is a token bucket expressed as a single
+timestamp per key - the theoretical arrival time (TAT) of the next request.
+That makes every check one read-modify-write of one float, which is what
+lets the state live in a sharded dict or a shared SQLite row, and makes
+eviction exact: once TAT is in the past the key is indistinguishable from a
+fresh one and can be dropped.
+
+Stores:
+- MemoryStore: in-process, sharded, idle keys evicted as they expire
+- SQLiteStore: shared by every worker process on the host; checks run in
+  memory and consumption is written through by a background thread
+
+Backend selection: GRACE_RATE_LIMIT_BACKEND=memory|sqlite and
+GRACE_RATE_LIMIT_DB (default: /dev/shm when available).
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate limit check"""
+    allowed: bool
+    limit: int                  # burst size
+    remaining: int              # requests left before throttling
+    retry_after: Optional[float]  # seconds until the next request is allowed
+    reset_after: float          # seconds until the bucket is full again
+
+
+class MemoryStore:
+    """
+    Per-process GCRA state, sharded by key hash
+
+    No locks: the gateway middleware runs on the event loop thread, and a
+    single dict read/write is atomic under the GIL. Two threads racing on the
+    same key can at worst both pass one check.
+
+    Each shard is ordered by last update. Entries at the front whose TAT has
+    passed carry no information and are dropped as new keys arrive; if a shard
+    is still over max_keys_per_shard (a scanner touching many IPs at once)
+    its least recently seen key is dropped, which only ever errs toward
+    allowing that key.
+    """
+
+    def __init__(self, shards: int = 64, max_keys_per_shard: int = 4096):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards: List["OrderedDict[str, float]"] = [OrderedDict() for _ in range(shards)]
+        self.evictions = 0
+
+    def _shard(self, key: str) -> "OrderedDict[str, float]":
+        return self._shards[zlib.crc32(key.encode("utf-8")) % len(self._shards)]
+
+    def update(self, key: str, increment: float, tolerance: float, now: float) -> Tuple[bool, float]:
+        shard = self._shard(key)
+        tat = shard.get(key, now)
+        new_tat = max(tat, now) + increment
+
+        if new_tat - now <= tolerance:
+            shard[key] = new_tat
+            shard.move_to_end(key)
+            if len(shard) > self.max_keys_per_shard // 2:
+                self._evict(shard, now)
+            return True, new_tat
+        return False, tat
+
+    def peek(self, key: str, now: float) -> float:
+        return self._shard(key).get(key, now)
+
+    def _evict(self, shard: "OrderedDict[str, float]", now: float):
+        # Expired keys at the front first, then LRU once over the hard cap
+        while shard:
+            oldest_key, oldest_tat = next(iter(shard.items()))
+            if oldest_tat <= now or len(shard) > self.max_keys_per_shard:
+                del shard[oldest_key]
+                self.evictions += 1
+            else:
+                break
+
+    def size(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def clear(self):
+        for shard in self._shards:
+            shard.clear()
+
+
+class SQLiteStore:
+    """
+    GCRA state shared across worker processes through one SQLite table
+
+    Checks never touch SQLite: they run against an in-process MemoryStore,
+    and the requests each key consumed are written through by a background
+    thread every flush_interval seconds. Each flush is one UPSERT ...
+    RETURNING per key that adds this worker's consumption to the shared TAT
+    and reads back the total, which is merged into the local state - so a
+    worker sees the others' traffic with at most flush_interval of lag, and
+    a locked or missing database degrades to per-process limits instead of
+    stalling the event loop. Keep the file on tmpfs (/dev/shm) - durability
+    is not needed for rate limit state.
+
+    The check path takes no lock: consumption is appended to a deque
+    (atomic under the GIL) that the flusher drains, and merged TATs are
+    single dict writes, as in MemoryStore. Only flushes are serialized.
+    """
+
+    SWEEP_EVERY = 256  # flushes between expired-row sweeps
+
+    def __init__(self, path: Optional[str] = None, busy_timeout_ms: int = 2000, flush_interval: float = 0.05):
+        self.path = path or default_sqlite_path()
+        self.busy_timeout_ms = busy_timeout_ms
+        self.flush_interval = flush_interval
+        self._memory = MemoryStore()
+        self._pending: "deque[Tuple[str, float]]" = deque()  # (key, increment) since the last flush
+        self._flush_lock = threading.Lock()
+        self._local = threading.local()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_pid: Optional[int] = None
+        self._stop = threading.Event()
+        self._flushes = 0
+        self.flush_errors = 0
+        self._use_returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+        self._connect()  # create the schema eagerly
+
+    @property
+    def evictions(self) -> int:
+        return self._memory.evictions
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # Connections must not cross a fork (gunicorn preload)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL, allowed INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def update(self, key: str, increment: float, tolerance: float, now: float) -> Tuple[bool, float]:
+        allowed, tat = self._memory.update(key, increment, tolerance, now)
+        if allowed:
+            self._pending.append((key, increment))
+            self._ensure_flusher()
+        return allowed, tat
+
+    def _ensure_flusher(self):
+        # Threads don't survive a fork, so each worker starts its own
+        if self._flusher_pid == os.getpid() or self._stop.is_set():
+            return
+        self._flusher_pid = os.getpid()
+        self._flusher = threading.Thread(target=self._flush_loop, name="rate-limit-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write consumed increments through to SQLite and merge back the shared TATs"""
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        pending: Dict[str, float] = {}
+        # Drain only what is queued now; checks keep appending meanwhile
+        for _ in range(len(self._pending)):
+            key, increment = self._pending.popleft()
+            pending[key] = pending.get(key, 0.0) + increment
+        if not pending:
+            return
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            shared = {key: self._add_consumption(conn, key, delta, now) for key, delta in pending.items()}
+            self._flushes += 1
+            if self._flushes % self.SWEEP_EVERY == 0:
+                conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+        except sqlite3.Error as e:
+            # Shared store unavailable - keep enforcing per-process limits
+            self.flush_errors += 1
+            print(f"[WARN] Rate limit store flush failed, limits are per-process until it recovers: {e}")
+            return
+
+        for key, tat in shared.items():
+            shard = self._memory._shard(key)
+            if tat > shard.get(key, now):
+                shard[key] = tat
+
+    def _add_consumption(self, conn: sqlite3.Connection, key: str, delta: float, now: float) -> float:
+        if self._use_returning:
+            row = conn.execute(
+                """
+                INSERT INTO rate_limits (key, tat) VALUES (:key, :now + :delta)
+                ON CONFLICT(key) DO UPDATE SET tat = max(tat, :now) + :delta
+                RETURNING tat
+                """,
+                {"key": key, "now": now, "delta": delta},
+            ).fetchone()
+            return float(row[0])
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            tat = max(row[0] if row else now, now) + delta
+            conn.execute("INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)", (key, tat))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return tat
+
+    def peek(self, key: str, now: float) -> float:
+        return self._memory.peek(key, now)
+
+    def size(self) -> int:
+        return self._memory.size()
+
+    def close(self):
+        """Stop the flusher and write out what is still pending"""
+        self._stop.set()
+        if self._flusher is not None and self._flusher_pid == os.getpid():
+            self._flusher.join(timeout=1.0)
+        self.flush()
+
+    def clear(self):
+        with self._flush_lock:
+            self._memory.clear()
+            self._pending.clear()
+        self._connect().execute("DELETE FROM rate_limits")
+
+
+class RateLimitEngine:
+    """
+    Shared GCRA rate limiter used by every gateway limiter
+
+    Limits are passed per call, so one engine (and one store) serves any
+    number of limiters; callers namespace their keys.
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else MemoryStore()
+        self.checks = 0
+        self.rejections = 0
+
+    def check(self, key: str, rate: float, burst: int, cost: int = 1) -> RateLimitDecision:
+        """
+        Consume `cost` requests for key
+
+        Args:
+            key: Namespaced client key
+            rate: Sustained requests per second
+            burst: Maximum requests allowed at once
+            cost: Requests this call consumes
+        """
+        now = time.time()
+        interval = 1.0 / rate
+        tolerance = interval * burst
+
+        allowed, tat = self.store.update(key, interval * cost, tolerance, now)
+
+        self.checks += 1
+        if not allowed:
+            self.rejections += 1
+            retry_after = max(0.0, tat + interval * cost - now - tolerance)
+            return RateLimitDecision(False, burst, 0, retry_after, max(0.0, tat - now))
+
+        return RateLimitDecision(
+            allowed=True,
+            limit=burst,
+            remaining=_remaining(tat, now, interval, tolerance),
+            retry_after=None,
+            reset_after=max(0.0, tat - now),
+        )
+
+    def status(self, key: str, rate: float, burst: int) -> RateLimitDecision:
+        """Current state for key without consuming anything"""
+        now = time.time()
+        interval = 1.0 / rate
+        tolerance = interval * burst
+        tat = max(self.store.peek(key, now), now)
+        remaining = _remaining(tat, now, interval, tolerance)
+        return RateLimitDecision(
+            allowed=remaining > 0,
+            limit=burst,
+            remaining=remaining,
+            retry_after=None if remaining > 0 else max(0.0, tat + interval - now - tolerance),
+            reset_after=tat - now,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.store).__name__,
+            "tracked_keys": self.store.size(),
+            "checks": self.checks,
+            "rejections": self.rejections,
+            "evictions": getattr(self.store, "evictions", None),
+            "flush_errors": getattr(self.store, "flush_errors", None),
+        }
+
+
+def _remaining(tat: float, now: float, interval: float, tolerance: float) -> int:
+    return max(0, int((tolerance - (tat - now)) / interval + 1e-9))
+
+
+def default_sqlite_path() -> str:
+    configured = os.getenv("GRACE_RATE_LIMIT_DB")
+    if configured:
+        return configured
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "grace_rate_limits.db")
+
+
+_engine: Optional[RateLimitEngine] = None
+
+
+def get_rate_limit_engine() -> RateLimitEngine:
+    """Process-wide engine; backend chosen by GRACE_RATE_LIMIT_BACKEND"""
+    global _engine
+    if _engine is None:
+        backend = os.getenv("GRACE_RATE_LIMIT_BACKEND", "memory").lower()
+        store = None
+        if backend == "sqlite":
+            try:
+                store = SQLiteStore()
+            except sqlite3.Error as e:
+                print(f"[WARN] Shared rate limit store unavailable, using in-process limits: {e}")
+        _engine = RateLimitEngine(store)
+    return _engine
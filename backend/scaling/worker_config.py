@@ -38,6 +38,11 @@ class WorkerConfig:
     keyfile: Optional[str] = None
     certfile: Optional[str] = None
     
+    # "minimal" workers serve requests only; run one "full" process for
+    # background subsystems (see backend.config.environment)
+    app_profile: str = "full"
+    router_loading: str = "lazy"
+    
     def to_gunicorn_config(self) -> dict:
         """Convert to Gunicorn configuration dict"""
         return {
@@ -62,6 +67,12 @@ class WorkerConfig:
             "tmp_upload_dir": self.tmp_upload_dir,
             "keyfile": self.keyfile,
             "certfile": self.certfile,
+            "raw_env": [
+                f"GRACE_APP_PROFILE={self.app_profile}",
+                f"GRACE_ROUTER_LOADING={self.router_loading}",
+                # Per-process limits would multiply by the worker count
+                f"GRACE_RATE_LIMIT_BACKEND={'sqlite' if self.workers > 1 else 'memory'}",
+            ],
         }
 
 
@@ -92,6 +103,7 @@ def get_worker_config(
     
     bind = os.getenv("GRACE_BIND", "0.0.0.0:8000")
     loglevel = os.getenv("GRACE_LOG_LEVEL", "info")
+    app_profile = os.getenv("GRACE_WORKER_PROFILE", "full")
     
     return WorkerConfig(
         workers=workers,
@@ -99,7 +111,9 @@ def get_worker_config(
         loglevel=loglevel,
         worker_connections=1000 if environment == "development" else 2000,
         max_requests=1000 if environment == "development" else 10000,
-        timeout=120 if environment == "development" else 300
+        timeout=120 if environment == "development" else 300,
+        app_profile=app_profile,
+        router_loading="eager" if environment == "development" else "lazy"
     )
 
 
@@ -1316,3 +1316,17 @@ class VerificationRegressionResponse(BaseModel):
     drift_detected: bool
     baseline_compared: bool
     results: Dict[str, Any]
+
+class VerificationPerformanceResponse(BaseModel):
+    run_id: str
+    passed: bool
+    duration_seconds: float
+    tests: int
+    trials: int
+    failures: List[str]
+    skipped: List[str]
+    metrics: Dict[str, float]
+    baseline_id: Optional[str] = None
+    delta_from_baseline: Optional[Dict[str, Any]] = None
+    regressions: List[str]
+    drift_detected: bool
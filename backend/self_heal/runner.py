@@ -6,7 +6,8 @@ Self-heal execution runner (feature-gated)
 Safety:
 - Only runs when settings.SELF_HEAL_EXECUTE is True
 - Requires PlaybookRun.status == 'approved' to begin execution
-- Governance/approvals assumed to have occurred upstream
+- Governance/approvals assumed to have occurred upstream; approve_runs() flips
+  proposed runs to 'approved' (governance decisions, /api/self-healing/runs/{id}/approve)
 
 This runner now includes real (safe) verification hooks and action adapters.
 External side effects are avoided or simulated; hooks have timeouts and
@@ -17,18 +18,60 @@ from __future__ import annotations
 import asyncio
 import json
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List
+from collections import deque
+from typing import Optional, Dict, Any, List, Set, Deque
 
 
 class ExecutionRunner:
-    def __init__(self, poll_interval_s: int = 15):
+    """Executes approved PlaybookRuns.
+
+    Modes (settings.SELF_HEAL_RUNNER_MODE):
+    - "concurrent" (default): wakes on approval events (or the poll interval),
+      runs up to max_concurrent runs at once, never two for the same service
+    - "serial": legacy behaviour, one run per poll executed inline
+
+    Runs are claimed with a conditional UPDATE, so several runner instances
+    (workers/hosts) can share one queue.
+    """
+
+    APPROVAL_EVENTS = ("approval.granted", "self_heal.run_approved")
+
+    def __init__(self, poll_interval_s: int = 15, max_concurrent: Optional[int] = None, mode: Optional[str] = None):
         self._task: Optional[asyncio.Task] = None
         self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
         self._interval = poll_interval_s
         # simple in-memory adapters state (simulated toggles/logging TTLs)
         self._flags: Dict[str, Dict[str, Any]] = {}
         self._log_level_ttl: Optional[datetime] = None
         self._last_htm_check: Optional[datetime] = None
+        self._last_health_check: Optional[datetime] = None
+
+        from backend.settings import settings
+        self.mode = (mode or getattr(settings, "SELF_HEAL_RUNNER_MODE", "concurrent")).lower()
+        self.max_concurrent = max(1, int(max_concurrent or getattr(settings, "SELF_HEAL_MAX_CONCURRENT_RUNS", 4)))
+        # Candidates examined per claim (some may be gated or blocked by a busy service)
+        self.claim_scan_limit = 50
+
+        # Concurrent mode state
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self._active_services: Set[str] = set()
+        self._subscribed = False
+
+        # Metrics
+        self.metrics: Dict[str, int] = {
+            "queue_depth": 0,
+            "claimed": 0,
+            "claim_conflicts": 0,
+            "wakeups": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "aborted": 0,
+        }
+        self._latencies: Dict[str, Deque[float]] = {
+            "queue_wait_s": deque(maxlen=500),
+            "time_to_remediate_s": deque(maxlen=500),
+        }
         
         # Real executors
         from .real_executors import real_executors
@@ -40,15 +83,21 @@ class ExecutionRunner:
         self._stopping.clear()
         self._task = asyncio.create_task(self._run_loop())
 
-    async def stop(self) -> None:
+    async def stop(self, drain_timeout_s: float = 30.0) -> None:
         try:
             self._stopping.set()
+            self._wakeup.set()
             if self._task:
                 self._task.cancel()
                 try:
                     await self._task
                 except asyncio.CancelledError:
                     pass
+            # Let in-flight remediations finish before giving up on them
+            if self._inflight:
+                _, pending = await asyncio.wait(list(self._inflight.values()), timeout=drain_timeout_s)
+                for task in pending:
+                    task.cancel()
         finally:
             self._task = None
 
@@ -58,16 +107,30 @@ class ExecutionRunner:
             return
             
         boot_time = datetime.now(timezone.utc)
+        concurrent = self.mode == "concurrent"
+        if concurrent:
+            await self._subscribe_approval_events()
         
         while not self._stopping.is_set():
+            # Adaptive Polling: Fast (15s) during boot (first 5m), Slow (3m) after
+            uptime_sec = (datetime.now(timezone.utc) - boot_time).total_seconds()
+            current_interval = 15 if uptime_sec < 300 else 180
+            
+            self._wakeup.clear()
             try:
-                await self._tick()
+                if concurrent:
+                    await self._dispatch()
+                else:
+                    await self._tick()
                 
                 # Health Monitoring (RAG + HTM)
                 # We piggyback on the runner loop to ensure consistent monitoring
-                base_url = getattr(settings, "SELF_HEAL_BASE_URL", "http://localhost:8000")
-                await self._check_rag_health(base_url)
-                await self._check_htm_anomalies()
+                now = datetime.now(timezone.utc)
+                if self._last_health_check is None or (now - self._last_health_check).total_seconds() >= current_interval:
+                    self._last_health_check = now
+                    base_url = getattr(settings, "SELF_HEAL_BASE_URL", "http://localhost:8000")
+                    await self._check_rag_health(base_url)
+                    await self._check_htm_anomalies()
                 
             except Exception as e:  # pragma: no cover
                 try:
@@ -75,11 +138,80 @@ class ExecutionRunner:
                 except Exception:
                     pass
             
-            # Adaptive Polling: Fast (15s) during boot (first 5m), Slow (3m) after
-            uptime_sec = (datetime.now(timezone.utc) - boot_time).total_seconds()
-            current_interval = 15 if uptime_sec < 300 else 180
-            
-            await asyncio.wait_for(asyncio.sleep(current_interval), timeout=current_interval + 1)
+            if concurrent:
+                # Approval events and finished runs cut the wait short
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=current_interval)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.wait_for(asyncio.sleep(current_interval), timeout=current_interval + 1)
+
+    async def _subscribe_approval_events(self) -> None:
+        if self._subscribed:
+            return
+        try:
+            from backend.misc.trigger_mesh import trigger_mesh
+            for event_type in self.APPROVAL_EVENTS:
+                trigger_mesh.subscribe(event_type, self._on_approval_event)
+            self._subscribed = True
+        except Exception as e:
+            print(f"[WARN] Self-heal runner: approval events unavailable, polling only ({e})")
+
+    # ---- Metrics ----
+    def _run_timeout_min(self) -> int:
+        try:
+            from backend.settings import settings
+            return int(getattr(settings, "SELF_HEAL_RUN_TIMEOUT_MIN", 10))
+        except Exception:
+            return 10
+
+    def _record_latency(self, name: str, start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+        if not start or not end:
+            return None
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        seconds = max(0.0, (end - start).total_seconds())
+        self._latencies[name].append(seconds)
+        return seconds
+
+    async def _record_outcome(self, run) -> None:
+        status = getattr(run, "status", None)
+        if status in self.metrics:
+            self.metrics[status] += 1
+        ttr = self._record_latency("time_to_remediate_s", getattr(run, "created_at", None), getattr(run, "ended_at", None))
+        if ttr is not None:
+            try:
+                from backend.metrics_service import publish_metric
+                await publish_metric("self_heal", "mean_time_to_recover", ttr, {"run_id": run.id, "status": status})
+            except Exception:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, concurrency and time-to-remediate percentiles"""
+        def summary(samples: Deque[float]) -> Dict[str, Any]:
+            if not samples:
+                return {"count": 0}
+            ordered = sorted(samples)
+            return {
+                "count": len(ordered),
+                "mean": round(sum(ordered) / len(ordered), 3),
+                "p50": round(ordered[len(ordered) // 2], 3),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                "max": round(ordered[-1], 3),
+            }
+
+        return {
+            "mode": self.mode,
+            "max_concurrent": self.max_concurrent,
+            "in_flight": len(self._inflight),
+            "active_services": sorted(self._active_services),
+            **self.metrics,
+            "queue_wait_s": summary(self._latencies["queue_wait_s"]),
+            "time_to_remediate_s": summary(self._latencies["time_to_remediate_s"]),
+        }
 
     # ---- Verification hooks ----
     async def _verify_http_health(self, base_url: str, path: str, expect: str = "ok", timeout_s: int = 20, retries: int = 2, backoff_ms: int = 250) -> bool:
@@ -118,7 +250,7 @@ class ExecutionRunner:
     async def _verify_metrics_threshold(self, session, service_name: str, metric: str, gte: float | None = None, lte: float | None = None, window_min: int = 5) -> bool:
         """Use recent HealthSignal rows as a proxy for metrics checks."""
         from sqlalchemy import select
-        from ..health_models import Service, HealthSignal
+        from ..models.health_models import Service, HealthSignal
         now = datetime.now(timezone.utc)
         cutoff = now - timedelta(minutes=window_min)
         svc_res = await session.execute(select(Service).where(Service.name == service_name))
@@ -151,7 +283,7 @@ class ExecutionRunner:
 
     async def _verify_metrics_trend(self, session, service_name: str, metric: str, direction: str = "down", window_min: int = 5) -> bool:
         from sqlalchemy import select
-        from ..health_models import Service, HealthSignal
+        from ..models.health_models import Service, HealthSignal
         now = datetime.now(timezone.utc)
         cutoff = now - timedelta(minutes=window_min)
         svc_res = await session.execute(select(Service).where(Service.name == service_name))
@@ -226,7 +358,7 @@ class ExecutionRunner:
         """Run step-level verifications from VerificationCheck if available.
         Falls back to a simple /health check when none present."""
         from sqlalchemy import select
-        from ..self_heal_models import VerificationCheck
+        from ..models.self_heal_models import VerificationCheck
 
         checks = []
         if getattr(run, "playbook_id", None) and getattr(step_obj, "id", None):
@@ -382,305 +514,453 @@ class ExecutionRunner:
         return await fn(**params) if params else await fn()
 
     async def _tick(self) -> None:
-        from sqlalchemy import select
+        """Serial mode: claim the oldest eligible approved run and execute it inline"""
         from ..models import async_session
-        from ..self_heal_models import PlaybookRun, PlaybookStep as PBStep, PlaybookStepRun, VerificationCheck
-        from ..governance_models import AuditLog
 
-        now = datetime.now(timezone.utc)
         async with async_session() as session:
-            # Fetch a single approved run to process
-            res = await session.execute(
-                select(PlaybookRun).where(PlaybookRun.status == "approved").order_by(PlaybookRun.created_at.asc()).limit(1)
-            )
-            run = res.scalar_one_or_none()
+            run = await self._claim_next(session, datetime.now(timezone.utc))
             if not run:
                 return
+            await self._execute_run(session, run)
 
-            # Governance/approval gate: if there is an approval_request_id, require it to be approved
-            try:
-                if getattr(run, "approval_request_id", None):
-                    from ..governance_models import ApprovalRequest
-                    appr = await session.get(ApprovalRequest, run.approval_request_id)
-                    if appr and getattr(appr, "status", "").lower() != "approved":
-                        # Defer execution until approval is granted
-                        return
-            except Exception:
-                pass
+    # ---- Claiming ----
+    async def _gates_allow(self, session, run, now: datetime) -> bool:
+        """Governance approval and change-window gates; False defers the run"""
+        # Governance/approval gate: if there is an approval_request_id, require it to be approved
+        try:
+            if getattr(run, "approval_request_id", None):
+                from ..models.governance_models import ApprovalRequest
+                appr = await session.get(ApprovalRequest, run.approval_request_id)
+                if appr and getattr(appr, "status", "").lower() != "approved":
+                    # Defer execution until approval is granted
+                    return False
+        except Exception:
+            pass
 
-            # Enforce change window: outside window requires approval for impact not low
-            try:
-                impact = ""
-                if run.diagnosis:
-                    try:
-                        d = json.loads(run.diagnosis)
-                        impact = str(d.get("impact") or "").lower()
-                    except Exception:
-                        impact = ""
-                
-                # Determine if outside window (weekdays 09:00–18:00 local)
+        # Enforce change window: outside window requires approval for impact not low
+        try:
+            impact = ""
+            if run.diagnosis:
                 try:
-                    local_now = now.astimezone()
+                    d = json.loads(run.diagnosis)
+                    impact = str(d.get("impact") or "").lower()
                 except Exception:
-                    local_now = now
-                wk = local_now.weekday()
-                hr = local_now.hour
-                outside_window = not ((wk <= 4) and (9 <= hr < 18))
-                if outside_window and impact in {"medium", "high", "critical"}:
-                    # If there is no explicit approved request, defer execution
-                    try:
-                        if not getattr(run, "approval_request_id", None):
-                            return
-                        else:
-                            from ..governance_models import ApprovalRequest
-                            appr2 = await session.get(ApprovalRequest, run.approval_request_id)
-                            if not appr2 or getattr(appr2, "status", "").lower() != "approved":
-                                return
-                    except Exception:
-                        return
+                    impact = ""
+            
+            # Determine if outside window (weekdays 09:00–18:00 local)
+            try:
+                local_now = now.astimezone()
             except Exception:
-                pass
+                local_now = now
+            wk = local_now.weekday()
+            hr = local_now.hour
+            outside_window = not ((wk <= 4) and (9 <= hr < 18))
+            if outside_window and impact in {"medium", "high", "critical"}:
+                # If there is no explicit approved request, defer execution
+                try:
+                    if not getattr(run, "approval_request_id", None):
+                        return False
+                    else:
+                        from ..models.governance_models import ApprovalRequest
+                        appr2 = await session.get(ApprovalRequest, run.approval_request_id)
+                        if not appr2 or getattr(appr2, "status", "").lower() != "approved":
+                            return False
+                except Exception:
+                    return False
+        except Exception:
+            pass
+        return True
+
+    async def _claim_next(self, session, now: datetime, busy_services: Optional[Set[str]] = None):
+        """Atomically move the oldest eligible approved run to 'running'.
+
+        The claim is a conditional UPDATE (status still 'approved' and no other
+        live run for the same service), so concurrent runner instances never
+        execute the same run or two runs against one service.
+        """
+        from sqlalchemy import select, update, exists, and_, func
+        from sqlalchemy.orm import aliased
+        from ..models.self_heal_models import PlaybookRun
+        from ..models.governance_models import AuditLog
+
+        busy_services = busy_services or set()
+        res = await session.execute(
+            select(PlaybookRun).where(PlaybookRun.status == "approved").order_by(PlaybookRun.created_at.asc()).limit(self.claim_scan_limit)
+        )
+        candidates = res.scalars().all()
+        self.metrics["queue_depth"] = await session.scalar(
+            select(func.count(PlaybookRun.id)).where(PlaybookRun.status == "approved")
+        ) or 0
+
+        # A 'running' row older than this belongs to a dead runner and no longer blocks its service
+        stale_before = now - timedelta(minutes=self._run_timeout_min() * 2)
+        for run in candidates:
+            if run.service and run.service in busy_services:
+                continue
+            if not await self._gates_allow(session, run, now):
+                continue
+
+            conditions = [PlaybookRun.id == run.id, PlaybookRun.status == "approved"]
+            if run.service:
+                other = aliased(PlaybookRun)
+                conditions.append(~exists().where(and_(
+                    other.service == run.service,
+                    other.status == "running",
+                    other.started_at >= stale_before,
+                )))
+            claimed = await session.execute(
+                update(PlaybookRun).where(*conditions).values(status="running", started_at=now).execution_options(synchronize_session=False)
+            )
+            if claimed.rowcount != 1:
+                # Taken by another runner (or its service is busy elsewhere);
+                # end the transaction so the write lock isn't held while scanning on
+                await session.commit()
+                self.metrics["claim_conflicts"] += 1
+                continue
 
             # LearningLog entry on approved start
             try:
-                from ..self_heal_models import LearningLog
+                from ..models.self_heal_models import LearningLog
                 session.add(LearningLog(service=run.service, signal_ref=None, diagnosis=run.diagnosis, action=json.dumps({"run_id": run.id, "status": "approved"}), outcome=None))
             except Exception:
                 pass
-
-            # Mark running and audit
-            run.status = "running"
-            run.started_at = now
             try:
                 session.add(AuditLog(actor="runner", action="playbook_run_start", resource=str(run.id), policy_checked="self_heal", result="started", details=f"service={run.service}"))
             except Exception:
                 pass
             await session.commit()
+            await session.refresh(run)
+            self.metrics["claimed"] += 1
+            self._record_latency("queue_wait_s", run.created_at, now)
+            return run
+        return None
+
+    # ---- Concurrent mode ----
+    async def _dispatch(self) -> None:
+        """Claim approved runs until the concurrency cap is reached"""
+        from ..models import async_session
 
-            # Determine steps: load from DB if playbook_id is set; otherwise simulate one step
-            steps: List[Any] = []
-            if getattr(run, "playbook_id", None):
-                st_res = await session.execute(
-                    select(PBStep).where(PBStep.playbook_id == run.playbook_id).order_by(PBStep.step_order.asc())
-                )
-                steps = st_res.scalars().all()
-            if not steps:
-                # Simulated single step
-                class _Sim:
-                    id = None
-                    action = "noop_or_safe_action"
-                    args = None
-                    timeout_s = 10
-                    rollback_action = None
-                    rollback_args = None
-                steps = [_Sim()]
-
-            from ..settings import settings as _settings
-            base_url = getattr(_settings, "SELF_HEAL_BASE_URL", "http://localhost:8000")
-            order = 1
-            # Global per-run timeout watchdog
+        while len(self._inflight) < self.max_concurrent and not self._stopping.is_set():
+            async with async_session() as session:
+                run = await self._claim_next(session, datetime.now(timezone.utc), set(self._active_services))
+                if not run:
+                    return
+                run_id, service = run.id, run.service
+            if service:
+                self._active_services.add(service)
+            task = asyncio.create_task(self._execute_claimed(run_id, service))
+            self._inflight[run_id] = task
+
+    async def _execute_claimed(self, run_id: int, service: Optional[str]) -> None:
+        from ..models import async_session
+        from ..models.self_heal_models import PlaybookRun
+
+        try:
+            async with async_session() as session:
+                run = await session.get(PlaybookRun, run_id)
+                if run is not None:
+                    await self._execute_run(session, run)
+        except Exception as e:  # pragma: no cover
             try:
-                from ..settings import settings as _settings_timeout
-                run_deadline = now + timedelta(minutes=int(getattr(_settings_timeout, "SELF_HEAL_RUN_TIMEOUT_MIN", 10)))
+                print(f"[self-heal:runner] run {run_id} error: {e}")
             except Exception:
-                run_deadline = now + timedelta(minutes=10)
+                pass
+        finally:
+            self._inflight.pop(run_id, None)
+            if service:
+                self._active_services.discard(service)
+            # Freed capacity / service lock may unblock queued runs
+            self._wakeup.set()
+
+    async def _on_approval_event(self, event) -> None:
+        self.metrics["wakeups"] += 1
+        self._wakeup.set()
+
+    def notify_approved(self, run_id: Optional[int] = None) -> None:
+        """Wake the dispatcher now instead of at the next poll (call after approving a run)"""
+        self._wakeup.set()
+
+    async def approve_runs(self, session, run_ids: Optional[List[int]] = None, approval_request_id: Optional[int] = None, approved_by: str = "system") -> List[int]:
+        """Move proposed runs to 'approved' and announce them (commits the session).
+
+        Runs are selected by id and/or by the ApprovalRequest they are linked
+        to. Each approved run is published as self_heal.run_approved so
+        runners wake up instead of waiting for their next poll.
+        """
+        from sqlalchemy import update
+        from ..models.self_heal_models import PlaybookRun
+
+        if run_ids is None and approval_request_id is None:
+            return []
+        conditions = [PlaybookRun.status == "proposed"]
+        if run_ids is not None:
+            conditions.append(PlaybookRun.id.in_(run_ids))
+        if approval_request_id is not None:
+            conditions.append(PlaybookRun.approval_request_id == approval_request_id)
 
+        res = await session.execute(
+            update(PlaybookRun).where(*conditions).values(status="approved").returning(PlaybookRun.id, PlaybookRun.service).execution_options(synchronize_session=False)
+        )
+        approved = res.all()
+        await session.commit()
+
+        for run_id, service in approved:
             try:
-                for step in steps:
-                    # Check global timeout before each step
-                    if datetime.now(timezone.utc) > run_deadline:
-                        run.status = "aborted"
-                        run.ended_at = datetime.now(timezone.utc)
-                        try:
-                            session.add(AuditLog(actor="runner", action="playbook_run_end", resource=str(run.id), policy_checked="self_heal", result="aborted", details="global timeout exceeded"))
-                        except Exception:
-                            pass
-                        try:
-                            from ..self_heal_models import LearningLog
-                            session.add(LearningLog(service=run.service, signal_ref=None, diagnosis=run.diagnosis, action=json.dumps({"run_id": run.id, "status": "aborted"}), outcome=json.dumps({"result": "timeout"})))
-                        except Exception:
-                            pass
-                        await session.commit()
-                        return
-                    # Prepare params
+                from backend.misc.trigger_mesh import trigger_mesh, TriggerEvent
+                await trigger_mesh.publish(TriggerEvent(
+                    event_type="self_heal.run_approved",
+                    source="self_heal",
+                    actor=approved_by,
+                    resource=str(run_id),
+                    payload={"run_id": run_id, "service": service, "approval_request_id": approval_request_id},
+                ))
+            except Exception as e:
+                print(f"[self-heal:runner] run_approved event for run {run_id} not published: {e}")
+            # The mesh delivers asynchronously; wake the local dispatcher directly too
+            self.notify_approved(run_id)
+        return [run_id for run_id, _ in approved]
+
+    # ---- Execution ----
+    async def _execute_run(self, session, run) -> None:
+        """Execute the steps of a claimed run, verify, and record the outcome"""
+        now = run.started_at or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        try:
+            await self._run_steps(session, run, now)
+        finally:
+            await self._record_outcome(run)
+
+    async def _run_steps(self, session, run, now: datetime) -> None:
+        from sqlalchemy import select
+        from ..models.self_heal_models import PlaybookStep as PBStep, PlaybookStepRun, VerificationCheck
+        from ..models.governance_models import AuditLog
+
+        # Determine steps: load from DB if playbook_id is set; otherwise simulate one step
+        steps: List[Any] = []
+        if getattr(run, "playbook_id", None):
+            st_res = await session.execute(
+                select(PBStep).where(PBStep.playbook_id == run.playbook_id).order_by(PBStep.step_order.asc())
+            )
+            steps = st_res.scalars().all()
+        if not steps:
+            # Simulated single step
+            class _Sim:
+                id = None
+                action = "noop_or_safe_action"
+                args = None
+                timeout_s = 10
+                rollback_action = None
+                rollback_args = None
+            steps = [_Sim()]
+
+        from ..settings import settings as _settings
+        base_url = getattr(_settings, "SELF_HEAL_BASE_URL", "http://localhost:8000")
+        order = 1
+        # Global per-run timeout watchdog
+        try:
+            from ..settings import settings as _settings_timeout
+            run_deadline = now + timedelta(minutes=int(getattr(_settings_timeout, "SELF_HEAL_RUN_TIMEOUT_MIN", 10)))
+        except Exception:
+            run_deadline = now + timedelta(minutes=10)
+
+        try:
+            for step in steps:
+                # Check global timeout before each step
+                if datetime.now(timezone.utc) > run_deadline:
+                    run.status = "aborted"
+                    run.ended_at = datetime.now(timezone.utc)
                     try:
-                        params = json.loads(step.args) if getattr(step, "args", None) else {}
+                        session.add(AuditLog(actor="runner", action="playbook_run_end", resource=str(run.id), policy_checked="self_heal", result="aborted", details="global timeout exceeded"))
                     except Exception:
-                        params = {}
-
-                    # Execute step
-                    srun = PlaybookStepRun(
-                        run_id=run.id,
-                        step_id=getattr(step, "id", None),
-                        step_order=order,
-                        status="running",
-                        log=f"Executing {getattr(step, 'action', 'noop')} params={params}",
-                    )
-                    session.add(srun)
-                    await session.flush()
-
-                    # Time-limited execution
+                        pass
                     try:
-                        await asyncio.wait_for(self._execute_action(getattr(step, "action", "noop"), params), timeout=float(getattr(step, "timeout_s", 60) or 60))
-                    except Exception as exec_ex:
-                        srun.status = "failed"
-                        srun.ended_at = datetime.now(timezone.utc)
-                        srun.log = (srun.log or "") + f"\nExecution error: {exec_ex}"
-                        await session.commit()
-                        # Attempt rollback if available
-                        try:
-                            rb_action = getattr(step, "rollback_action", None)
-                            if rb_action:
-                                try:
-                                    rb_params = json.loads(getattr(step, "rollback_args", "") or "{}")
-                                except Exception:
-                                    rb_params = {}
-                                rb_log = await self._execute_action(rb_action, rb_params)
-                                srun.log += f"\nRollback executed: {rb_log}"
-                        except Exception:
-                            pass
-                        raise
-
-                    # Verifications
-                    ok = await self._run_verifications_for_step(session, run, step, base_url)
-                    if not ok:
-                        srun.status = "failed"
-                        srun.ended_at = datetime.now(timezone.utc)
-                        srun.log = (srun.log or "") + "\nVerification failed"
-                        await session.commit()
-                        # rollback if defined
-                        try:
-                            rb_action = getattr(step, "rollback_action", None)
-                            if rb_action:
-                                try:
-                                    rb_params = json.loads(getattr(step, "rollback_args", "") or "{}")
-                                except Exception:
-                                    rb_params = {}
-                                rb_log = await self._execute_action(rb_action, rb_params)
-                                srun.log += f"\nRollback executed: {rb_log}"
-                        except Exception:
-                            pass
-                        raise RuntimeError("verification_failed")
-
-                    # Mark succeeded
-                    srun.status = "succeeded"
-                    srun.ended_at = datetime.now(timezone.utc)
-                    srun.log = (srun.log or "") + "\nStep verification passed"
+                        from ..models.self_heal_models import LearningLog
+                        session.add(LearningLog(service=run.service, signal_ref=None, diagnosis=run.diagnosis, action=json.dumps({"run_id": run.id, "status": "aborted"}), outcome=json.dumps({"result": "timeout"})))
+                    except Exception:
+                        pass
                     await session.commit()
-                    order += 1
-
-                # Post-plan verifications (if any)
+                    return
+                # Prepare params
                 try:
-                    ver_res = await session.execute(
-                        select(VerificationCheck).where(VerificationCheck.playbook_id == run.playbook_id, VerificationCheck.scope == "post_plan")
-                    )
-                    post_checks = ver_res.scalars().all()
+                    params = json.loads(step.args) if getattr(step, "args", None) else {}
                 except Exception:
-                    post_checks = []
-                all_ok = True
-                for chk in post_checks:
+                    params = {}
+
+                # Execute step
+                srun = PlaybookStepRun(
+                    run_id=run.id,
+                    step_id=getattr(step, "id", None),
+                    step_order=order,
+                    status="running",
+                    log=f"Executing {getattr(step, 'action', 'noop')} params={params}",
+                )
+                session.add(srun)
+                # Commit (not just flush) so the DB write lock isn't held while the action runs
+                await session.commit()
+
+                # Time-limited execution
+                try:
+                    await asyncio.wait_for(self._execute_action(getattr(step, "action", "noop"), params), timeout=float(getattr(step, "timeout_s", 60) or 60))
+                except Exception as exec_ex:
+                    srun.status = "failed"
+                    srun.ended_at = datetime.now(timezone.utc)
+                    srun.log = (srun.log or "") + f"\nExecution error: {exec_ex}"
+                    await session.commit()
+                    # Attempt rollback if available
                     try:
-                        cfg = json.loads(chk.config) if chk.config else {}
+                        rb_action = getattr(step, "rollback_action", None)
+                        if rb_action:
+                            try:
+                                rb_params = json.loads(getattr(step, "rollback_args", "") or "{}")
+                            except Exception:
+                                rb_params = {}
+                            rb_log = await self._execute_action(rb_action, rb_params)
+                            srun.log += f"\nRollback executed: {rb_log}"
                     except Exception:
-                        cfg = {}
-                    ctype = (chk.check_type or "").lower()
-                    if ctype in {"health_endpoint", "http_health"}:
-                        ok = await self._verify_http_health(base_url, cfg.get("path", "/health"), cfg.get("expect", "ok"), int(cfg.get("timeout_s", 20)), int(cfg.get("retries", 2)), int(cfg.get("backoff_ms", 250)))
-                        all_ok = all_ok and ok
-                    elif ctype == "metric" or ctype == "metrics_threshold":
-                        ok = await self._verify_metrics_threshold(session, run.service, cfg.get("metric"), cfg.get("gte"), cfg.get("lte"), int(cfg.get("window_min", 5)))
-                        all_ok = all_ok and ok
-                    elif ctype == "metrics_trend":
-                        ok = await self._verify_metrics_trend(session, run.service, cfg.get("metric"), cfg.get("direction", "down"), int(cfg.get("window_min", 5)))
-                        all_ok = all_ok and ok
-                    else:
-                        all_ok = False
-                if not all_ok:
-                    raise RuntimeError("post_plan_verification_failed")
+                        pass
+                    raise
 
-                run.status = "succeeded"
-                run.ended_at = datetime.now(timezone.utc)
-                try:
-                    session.add(AuditLog(actor="runner", action="playbook_run_end", resource=str(run.id), policy_checked="self_heal", result="succeeded", details=f"service={run.service}"))
-                except Exception:
-                    pass
+                # Verifications
+                ok = await self._run_verifications_for_step(session, run, step, base_url)
+                if not ok:
+                    srun.status = "failed"
+                    srun.ended_at = datetime.now(timezone.utc)
+                    srun.log = (srun.log or "") + "\nVerification failed"
+                    await session.commit()
+                    # rollback if defined
+                    try:
+                        rb_action = getattr(step, "rollback_action", None)
+                        if rb_action:
+                            try:
+                                rb_params = json.loads(getattr(step, "rollback_args", "") or "{}")
+                            except Exception:
+                                rb_params = {}
+                            rb_log = await self._execute_action(rb_action, rb_params)
+                            srun.log += f"\nRollback executed: {rb_log}"
+                    except Exception:
+                        pass
+                    raise RuntimeError("verification_failed")
 
-                # Write learning log entry for successful execution
-                try:
-                    from ..self_heal_models import LearningLog
-                    entry = LearningLog(
-                        service=run.service,
-                        signal_ref=None,
-                        diagnosis=run.diagnosis,
-                        action=json.dumps({
-                            "playbook_id": run.playbook_id,
-                            "run_id": run.id,
-                            "status": "succeeded",
-                        }),
-                        outcome=json.dumps({
-                            "status": "succeeded",
-                            "result": "ok",
-                            "ended_at": datetime.now(timezone.utc).isoformat(),
-                        }),
-                    )
-                    session.add(entry)
-                except Exception:
-                    pass
+                # Mark succeeded
+                srun.status = "succeeded"
+                srun.ended_at = datetime.now(timezone.utc)
+                srun.log = (srun.log or "") + "\nStep verification passed"
                 await session.commit()
-            except Exception as ex:
-                # Mark failed/rolled_back and create incident
-                run.status = "failed"
-                run.ended_at = datetime.now(timezone.utc)
-                try:
-                    session.add(AuditLog(actor="runner", action="playbook_run_end", resource=str(run.id), policy_checked="self_heal", result="failed", details=str(ex)))
-                except Exception:
-                    pass
+                order += 1
 
-                # Learning log
+            # Post-plan verifications (if any)
+            try:
+                ver_res = await session.execute(
+                    select(VerificationCheck).where(VerificationCheck.playbook_id == run.playbook_id, VerificationCheck.scope == "post_plan")
+                )
+                post_checks = ver_res.scalars().all()
+            except Exception:
+                post_checks = []
+            all_ok = True
+            for chk in post_checks:
                 try:
-                    from ..self_heal_models import LearningLog
-                    entry = LearningLog(
-                        service=run.service,
-                        signal_ref=None,
-                        diagnosis=run.diagnosis,
-                        action=json.dumps({
-                            "playbook_id": run.playbook_id,
-                            "run_id": run.id,
-                            "status": "failed",
-                        }),
-                        outcome=json.dumps({
-                            "result": "failed",
-                            "error": str(ex),
-                            "ended_at": datetime.now(timezone.utc).isoformat(),
-                        }),
-                    )
-                    session.add(entry)
+                    cfg = json.loads(chk.config) if chk.config else {}
                 except Exception:
-                    pass
+                    cfg = {}
+                ctype = (chk.check_type or "").lower()
+                if ctype in {"health_endpoint", "http_health"}:
+                    ok = await self._verify_http_health(base_url, cfg.get("path", "/health"), cfg.get("expect", "ok"), int(cfg.get("timeout_s", 20)), int(cfg.get("retries", 2)), int(cfg.get("backoff_ms", 250)))
+                    all_ok = all_ok and ok
+                elif ctype == "metric" or ctype == "metrics_threshold":
+                    ok = await self._verify_metrics_threshold(session, run.service, cfg.get("metric"), cfg.get("gte"), cfg.get("lte"), int(cfg.get("window_min", 5)))
+                    all_ok = all_ok and ok
+                elif ctype == "metrics_trend":
+                    ok = await self._verify_metrics_trend(session, run.service, cfg.get("metric"), cfg.get("direction", "down"), int(cfg.get("window_min", 5)))
+                    all_ok = all_ok and ok
+                else:
+                    all_ok = False
+            if not all_ok:
+                raise RuntimeError("post_plan_verification_failed")
+
+            run.status = "succeeded"
+            run.ended_at = datetime.now(timezone.utc)
+            try:
+                session.add(AuditLog(actor="runner", action="playbook_run_end", resource=str(run.id), policy_checked="self_heal", result="succeeded", details=f"service={run.service}"))
+            except Exception:
+                pass
 
-                # Incident + notify
-                try:
-                    from ..self_heal_models import Incident, IncidentEvent
-                    from ..integrations.notify import notify
-                    inc = Incident(service=run.service, severity="high", status="open", title=f"Playbook run {run.id} failed", summary="Self-heal runner reported failure")
-                    session.add(inc)
-                    await session.flush()
-                    ev = IncidentEvent(incident_id=inc.id, event_type="playbook_failed", details=json.dumps({"run_id": run.id, "error": str(ex)}))
-                    session.add(ev)
-                    try:
-                        notify(
-                            event="incident.playbook_failed",
-                            payload={"run_id": run.id, "service": run.service, "error": str(ex)},
-                        )
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
-                await session.commit()
+            # Write learning log entry for successful execution
+            try:
+                from ..models.self_heal_models import LearningLog
+                entry = LearningLog(
+                    service=run.service,
+                    signal_ref=None,
+                    diagnosis=run.diagnosis,
+                    action=json.dumps({
+                        "playbook_id": run.playbook_id,
+                        "run_id": run.id,
+                        "status": "succeeded",
+                    }),
+                    outcome=json.dumps({
+                        "status": "succeeded",
+                        "result": "ok",
+                        "ended_at": datetime.now(timezone.utc).isoformat(),
+                    }),
+                )
+                session.add(entry)
+            except Exception:
+                pass
+            await session.commit()
+        except Exception as ex:
+            # Mark failed/rolled_back and create incident
+            run.status = "failed"
+            run.ended_at = datetime.now(timezone.utc)
+            try:
+                session.add(AuditLog(actor="runner", action="playbook_run_end", resource=str(run.id), policy_checked="self_heal", result="failed", details=str(ex)))
+            except Exception:
+                pass
+
+            # Learning log
+            try:
+                from ..models.self_heal_models import LearningLog
+                entry = LearningLog(
+                    service=run.service,
+                    signal_ref=None,
+                    diagnosis=run.diagnosis,
+                    action=json.dumps({
+                        "playbook_id": run.playbook_id,
+                        "run_id": run.id,
+                        "status": "failed",
+                    }),
+                    outcome=json.dumps({
+                        "result": "failed",
+                        "error": str(ex),
+                        "ended_at": datetime.now(timezone.utc).isoformat(),
+                    }),
+                )
+                session.add(entry)
+            except Exception:
+                pass
+
+            # Incident + notify
+            try:
+                from ..models.self_heal_models import Incident, IncidentEvent
+                from ..integrations.notify import notify
+                inc = Incident(service=run.service, severity="high", status="open", title=f"Playbook run {run.id} failed", summary="Self-heal runner reported failure")
+                session.add(inc)
+                await session.flush()
+                ev = IncidentEvent(incident_id=inc.id, event_type="playbook_failed", details=json.dumps({"run_id": run.id, "error": str(ex)}))
+                session.add(ev)
                 try:
-                    print(f"[self-heal:runner] run {run.id} failed: {ex}")
+                    notify(
+                        event="incident.playbook_failed",
+                        payload={"run_id": run.id, "service": run.service, "error": str(ex)},
+                    )
                 except Exception:
                     pass
+            except Exception:
+                pass
+            await session.commit()
+            try:
+                print(f"[self-heal:runner] run {run.id} failed: {ex}")
+            except Exception:
+                pass
 
 
 # Singleton instance
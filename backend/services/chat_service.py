@@ -11,10 +11,15 @@ Gathers:
 """
 
 from typing import Dict, Any, List, Optional
+from collections import OrderedDict
 from datetime import datetime
+import asyncio
+import time
 import uuid
 import logging
 
+from backend.observability.tracing import request_tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -137,10 +142,203 @@ chat_history = ChatHistoryManager()
 action_registry = ActionRegistry()
 
 
+# Per-source deadlines (seconds) for gather_full_context
+DEFAULT_SOURCE_DEADLINES: Dict[str, float] = {
+    "rag": 2.0,
+    "world_model": 1.0,
+    "trust": 0.5,
+}
+
+# How long a gathered source result may be reused within a session
+SESSION_CONTEXT_TTL_SECONDS = 120.0
+
+# Oldest same-query result a failed/timed-out source may fall back to
+SESSION_CONTEXT_STALE_SECONDS = 600.0
+
+# Message-independent sources (trust state) are shared across sessions
+SHARED_CONTEXT_TTL_SECONDS = 30.0
+
+# Back-off before retrying a dependency whose initialize() failed
+INIT_RETRY_SECONDS = 30.0
+
+
+class _DependencyInitializer:
+    """
+    Runs each dependency's initialize() once instead of on every message
+    
+    The initialization runs as its own task, so a caller that stops
+    waiting (request deadline) doesn't cancel it; the next request finds
+    the dependency ready.
+    """
+    
+    def __init__(self):
+        self._ready: set = set()
+        self._failed_at: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    async def _run(self, name: str, init_fn):
+        try:
+            await init_fn()
+        except Exception as e:
+            self._failed_at[name] = time.monotonic()
+            logger.warning(f"{name} initialization failed: {e}")
+            return
+        self._ready.add(name)
+        self._failed_at.pop(name, None)
+    
+    def is_failed(self, name: str) -> bool:
+        """True when the last initialization attempt for name failed"""
+        return name in self._failed_at
+    
+    async def ensure(self, name: str, init_fn, wait: Optional[float] = None) -> bool:
+        """
+        Start (once) and wait for initialization; True when ready
+        
+        wait bounds how long this caller waits; initialization keeps
+        running in the background past it.
+        """
+        if name in self._ready:
+            return True
+        
+        failed_at = self._failed_at.get(name)
+        if failed_at is not None and time.monotonic() - failed_at < INIT_RETRY_SECONDS:
+            return False
+        
+        task = self._tasks.get(name)
+        if task is None or task.done():
+            task = self._tasks[name] = asyncio.create_task(self._run(name, init_fn))
+        
+        if wait is None:
+            await asyncio.shield(task)
+        else:
+            await asyncio.wait({task}, timeout=wait)
+        return name in self._ready
+
+
+class SessionContextCache:
+    """
+    Remembers the last result of each context source per session
+    
+    A repeated (or re-asked) message in the same session reuses results
+    instead of re-querying, and a source that misses its deadline falls
+    back to the session's previous result for the same query (at most
+    SESSION_CONTEXT_STALE_SECONDS old).
+    """
+    
+    def __init__(self, max_sessions: int = 1000):
+        self.max_sessions = max_sessions
+        # session_id -> source -> (query_key, value, stored_at)
+        self._sessions: "OrderedDict[str, Dict[str, tuple]]" = OrderedDict()
+    
+    @staticmethod
+    def query_key(message: str) -> str:
+        return " ".join(message.lower().split())
+    
+    def get(self, session_id: str, source: str, query_key: Optional[str], allow_stale: bool = False):
+        entry = self._sessions.get(session_id, {}).get(source)
+        if entry is None:
+            return None
+        
+        cached_key, value, stored_at = entry
+        max_age = SESSION_CONTEXT_STALE_SECONDS if allow_stale else SESSION_CONTEXT_TTL_SECONDS
+        if time.monotonic() - stored_at > max_age:
+            return None
+        if query_key is not None and cached_key != query_key:
+            return None
+        return value
+    
+    def put(self, session_id: str, source: str, query_key: Optional[str], value: Any):
+        sources = self._sessions.setdefault(session_id, {})
+        sources[source] = (query_key, value, time.monotonic())
+        self._sessions.move_to_end(session_id)
+        
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+    
+    def clear_session(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+
+_dependency_init = _DependencyInitializer()
+session_context_cache = SessionContextCache()
+_shared_context: Dict[str, tuple] = {}  # source -> (value, stored_at)
+
+
+async def _init_rag_service():
+    from backend.services.rag_service import rag_service
+    await rag_service.initialize()
+
+
+async def _init_world_model():
+    from backend.world_model.grace_world_model import world_model
+    await world_model.initialize()
+
+
+async def _gather_rag_context(user_message: str, user_id: str) -> List[Dict[str, Any]]:
+    from backend.services.rag_service import rag_service
+    
+    rag_result = await rag_service.retrieve(
+        query=user_message,
+        top_k=5,
+        similarity_threshold=0.6,
+        requested_by=user_id
+    )
+    return rag_result.get("results", [])
+
+
+async def _gather_world_model_facts(user_message: str) -> Dict[str, Any]:
+    from backend.world_model.grace_world_model import world_model
+    
+    knowledge_items = await world_model.query(user_message, top_k=3)
+    if not knowledge_items:
+        return {}
+    
+    return {
+        "relevant_knowledge": [
+            {
+                "content": k.content,
+                "confidence": k.confidence,
+                "source": k.source,
+                "category": k.category
+            }
+            for k in knowledge_items
+        ]
+    }
+
+
+async def _gather_trust_state() -> Dict[str, Any]:
+    cached = _shared_context.get("trust")
+    if cached and time.monotonic() - cached[1] < SHARED_CONTEXT_TTL_SECONDS:
+        return cached[0]
+    
+    from backend.trust_framework import calculate_trust_score, model_health_registry
+    
+    # Get current trust score
+    trust_score = calculate_trust_score(
+        verification_passed=True,
+        model_health_ok=True,
+        hallucination_detected=False,
+        context_provenance_verified=True
+    )
+    
+    # Get model health
+    model_health = model_health_registry.get_current_health()
+    
+    trust_state = {
+        "trust_score": trust_score.score,
+        "trust_level": trust_score.level.value,
+        "model_health": model_health.value if model_health else "unknown",
+        "guardrail_active": True
+    }
+    _shared_context["trust"] = (trust_state, time.monotonic())
+    return trust_state
+
+
 async def gather_full_context(
     user_message: str,
     session_id: str,
-    user_id: str = "user"
+    user_id: str = "user",
+    deadlines: Optional[Dict[str, float]] = None
 ) -> Dict[str, Any]:
     """
     Gather all context for Grace's response:
@@ -148,17 +346,31 @@ async def gather_full_context(
     - RAG context
     - World model facts
     - Trust framework state
+    
+    Independent sources run concurrently, each under its own deadline
+    (DEFAULT_SOURCE_DEADLINES, overridable per call) that covers both
+    waiting for the dependency's one-time initialization and the fetch,
+    which gets whatever time the wait left. Initialization itself isn't
+    cancelled at the deadline; it keeps running in the background
+    ("initializing"). A source that fails or times out contributes its
+    previous same-query session value or an empty default;
+    context["sources"] reports what happened to each one.
     """
+    deadlines = {**DEFAULT_SOURCE_DEADLINES, **(deadlines or {})}
+    query_key = session_context_cache.query_key(user_message)
+    
     context = {
         "conversation_history": [],
         "rag_context": [],
         "world_model_facts": {},
         "trust_state": {},
         "user_id": user_id,
-        "session_id": session_id
+        "session_id": session_id,
+        "sources": {},
+        "partial": False
     }
     
-    # 1. Conversation History
+    # 1. Conversation History (in-process, no need to schedule)
     try:
         context["conversation_history"] = chat_history.get_context_window(
             session_id, 
@@ -167,65 +379,75 @@ async def gather_full_context(
     except Exception as e:
         logger.warning(f"Failed to get conversation history: {e}")
     
-    # 2. RAG Context
-    try:
-        from backend.services.rag_service import rag_service
-        await rag_service.initialize()
-        
-        rag_result = await rag_service.retrieve(
-            query=user_message,
-            top_k=5,
-            similarity_threshold=0.6,
-            requested_by=user_id
-        )
-        context["rag_context"] = rag_result.get("results", [])
-    except Exception as e:
-        logger.warning(f"RAG retrieval failed: {e}")
+    # 2-4. RAG, world model and trust state, concurrently
+    sources = {
+        "rag": ("rag_context", lambda: _gather_rag_context(user_message, user_id), query_key),
+        "world_model": ("world_model_facts", lambda: _gather_world_model_facts(user_message), query_key),
+        "trust": ("trust_state", _gather_trust_state, None),
+    }
+    initializers = {
+        "rag": ("rag_service", _init_rag_service),
+        "world_model": ("world_model", _init_world_model),
+    }
     
-    # 3. World Model Facts
-    try:
-        from backend.world_model.grace_world_model import world_model
-        await world_model.initialize()
+    async def run_source(name: str, fetch, source_query_key: Optional[str]):
+        with request_tracer.span(f"chat.{name}", require_parent=True, **{"chat.deadline_s": deadlines[name]}) as span:
+            name, status, value, elapsed_ms = await fetch_source(name, fetch, source_query_key)
+            if span is not None:
+                span.add_tag("chat.source.status", status)
+            return name, status, value, elapsed_ms
+    
+    async def fetch_source(name: str, fetch, source_query_key: Optional[str]):
+        cached = session_context_cache.get(session_id, name, source_query_key)
+        if cached is not None:
+            return name, "cached", cached, 0.0
         
-        knowledge_items = await world_model.query(user_message, top_k=3)
-        if knowledge_items:
-            context["world_model_facts"] = {
-                "relevant_knowledge": [
-                    {
-                        "content": k.content,
-                        "confidence": k.confidence,
-                        "source": k.source,
-                        "category": k.category
-                    }
-                    for k in knowledge_items
-                ]
-            }
-    except Exception as e:
-        logger.warning(f"World model query failed: {e}")
+        started = time.monotonic()
+        deadline = started + deadlines[name]
+        if name in initializers:
+            dependency, init_fn = initializers[name]
+            if not await _dependency_init.ensure(dependency, init_fn, wait=deadlines[name]):
+                status = "unavailable" if _dependency_init.is_failed(dependency) else "initializing"
+                return name, status, None, (time.monotonic() - started) * 1000
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return name, "timeout", None, (time.monotonic() - started) * 1000
+        
+        try:
+            value = await asyncio.wait_for(fetch(), timeout=remaining)
+            status = "ok"
+        except asyncio.TimeoutError:
+            value, status = None, "timeout"
+        except Exception as e:
+            logger.warning(f"Context source {name} failed: {e}")
+            value, status = None, "error"
+        
+        return name, status, value, (time.monotonic() - started) * 1000
     
-    # 4. Trust Framework State
-    try:
-        from backend.trust_framework import calculate_trust_score, model_health_registry
+    results = await asyncio.gather(*[
+        run_source(name, fetch, source_query_key)
+        for name, (_, fetch, source_query_key) in sources.items()
+    ])
+    
+    for name, status, value, elapsed_ms in results:
+        field_name, _, source_query_key = sources[name]
         
-        # Get current trust score
-        trust_score = calculate_trust_score(
-            verification_passed=True,
-            model_health_ok=True,
-            hallucination_detected=False,
-            context_provenance_verified=True
-        )
+        if status == "ok":
+            session_context_cache.put(session_id, name, source_query_key, value)
+        elif status in ("timeout", "error", "initializing", "unavailable"):
+            context["partial"] = True
+            # Fall back to this session's last result for the same query
+            value = session_context_cache.get(session_id, name, source_query_key, allow_stale=True)
+            if value is not None:
+                status = f"{status}_stale"
         
-        # Get model health
-        model_health = model_health_registry.get_current_health()
+        if value is not None:
+            context[field_name] = value
         
-        context["trust_state"] = {
-            "trust_score": trust_score.score,
-            "trust_level": trust_score.level.value,
-            "model_health": model_health.value if model_health else "unknown",
-            "guardrail_active": True
-        }
-    except Exception as e:
-        logger.warning(f"Trust framework check failed: {e}")
+        context["sources"][name] = {"status": status, "elapsed_ms": round(elapsed_ms, 1)}
+    
+    if not context["trust_state"]:
         context["trust_state"] = {
             "trust_score": 0.8,
             "trust_level": "medium",
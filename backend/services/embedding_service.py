@@ -262,6 +262,17 @@ class EmbeddingService:
             "cached": False
         }
     
+    async def embed_query(self, text: str, model: Optional[str] = None) -> List[float]:
+        """
+        Embedding vector for a lookup (search query, cache key)
+        
+        Nothing is stored: no database row and no text-hash cache entry.
+        """
+        if not text or not text.strip():
+            raise ValueError("Text cannot be empty")
+        
+        return await self._generate_embedding(text, model or self.default_model)
+    
     async def embed_batch(
         self,
         items: List[Dict[str, Any]],
@@ -408,49 +419,77 @@ class EmbeddingService:
                 print(f"[EMBEDDING SERVICE] OpenAI API error: {e}")
                 raise
         
-        elif self.provider == "huggingface":
-            # Use sentence-transformers for local embeddings
+        elif self.provider in ("huggingface", "local"):
             try:
-                from sentence_transformers import SentenceTransformer
-                
-                # Load model (cached)
-                if not hasattr(self, '_hf_model'):
-                    self._hf_model = SentenceTransformer(model)
-                
-                embedding = self._hf_model.encode(text, convert_to_tensor=False)
+                embedding = self._sentence_model(model).encode(text, convert_to_tensor=False)
                 return embedding.tolist()
-                
-            except ImportError:
-                raise RuntimeError("sentence-transformers not installed. Run: pip install sentence-transformers")
             except Exception as e:
-                print(f"[EMBEDDING SERVICE] HuggingFace error: {e}")
+                print(f"[EMBEDDING SERVICE] {self.provider} embedding error: {e}")
+                raise
+        
+        else:
+            raise ValueError(f"Unknown provider: {self.provider}. Supported: openai, huggingface, local")
+    
+    async def _generate_embeddings(self, texts: List[str], model: str) -> List[List[float]]:
+        """
+        Generate embedding vectors for many texts in one provider call
+        
+        One OpenAI request per call, or one batched encode() for the
+        sentence-transformers providers, instead of one call per text.
+        """
+        if not texts:
+            return []
+        
+        if self.provider == "openai":
+            if not self.openai_client:
+                raise RuntimeError("OpenAI client not initialized")
+            
+            try:
+                response = await self.openai_client.embeddings.create(
+                    input=texts,
+                    model=model
+                )
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            except Exception as e:
+                print(f"[EMBEDDING SERVICE] OpenAI API error: {e}")
                 raise
         
-        elif self.provider == "local":
-            # Use local sentence-transformers models
+        elif self.provider in ("huggingface", "local"):
             try:
-                from sentence_transformers import SentenceTransformer
-                
-                # Default to all-MiniLM-L6-v2 (fast, 384 dimensions)
-                # Use self.default_model which is already set to a valid local model
-                model_name = "all-MiniLM-L6-v2"  # Always use this for local
-                
-                if not hasattr(self, '_local_model'):
-                    print(f"[EMBEDDING SERVICE] Loading local model: {model_name}")
-                    self._local_model = SentenceTransformer(model_name)
-                
-                embedding = self._local_model.encode(text, convert_to_tensor=False)
-                return embedding.tolist()
-                
-            except ImportError:
-                raise RuntimeError("sentence-transformers not installed. Run: pip install sentence-transformers")
+                embeddings = self._sentence_model(model).encode(
+                    texts,
+                    batch_size=self.batch_size,
+                    convert_to_tensor=False
+                )
+                return [embedding.tolist() for embedding in embeddings]
             except Exception as e:
-                print(f"[EMBEDDING SERVICE] Local embedding error: {e}")
+                print(f"[EMBEDDING SERVICE] {self.provider} embedding error: {e}")
                 raise
         
         else:
             raise ValueError(f"Unknown provider: {self.provider}. Supported: openai, huggingface, local")
     
+    def _sentence_model(self, model: str):
+        """Loaded (cached) sentence-transformers model for this provider"""
+        attr = '_hf_model' if self.provider == "huggingface" else '_local_model'
+        if hasattr(self, attr):
+            return getattr(self, attr)
+        
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise RuntimeError("sentence-transformers not installed. Run: pip install sentence-transformers")
+        
+        if self.provider == "huggingface":
+            self._hf_model = SentenceTransformer(model)
+            return self._hf_model
+        
+        # Local always uses all-MiniLM-L6-v2 (fast, 384 dimensions)
+        model_name = "all-MiniLM-L6-v2"
+        print(f"[EMBEDDING SERVICE] Loading local model: {model_name}")
+        self._local_model = SentenceTransformer(model_name)
+        return self._local_model
+    
     async def embed_chunks(
         self,
         text: str,
@@ -0,0 +1,378 @@
+"""
+LLM Response Cache
+
+Sits in front of ModelOrchestrator so repeated or near-identical prompts
+from chat, world-model self queries and reflection loops don't each pay
+for a multi-second local LLM call.
+
+Tiers:
+- Exact: whitespace-normalized prompt hash, keyed per model and temperature
+- Semantic: cosine similarity over embeddings of the user question only
+  (EmbeddingService), bucketed by a hash of the system prefix. Callers
+  pass the bare question separately; the full prompt is never embedded,
+  since a shared template or RAG context would dominate a truncated
+  sentence embedding. Multi-turn prompts are exact-only.
+
+Features:
+- TTL expiry and LRU eviction
+- O(1) invalidation of RAG-dependent entries when the corpus changes
+- In-flight coalescing so concurrent identical prompts share one call
+- Hit-rate metrics
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class CachedResponse:
+    """One cached LLM response"""
+    key: str
+    bucket: Tuple[str, float, str]
+    response: Dict[str, Any]
+    created_at: float
+    corpus_generation: Optional[int]  # None = not RAG-dependent
+    vector: Optional[Any] = None  # unit-normalized prompt embedding
+    hits: int = 0
+
+
+@dataclass
+class CacheMetrics:
+    """Counters for cache effectiveness"""
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    embedding_failures: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "embedding_failures": self.embedding_failures,
+            "lookups": lookups,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+        }
+
+
+class LLMResponseCache:
+    """
+    Two-tier (exact + embedding similarity) cache for LLM responses
+
+    Usage:
+        result = await llm_response_cache.get_or_generate(
+            model="qwen2.5:32b",
+            prompt=prompt,
+            temperature=0.7,
+            generate=lambda: call_the_model(prompt),
+        )
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600.0,
+        similarity_threshold: float = 0.95,
+        semantic_enabled: bool = True,
+        max_semantic_temperature: float = 1.0,
+        embedding_backoff_seconds: float = 30.0,
+        max_embedding_backoff_seconds: float = 600.0
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.semantic_enabled = semantic_enabled
+        # Above this temperature callers want variety, so only exact hits apply
+        self.max_semantic_temperature = max_semantic_temperature
+        # An embedding failure pauses the semantic tier, doubling per failure
+        self.embedding_backoff_seconds = embedding_backoff_seconds
+        self.max_embedding_backoff_seconds = max_embedding_backoff_seconds
+        self._semantic_retry_at = 0.0
+        self._consecutive_embedding_failures = 0
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, float, str], Dict[str, CachedResponse]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._corpus_generation = 0
+        self.metrics = CacheMetrics()
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(prompt: str) -> str:
+        # Case can change the answer (code, identifiers), so only whitespace is folded
+        return " ".join(prompt.split())
+
+    @classmethod
+    def _digest(cls, text: str) -> str:
+        return hashlib.sha256(cls._normalize(text).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _bucket(cls, model: str, temperature: float, prefix: str = "") -> Tuple[str, float, str]:
+        return (model, round(float(temperature), 2), cls._digest(prefix)[:16])
+
+    def _key(self, bucket: Tuple[str, float, str], prompt: str) -> str:
+        model, temp, prefix = bucket
+        return f"{model}|{temp}|{prefix}|{self._digest(prompt)}"
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def _is_live(self, entry: CachedResponse, now: float) -> bool:
+        if now - entry.created_at > self.ttl_seconds:
+            self.metrics.expirations += 1
+            return False
+        if entry.corpus_generation is not None and entry.corpus_generation != self._corpus_generation:
+            self.metrics.invalidations += 1
+            return False
+        return True
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            bucket = self._buckets.get(entry.bucket)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._buckets[entry.bucket]
+
+    def _lookup_exact(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not self._is_live(entry, time.time()):
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _lookup_semantic(
+        self,
+        bucket: Tuple[str, float, str],
+        vector: Any
+    ) -> Optional[CachedResponse]:
+        candidates = self._buckets.get(bucket)
+        if not candidates:
+            return None
+
+        now = time.time()
+        best: Optional[CachedResponse] = None
+        best_score = self.similarity_threshold
+
+        for key, entry in list(candidates.items()):
+            if entry.vector is None:
+                continue
+            if not self._is_live(entry, now):
+                self._remove(key)
+                continue
+            score = _cosine(vector, entry.vector)
+            if score >= best_score:
+                best, best_score = entry, score
+
+        if best is not None:
+            self._entries.move_to_end(best.key)
+        return best
+
+    def _store(self, entry: CachedResponse):
+        self._remove(entry.key)
+        self._entries[entry.key] = entry
+        self._buckets.setdefault(entry.bucket, {})[entry.key] = entry
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.metrics.evictions += 1
+
+    def _semantic_available(self) -> bool:
+        return self.semantic_enabled and time.monotonic() >= self._semantic_retry_at
+
+    async def _embed(self, question: str) -> Optional[Any]:
+        """Embed a question with the shared EmbeddingService (no DB persistence)"""
+        try:
+            from backend.services.embedding_service import embedding_service
+
+            vector = await embedding_service.embed_query(self._normalize(question))
+        except Exception as e:
+            # Pause the semantic tier (exact caching continues) and retry later
+            self.metrics.embedding_failures += 1
+            self._consecutive_embedding_failures += 1
+            backoff = min(
+                self.embedding_backoff_seconds * 2 ** (self._consecutive_embedding_failures - 1),
+                self.max_embedding_backoff_seconds
+            )
+            self._semantic_retry_at = time.monotonic() + backoff
+            print(f"[LLM CACHE] Semantic tier paused for {backoff:.0f}s: {e}")
+            return None
+
+        self._consecutive_embedding_failures = 0
+        return _unit(vector)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_or_generate(
+        self,
+        model: str,
+        prompt: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]],
+        temperature: float = 0.7,
+        corpus_dependent: bool = True,
+        cacheable: Callable[[Dict[str, Any]], bool] = lambda r: bool(r.get("text")),
+        question: Optional[str] = None,
+        prefix: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Return a cached response for (model, temperature, prompt) or call generate()
+
+        Args:
+            model: Model name (part of the key)
+            prompt: Full prompt text (system + context + user)
+            generate: Coroutine factory producing the response dict
+            temperature: Sampling temperature (part of the key)
+            corpus_dependent: Drop this entry when the RAG corpus changes
+            cacheable: Predicate deciding whether a fresh response is stored
+            question: The bare user question. Only when given is the
+                semantic tier used, and only this text is embedded; leave
+                it None for multi-turn prompts, where history changes the
+                answer.
+            prefix: System prompt preceding the question; its hash is
+                part of the key so different personas never share entries
+
+        Returns:
+            Response dict with "cache" set to "exact", "semantic" or "miss"
+        """
+        bucket = self._bucket(model, temperature, prefix)
+        key = self._key(bucket, prompt)
+
+        entry = self._lookup_exact(key)
+        if entry is not None:
+            entry.hits += 1
+            self.metrics.exact_hits += 1
+            return {**entry.response, "cache": "exact"}
+
+        # Identical prompt already being generated - share the result
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.metrics.coalesced += 1
+            response = await asyncio.shield(pending)
+            return {**response, "cache": "coalesced"}
+
+        # Register before any await so concurrent duplicates coalesce
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            vector = None
+            if (
+                question
+                and bucket[1] <= self.max_semantic_temperature
+                and self._semantic_available()
+            ):
+                vector = await self._embed(question)
+                if vector is not None:
+                    entry = self._lookup_semantic(bucket, vector)
+                    if entry is not None:
+                        entry.hits += 1
+                        self.metrics.semantic_hits += 1
+                        future.set_result(entry.response)
+                        return {**entry.response, "cache": "semantic"}
+
+            self.metrics.misses += 1
+            response = await generate()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure doesn't warn
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(response)
+
+        if cacheable(response):
+            self._store(CachedResponse(
+                key=key,
+                bucket=bucket,
+                response=response,
+                created_at=time.time(),
+                corpus_generation=self._corpus_generation if corpus_dependent else None,
+                vector=vector,
+            ))
+
+        return {**response, "cache": "miss"}
+
+    def on_corpus_changed(self):
+        """
+        Invalidate every RAG-dependent entry (lazily, by bumping the generation)
+
+        Called by the vector store whenever new documents are indexed.
+        """
+        self._corpus_generation += 1
+
+    def clear(self):
+        """Drop all cached responses"""
+        self._entries.clear()
+        self._buckets.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size, configuration and hit-rate metrics"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "similarity_threshold": self.similarity_threshold,
+            "semantic_enabled": self.semantic_enabled,
+            "semantic_paused_for": max(0.0, round(self._semantic_retry_at - time.monotonic(), 1)),
+            "corpus_generation": self._corpus_generation,
+            "buckets": len(self._buckets),
+            **self.metrics.to_dict(),
+        }
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with the ML stack
+    np = None
+
+
+def _unit(vector: List[float]):
+    if np is not None:
+        arr = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(arr)) or 1.0
+        return arr / norm
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _cosine(a, b) -> float:
+    # Vectors are stored pre-normalized, so the dot product is the cosine
+    if len(a) != len(b):
+        return 0.0
+    if np is not None:
+        return float(np.dot(a, b))
+    return sum(x * y for x, y in zip(a, b))
+
+
+# Global instance
+llm_response_cache = LLMResponseCache()
@@ -14,6 +14,8 @@ from typing import Dict, Any, List, Optional
 from openai import AsyncOpenAI
 import logging
 
+from backend.observability.tracing import request_tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +71,7 @@ FORMAT YOUR RESPONSES:
 - If uncertain, say "I'm not confident about X" and suggest verification
 """
 
+    @request_tracer.traced("llm.reasoner.generate")
     async def generate(
         self,
         user_message: str,
@@ -181,13 +184,20 @@ WORLD MODEL FACTS (canonical, verified):
             ]
             
             # Call OpenAI
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=tools,
-                max_tokens=self.max_tokens,
-                temperature=0.7,
-            )
+            with request_tracer.span(
+                "llm.inference",
+                require_parent=True,
+                **{"llm.provider": "openai", "llm.model": self.model, "llm.messages": len(messages)}
+            ) as span:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    tools=tools,
+                    max_tokens=self.max_tokens,
+                    temperature=0.7,
+                )
+                if span is not None and getattr(response, "usage", None):
+                    span.add_tag("llm.total_tokens", response.usage.total_tokens)
             
             # Parse response
             choice = response.choices[0]
@@ -529,6 +529,13 @@ class VectorStore:
                 await session.commit()
             
             indexed_count = len(embeddings)
+            
+            # Cached LLM answers built on the old corpus are now stale
+            try:
+                from backend.services.llm_response_cache import llm_response_cache
+                llm_response_cache.on_corpus_changed()
+            except Exception:
+                pass
         else:
             indexed_count = 0
         
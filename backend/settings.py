@@ -13,5 +13,9 @@ class Settings:
     
     # Timeouts
     SELF_HEAL_RUN_TIMEOUT_MIN = int(os.getenv("SELF_HEAL_RUN_TIMEOUT_MIN", 10))
+    
+    # Runner: "concurrent" (event-driven, parallel across services) or "serial"
+    SELF_HEAL_RUNNER_MODE = os.getenv("SELF_HEAL_RUNNER_MODE", "concurrent")
+    SELF_HEAL_MAX_CONCURRENT_RUNS = int(os.getenv("SELF_HEAL_MAX_CONCURRENT_RUNS", 4))
 
 settings = Settings()
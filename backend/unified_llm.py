@@ -4,10 +4,12 @@ Combines open-source models with Grace's autonomous capabilities + learning
 """
 
 import os
-import httpx
-from typing import Dict, Any, List, Optional
+import json
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator
 from datetime import datetime
 from backend.model_orchestrator import model_orchestrator
+from backend.observability.tracing import request_tracer
 
 class UnifiedLLM:
     """
@@ -47,6 +49,7 @@ class UnifiedLLM:
         installed_count = len([m for m in available if m["installed"]])
         print(f"[OK] Model Orchestrator: {installed_count} models available")
     
+    @request_tracer.traced("llm.chat")
     async def chat(
         self,
         message: str,
@@ -68,54 +71,23 @@ class UnifiedLLM:
         """
         
         # Step 1: Enrich with Grace's memory (if enabled)
-        enriched_context = message
-        memory_results = []
-        
-        if use_memory:
-            try:
-                from backend.memory_services.memory import memory_service
-                # Search memory for relevant context
-                memory_results = await memory_service.semantic_search(message, limit=3)
-                
-                if memory_results:
-                    memory_context = "\n\n[From Grace's Memory]:\n"
-                    for result in memory_results:
-                        memory_context += f"- {result.get('content', '')}\n"
-                    enriched_context = f"{message}\n{memory_context}"
-            except Exception as e:
-                print(f"Memory enrichment skipped: {e}")
+        enriched_context, memory_results = await self._enrich_with_memory(message, use_memory)
         
         # Step 2: Use Model Orchestrator for intelligent routing
-        try:
-            selected_model = await model_orchestrator.select_best_model(
-                task=message,
-                context=context
-            )
-            print(f"[Model Router] Selected: {selected_model}")
-        except Exception as e:
-            print(f"[Model Router] Fallback to default: {e}")
-            selected_model = self.models[0]
+        selected_model = await self._select_model(message, context)
         
         # Step 3: Try selected model with learning feedback
         try:
-            async with httpx.AsyncClient() as client:
-                # Build conversation history
-                messages = [
-                    {
-                        "role": "system",
-                        "content": self._build_system_prompt(memory_results)
-                    }
-                ]
-                
-                # Add context history
-                if context:
-                    messages.extend(context[-5:])  # Last 5 exchanges
-                
-                messages.append({"role": "user", "content": enriched_context})
-                    
-                start_time = datetime.now()
-                ollama_response = await client.post(
-                    f"{self.ollama_url}/api/chat",
+            messages = self._build_messages(enriched_context, context, memory_results)
+            
+            start_time = time.time()
+            with request_tracer.span(
+                "llm.inference",
+                require_parent=True,
+                **{"llm.provider": "ollama", "llm.model": selected_model}
+            ):
+                ollama_response = await model_orchestrator.get_http_client().post(
+                    "/api/chat",
                     json={
                         "model": selected_model,
                         "messages": messages,
@@ -127,41 +99,42 @@ class UnifiedLLM:
                     },
                     timeout=30.0
                 )
+            
+            if ollama_response.status_code == 200:
+                result = ollama_response.json()
+                response_text = result["message"]["content"]
+                response_time = time.time() - start_time
                 
-                if ollama_response.status_code == 200:
-                    result = ollama_response.json()
-                    response_text = result["message"]["content"]
-                    latency_ms = (datetime.now() - start_time).total_seconds() * 1000
-                    
-                    await model_orchestrator._record_performance(
-                        model=selected_model,
-                        task=message,
-                        success=True,
-                        latency_ms=latency_ms,
-                        quality_score=0.8  # Default, can be improved with verification
-                    )
-                    
-                    # Step 4: Route through agentic spine (if enabled)
-                    if use_agentic and self._should_execute_task(message, response_text):
-                        response_text = await self._route_to_agentic(message, response_text)
-                    
-                    return {
-                        "text": response_text,
-                        "provider": "ollama",
-                        "model": selected_model,
-                        "latency_ms": latency_ms,
-                        "memory_used": len(memory_results) > 0,
-                        "agentic_routing": use_agentic,
-                        "timestamp": datetime.now().isoformat()
-                    }
+                await model_orchestrator._record_performance(
+                    model=selected_model,
+                    task_type=model_orchestrator._classify_task(message),
+                    success=True,
+                    response_time=response_time,
+                    message_length=len(message),
+                    response_length=len(response_text)
+                )
+                
+                # Step 4: Route through agentic spine (if enabled)
+                if use_agentic and self._should_execute_task(message, response_text):
+                    response_text = await self._route_to_agentic(message, response_text)
+                
+                return {
+                    "text": response_text,
+                    "provider": "ollama",
+                    "model": selected_model,
+                    "latency_ms": response_time * 1000,
+                    "memory_used": len(memory_results) > 0,
+                    "agentic_routing": use_agentic,
+                    "timestamp": datetime.now().isoformat()
+                }
         except Exception as ollama_error:
             print(f"Ollama error with {selected_model}: {ollama_error}")
             await model_orchestrator._record_performance(
                 model=selected_model,
-                task=message,
+                task_type=model_orchestrator._classify_task(message),
                 success=False,
-                latency_ms=0,
-                quality_score=0.0
+                response_time=0.0,
+                error=str(ollama_error)
             )
         
         # Step 4: Try OpenAI GPT-4
@@ -178,12 +151,17 @@ class UnifiedLLM:
                 if context:
                     messages = [messages[0]] + context[-5:] + [messages[1]]
                 
-                completion = await client.chat.completions.create(
-                    model="gpt-4-turbo-preview",
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=600
-                )
+                with request_tracer.span(
+                    "llm.inference",
+                    require_parent=True,
+                    **{"llm.provider": "openai", "llm.model": "gpt-4-turbo-preview"}
+                ):
+                    completion = await client.chat.completions.create(
+                        model="gpt-4-turbo-preview",
+                        messages=messages,
+                        temperature=0.7,
+                        max_tokens=600
+                    )
                 
                 response_text = completion.choices[0].message.content
                 
@@ -212,12 +190,17 @@ class UnifiedLLM:
                 if context:
                     claude_messages = context[-5:] + claude_messages
                 
-                response = await client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=600,
-                    system=self._build_system_prompt(memory_results),
-                    messages=claude_messages
-                )
+                with request_tracer.span(
+                    "llm.inference",
+                    require_parent=True,
+                    **{"llm.provider": "anthropic", "llm.model": "claude-3-5-sonnet-20241022"}
+                ):
+                    response = await client.messages.create(
+                        model="claude-3-5-sonnet-20241022",
+                        max_tokens=600,
+                        system=self._build_system_prompt(memory_results),
+                        messages=claude_messages
+                    )
                 
                 response_text = response.content[0].text
                 
@@ -238,7 +221,8 @@ class UnifiedLLM:
         
         # Step 6: Fallback to Grace's built-in LLM
         if self.grace_llm:
-            result = await self.grace_llm.generate_response(message, domain="chat")
+            with request_tracer.span("llm.inference", require_parent=True, **{"llm.provider": "grace_llm"}):
+                result = await self.grace_llm.generate_response(message, domain="chat")
             return {
                 "text": result.get("text", "I'm ready to help."),
                 "provider": "grace_llm",
@@ -258,6 +242,151 @@ class UnifiedLLM:
             "timestamp": datetime.now().isoformat()
         }
         
+    async def stream_chat(
+        self,
+        message: str,
+        context: Optional[List[Dict]] = None,
+        use_memory: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream tokens from Ollama as they are generated.
+        
+        Yields {"type": "token", "text": ...} events followed by one
+        {"type": "done", ...} event. Agentic routing is skipped because it
+        needs the full response; use chat() when execution is required.
+        """
+        
+        enriched_context, memory_results = await self._enrich_with_memory(message, use_memory)
+        selected_model = await self._select_model(message, context)
+        messages = self._build_messages(enriched_context, context, memory_results)
+        
+        start_time = time.time()
+        first_token_at: Optional[float] = None
+        parts: List[str] = []
+        
+        try:
+            async with model_orchestrator.get_http_client().stream(
+                "POST",
+                "/api/chat",
+                json={
+                    "model": selected_model,
+                    "messages": messages,
+                    "stream": True,
+                    "options": {
+                        "temperature": 0.8,
+                        "num_predict": 600
+                    }
+                },
+                timeout=60.0
+            ) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"Ollama returned HTTP {response.status_code}")
+                
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    
+                    token = chunk.get("message", {}).get("content", "")
+                    if token:
+                        if first_token_at is None:
+                            first_token_at = time.time()
+                        parts.append(token)
+                        yield {"type": "token", "text": token}
+                    
+                    if chunk.get("done"):
+                        break
+        except Exception as e:
+            print(f"Ollama stream error with {selected_model}: {e}")
+            await model_orchestrator._record_performance(
+                model=selected_model,
+                task_type=model_orchestrator._classify_task(message),
+                success=False,
+                response_time=time.time() - start_time,
+                error=str(e)
+            )
+            yield {"type": "error", "error": str(e), "model": selected_model}
+            return
+        
+        response_time = time.time() - start_time
+        response_text = "".join(parts)
+        
+        await model_orchestrator._record_performance(
+            model=selected_model,
+            task_type=model_orchestrator._classify_task(message),
+            success=True,
+            response_time=response_time,
+            message_length=len(message),
+            response_length=len(response_text)
+        )
+        
+        yield {
+            "type": "done",
+            "text": response_text,
+            "provider": "ollama",
+            "model": selected_model,
+            "latency_ms": response_time * 1000,
+            "time_to_first_token_ms": (first_token_at - start_time) * 1000 if first_token_at else None,
+            "memory_used": len(memory_results) > 0,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    @request_tracer.traced("llm.memory_enrichment")
+    async def _enrich_with_memory(self, message: str, use_memory: bool):
+        """Append relevant memory snippets to the message"""
+        enriched_context = message
+        memory_results = []
+        
+        if use_memory:
+            try:
+                from backend.memory_services.memory import memory_service
+                # Search memory for relevant context
+                memory_results = await memory_service.semantic_search(message, limit=3)
+                
+                if memory_results:
+                    memory_context = "\n\n[From Grace's Memory]:\n"
+                    for result in memory_results:
+                        memory_context += f"- {result.get('content', '')}\n"
+                    enriched_context = f"{message}\n{memory_context}"
+            except Exception as e:
+                print(f"Memory enrichment skipped: {e}")
+        
+        return enriched_context, memory_results
+    
+    @request_tracer.traced("llm.select_model")
+    async def _select_model(self, message: str, context: Optional[List[Dict]]) -> str:
+        """Route through the model orchestrator, falling back to the default model"""
+        try:
+            selected_model = await model_orchestrator.select_best_model(message, context)
+            print(f"[Model Router] Selected: {selected_model}")
+        except Exception as e:
+            print(f"[Model Router] Fallback to default: {e}")
+            selected_model = self.models[0]
+        return selected_model
+    
+    def _build_messages(
+        self,
+        enriched_context: str,
+        context: Optional[List[Dict]],
+        memory_results: List
+    ) -> List[Dict[str, str]]:
+        """Build the Ollama chat message list"""
+        messages = [
+            {
+                "role": "system",
+                "content": self._build_system_prompt(memory_results)
+            }
+        ]
+        
+        # Add context history
+        if context:
+            messages.extend(context[-5:])  # Last 5 exchanges
+        
+        messages.append({"role": "user", "content": enriched_context})
+        return messages
+    
     def _build_system_prompt(self, memory_results: List = None) -> str:
         """Build system prompt with Grace's context"""
         
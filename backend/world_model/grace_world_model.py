@@ -380,7 +380,8 @@ class GraceWorldModel:
         # Use LLM to synthesize answer
         from backend.model_orchestrator import model_orchestrator
         
-        prompt = f"""Based on my internal knowledge, answer this question about myself:
+        instruction = "Based on my internal knowledge, answer this question about myself:"
+        prompt = f"""{instruction}
 
 My knowledge:
 {context}
@@ -392,7 +393,9 @@ Answer (first person, as Grace):"""
         response = await model_orchestrator.generate(
             model="qwen2.5:32b",
             prompt=prompt,
-            max_tokens=200
+            max_tokens=200,
+            question=question,
+            prefix=instruction
         )
         
         return {
@@ -0,0 +1,59 @@
+"""Tests for the performance benchmark scenarios"""
+
+import asyncio
+import os
+
+import pytest
+
+from backend.benchmarks import performance
+
+
+def test_immutable_log_scenario_uses_a_private_log(monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from backend.logging_system.immutable_log import immutable_log
+
+    def fail(*args, **kwargs):
+        raise AssertionError("benchmark touched the global immutable log")
+
+    monkeypatch.setattr(immutable_log, "submit", fail)
+
+    scenario = performance.immutable_log_scenario(appends=5)
+    captured = {}
+    setup = scenario.setup
+
+    async def capturing_setup():
+        state = await setup()
+        captured.update(state)
+        return state
+
+    scenario.setup = capturing_setup
+    outcome = asyncio.run(performance.run_scenario(scenario, trials=2, warmup=0))
+
+    assert outcome["error"] is None
+    assert outcome["metrics"]["appends_per_s"]["trials"] == 2
+    assert captured["log"].stats["entries_written"] == 10
+    assert not os.path.exists(captured["tmpdir"].name)
+
+
+def test_batched_embeddings_use_one_encode_call():
+    EmbeddingService = pytest.importorskip("backend.services.embedding_service").EmbeddingService
+
+    class FakeVector(list):
+        def tolist(self):
+            return list(self)
+
+    class FakeModel:
+        def __init__(self):
+            self.calls = []
+
+        def encode(self, texts, batch_size=None, convert_to_tensor=False):
+            self.calls.append(texts)
+            return [FakeVector([float(len(text))]) for text in texts]
+
+    service = EmbeddingService(provider="local")
+    service._local_model = model = FakeModel()
+
+    vectors = asyncio.run(service._generate_embeddings(["a", "bb", "ccc"], service.default_model))
+
+    assert vectors == [[1.0], [2.0], [3.0]]
+    assert model.calls == [["a", "bb", "ccc"]]
@@ -0,0 +1,100 @@
+"""Tests for the eager DAG boot scheduler and its critical-path report"""
+
+import asyncio
+import time
+
+import pytest
+
+import backend.core.boot_orchestrator as boot_module
+from backend.core.boot_orchestrator import BootOrchestrator, KernelDependency
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    # Keep .grace_cache and feature flag lookups inside tmp_path
+    monkeypatch.setattr(boot_module, "__file__", str(tmp_path / "backend" / "core" / "boot_orchestrator.py"))
+    return BootOrchestrator()
+
+
+def boot(orchestrator, kernels, durations, failing=()):
+    """Boot a fake kernel graph; each kernel sleeps for its duration"""
+    orchestrator.kernel_graph = {k.name: k for k in kernels}
+    events = []
+
+    async def boot_kernel(kernel, control_plane):
+        events.append(("start", kernel.name))
+        await asyncio.sleep(durations.get(kernel.name, 0.01))
+        events.append(("finish", kernel.name))
+        return kernel.name not in failing
+
+    orchestrator._boot_kernel_with_timeout = boot_kernel
+
+    async def run():
+        booted, failed = set(), set()
+        orchestrator.boot_started_at = time.monotonic()
+        ok = await orchestrator._boot_dag_eager(None, booted, failed)
+        return ok, booted, failed
+
+    ok, booted, failed = asyncio.run(run())
+    return ok, booted, failed, events
+
+
+def kernel(name, *depends_on, critical=False):
+    return KernelDependency(name=name, tier="core", depends_on=list(depends_on), critical=critical)
+
+
+def test_kernel_starts_as_soon_as_its_own_dependencies_are_ready(orchestrator):
+    kernels = [kernel("bus"), kernel("slow"), kernel("log", "bus"), kernel("api", "log", "slow")]
+
+    ok, booted, failed, events = boot(orchestrator, kernels, {"slow": 0.2})
+
+    assert ok and failed == set()
+    assert booted == {"bus", "slow", "log", "api"}
+    # log does not wait for the unrelated slow kernel, api waits for both
+    assert events.index(("start", "log")) < events.index(("finish", "slow"))
+    assert events.index(("start", "api")) > events.index(("finish", "slow"))
+    assert events.index(("start", "api")) > events.index(("finish", "log"))
+
+
+def test_critical_path_follows_the_dependency_that_finished_last(orchestrator):
+    kernels = [kernel("bus"), kernel("fast", "bus"), kernel("slow", "bus"), kernel("api", "fast", "slow")]
+
+    boot(orchestrator, kernels, {"slow": 0.2})
+    report = orchestrator.get_boot_timeline_report()
+
+    assert [k["kernel"] for k in report["critical_path"]] == ["bus", "slow", "api"]
+    assert report["slowest_kernels"][0]["kernel"] == "slow"
+    assert report["critical_path_seconds"] >= 0.2
+
+
+def test_failed_optional_kernel_blocks_only_its_dependents(orchestrator):
+    kernels = [kernel("bus", critical=True), kernel("voice", "bus"), kernel("tts", "voice"), kernel("api", "bus")]
+
+    ok, booted, failed, _ = boot(orchestrator, kernels, {}, failing={"voice"})
+
+    assert ok
+    assert booted == {"bus", "api"}
+    assert failed == {"voice"}
+    assert orchestrator.kernel_timings["tts"]["status"] == "blocked"
+
+
+def test_critical_kernel_blocked_by_failed_optional_dependency_fails_the_boot(orchestrator):
+    kernels = [kernel("bus"), kernel("governance", "bus", critical=True), kernel("slow")]
+
+    ok, booted, failed, events = boot(orchestrator, kernels, {"slow": 5.0}, failing={"bus"})
+
+    assert not ok
+    assert failed == {"bus"}
+    assert orchestrator.kernel_timings["governance"]["status"] == "blocked"
+    # Unrelated kernels still booting are cancelled rather than awaited
+    assert ("finish", "slow") not in events
+    assert orchestrator.kernel_timings["slow"]["status"] == "cancelled"
+
+
+def test_critical_kernel_with_unmet_dependencies_fails_the_boot(orchestrator):
+    kernels = [kernel("a", "b"), kernel("b", "a", critical=True)]
+
+    ok, booted, failed, events = boot(orchestrator, kernels, {})
+
+    assert not ok
+    assert events == []
@@ -0,0 +1,168 @@
+"""Tests for chat context gathering: dependency init and session cache"""
+
+import asyncio
+
+import pytest
+
+from backend.services import chat_service
+from backend.services.chat_service import SessionContextCache, _DependencyInitializer
+
+
+def age_entry(cache, session_id, source, seconds):
+    query_key, value, stored_at = cache._sessions[session_id][source]
+    cache._sessions[session_id][source] = (query_key, value, stored_at - seconds)
+
+
+def test_session_cache_reuses_same_query_within_ttl():
+    cache = SessionContextCache()
+    cache.put("s1", "rag", "what is grace?", ["doc"])
+
+    assert cache.get("s1", "rag", "what is grace?") == ["doc"]
+    assert cache.get("s1", "rag", "something else") is None
+
+    age_entry(cache, "s1", "rag", chat_service.SESSION_CONTEXT_TTL_SECONDS + 1)
+    assert cache.get("s1", "rag", "what is grace?") is None
+
+
+def test_stale_fallback_requires_same_query_and_bounded_age():
+    cache = SessionContextCache()
+    cache.put("s1", "rag", "what is grace?", ["doc"])
+    age_entry(cache, "s1", "rag", chat_service.SESSION_CONTEXT_TTL_SECONDS + 1)
+
+    assert cache.get("s1", "rag", "what is grace?", allow_stale=True) == ["doc"]
+    assert cache.get("s1", "rag", "how do kernels boot?", allow_stale=True) is None
+
+    age_entry(cache, "s1", "rag", chat_service.SESSION_CONTEXT_STALE_SECONDS)
+    assert cache.get("s1", "rag", "what is grace?", allow_stale=True) is None
+
+
+def test_slow_init_keeps_running_past_the_wait():
+    calls = []
+
+    async def init():
+        calls.append("init")
+        await asyncio.sleep(0.05)
+
+    async def run():
+        initializer = _DependencyInitializer()
+        assert not await initializer.ensure("dep", init, wait=0.01)
+        assert not await initializer.ensure("dep", init, wait=0.01)
+        await asyncio.sleep(0.06)
+        assert await initializer.ensure("dep", init, wait=0.01)
+
+    asyncio.run(run())
+    assert calls == ["init"]
+
+
+def test_failed_init_is_not_retried_immediately():
+    calls = []
+
+    async def init():
+        calls.append("init")
+        raise RuntimeError("backend down")
+
+    async def run():
+        initializer = _DependencyInitializer()
+        assert not await initializer.ensure("dep", init)
+        assert not await initializer.ensure("dep", init)
+
+    asyncio.run(run())
+    assert calls == ["init"]
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    state = {"rag_init_delay": 0.0, "rag_calls": 0}
+
+    async def init_rag():
+        await asyncio.sleep(state["rag_init_delay"])
+
+    async def init_world_model():
+        pass
+
+    async def gather_rag(message, user_id):
+        state["rag_calls"] += 1
+        return [{"text": message}]
+
+    async def gather_world_model(message):
+        return {}
+
+    async def gather_trust():
+        return {"trust_score": 0.9}
+
+    monkeypatch.setattr(chat_service, "_dependency_init", _DependencyInitializer())
+    monkeypatch.setattr(chat_service, "session_context_cache", SessionContextCache())
+    monkeypatch.setattr(chat_service, "_init_rag_service", init_rag)
+    monkeypatch.setattr(chat_service, "_init_world_model", init_world_model)
+    monkeypatch.setattr(chat_service, "_gather_rag_context", gather_rag)
+    monkeypatch.setattr(chat_service, "_gather_world_model_facts", gather_world_model)
+    monkeypatch.setattr(chat_service, "_gather_trust_state", gather_trust)
+    return state
+
+
+def test_cold_init_slower_than_deadline_eventually_serves(sources):
+    sources["rag_init_delay"] = 0.05
+    deadlines = {"rag": 0.01}
+
+    async def run():
+        first = await chat_service.gather_full_context("hello", "s1", deadlines=deadlines)
+        await asyncio.sleep(0.06)
+        second = await chat_service.gather_full_context("hello", "s2", deadlines=deadlines)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first["sources"]["rag"]["status"] == "initializing"
+    assert first["partial"] is True
+    assert second["sources"]["rag"]["status"] == "ok"
+    assert second["rag_context"] == [{"text": "hello"}]
+
+
+def test_init_and_fetch_share_one_deadline(sources, monkeypatch):
+    sources["rag_init_delay"] = 0.06
+    fetched = []
+
+    async def slow_rag(message, user_id):
+        fetched.append(message)
+        await asyncio.sleep(0.06)
+        return [{"text": message}]
+
+    monkeypatch.setattr(chat_service, "_gather_rag_context", slow_rag)
+
+    context = asyncio.run(chat_service.gather_full_context("hello", "s1", deadlines={"rag": 0.1}))
+
+    # Init took 60ms of the 100ms budget, so the 60ms fetch only had 40ms
+    assert fetched == ["hello"]
+    assert context["sources"]["rag"]["status"] == "timeout"
+
+
+def test_failed_init_reports_unavailable(sources, monkeypatch):
+    async def broken_init():
+        raise RuntimeError("vector store down")
+
+    monkeypatch.setattr(chat_service, "_init_rag_service", broken_init)
+
+    context = asyncio.run(chat_service.gather_full_context("hello", "s1"))
+
+    assert chat_service._dependency_init.is_failed("rag_service")
+    assert not chat_service._dependency_init.is_failed("world_model")
+    assert context["sources"]["rag"]["status"] == "unavailable"
+    assert context["sources"]["world_model"]["status"] == "ok"
+
+
+def test_each_source_fetch_gets_a_span(sources, monkeypatch):
+    from backend.observability.tracing import RequestTracer
+
+    tracer = RequestTracer(sample_rate=1.0)
+    monkeypatch.setattr(chat_service, "request_tracer", tracer)
+
+    async def run():
+        with tracer.span("http.request"):
+            await chat_service.gather_full_context("hello", "s1")
+
+    asyncio.run(run())
+
+    spans = {span.operation_name: span for span in tracer.drain(10)}
+    assert {"chat.rag", "chat.world_model", "chat.trust"} <= set(spans)
+    assert spans["chat.rag"].parent_span_id == spans["http.request"].span_id
+    assert spans["chat.rag"].tags["chat.source.status"] == "ok"
@@ -0,0 +1,165 @@
+"""Tests for incremental code indexing (manifest) and full-text recall"""
+
+import asyncio
+import os
+import textwrap
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import backend.misc.code_memory as code_memory_module
+from backend.misc.code_memory import (
+    CodeIndexManifest,
+    CodeMemoryEngine,
+    CodePattern,
+    CodeSymbol,
+    fts_query,
+    scan_file,
+)
+
+RETRY = '''
+def retry_with_backoff(fn, attempts: int = 3):
+    """Retry a flaky call with exponential backoff"""
+    return fn()
+'''
+
+CACHE = '''
+class ResponseCache:
+    """Cache HTTP responses on disk"""
+
+    def lookup(self, key):
+        return None
+'''
+
+
+def write(root, name, source):
+    path = root / name
+    path.write_text(textwrap.dedent(source))
+    return path
+
+
+def run_with_engine(tmp_path, monkeypatch, scenario):
+    """Run scenario(engine, session_factory, src) with the code index on a temp database"""
+    src = tmp_path / "src"
+    src.mkdir()
+
+    async def run():
+        db = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/code_memory.db")
+        async with db.begin() as conn:
+            for model in (CodePattern, CodeSymbol, CodeIndexManifest):
+                await conn.run_sync(model.__table__.create)
+        session_factory = async_sessionmaker(db, expire_on_commit=False)
+        monkeypatch.setattr(code_memory_module, "async_session", session_factory)
+        try:
+            return await scenario(CodeMemoryEngine(), session_factory, src)
+        finally:
+            await db.dispose()
+
+    return asyncio.run(run())
+
+
+async def pattern_rows(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(CodePattern).order_by(CodePattern.id))).scalars().all()
+
+
+def test_fts_query_splits_identifiers_and_quotes_terms():
+    query = fts_query('retryWithBackoff "OR" x NEAR(')
+
+    assert '"retrywithbackoff"*' in query
+    assert '"retry"*' in query and '"backoff"*' in query
+    assert '"near"*' in query
+    assert '"x"' not in query  # single characters are dropped
+    assert fts_query("!!") is None
+
+
+def test_scan_file_skips_parsing_when_hash_matches(tmp_path):
+    path = write(tmp_path, "retry.py", RETRY)
+    first = scan_file(str(path), "python", "test")
+
+    second = scan_file(str(path), "python", "test", known_hash=first["hash"])
+
+    assert [p["name"] for p in first["patterns"]] == ["retry_with_backoff"]
+    assert second["unchanged"] and second["patterns"] == []
+
+
+def test_reindex_only_touches_changed_files(tmp_path, monkeypatch):
+    async def scenario(engine, session_factory, src):
+        retry = write(src, "retry.py", RETRY)
+        cache = write(src, "cache.py", CACHE)
+        first = await engine.parse_codebase(str(src), project_name="test")
+        again = await engine.parse_codebase(str(src), project_name="test")
+
+        # New mtime, same content: fingerprint refresh only
+        os.utime(retry, (1_000_000, 1_000_000))
+        touched = await engine.parse_codebase(str(src), project_name="test")
+
+        cache.unlink()
+        removed = await engine.parse_codebase(str(src), project_name="test")
+        return first, again, touched, removed, await pattern_rows(session_factory)
+
+    first, again, touched, removed, rows = run_with_engine(tmp_path, monkeypatch, scenario)
+
+    assert first["files_changed"] == 2 and first["total"] == 3
+    assert again["files_changed"] == 0 and again["files_unchanged"] == 2
+    assert touched["files_changed"] == 0 and touched["files_unchanged"] == 2
+    assert removed["files_removed"] == 1
+    assert [row.name for row in rows] == ["retry_with_backoff"]
+
+
+def test_usage_counters_survive_reindexing(tmp_path, monkeypatch):
+    async def scenario(engine, session_factory, src):
+        retry = write(src, "retry.py", RETRY)
+        await engine.parse_codebase(str(src), project_name="test")
+        async with session_factory() as session:
+            await session.execute(update(CodePattern).values(times_used=7))
+            await session.commit()
+        (original,) = await pattern_rows(session_factory)
+
+        retry.write_text(textwrap.dedent(RETRY) + "\n\ndef jitter():\n    return 0.1\n")
+        result = await engine.parse_codebase(str(src), project_name="test")
+        return original, result, await pattern_rows(session_factory)
+
+    original, result, rows = run_with_engine(tmp_path, monkeypatch, scenario)
+
+    assert result["files_changed"] == 1
+    by_name = {row.name: row for row in rows}
+    assert by_name["retry_with_backoff"].id == original.id
+    assert by_name["retry_with_backoff"].times_used == 7
+    assert by_name["jitter"].times_used == 0
+
+
+def test_recall_ranks_by_bm25_relevance(tmp_path, monkeypatch):
+    async def scenario(engine, session_factory, src):
+        write(src, "retry.py", RETRY)
+        write(src, "cache.py", CACHE)
+        await engine.parse_codebase(str(src), project_name="test")
+        recalled = await engine.recall_patterns("exponential backoff retry")
+        searched = await engine.deep_search(query="ResponseCache")
+        return engine._fts_ready, recalled, searched
+
+    fts_ready, recalled, searched = run_with_engine(tmp_path, monkeypatch, scenario)
+
+    assert fts_ready
+    assert recalled[0]["name"] == "retry_with_backoff" and recalled[0]["relevance"] == 1.0
+    assert "ResponseCache" not in {r["name"] for r in recalled}
+    assert searched[0]["name"] == "ResponseCache"
+    assert {r["type"] for r in searched} == {"pattern", "symbol"}
+
+
+def test_fts_index_follows_edits(tmp_path, monkeypatch):
+    async def scenario(engine, session_factory, src):
+        retry = write(src, "retry.py", RETRY)
+        await engine.parse_codebase(str(src), project_name="test")
+        retry.write_text("def fetch_page(url):\n    return url\n")
+        await engine.parse_codebase(str(src), project_name="test")
+        return await engine.recall_patterns("backoff"), await engine.recall_patterns("fetch page")
+
+    stale, fresh = run_with_engine(tmp_path, monkeypatch, scenario)
+
+    assert stale == []
+    assert [r["name"] for r in fresh] == ["fetch_page"]
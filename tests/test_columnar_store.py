@@ -0,0 +1,130 @@
+"""Tests for columnar compaction of closed cube days and late-row handling"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("pyarrow")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.data_cube.columnar_store import ColumnarStore, count_by
+from backend.data_cube.etl import CubeETL
+from backend.data_cube.schema import FACT_ERROR_EVENTS_DDL, FACT_VERIFICATION_EXECUTIONS_DDL, date_key
+from backend.models.base_models import ImmutableLogEntry
+
+# The package re-exports the singleton under the module's name
+columnar_module = sys.modules["backend.data_cube.columnar_store"]
+
+DATASET = "fact_verification_executions"
+
+
+def days_ago(n):
+    return (datetime.now(timezone.utc) - timedelta(days=n)).replace(tzinfo=None, hour=12)
+
+
+def run_with_store(tmp_path, monkeypatch, scenario):
+    """Run scenario(store, session_factory) with the cube tables on a temp database"""
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/cube.db")
+        async with engine.begin() as conn:
+            for ddl in (FACT_VERIFICATION_EXECUTIONS_DDL, FACT_ERROR_EVENTS_DDL):
+                for stmt in ddl.split(';'):
+                    if stmt.strip():
+                        await conn.execute(text(stmt))
+            await conn.run_sync(ImmutableLogEntry.__table__.create)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(columnar_module, "async_session", session_factory)
+        try:
+            return await scenario(ColumnarStore(root=str(tmp_path / "columnar")), session_factory)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def add_executions(session_factory, created_at, count, status="verified"):
+    async with session_factory() as session:
+        await session.execute(text("""
+            INSERT INTO fact_verification_executions (time_key, contract_id, contract_status, created_at)
+            VALUES (:time_key, :contract_id, :status, :created_at)
+        """), [
+            {
+                "time_key": date_key(created_at),
+                "contract_id": f"{created_at:%Y%m%d}-{status}-{i}",
+                "status": status,
+                "created_at": created_at.isoformat(sep=" "),
+            }
+            for i in range(count)
+        ])
+        await session.commit()
+
+
+async def statuses(store, from_key, to_key):
+    table = await store.scan(DATASET, from_key, to_key, columns=["contract_status"])
+    return count_by(table, "contract_status")
+
+
+def test_closed_days_are_compacted_and_scanned(tmp_path, monkeypatch):
+    old, older, today = days_ago(2), days_ago(3), days_ago(0)
+
+    async def scenario(store, session_factory):
+        await add_executions(session_factory, older, 2)
+        await add_executions(session_factory, old, 3)
+        await add_executions(session_factory, today, 4)
+
+        written = await store.compact_closed_days()
+        again = await store.compact_closed_days()
+        scanned = await statuses(store, date_key(older), store.hot_start_key(DATASET, date_key(older)))
+        return written, again, scanned, store
+
+    written, again, scanned, store = run_with_store(tmp_path, monkeypatch, scenario)
+
+    assert written == {DATASET: 5}
+    assert again == {}
+    assert scanned == {"verified": 5}
+    assert {date_key(older), date_key(old)} <= store.compacted_keys(DATASET)
+    assert date_key(today) not in store.compacted_keys(DATASET)
+    assert store.hot_start_key(DATASET, date_key(older)) > date_key(old)
+
+
+def test_late_row_is_served_from_sqlite_until_recompacted(tmp_path, monkeypatch):
+    older, old = days_ago(3), days_ago(2)
+
+    async def scenario(store, session_factory):
+        await add_executions(session_factory, older, 2)
+        await add_executions(session_factory, old, 2)
+        await store.compact_closed_days()
+
+        # Catch-up ETL lands a row on a compacted day
+        monkeypatch.setattr(columnar_module, "columnar_store", store)
+        await add_executions(session_factory, old, 1, status="rolled_back")
+        CubeETL()._mark_late_days(old, days_ago(0), {DATASET: 1, "fact_error_events": 0})
+
+        hot_key = store.hot_start_key(DATASET, date_key(older))
+        while_dirty = await statuses(store, date_key(older), date_key(days_ago(0)))
+
+        await store.compact_closed_days()
+        recompacted = await statuses(store, date_key(older), date_key(days_ago(0)))
+        reloaded = ColumnarStore(root=str(store.root))
+        return hot_key, while_dirty, recompacted, reloaded
+
+    hot_key, while_dirty, recompacted, reloaded = run_with_store(tmp_path, monkeypatch, scenario)
+
+    assert hot_key == date_key(old)
+    assert while_dirty == {"verified": 2}  # only the clean day comes from Parquet
+    assert recompacted == {"verified": 4, "rolled_back": 1}
+    assert reloaded.dirty_keys(DATASET) == set()
+    assert date_key(old) in reloaded.compacted_keys(DATASET)
+
+
+def test_mark_dirty_ignores_days_never_compacted(tmp_path):
+    store = ColumnarStore(root=str(tmp_path))
+
+    assert store.mark_dirty(DATASET, 20240101, 20241231) == set()
+    assert store.dirty_keys(DATASET) == set()
@@ -0,0 +1,180 @@
+"""Tests for the chunked cube ETL and the dim_time date-key migration"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import backend.data_cube.etl as etl_module
+import backend.data_cube.schema as schema_module
+from backend.data_cube.columnar_store import ColumnarStore
+from backend.data_cube.etl import CubeETL
+from backend.data_cube.schema import create_cube_schema, date_key, migrate_time_keys
+from backend.models.base_models import ImmutableLogEntry
+
+# The package re-exports the singleton under the module's name
+columnar_module = sys.modules["backend.data_cube.columnar_store"]
+
+# Source tables, reduced to the columns the ETL reads
+SOURCE_DDL = """
+CREATE TABLE action_contracts (
+    id TEXT PRIMARY KEY, action_type TEXT, playbook_id TEXT, status TEXT,
+    confidence_score REAL, created_at TIMESTAMP NOT NULL, verified_at TIMESTAMP,
+    safe_hold_snapshot_id TEXT, triggered_by TEXT, tier TEXT
+);
+CREATE TABLE mission_timelines (
+    mission_id TEXT PRIMARY KEY, mission_name TEXT, started_at TIMESTAMP,
+    completed_at TIMESTAMP, status TEXT
+)
+"""
+
+
+def run_with_cube(tmp_path, monkeypatch, scenario):
+    """Run scenario(session_factory) with the cube and its sources on a temp database"""
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/cube.db")
+        async with engine.begin() as conn:
+            for stmt in SOURCE_DDL.split(';'):
+                await conn.execute(text(stmt))
+            await conn.run_sync(ImmutableLogEntry.__table__.create)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(schema_module, "async_session", session_factory)
+        monkeypatch.setattr(etl_module, "async_session", session_factory)
+        monkeypatch.setattr(columnar_module, "columnar_store", ColumnarStore(root=str(tmp_path / "columnar")))
+        await create_cube_schema()
+        try:
+            return await scenario(session_factory)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def add_contracts(session_factory, created_at, count, prefix="c"):
+    async with session_factory() as session:
+        await session.execute(text("""
+            INSERT INTO action_contracts (id, action_type, status, created_at, triggered_by, tier)
+            VALUES (:id, 'restart', 'verified', :created_at, 'agent:healer', 'tier_2')
+        """), [{"id": f"{prefix}{i:03d}", "created_at": created_at} for i in range(count)])
+        await session.commit()
+
+
+async def add_log_entries(session_factory, timestamp, actions):
+    async with session_factory() as session:
+        start = (await session.execute(text("SELECT COUNT(*) FROM immutable_log"))).scalar()
+        session.add_all([
+            ImmutableLogEntry(
+                sequence=start + i, actor="test", action=action, resource="api",
+                entry_hash=f"hash-{start + i}", previous_hash="", timestamp=timestamp,
+            )
+            for i, action in enumerate(actions)
+        ])
+        await session.commit()
+
+
+async def scalar(session_factory, query):
+    async with session_factory() as session:
+        return (await session.execute(text(query))).scalar()
+
+
+def test_fact_loads_walk_the_window_in_chunks(tmp_path, monkeypatch):
+    day = datetime(2024, 3, 4, 10)
+
+    async def scenario(session_factory):
+        # Same created_at for a whole chunk: the id breaks the keyset ties
+        await add_contracts(session_factory, day, 7, prefix="a")
+        await add_contracts(session_factory, day + timedelta(days=1), 5, prefix="b")
+        await add_log_entries(session_factory, day, ["task_error"] * 6 + ["task_ok"] * 3 + ["sync_failed"])
+
+        etl = CubeETL(chunk_size=5)
+        bounds = []
+        chunk_upper_bound = etl._chunk_upper_bound
+
+        async def spy(session, query, params):
+            bounds.append(await chunk_upper_bound(session, query, params))
+            return bounds[-1]
+
+        etl._chunk_upper_bound = spy
+        since, until = day - timedelta(hours=1), day + timedelta(days=2)
+        loaded = (
+            await etl._load_fact_verification_executions(since, until),
+            await etl._load_fact_error_events(since, until),
+        )
+        reloaded = (
+            await etl._load_fact_verification_executions(since, until),
+            await etl._load_fact_error_events(since, until),
+        )
+        distinct = await scalar(session_factory, "SELECT COUNT(DISTINCT contract_id) FROM fact_verification_executions")
+        keys = await scalar(session_factory, "SELECT GROUP_CONCAT(DISTINCT time_key) FROM fact_verification_executions")
+        return loaded, reloaded, distinct, keys, bounds
+
+    loaded, reloaded, distinct, keys, bounds = run_with_cube(tmp_path, monkeypatch, scenario)
+
+    assert loaded == (12, 7)
+    assert reloaded == (0, 0)  # re-running a window is idempotent
+    assert distinct == 12
+    assert sorted(int(k) for k in keys.split(",")) == [20240304, 20240305]
+    # 12 contracts and 10 log rows: two full chunks of 5 then the tail, per load
+    assert [bound is not None for bound in bounds[:6]] == [True, True, False] * 2
+
+
+def test_incremental_runs_load_each_row_once(tmp_path, monkeypatch):
+    async def scenario(session_factory):
+        now = datetime.utcnow()
+        await add_contracts(session_factory, now - timedelta(hours=2), 3, prefix="old")
+        await add_log_entries(session_factory, now - timedelta(hours=2), ["task_error"])
+
+        etl = CubeETL(chunk_size=2)
+        first = await etl.run_incremental_load()
+        await add_contracts(session_factory, datetime.utcnow(), 2, prefix="new")
+        second = await etl.run_incremental_load()
+
+        facts = await scalar(session_factory, "SELECT COUNT(*) FROM fact_verification_executions")
+        rolled_up = await scalar(session_factory, "SELECT SUM(total) FROM rollup_verification_daily")
+        runs = await scalar(session_factory, "SELECT COUNT(*) FROM cube_etl_metadata WHERE status = 'success'")
+        return first, second, facts, rolled_up, runs
+
+    first, second, facts, rolled_up, runs = run_with_cube(tmp_path, monkeypatch, scenario)
+
+    assert first["records_loaded"] == 4
+    assert second["records_loaded"] == 2
+    assert facts == rolled_up == 5
+    assert runs == 2
+
+
+def test_migrate_time_keys_rekeys_legacy_rows(tmp_path, monkeypatch):
+    async def scenario(session_factory):
+        async with session_factory() as session:
+            await session.execute(text("""
+                INSERT INTO dim_time (time_key, timestamp, day, month, year)
+                VALUES (1, '2024-03-04', 4, 3, 2024), (2, '2024-03-05', 5, 3, 2024)
+            """))
+            await session.execute(text("""
+                INSERT INTO fact_verification_executions (time_key, contract_id) VALUES (1, 'a'), (2, 'b'), (2, 'c')
+            """))
+            await session.execute(text("INSERT INTO fact_error_events (time_key, error_id) VALUES (1, 'e')"))
+            await session.commit()
+
+        async with session_factory() as session:
+            await migrate_time_keys(session)
+            await migrate_time_keys(session)  # idempotent
+            await session.commit()
+            dims = (await session.execute(text("SELECT time_key FROM dim_time ORDER BY time_key"))).scalars().all()
+            facts = dict((await session.execute(text(
+                "SELECT contract_id, time_key FROM fact_verification_executions"
+            ))).all())
+            errors = (await session.execute(text("SELECT time_key FROM fact_error_events"))).scalars().all()
+        return dims, facts, errors
+
+    dims, facts, errors = run_with_cube(tmp_path, monkeypatch, scenario)
+
+    assert dims == [20240304, 20240305]
+    assert facts == {"a": 20240304, "b": 20240305, "c": 20240305}
+    assert errors == [date_key(datetime(2024, 3, 4))]
@@ -0,0 +1,238 @@
+"""Tests for cube rollups and the GraceCube result cache"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import backend.data_cube.cube_engine as cube_module
+import backend.data_cube.etl as etl_module
+import backend.data_cube.schema as schema_module
+from backend.data_cube.columnar_store import ColumnarStore
+from backend.data_cube.cube_engine import GraceCube
+from backend.data_cube.etl import CubeETL
+from backend.data_cube.rollups import refresh_rollups
+from backend.data_cube.schema import create_cube_schema, date_key
+from backend.models.base_models import ImmutableLogEntry
+
+# The package re-exports the singleton under the module's name
+columnar_module = sys.modules["backend.data_cube.columnar_store"]
+
+# ETL source tables, reduced to the columns it reads
+SOURCE_DDL = """
+CREATE TABLE action_contracts (
+    id TEXT PRIMARY KEY, action_type TEXT, playbook_id TEXT, status TEXT,
+    confidence_score REAL, created_at TIMESTAMP NOT NULL, verified_at TIMESTAMP,
+    safe_hold_snapshot_id TEXT, triggered_by TEXT, tier TEXT
+);
+CREATE TABLE mission_timelines (
+    mission_id TEXT PRIMARY KEY, mission_name TEXT, started_at TIMESTAMP,
+    completed_at TIMESTAMP, status TEXT
+)
+"""
+
+VERIFICATION_BY_DAY = """
+    SELECT time_key, COALESCE(tier_key, 0), COUNT(*),
+        SUM(CASE WHEN was_successful THEN 1 ELSE 0 END),
+        SUM(CASE WHEN was_rolled_back THEN 1 ELSE 0 END),
+        ROUND(SUM(confidence_score), 6), COUNT(confidence_score),
+        ROUND(SUM(duration_seconds), 6), COUNT(duration_seconds)
+    FROM fact_verification_executions
+    GROUP BY 1, 2 ORDER BY 1, 2
+"""
+
+VERIFICATION_ROLLUP = """
+    SELECT time_key, tier_key, total, successful, rolled_back,
+        ROUND(confidence_sum, 6), confidence_count, ROUND(duration_sum, 6), duration_count
+    FROM rollup_verification_daily ORDER BY 1, 2
+"""
+
+VERIFICATION_BY_HOUR = """
+    SELECT CAST(strftime('%Y%m%d%H', created_at) AS INTEGER), COALESCE(tier_key, 0), COUNT(*)
+    FROM fact_verification_executions GROUP BY 1, 2 ORDER BY 1, 2
+"""
+
+ERRORS_BY_DAY = """
+    SELECT time_key, COALESCE(severity, ''), COUNT(*), SUM(CASE WHEN was_auto_resolved THEN 1 ELSE 0 END)
+    FROM fact_error_events GROUP BY 1, 2 ORDER BY 1, 2
+"""
+
+
+def run_with_cube(tmp_path, monkeypatch, scenario):
+    """Run scenario(session_factory, cube) with the cube tables on a temp database"""
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/cube.db")
+        async with engine.begin() as conn:
+            for stmt in SOURCE_DDL.split(';'):
+                await conn.execute(text(stmt))
+            await conn.run_sync(ImmutableLogEntry.__table__.create)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        for module in (schema_module, etl_module, cube_module):
+            monkeypatch.setattr(module, "async_session", session_factory)
+        monkeypatch.setattr(columnar_module, "columnar_store", ColumnarStore(root=str(tmp_path / "columnar")))
+        cube = GraceCube(generation_check_seconds=0)
+        monkeypatch.setattr(cube_module, "grace_cube", cube)
+        await create_cube_schema()
+        try:
+            return await scenario(session_factory, cube)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def add_facts(session_factory, created_at, rows):
+    """rows: (tier_key, status, confidence, duration) tuples"""
+    async with session_factory() as session:
+        await session.execute(text("""
+            INSERT INTO fact_verification_executions (
+                time_key, tier_key, contract_id, confidence_score, duration_seconds,
+                was_successful, was_rolled_back, contract_status, created_at
+            )
+            VALUES (:time_key, :tier_key, :contract_id, :confidence, :duration,
+                :status = 'verified', :status = 'rolled_back', :status, :created_at)
+        """), [
+            {
+                "time_key": date_key(created_at),
+                "tier_key": tier_key,
+                "contract_id": f"{created_at:%Y%m%d%H}-{i}",
+                "confidence": confidence,
+                "duration": duration,
+                "status": status,
+                "created_at": created_at.isoformat(sep=" "),
+            }
+            for i, (tier_key, status, confidence, duration) in enumerate(rows)
+        ])
+        await session.commit()
+
+
+async def add_errors(session_factory, created_at, severities):
+    async with session_factory() as session:
+        await session.execute(text("""
+            INSERT INTO fact_error_events (time_key, error_id, severity, was_auto_resolved, created_at)
+            VALUES (:time_key, :error_id, :severity, :resolved, :created_at)
+        """), [
+            {
+                "time_key": date_key(created_at),
+                "error_id": f"{created_at:%Y%m%d%H}-{i}",
+                "severity": severity,
+                "resolved": i % 2,
+                "created_at": created_at.isoformat(sep=" "),
+            }
+            for i, severity in enumerate(severities)
+        ])
+        await session.commit()
+
+
+async def query(session_factory, sql):
+    async with session_factory() as session:
+        return [tuple(row) for row in (await session.execute(text(sql))).fetchall()]
+
+
+async def refresh(session_factory, from_key=0, to_key=None):
+    async with session_factory() as session:
+        await refresh_rollups(session, from_key, to_key)
+        await session.commit()
+
+
+def test_rollups_match_the_base_table_aggregates(tmp_path, monkeypatch):
+    monday, tuesday = datetime(2024, 3, 4, 9), datetime(2024, 3, 5, 17)
+
+    async def scenario(session_factory, cube):
+        await add_facts(session_factory, monday, [
+            (1, "verified", 0.9, 2.0), (1, "rolled_back", 0.4, 8.5), (2, "verified", None, 1.0),
+        ])
+        await add_facts(session_factory, monday + timedelta(hours=1), [(None, "failed", 0.1, None)])
+        await add_facts(session_factory, tuesday, [(3, "verified", 0.75, 3.25)] * 4)
+        await add_errors(session_factory, monday, ["high", "low", "high", None])
+        await refresh(session_factory)
+        full = (
+            await query(session_factory, VERIFICATION_BY_DAY),
+            await query(session_factory, VERIFICATION_ROLLUP),
+            await query(session_factory, VERIFICATION_BY_HOUR),
+            await query(session_factory, "SELECT hour_key, tier_key, total FROM rollup_verification_hourly ORDER BY 1, 2"),
+            await query(session_factory, ERRORS_BY_DAY),
+            await query(session_factory, """
+                SELECT time_key, severity, error_count, auto_resolved_count FROM rollup_error_daily ORDER BY 1, 2
+            """),
+        )
+
+        # A late fact on Tuesday: rebuilding only Tuesday leaves Monday's buckets intact
+        await add_facts(session_factory, tuesday + timedelta(hours=1), [(1, "verified", 0.5, 1.5)])
+        await refresh(session_factory, date_key(tuesday), date_key(tuesday))
+        partial = (await query(session_factory, VERIFICATION_BY_DAY), await query(session_factory, VERIFICATION_ROLLUP))
+        return full, partial
+
+    full, partial = run_with_cube(tmp_path, monkeypatch, scenario)
+    by_day, rollup, by_hour, hourly, errors_by_day, error_rollup = full
+
+    assert rollup == by_day
+    assert hourly == by_hour
+    assert error_rollup == errors_by_day
+    assert sum(row[2] for row in rollup) == 8
+    assert partial[1] == partial[0]
+
+
+def test_fact_load_invalidates_the_cached_rollup(tmp_path, monkeypatch):
+    async def scenario(session_factory, cube):
+        now = datetime.utcnow() - timedelta(minutes=5)
+        async with session_factory() as session:
+            await session.execute(text("""
+                INSERT INTO action_contracts (id, action_type, status, created_at, tier)
+                VALUES ('first', 'restart', 'verified', :created_at, 'tier_1')
+            """), {"created_at": now})
+            await session.commit()
+        await CubeETL().run_incremental_load()
+
+        before = await cube.get_daily_rollup(days=1)
+        cached = await cube.get_daily_rollup(days=1)
+        hits = cube.cache_hits
+
+        async with session_factory() as session:
+            await session.execute(text("""
+                INSERT INTO action_contracts (id, action_type, status, created_at, tier)
+                VALUES ('second', 'restart', 'rolled_back', :created_at, 'tier_1')
+            """), {"created_at": datetime.utcnow()})
+            await session.commit()
+        await CubeETL().run_incremental_load()
+        after = await cube.get_daily_rollup(days=1)
+        return before, cached, hits, after
+
+    before, cached, hits, after = run_with_cube(tmp_path, monkeypatch, scenario)
+
+    assert cached == before and hits == 1
+    assert sum(row["total_executions"] for row in before) == 1
+    assert sum(row["total_executions"] for row in after) == 2
+    assert sum(row["rollbacks"] for row in after) == 1
+
+
+def test_cache_follows_an_etl_run_in_another_process(tmp_path, monkeypatch):
+    async def scenario(session_factory, cube):
+        today = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        await add_facts(session_factory, today, [(1, "verified", 0.9, 1.0)])
+        await refresh(session_factory)
+        before = await cube.get_daily_rollup(days=1)
+
+        # Another worker loads a fact and records its run; this cube is never told directly
+        await add_facts(session_factory, today + timedelta(seconds=1), [(1, "verified", 0.9, 1.0)] * 2)
+        await refresh(session_factory, date_key(today))
+        async with session_factory() as session:
+            await session.execute(text("""
+                INSERT INTO cube_etl_metadata (last_load_timestamp, records_loaded, status)
+                VALUES (:now, 2, 'success')
+            """), {"now": datetime.utcnow()})
+            await session.commit()
+        after = await cube.get_daily_rollup(days=1)
+        return before, after
+
+    before, after = run_with_cube(tmp_path, monkeypatch, scenario)
+
+    assert [row["total_executions"] for row in before] == [1]
+    assert [row["total_executions"] for row in after] == [3]
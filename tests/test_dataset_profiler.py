@@ -0,0 +1,191 @@
+"""Tests for the streaming dataset profiler"""
+
+import json
+
+import pytest
+
+pytest.importorskip("sqlmodel")  # backend.memory_tables imports the schema registry
+
+from backend.memory_tables import dataset_profiler as profiler_module
+from backend.memory_tables.dataset_profiler import (
+    DatasetProfiler,
+    HyperLogLog,
+    Reservoir,
+    count_lines,
+    iter_json_array,
+)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Read a few bytes at a time so values straddle chunk boundaries"""
+    monkeypatch.setattr(profiler_module, "_READ_CHUNK", 7)
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_hyperloglog_estimate_is_close():
+    hll = HyperLogLog(p=12)
+    for i in range(20_000):
+        hll.add(f"value-{i}")
+        hll.add(f"value-{i}")  # duplicates don't count
+
+    assert abs(hll.estimate() - 20_000) / 20_000 < 0.05
+
+
+def test_hyperloglog_small_cardinality_is_exact_enough():
+    hll = HyperLogLog()
+    for value in ("a", "b", "c", "a"):
+        hll.add(value)
+
+    assert hll.estimate() == 3
+
+
+def test_reservoir_keeps_k_items_uniformly():
+    counts = [0] * 10
+    for seed in range(2000):
+        reservoir = Reservoir(k=2, seed=seed)
+        for item in range(10):
+            reservoir.add(item)
+        assert len(reservoir.items) == 2
+        for item in reservoir.items:
+            counts[item] += 1
+
+    # Each of 10 items should be picked ~400 times out of 4000 slots
+    assert min(counts) > 300 and max(counts) < 500
+
+
+def test_reservoir_with_fewer_items_than_k_keeps_all():
+    reservoir = Reservoir(k=5)
+    for item in range(3):
+        reservoir.add(item)
+
+    assert reservoir.items == [0, 1, 2]
+
+
+@pytest.mark.parametrize("records", [
+    [],
+    [1, 2.5, -3e10, True, False, None],
+    [{"a": 1, "b": "x" * 40}, {"a": 22, "b": "esc \u00e9 \" \\"}, [1, [2, [3]]]],
+])
+def test_json_array_elements_survive_chunk_boundaries(tmp_path, small_chunks, records):
+    path = write(tmp_path, "data.json", json.dumps(records, indent=1))
+
+    assert list(iter_json_array(path)) == records
+
+
+def test_truncated_json_array_raises(tmp_path, small_chunks):
+    path = write(tmp_path, "data.json", '[{"a": 1}, {"a": 2}, {"a": 3')
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(path))
+
+
+def test_json_array_without_closing_bracket_raises(tmp_path, small_chunks):
+    path = write(tmp_path, "data.json", '[{"a": 1}, {"a": 2}')
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(path))
+
+
+def test_malformed_json_array_fails_without_reading_to_eof(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler_module, "_READ_CHUNK", 64)
+    path = write(tmp_path, "data.json", '[{"a": 1}, {"a": }, ' + '{"a": 1}, ' * 10_000 + '{"a": 1}]')
+
+    reads = []
+    real_open = open
+
+    def counting_open(*args, **kwargs):
+        handle = real_open(*args, **kwargs)
+        real_read = handle.read
+
+        def read(size=-1):
+            reads.append(size)
+            return real_read(size)
+
+        handle.read = read
+        return handle
+
+    monkeypatch.setattr(profiler_module, "open", counting_open, raising=False)
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(path))
+    assert len(reads) <= 2
+
+
+def test_oversized_element_raises(tmp_path, small_chunks):
+    path = write(tmp_path, "data.json", '["' + "x" * 200 + '"]')
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, max_element_chars=50))
+
+
+def test_profile_json_array(tmp_path):
+    records = [{"id": i, "name": f"n{i % 3}", "score": i / 2} for i in range(50)]
+    path = write(tmp_path, "data.json", json.dumps(records))
+
+    result = DatasetProfiler().profile(path)
+
+    assert result["rows"] == 50 and result["rows_exact"]
+    assert result["column_types"] == {"id": "integer", "name": "string", "score": "float"}
+    assert result["column_stats"]["name"]["distinct_estimate"] == 3
+
+
+def test_profile_json_object_is_not_a_dataset(tmp_path):
+    path = write(tmp_path, "config.json", '{"a": 1}')
+
+    assert DatasetProfiler().profile(path) == {}
+
+
+def test_profile_malformed_json_raises(tmp_path):
+    path = write(tmp_path, "data.json", '[{"a": 1}, {"a": }]')
+
+    with pytest.raises(ValueError):
+        DatasetProfiler().profile(path)
+
+
+def test_csv_row_count_and_types(tmp_path):
+    lines = ["id,name,active"] + [f"{i},name {i},{'true' if i % 2 else 'false'}" for i in range(100)] + [""]
+    path = write(tmp_path, "data.csv", "\n".join(lines))
+
+    result = DatasetProfiler().profile(path)
+
+    assert result["rows"] == 100 and result["rows_exact"]
+    assert result["column_types"] == {"id": "integer", "name": "string", "active": "boolean"}
+    assert result["column_stats"]["id"]["min"] == 0 and result["column_stats"]["id"]["max"] == 99
+
+
+def test_csv_beyond_max_profile_rows_counts_remaining_lines(tmp_path):
+    path = write(tmp_path, "data.csv", "id\n" + "".join(f"{i}\n" for i in range(100)))
+
+    result = DatasetProfiler(max_profile_rows=10).profile(path)
+
+    assert result["profiled_rows"] == 10
+    assert result["rows"] == 100 and not result["rows_exact"]
+
+
+def test_jsonl_row_count_skips_bad_lines(tmp_path):
+    lines = [json.dumps({"id": i}) for i in range(20)] + ["not json", ""]
+    path = write(tmp_path, "data.jsonl", "\n".join(lines))
+
+    result = DatasetProfiler().profile(path)
+
+    assert result["rows"] == 20
+
+
+def test_jsonl_beyond_max_profile_rows_counts_lines(tmp_path):
+    path = write(tmp_path, "data.jsonl", "".join(json.dumps({"id": i}) + "\n" for i in range(30)))
+
+    result = DatasetProfiler(max_profile_rows=5).profile(path)
+
+    assert result["profiled_rows"] == 5
+    assert result["rows"] == 30 and not result["rows_exact"]
+
+
+@pytest.mark.parametrize("text, lines", [("", 0), ("a", 1), ("a\n", 1), ("a\nb", 2), ("a\nb\n", 2)])
+def test_count_lines(tmp_path, text, lines):
+    assert count_lines(write(tmp_path, "f.txt", text)) == lines
@@ -0,0 +1,148 @@
+"""Tests for the immutable log's batch writer and chain verification"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.logging_system.immutable_log import GENESIS_HASH, ImmutableLog
+from backend.models.base_models import ImmutableLogEntry
+
+
+def run_with_log(tmp_path, scenario, **log_kwargs):
+    """Run scenario(log, session_factory) against a private temp database"""
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/immutable_log.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(ImmutableLogEntry.__table__.create)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        log = ImmutableLog(session_factory=session_factory, **log_kwargs)
+        try:
+            return await scenario(log, session_factory)
+        finally:
+            await log.stop()
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def append_many(log, n, start=0):
+    return await asyncio.gather(*[
+        log.append("tester", "act", f"r{i}", "tests", {"i": i}, "ok")
+        for i in range(start, start + n)
+    ])
+
+
+def test_concurrent_appends_are_batched_and_chained(tmp_path):
+    async def scenario(log, session_factory):
+        ids = await append_many(log, 50)
+        return ids, log.get_writer_stats(), await log.verify_integrity()
+
+    ids, stats, report = run_with_log(tmp_path, scenario)
+
+    assert len(set(ids)) == 50 and -1 not in ids
+    assert stats["entries_written"] == 50
+    assert stats["batches_committed"] < 50
+    assert stats["tail_sequence"] == 50
+    assert report["valid"] and report["entries_verified"] == 50
+
+
+def test_max_batch_bounds_each_commit(tmp_path):
+    async def scenario(log, session_factory):
+        await append_many(log, 25)
+        return log.stats
+
+    stats = run_with_log(tmp_path, scenario, max_batch=10)
+
+    assert stats["largest_batch"] <= 10
+    assert stats["batches_committed"] >= 3
+
+
+def test_unserializable_payload_is_rejected_alone(tmp_path):
+    async def scenario(log, session_factory):
+        bad = log.append("tester", "act", "r", "tests", {"x": object()}, "ok")
+        good = log.append("tester", "act", "r", "tests", {"x": 1}, "ok")
+        return await asyncio.gather(bad, good)
+
+    bad_id, good_id = run_with_log(tmp_path, scenario)
+
+    assert bad_id == -1 and good_id > 0
+
+
+def test_first_entry_must_link_to_genesis(tmp_path):
+    async def scenario(log, session_factory):
+        await append_many(log, 3)
+        # Re-hash entry 1 against a forged predecessor: its own hash checks out
+        async with session_factory() as session:
+            entry = await session.get(ImmutableLogEntry, 1)
+            forged = "f" * 64
+            entry_hash = ImmutableLogEntry.compute_hash(
+                entry.sequence, entry.actor, entry.action, entry.resource,
+                entry.payload, entry.result, forged
+            )
+            await session.execute(
+                update(ImmutableLogEntry)
+                .where(ImmutableLogEntry.sequence == 1)
+                .values(previous_hash=forged, entry_hash=entry_hash)
+            )
+            await session.commit()
+        return await log.verify_integrity()
+
+    report = run_with_log(tmp_path, scenario)
+
+    assert not report["valid"]
+    assert report["broken_chain_at"] == 1
+
+
+def test_tampered_payload_is_detected_across_windows(tmp_path):
+    async def scenario(log, session_factory):
+        await append_many(log, 12)
+        async with session_factory() as session:
+            await session.execute(
+                update(ImmutableLogEntry).where(ImmutableLogEntry.sequence == 8).values(payload='{"i": 99}')
+            )
+            await session.commit()
+        return await log.verify_integrity(window=5)
+
+    report = run_with_log(tmp_path, scenario)
+
+    assert not report["valid"]
+    assert report["corrupted_at"] == 8 and report["entries_verified"] == 7
+
+
+def test_checkpoint_resume_verifies_only_new_entries(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+
+    async def scenario(log, session_factory):
+        await append_many(log, 10)
+        first = await log.verify_integrity(window=4, save_checkpoint=True, checkpoint_path=checkpoint)
+        saved = ImmutableLog.load_checkpoint(checkpoint)
+        await append_many(log, 5, start=10)
+        second = await log.verify_integrity(resume=True, save_checkpoint=True, checkpoint_path=checkpoint)
+        return first, saved, second
+
+    first, saved, second = run_with_log(tmp_path, scenario)
+
+    assert first["valid"] and first["entries_verified"] == 10 and first["windows"] == 3
+    assert saved["sequence"] == 10 and saved["entry_hash"] != GENESIS_HASH
+    assert second["valid"] and second["resumed_from"] == 10
+    assert second["entries_verified"] == 5
+    assert ImmutableLog.load_checkpoint(checkpoint)["sequence"] == 15
+
+
+def test_resumed_chain_must_link_to_checkpoint(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+
+    async def scenario(log, session_factory):
+        await append_many(log, 4)
+        ImmutableLog.save_checkpoint(2, "e" * 64, checkpoint)
+        return await log.verify_integrity(resume=True, checkpoint_path=checkpoint)
+
+    report = run_with_log(tmp_path, scenario)
+
+    assert not report["valid"] and report["broken_chain_at"] == 3
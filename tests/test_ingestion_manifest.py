@@ -0,0 +1,90 @@
+"""Tests for the librarian's ingestion manifest across restarts"""
+
+import asyncio
+import os
+
+from backend.kernels.ingestion_manifest import STATUS_COMPLETED, STATUS_FAILED, IngestionManifest, hash_file
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+def ingest(manifest, paths, version="1", status=STATUS_COMPLETED):
+    asyncio.run(manifest.mark(paths, version, status, error=None if status == STATUS_COMPLETED else "boom"))
+
+
+def test_restart_requeues_only_new_modified_and_failed_files(tmp_path):
+    root = tmp_path / "watched"
+    db = str(tmp_path / "manifest.db")
+    same = write(root / "same.md", "unchanged")
+    touched = write(root / "nested" / "deep" / "touched.md", "same bytes")
+    edited = write(root / "nested" / "edited.md", "v1")
+    deleted = write(root / "deleted.md", "gone soon")
+    broken = write(root / "broken.pdf", "bad")
+    outside = write(tmp_path / "elsewhere" / "kept.md", "not under the watched root")
+
+    first = IngestionManifest(db)
+    assert sorted(first.reconcile([root], "1")["new"]) == sorted([same, touched, edited, deleted, broken])
+    ingest(first, [same, touched, edited, deleted, outside])
+    ingest(first, [broken], status=STATUS_FAILED)
+
+    # While the process is down
+    os.utime(touched, (1_000_000, 1_000_000))
+    write(root / "nested" / "edited.md", "v2 is longer")
+    os.remove(deleted)
+    added = write(root / "added.txt", "new")
+
+    result = asyncio.run(IngestionManifest(db).reconcile_async([root], "1"))
+
+    assert result["new"] == [added]
+    assert result["changed"] == [edited]
+    assert result["failed"] == [broken]
+    assert result["outdated"] == []
+    assert result["removed"] == [deleted]
+    assert result["unchanged"] == 2  # same.md, plus touched.md whose bytes didn't change
+    assert result["hashes"] == {path: hash_file(path) for path in (same, touched, broken)}
+
+    # The touch was recorded and the deletion forgotten; files outside the roots are kept
+    stored = IngestionManifest(db).load()
+    assert stored[touched]["mtime"] == 1_000_000
+    assert deleted not in stored
+    assert outside in stored
+
+
+def test_unchanged_tree_is_not_requeued(tmp_path):
+    root = tmp_path / "watched"
+    db = str(tmp_path / "manifest.db")
+    paths = [write(root / f"dir{i}" / f"file{i}.md", str(i)) for i in range(5)]
+    ingest(IngestionManifest(db), paths)
+
+    result = IngestionManifest(db).reconcile([root], "1")
+
+    assert result["new"] == result["changed"] == result["failed"] == result["removed"] == []
+    assert result["unchanged"] == 5
+
+
+def test_pipeline_version_bump_requeues_everything(tmp_path):
+    root = tmp_path / "watched"
+    db = str(tmp_path / "manifest.db")
+    path = write(root / "doc.md", "content")
+    ingest(IngestionManifest(db), [path], version="1")
+
+    result = IngestionManifest(db).reconcile([root], "2")
+    ingest(IngestionManifest(db), [path], version="2")
+    after = IngestionManifest(db).reconcile([root], "2")
+
+    assert result["outdated"] == [path] and result["unchanged"] == 0
+    assert after["outdated"] == [] and after["unchanged"] == 1
+
+
+def test_mark_skips_files_that_disappeared(tmp_path):
+    db = str(tmp_path / "manifest.db")
+    kept = write(tmp_path / "kept.md", "x")
+
+    manifest = IngestionManifest(db)
+    ingest(manifest, [kept, str(tmp_path / "vanished.md")])
+
+    assert list(manifest.load()) == [kept]
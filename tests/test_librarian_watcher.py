@@ -0,0 +1,192 @@
+"""Tests for the librarian's debounced filesystem watcher and batched dispatch"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("watchdog")
+
+from backend.kernels.librarian_kernel import FileSystemWatcher, LibrarianKernel
+
+
+def watch(scenario, debounce_s=0.05, max_wait_s=1.0):
+    """Run scenario(watcher) against a running watcher; returns (emitted events, _emit batches)"""
+    watcher = FileSystemWatcher(kernel=None, debounce_s=debounce_s, max_wait_s=max_wait_s)
+    batches = []
+    emit = watcher._emit
+
+    async def recording_emit(settled):
+        batches.append(sorted(settled))
+        await emit(settled)
+
+    watcher._emit = recording_emit
+
+    async def run():
+        task = asyncio.create_task(watcher.run())
+        await asyncio.sleep(0)
+        try:
+            await scenario(watcher)
+            await asyncio.sleep(debounce_s * 3)
+        finally:
+            task.cancel()
+        events = []
+        while not watcher.queue.empty():
+            events.append(watcher.queue.get_nowait())
+        return events
+
+    return asyncio.run(run()), batches, watcher
+
+
+def test_create_modify_delete_collapses_to_nothing(tmp_path):
+    path = str(tmp_path / "draft.txt")
+
+    async def scenario(watcher):
+        (tmp_path / "draft.txt").write_text("partial")
+        watcher._note("created", path)
+        watcher._note("modified", path)
+        (tmp_path / "draft.txt").unlink()
+        watcher._note("deleted", path)
+
+    events, batches, watcher = watch(scenario)
+
+    assert events == [] and batches == []
+    assert watcher.stats["raw_events"] == 3 and watcher.stats["coalesced"] == 2
+
+
+def test_repeated_writes_collapse_into_one_event(tmp_path):
+    new, known, removed = (tmp_path / name for name in ("new.md", "known.md", "removed.md"))
+
+    async def scenario(watcher):
+        known.write_text("v1")
+        removed.write_text("v1")
+        watcher.seed_hashes(watcher._hash_files([str(known), str(removed)]))
+
+        new.write_text("v1")
+        watcher._note("created", str(new))
+        new.write_text("v2")
+        watcher._note("modified", str(new))
+        watcher._note("modified", str(new))
+
+        # Atomic save: delete + create of the same path is an in-place edit
+        watcher._note("deleted", str(known))
+        known.write_text("v2")
+        watcher._note("created", str(known))
+
+        watcher._note("modified", str(removed))
+        removed.unlink()
+        watcher._note("deleted", str(removed))
+
+    events, _, _ = watch(scenario)
+
+    assert sorted((e["type"], e["path"]) for e in events) == sorted([
+        ("file_created", str(new)),
+        ("file_modified", str(known)),
+        ("file_deleted", str(removed)),
+    ])
+
+
+def test_unchanged_content_is_dropped(tmp_path):
+    path = tmp_path / "same.txt"
+    path.write_text("same")
+
+    async def scenario(watcher):
+        watcher.seed_hashes(watcher._hash_files([str(path)]))
+        path.write_text("same")
+        watcher._note("modified", str(path))
+
+    events, _, watcher = watch(scenario)
+
+    assert events == []
+    assert watcher.stats["noop_skipped"] == 1
+
+
+def test_burst_is_emitted_and_dispatched_as_one_batch(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    paths = [str(books / f"book{i}.pdf") for i in range(10)]
+
+    async def scenario(watcher):
+        for path in paths:
+            with open(path, "w") as f:
+                f.write(path)
+            watcher._note("created", path)
+            watcher._note("modified", path)
+
+    events, batches, _ = watch(scenario)
+
+    assert batches == [sorted(paths)]
+    assert len(events) == 10
+
+    async def dispatch():
+        kernel = LibrarianKernel()
+        for event in events + events[:3]:  # duplicates are dropped at enqueue
+            await kernel._handle_filesystem_event(event)
+        return kernel._take_batch(kernel.ingestion_queue), kernel.ingestion_queue.qsize()
+
+    batch, left = asyncio.run(dispatch())
+
+    assert batch["type"] == "book_ingestion" and batch["priority"] == "high"
+    assert sorted(batch["paths"]) == sorted(paths)
+    assert left == 0
+
+
+def test_take_batch_respects_the_batch_size():
+    async def dispatch():
+        kernel = LibrarianKernel()
+        kernel.config["dispatch_batch_size"] = 4
+        for i in range(6):
+            await kernel.queue_ingestion(f"/data/{i}.csv")
+        return kernel._take_batch(kernel.ingestion_queue), kernel._take_batch(kernel.ingestion_queue)
+
+    first, second = asyncio.run(dispatch())
+
+    assert first["paths"] == [f"/data/{i}.csv" for i in range(4)]
+    assert second["paths"] == ["/data/4.csv", "/data/5.csv"]
+
+
+def test_path_is_emitted_only_after_the_debounce_window(tmp_path):
+    path = tmp_path / "log.txt"
+    emitted_at = {}
+
+    async def scenario(watcher):
+        emit = watcher._emit
+
+        async def timed_emit(settled):
+            emitted_at.setdefault("t", time.monotonic())
+            await emit(settled)
+
+        watcher._emit = timed_emit
+        path.write_text("0")
+        for i in range(5):
+            path.write_text(str(i))
+            watcher._note("modified", str(path))
+            await asyncio.sleep(0.04)  # keeps the path busy for longer than one debounce window
+        emitted_at["last_write"] = time.monotonic()
+        assert "t" not in emitted_at
+        await asyncio.sleep(0.3)
+
+    events, _, _ = watch(scenario, debounce_s=0.1, max_wait_s=5.0)
+
+    assert [e["type"] for e in events] == ["file_modified"]
+    assert emitted_at["t"] - emitted_at["last_write"] >= 0.05
+
+
+def test_continuous_churn_is_flushed_after_max_wait(tmp_path):
+    path = tmp_path / "busy.txt"
+    churn = {}
+
+    async def scenario(watcher):
+        started = time.monotonic()
+        i = 0
+        while watcher.queue.empty() and time.monotonic() - started < 1.0:
+            path.write_text(str(i))
+            watcher._note("modified", str(path))
+            i += 1
+            await asyncio.sleep(0.02)
+        churn["flushed_after"] = time.monotonic() - started
+
+    events, _, _ = watch(scenario, debounce_s=0.1, max_wait_s=0.2)
+
+    assert events and events[0]["type"] == "file_modified"
+    assert 0.15 <= churn["flushed_after"] < 0.6
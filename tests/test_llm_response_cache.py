@@ -0,0 +1,160 @@
+"""Tests for the two-tier LLM response cache"""
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from backend.services.llm_response_cache import LLMResponseCache
+
+
+class FakeEmbeddingService:
+    """Maps known texts to fixed vectors; raises when fail is set"""
+
+    default_model = "fake"
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.fail = False
+        self.calls = []
+
+    async def embed_query(self, text, model=None):
+        self.calls.append(text)
+        if self.fail:
+            raise RuntimeError("embedding backend down")
+        return self.vectors.get(text, [0.0, 0.0, 1.0])
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    service = FakeEmbeddingService({
+        "What is Grace?": [1.0, 0.0, 0.0],
+        "What's Grace?": [0.99, 0.01, 0.0],
+        "How do kernels boot?": [0.0, 1.0, 0.0],
+    })
+    module = types.ModuleType("backend.services.embedding_service")
+    module.embedding_service = service
+    monkeypatch.setitem(sys.modules, "backend.services.embedding_service", module)
+    return service
+
+
+def generator(text):
+    calls = []
+
+    async def generate():
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return {"text": text}
+    return generate, calls
+
+
+def test_exact_hit_and_coalescing(embeddings):
+    cache = LLMResponseCache()
+    generate, calls = generator("answer")
+
+    async def run():
+        first, second = await asyncio.gather(
+            cache.get_or_generate("m", "prompt", generate),
+            cache.get_or_generate("m", "prompt", generate),
+        )
+        third = await cache.get_or_generate("m", "  prompt\n", generate)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert len(calls) == 1
+    assert {first["cache"], second["cache"]} == {"miss", "coalesced"}
+    assert third["cache"] == "exact"
+
+
+def test_case_is_part_of_the_key(embeddings):
+    cache = LLMResponseCache()
+    generate, calls = generator("answer")
+
+    async def run():
+        await cache.get_or_generate("m", "rename getUser to get_user", generate)
+        return await cache.get_or_generate("m", "rename GETUSER to GET_USER", generate)
+
+    assert asyncio.run(run())["cache"] == "miss"
+    assert len(calls) == 2
+
+
+def test_semantic_hit_embeds_question_only(embeddings):
+    cache = LLMResponseCache()
+    generate, calls = generator("Grace is an AI")
+
+    async def run():
+        await cache.get_or_generate("m", "system: persona\nuser: What is Grace?", generate,
+                                    question="What is Grace?", prefix="persona")
+        return await cache.get_or_generate("m", "system: persona\nuser: What's Grace?", generate,
+                                           question="What's Grace?", prefix="persona")
+
+    result = asyncio.run(run())
+    assert result["cache"] == "semantic"
+    assert len(calls) == 1
+    assert embeddings.calls == ["What is Grace?", "What's Grace?"]
+
+
+def test_different_prefix_never_shares_semantic_entries(embeddings):
+    cache = LLMResponseCache()
+    generate, calls = generator("x")
+
+    async def run():
+        await cache.get_or_generate("m", "a What is Grace?", generate, question="What is Grace?", prefix="a")
+        return await cache.get_or_generate("m", "b What's Grace?", generate, question="What's Grace?", prefix="b")
+
+    assert asyncio.run(run())["cache"] == "miss"
+    assert len(calls) == 2
+
+
+def test_context_bearing_prompts_are_exact_only(embeddings):
+    cache = LLMResponseCache()
+    shared = "long shared RAG context " * 200
+    generate, calls = generator("x")
+
+    async def run():
+        await cache.get_or_generate("m", shared + "What is Grace?", generate)
+        return await cache.get_or_generate("m", shared + "How do kernels boot?", generate)
+
+    assert asyncio.run(run())["cache"] == "miss"
+    assert len(calls) == 2
+    assert embeddings.calls == []
+
+
+def test_embedding_failure_backs_off_then_recovers(embeddings):
+    cache = LLMResponseCache(embedding_backoff_seconds=10)
+    generate, _ = generator("x")
+    embeddings.fail = True
+
+    async def ask(question):
+        return await cache.get_or_generate("m", question, generate, question=question)
+
+    asyncio.run(ask("What is Grace?"))
+    assert not cache._semantic_available()
+    assert cache.semantic_enabled
+
+    asyncio.run(ask("How do kernels boot?"))
+    assert len(embeddings.calls) == 1  # paused, not retried
+
+    embeddings.fail = False
+    cache._semantic_retry_at = 0.0  # back-off window elapsed
+    asyncio.run(ask("What's Grace?"))
+    assert len(embeddings.calls) == 2
+    assert cache._consecutive_embedding_failures == 0
+
+
+def test_corpus_change_invalidates_dependent_entries(embeddings):
+    cache = LLMResponseCache()
+    generate, calls = generator("x")
+
+    async def run():
+        await cache.get_or_generate("m", "rag prompt", generate)
+        await cache.get_or_generate("m", "plain prompt", generate, corpus_dependent=False)
+        cache.on_corpus_changed()
+        rag = await cache.get_or_generate("m", "rag prompt", generate)
+        plain = await cache.get_or_generate("m", "plain prompt", generate, corpus_dependent=False)
+        return rag, plain
+
+    rag, plain = asyncio.run(run())
+    assert rag["cache"] == "miss"
+    assert plain["cache"] == "exact"
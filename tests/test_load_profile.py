@@ -0,0 +1,130 @@
+"""Tests for the load profiler's target pinning and generator isolation"""
+
+import asyncio
+import importlib
+import threading
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+
+from backend.chaos import load_profile
+from backend.chaos.load_profile import LoadProfiler, RequestSpec, StressLevel
+
+
+@pytest.fixture
+def targets(monkeypatch):
+    monkeypatch.setattr(load_profile, "LOAD_PROFILE_TARGETS", ["http://localhost:8000", "http://127.0.0.1:9000"])
+
+
+def test_resolve_target_defaults_to_first_configured(targets):
+    assert load_profile.resolve_target() == "http://localhost:8000"
+    assert load_profile.resolve_target("http://127.0.0.1:9000/") == "http://127.0.0.1:9000"
+
+
+@pytest.mark.parametrize("url", [
+    "http://169.254.169.254",
+    "http://localhost:8001",
+    "https://example.com",
+])
+def test_unlisted_targets_are_rejected(targets, url):
+    with pytest.raises(ValueError):
+        load_profile.resolve_target(url)
+
+
+@pytest.mark.parametrize("rates, duration_s", [
+    ([load_profile.MAX_OFFERED_RPS + 1], 10.0),
+    ([0.0], 10.0),
+    (None, load_profile.MAX_WINDOW_SECONDS + 1),
+])
+def test_limits_are_enforced(rates, duration_s):
+    with pytest.raises(ValueError):
+        load_profile.check_limits(rates, duration_s)
+
+
+def test_default_mix_does_not_write():
+    writes = [spec.name for spec in load_profile.DEFAULT_REQUEST_MIX if spec.method != "GET"]
+
+    assert writes == ["chat"]
+
+
+def test_sweep_measures_on_its_own_loop(monkeypatch):
+    seen = []
+
+    async def run_point(self, rate, duration_s, level="baseline"):
+        seen.append((threading.get_ident(), asyncio.get_running_loop()))
+        return load_profile.LoadPoint(level=level, offered_rps=rate, duration_s=duration_s)
+
+    monkeypatch.setattr(LoadProfiler, "run_point", run_point)
+
+    async def run():
+        profiler = LoadProfiler()
+        await profiler.sweep([StressLevel("baseline")], [5.0], duration_s=1.0, cooldown_s=0, warmup_s=0)
+        return threading.get_ident(), asyncio.get_running_loop()
+
+    caller_thread, caller_loop = asyncio.run(run())
+
+    assert len(seen) == 1
+    assert seen[0][0] != caller_thread
+    assert seen[0][1] is not caller_loop
+
+
+def test_generator_drives_a_server_on_the_callers_loop():
+    requests = []
+
+    async def ok(request):
+        requests.append(request.path)
+        return web.Response(text="ok")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/ok", ok)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            profiler = LoadProfiler(
+                f"http://127.0.0.1:{port}",
+                request_mix=[RequestSpec("ok", "GET", "/ok")],
+                seed=1
+            )
+            return await profiler.sweep([StressLevel("baseline")], [40.0], duration_s=0.5, cooldown_s=0, warmup_s=0)
+        finally:
+            await runner.cleanup()
+
+    report = asyncio.run(run())
+    point = report["points"][0]
+
+    assert point["sent"] > 0
+    assert point["completed"] == len(requests) == point["sent"]
+    assert point["errors"] == 0
+
+
+def test_release_stops_the_cpu_burners(monkeypatch):
+    # The package re-exports the singleton under the module's name
+    runner_module = importlib.import_module("backend.chaos.chaos_runner")
+
+    create = asyncio.create_subprocess_exec
+
+    async def no_stress_ng(program, *args, **kwargs):
+        if program == 'stress-ng':
+            raise FileNotFoundError(program)
+        return await create(program, *args, **kwargs)
+
+    monkeypatch.setattr(runner_module.asyncio, "create_subprocess_exec", no_stress_ng)
+
+    async def run():
+        runner = runner_module.ChaosRunner()
+        release = await runner._apply_load_stress(StressLevel("cpu", cpu_cores=2), duration_s=60)
+        processes = [p for group in runner.stress_processes.values() for p in group]
+        running = [p.returncode is None for p in processes]
+        await release()
+        return running, [p.returncode for p in processes], runner.stress_processes
+
+    running, returncodes, left = asyncio.run(run())
+
+    assert running == [True, True]
+    assert all(code is not None for code in returncodes)
+    assert left == {}
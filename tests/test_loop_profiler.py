@@ -0,0 +1,105 @@
+"""Tests for the event-loop sampling profiler and stall detector"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from backend.observability.loop_profiler import _REPO_ROOT, LoopProfiler, module_name, subsystem_for
+
+
+def run_profiled(workload, hz=200, stall_ms=50):
+    profiler = LoopProfiler()
+
+    async def run():
+        profiler.start(hz=hz, stall_threshold_ms=stall_ms)
+        try:
+            await workload()
+            await asyncio.sleep(0.1)  # let the heartbeat close any open stall
+        finally:
+            profiler.stop()
+
+    asyncio.run(run())
+    return profiler
+
+
+def block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+def test_module_name_for_repo_files():
+    path = os.path.join(_REPO_ROOT, "backend", "core", "htm", "__init__.py")
+
+    assert module_name(path) == "backend.core.htm"
+    assert module_name("/usr/lib/python3/site-packages/uvicorn/server.py") == "uvicorn.server"
+
+
+@pytest.mark.parametrize("module, subsystem", [
+    ("backend.core.htm.queue", "htm"),
+    ("backend.routes.chat_api", "api"),
+    ("backend.self_heal.runner", "self_heal"),
+    ("backend.world_model.service", "world_model"),
+    ("asyncio.tasks", "other"),
+])
+def test_subsystem_for(module, subsystem):
+    assert subsystem_for(module) == subsystem
+
+
+def test_blocking_call_is_reported_as_a_stall_with_its_stack():
+    async def workload():
+        async def blocker():
+            await asyncio.sleep(0.05)
+            block_the_loop(0.3)
+
+        await asyncio.create_task(blocker(), name="blocking-job")
+
+    profiler = run_profiled(workload)
+
+    stalls = [s for s in profiler.stalls if s.task == "blocking-job"]
+    assert len(stalls) == 1
+    assert stalls[0].finished
+    assert stalls[0].duration_ms >= 250
+    assert any(frame.endswith(":block_the_loop") for frame in stalls[0].stack)
+
+
+def test_idle_loop_is_not_profiled_as_busy():
+    async def workload():
+        await asyncio.sleep(0.3)
+
+    profiler = run_profiled(workload)
+    report = profiler.get_report()
+
+    assert report["samples"] > 0
+    assert report["by_subsystem"]["idle"]["wall_pct"] > 50
+    assert not [s for s in profiler.stalls if s.task != "(unsampled)"]
+
+
+def test_busy_task_shows_up_in_report_and_flamegraph():
+    async def workload():
+        async def spin():
+            deadline = time.perf_counter() + 0.3
+            while time.perf_counter() < deadline:
+                block_the_loop(0.005)
+                await asyncio.sleep(0)
+
+        await asyncio.create_task(spin(), name="spinner")
+
+    profiler = run_profiled(workload, stall_ms=1000)
+    report = profiler.get_report()
+
+    assert "spinner" in {row["task"] for row in report["top_tasks"]}
+    lines = profiler.export_collapsed().splitlines()
+    assert any(";spinner;" in line and ":block_the_loop " in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_reset_clears_aggregates():
+    async def workload():
+        await asyncio.sleep(0.05)
+
+    profiler = run_profiled(workload)
+    profiler.reset()
+
+    assert profiler.get_report()["samples"] == 0
+    assert profiler.export_collapsed() == ""
@@ -0,0 +1,118 @@
+"""Tests for the memory table registry's bulk insert/upsert/update"""
+
+import logging
+import uuid
+
+import pytest
+
+pytest.importorskip("sqlmodel")
+
+from backend.memory_tables.registry import SchemaRegistry
+
+SCHEMA = """
+table: bulk_test_documents
+fields:
+  - name: id
+    type: uuid
+    primary_key: true
+    generated: true
+  - name: file_path
+    type: string
+    unique: true
+  - name: title
+    type: string
+  - name: status
+    type: string
+    nullable: true
+"""
+
+
+@pytest.fixture
+def registry(tmp_path):
+    schema_dir = tmp_path / "schema"
+    schema_dir.mkdir()
+    (schema_dir / "bulk_test_documents.yaml").write_text(SCHEMA)
+    registry = SchemaRegistry(schema_dir)
+    registry.load_all_schemas()
+    registry.initialize_database(f"sqlite:///{tmp_path}/memory_tables.db")
+    yield registry
+    registry.engine.dispose()
+
+
+def docs(*paths, **fields):
+    return [{"file_path": path, "title": path.upper(), **fields} for path in paths]
+
+
+def stored(registry):
+    rows = registry.query_rows("bulk_test_documents", limit=1000)
+    return {row.file_path: row for row in rows}
+
+
+def test_insert_rows_writes_every_batch(registry):
+    paths = [f"/docs/{i}.md" for i in range(7)]
+
+    assert registry.insert_rows("bulk_test_documents", docs(*paths), batch_size=3) == 7
+    assert sorted(stored(registry)) == sorted(paths)
+
+
+def test_a_bad_row_only_rejects_itself(registry, caplog):
+    registry.insert_rows("bulk_test_documents", docs("/docs/taken.md"))
+    rows = docs("/docs/a.md", "/docs/taken.md", "/docs/b.md", "/docs/c.md")
+
+    with caplog.at_level(logging.ERROR, logger="backend.memory_tables.registry"):
+        inserted = registry.insert_rows("bulk_test_documents", rows, batch_size=500)
+
+    assert inserted == 3
+    assert sorted(stored(registry)) == ["/docs/a.md", "/docs/b.md", "/docs/c.md", "/docs/taken.md"]
+    rejected = [r for r in caplog.records if "Rejected insert" in r.getMessage()]
+    assert len(rejected) == 1 and "UNIQUE" in rejected[0].getMessage()
+
+
+def test_upsert_rows_updates_by_unique_column(registry):
+    registry.insert_rows("bulk_test_documents", docs("/docs/a.md", "/docs/b.md", status="new"))
+    before = stored(registry)
+
+    written = registry.upsert_rows("bulk_test_documents", [
+        {"file_path": "/docs/a.md", "title": "renamed"},
+        {"file_path": "/docs/c.md", "title": "C"},
+        {"file_path": "/docs/a.md", "title": "renamed again"},  # last write wins
+    ])
+    after = stored(registry)
+
+    assert written == 2
+    assert after["/docs/a.md"].id == before["/docs/a.md"].id
+    assert after["/docs/a.md"].title == "renamed again"
+    assert after["/docs/a.md"].status == "new"  # not provided, so kept
+    assert after["/docs/b.md"].title == "/DOCS/B.MD"
+    assert after["/docs/c.md"].title == "C"
+
+
+def test_upsert_rows_without_the_unique_column_is_logged(registry, caplog):
+    registry.insert_rows("bulk_test_documents", docs("/docs/a.md"))
+    rows = [{"file_path": "/docs/a.md", "title": "updated"}, {"title": "no path"}]
+
+    with caplog.at_level(logging.WARNING, logger="backend.memory_tables.registry"):
+        registry.upsert_rows("bulk_test_documents", rows)
+
+    assert any("1 of 2 rows" in r.getMessage() and "lack" in r.getMessage() for r in caplog.records)
+    assert stored(registry)["/docs/a.md"].title == "updated"
+
+
+def test_update_rows_matches_by_id(registry, caplog):
+    registry.insert_rows("bulk_test_documents", docs("/docs/a.md", "/docs/b.md", "/docs/c.md"))
+    ids = {path: row.id for path, row in stored(registry).items()}
+
+    with caplog.at_level(logging.ERROR, logger="backend.memory_tables.registry"):
+        matched = registry.update_rows("bulk_test_documents", [
+            {"id": str(ids["/docs/a.md"]), "status": "done"},
+            {"id": ids["/docs/b.md"], "file_path": "/docs/c.md"},  # collides with c
+            {"id": ids["/docs/c.md"], "status": "done"},
+            {"id": uuid.uuid4(), "status": "done"},  # no such row
+            {"id": "not-a-uuid", "status": "done"},
+        ])
+    after = stored(registry)
+
+    assert matched == 2
+    assert after["/docs/a.md"].status == after["/docs/c.md"].status == "done"
+    assert after["/docs/b.md"].id == ids["/docs/b.md"]
+    assert any("Rejected update" in r.getMessage() for r in caplog.records)
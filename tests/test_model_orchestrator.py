@@ -0,0 +1,181 @@
+"""Tests for the ModelOrchestrator installed-model cache"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from backend import model_orchestrator as mo
+
+
+class FakeResponse:
+    def __init__(self, status_code, models=()):
+        self.status_code = status_code
+        self._models = models
+
+    def json(self):
+        return {"models": [{"name": m} for m in self._models]}
+
+
+class FakeClient:
+    is_closed = False
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def get(self, path, timeout=None):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_orchestrator(responses):
+    orchestrator = mo.ModelOrchestrator()
+    orchestrator._client = FakeClient(responses)
+    return orchestrator
+
+
+def test_successful_listing_is_cached():
+    orchestrator = make_orchestrator([FakeResponse(200, ["llama3:8b"])])
+
+    async def run():
+        first = await orchestrator.get_installed_models()
+        second = await orchestrator.get_installed_models()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == ["llama3:8b"]
+    assert orchestrator._client.calls == 1
+
+
+def age_cache(orchestrator, seconds):
+    orchestrator._installed_models_at -= seconds
+
+
+def test_failure_is_only_cached_briefly():
+    orchestrator = make_orchestrator([ConnectionError("down"), FakeResponse(200, ["qwen2.5:7b"])])
+
+    async def run():
+        failed = await orchestrator.get_installed_models()
+        cached = await orchestrator.get_installed_models()
+        age_cache(orchestrator, mo.MODEL_LIST_FAILURE_TTL_SECONDS + 0.1)
+        recovered = await orchestrator.get_installed_models()
+        return failed, cached, recovered
+
+    failed, cached, recovered = asyncio.run(run())
+    assert failed == [] and cached == []
+    assert recovered == ["qwen2.5:7b"]
+    assert orchestrator._client.calls == 2
+
+
+def test_failure_keeps_last_good_list():
+    orchestrator = make_orchestrator([FakeResponse(200, ["a"]), FakeResponse(500)])
+
+    async def run():
+        await orchestrator.get_installed_models()
+        age_cache(orchestrator, mo.MODEL_LIST_TTL_SECONDS + 1)
+        return await orchestrator.get_installed_models()
+
+    assert asyncio.run(run()) == ["a"]
+    assert orchestrator._installed_models_ttl == mo.MODEL_LIST_FAILURE_TTL_SECONDS
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    from backend.services import llm_response_cache as cache_module
+
+    cache = cache_module.LLMResponseCache(semantic_enabled=False)
+    monkeypatch.setattr(cache_module, "llm_response_cache", cache)
+    return cache
+
+
+def test_fallback_answer_is_cached_under_the_model_that_gave_it(response_cache):
+    orchestrator = mo.ModelOrchestrator()
+    calls = []
+
+    async def chat_with_model(message, context, model):
+        calls.append(model)
+        if model == "primary:latest":
+            return await orchestrator._try_alternative_model(message, context, model)
+        return {"text": f"from {model}", "model": model, "provider": "ollama"}
+
+    async def available(model):
+        return model == "gemma2:9b"
+
+    orchestrator._chat_with_model = chat_with_model
+    orchestrator._check_model_available = available
+
+    async def run():
+        first = await orchestrator.chat_with_learning("hi", user_preference="primary:latest")
+        again = await orchestrator.chat_with_learning("hi", user_preference="primary:latest")
+        direct = await orchestrator.chat_with_learning("hi", user_preference="gemma2:9b")
+        return first, again, direct
+
+    first, again, direct = asyncio.run(run())
+
+    assert first["model"] == "gemma2:9b"
+    assert again["cache"] == "miss"  # nothing stored under the model that failed
+    assert direct["cache"] == "exact"
+    assert calls == ["primary:latest", "gemma2:9b", "primary:latest"]
+    assert all(key.startswith("gemma2:9b|") for key in response_cache._entries)
+
+
+def test_generate_passes_the_question_to_the_cache(response_cache, monkeypatch):
+    orchestrator = mo.ModelOrchestrator()
+    seen = {}
+
+    async def get_or_generate(**kwargs):
+        seen.update(kwargs)
+        return {"text": "ok"}
+
+    monkeypatch.setattr(response_cache, "get_or_generate", get_or_generate)
+
+    asyncio.run(orchestrator.generate(
+        "Answer briefly.\n\nQuestion: What is Grace?", model="m",
+        question="What is Grace?", prefix="Answer briefly."
+    ))
+
+    assert seen["question"] == "What is Grace?"
+    assert seen["prefix"] == "Answer briefly."
+
+
+def test_http_client_is_reused_within_a_loop_and_replaced_across_loops():
+    orchestrator = mo.ModelOrchestrator()
+
+    async def clients():
+        return orchestrator.get_http_client(), orchestrator.get_http_client()
+
+    first, again = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+
+    assert first is again
+    assert second is not first
+    asyncio.run(orchestrator.aclose())
+    assert orchestrator._client is None
+
+
+def test_client_of_a_running_loop_is_closed_on_that_loop():
+    orchestrator = mo.ModelOrchestrator()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        async def client():
+            return orchestrator.get_http_client()
+
+        worker_client = asyncio.run_coroutine_threadsafe(client(), loop).result(timeout=5)
+        asyncio.run(client())
+
+        # Retired from the other loop; the close runs on the worker's loop
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), loop).result(timeout=5)
+        assert worker_client.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+    asyncio.run(orchestrator.aclose())
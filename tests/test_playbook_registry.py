@@ -0,0 +1,178 @@
+"""Tests for the playbook registry's compiled conditions and trigger prefilter"""
+
+import asyncio
+import re
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core.playbook_registry import (
+    CompiledPlaybook,
+    PlaybookSnapshot,
+    _required_literal,
+    compile_condition,
+)
+
+
+PATTERNS = [
+    r"connection refused",
+    r"timeout{0,10}x",
+    r"ab{0,100000}c",
+    r"db.*locked",
+    r"disk (full|low)",
+    r"port \d+ in use",
+    r"err(or)?: \.\.\.",
+    r"[^]x]yz",
+    r"[\]q]zz",
+    r"colou?r",
+    r"retr(y|ies) exhausted",
+    r"oom|out of memory",
+    r"abc{2}def",
+    r"x{y",
+    r"(?i)GPU hang",
+    r"(?x) token \s+ expired",
+    r"\bfaiss\b",
+]
+
+ISSUES = [
+    "Connection refused by upstream",
+    "timeoux",
+    "timeouttttx",
+    "ac",
+    "DB is locked",
+    "disk low on /var",
+    "port 8000 in use",
+    "err: ...",
+    "error: ...",
+    "ayz",
+    "]zz",
+    "color mismatch",
+    "retries exhausted",
+    "process killed: OOM",
+    "abccdef",
+    "x{y",
+    "gpu hang detected",
+    "token expired",
+    "tokenexpired",
+    "faiss index lock",
+    "nothing to see here",
+]
+
+
+def indexed_snapshot(patterns):
+    """One single-trigger playbook per pattern, named after the pattern"""
+    compiled = [
+        CompiledPlaybook(
+            SimpleNamespace(name=p, domain="test", steps=[]),
+            {"triggers": [{"pattern": p}]},
+            Path(f"{i}.yaml")
+        )
+        for i, p in enumerate(patterns)
+    ]
+    return PlaybookSnapshot(compiled)
+
+
+@pytest.mark.parametrize("pattern, literal", [
+    ("timeout{0,10}x", "timeou"),
+    ("abc{2}def", "def"),
+    ("ab{0,100000}c", "a"),
+    ("ab?cd", "cd"),
+    ("[^]abc]xyz", "xyz"),
+    ("disk (full|low)", "disk "),
+    ("a|b", ""),
+    (r"err: \.\.\.", "err: ..."),
+])
+def test_required_literal(pattern, literal):
+    assert _required_literal(pattern) == literal
+
+
+@pytest.mark.parametrize("issue", ISSUES)
+def test_prefilter_agrees_with_plain_search(issue):
+    snapshot = indexed_snapshot(PATTERNS)
+
+    via_prefilter = {
+        entry.playbook.name for pattern, entry in snapshot.pattern_candidates(issue)
+        if pattern.search(issue)
+    }
+    via_search = {p for p in PATTERNS if re.search(p, issue, re.IGNORECASE)}
+
+    assert via_prefilter == via_search
+
+
+@pytest.mark.parametrize("condition, context, expected", [
+    ("stale_count > 0", {"stale_count": 2}, True),
+    ("stale_count > 0", {"stale_count": 0}, False),
+    ("stale_count > 0", {}, False),
+    ("pruned_count > 0 or not health_check_passed", {"pruned_count": 0, "health_check_passed": False}, True),
+    ("vault_has_token == true", {"vault_has_token": True}, True),
+    ("$cpu >= 80%", {"cpu": 85}, True),
+    ("service.status == 'down'", {"service": {"status": "down"}}, True),
+    ("hosts[0] in ('a', 'b')", {"hosts": ["b"]}, True),
+    ("__import__('os')", {}, True),
+    ("not (", {}, True),
+])
+def test_compile_condition(condition, context, expected):
+    assert compile_condition(condition)(context) is expected
+
+
+def test_compile_condition_is_cached():
+    assert compile_condition("x > 1") is compile_condition("x > 1")
+
+
+def engine_with_actions(results):
+    """Engine whose actions record the params they get and return canned results"""
+    from backend.core.advanced_playbook_engine import AdvancedPlaybookEngine
+
+    calls = []
+
+    def action(name, result):
+        async def run(params):
+            calls.append((name, params))
+            return {"success": True, **result}
+        return run
+
+    engine = AdvancedPlaybookEngine()
+    engine.action_primitives = {name: action(name, result) for name, result in results.items()}
+    return engine, calls
+
+
+def test_later_step_conditions_see_earlier_step_results():
+    from backend.core.advanced_playbook_engine import PlaybookStep, Severity
+
+    engine, calls = engine_with_actions({
+        "scan": {"stale_count": 3},
+        "prune": {"pruned_count": 0},
+        "restart": {},
+    })
+    steps = [
+        PlaybookStep(action="scan", id="scan"),
+        PlaybookStep(action="prune", conditional="stale_count > 0 and steps.scan.success"),
+        PlaybookStep(action="restart", conditional="pruned_count > 0"),
+    ]
+    context = {"issue": "ports"}
+
+    asyncio.run(engine._execute_steps(steps, context, Severity.MINOR))
+
+    assert [name for name, _ in calls] == ["scan", "prune"]
+    assert context == {"issue": "ports"}
+
+
+def test_step_outputs_do_not_leak_into_later_step_params():
+    from backend.core.advanced_playbook_engine import PlaybookStep, Severity
+
+    engine, calls = engine_with_actions({
+        "scan": {"stale_count": 3, "target": "/tmp/scan-output"},
+        "prune": {},
+    })
+    steps = [
+        PlaybookStep(action="scan", id="scan"),
+        PlaybookStep(action="prune", params={"dry_run": True}, conditional="stale_count > 0"),
+    ]
+
+    asyncio.run(engine._execute_steps(steps, {"issue": "ports"}, Severity.MINOR))
+
+    assert calls == [
+        ("scan", {"issue": "ports"}),
+        ("prune", {"issue": "ports", "dry_run": True}),
+    ]
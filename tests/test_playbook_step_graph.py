@@ -0,0 +1,100 @@
+"""Tests for dependency-graph step execution in the advanced playbook engine"""
+
+import asyncio
+
+from backend.core.advanced_playbook_engine import AdvancedPlaybookEngine, PlaybookStep, Severity
+
+
+def run_steps(steps, durations=None, failing=(), max_parallel_steps=4, severity=Severity.MINOR):
+    """Run steps whose actions sleep for their duration; returns (results, events, peak concurrency)"""
+    durations = durations or {}
+    events = []
+    running = set()
+    peak = [0]
+
+    def action(name):
+        async def run(params):
+            events.append(("start", name))
+            running.add(name)
+            peak[0] = max(peak[0], len(running))
+            await asyncio.sleep(durations.get(name, 0.01))
+            running.discard(name)
+            events.append(("finish", name))
+            return {"success": name not in failing}
+        return run
+
+    engine = AdvancedPlaybookEngine(max_parallel_steps=max_parallel_steps)
+    engine.action_primitives = {step.action: action(step.action) for step in steps}
+    results = asyncio.run(engine._execute_steps(steps, {}, severity))
+    return results, events, peak[0]
+
+
+def step(action, *depends_on, sequential=False):
+    # retry_count=1: failing steps shouldn't back off and retry
+    return PlaybookStep(action=action, depends_on=None if sequential else list(depends_on), retry_count=1)
+
+
+def test_steps_wait_for_their_dependencies():
+    steps = [step("fetch"), step("build", "fetch"), step("test", "build"), step("lint", "fetch")]
+
+    results, events, _ = run_steps(steps, {"build": 0.05})
+
+    assert [r["action"] for r in results] == ["fetch", "build", "test", "lint"]
+    assert events.index(("start", "build")) > events.index(("finish", "fetch"))
+    assert events.index(("start", "test")) > events.index(("finish", "build"))
+    # lint only needs fetch, so it doesn't wait for the slow build
+    assert events.index(("finish", "lint")) < events.index(("finish", "build"))
+
+
+def test_steps_without_depends_on_run_in_order():
+    steps = [step(name, sequential=True) for name in ("a", "b", "c")]
+
+    _, events, peak = run_steps(steps)
+
+    assert events == [("start", "a"), ("finish", "a"), ("start", "b"), ("finish", "b"), ("start", "c"), ("finish", "c")]
+    assert peak == 1
+
+
+def test_independent_steps_run_concurrently():
+    steps = [step(name) for name in ("a", "b", "c")]
+
+    _, events, peak = run_steps(steps, {"a": 0.05, "b": 0.05, "c": 0.05})
+
+    assert peak == 3
+    assert [kind for kind, _ in events] == ["start"] * 3 + ["finish"] * 3
+
+
+def test_concurrency_is_capped_by_max_parallel_steps():
+    steps = [step(f"s{i}") for i in range(5)]
+
+    results, _, peak = run_steps(steps, {f"s{i}": 0.02 for i in range(5)}, max_parallel_steps=2)
+
+    assert peak == 2
+    assert len(results) == 5
+
+
+def test_dependents_of_a_failed_step_are_skipped():
+    steps = [
+        step("backup"),
+        step("migrate", "backup"),
+        step("restart", "migrate"),
+        step("notify"),
+        step("report", "notify", "backup"),
+        step("cleanup", sequential=True),
+    ]
+
+    results, events, _ = run_steps(steps, failing={"backup"})
+
+    started = {name for kind, name in events if kind == "start"}
+    assert started == {"backup", "notify", "cleanup"}
+    assert [r["action"] for r in results] == ["backup", "notify", "cleanup"]
+    assert not results[0]["result"]["success"]
+
+
+def test_critical_failure_starts_no_further_steps():
+    steps = [step("probe"), step("slow"), step("after_probe", "probe"), step("after_slow", "slow")]
+
+    results, events, _ = run_steps(steps, {"slow": 0.05}, failing={"probe"}, severity=Severity.CRITICAL)
+
+    assert [r["action"] for r in results] == ["probe", "slow"]
+    assert ("start", "after_slow") not in events
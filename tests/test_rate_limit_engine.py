@@ -0,0 +1,117 @@
+"""Tests for the GCRA rate limit engine and its stores"""
+
+import sqlite3
+import time
+
+import pytest
+
+from backend.scaling.rate_limit_engine import MemoryStore, RateLimitEngine, SQLiteStore
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SQLiteStore(str(tmp_path / "limits.db"), flush_interval=3600)
+    yield store
+    store.close()
+
+
+def test_burst_then_steady_rate():
+    store = MemoryStore()
+    interval, tolerance = 1.0, 3.0
+
+    decisions = [store.update("k", interval, tolerance, 100.0)[0] for _ in range(4)]
+    assert decisions == [True, True, True, False]
+
+    # One interval later exactly one more request fits
+    assert store.update("k", interval, tolerance, 101.0)[0]
+    assert not store.update("k", interval, tolerance, 101.0)[0]
+
+
+def test_rejection_does_not_consume():
+    store = MemoryStore()
+    store.update("k", 1.0, 1.0, 0.0)
+    tat = store.peek("k", 0.0)
+
+    assert store.update("k", 1.0, 1.0, 0.5) == (False, tat)
+    assert store.peek("k", 0.5) == tat
+
+
+def test_engine_decision_fields():
+    engine = RateLimitEngine(MemoryStore())
+
+    first = engine.check("ip:1", rate=1.0, burst=2)
+    engine.check("ip:1", rate=1.0, burst=2)
+    rejected = engine.check("ip:1", rate=1.0, burst=2)
+
+    assert first.allowed and first.remaining == 1 and first.limit == 2
+    assert not rejected.allowed and rejected.remaining == 0
+    assert 0.0 < rejected.retry_after <= 1.0
+    assert engine.get_stats()["rejections"] == 1
+
+
+def test_expired_keys_are_evicted():
+    store = MemoryStore(shards=1, max_keys_per_shard=4)
+    for i in range(10):
+        store.update(f"k{i}", 1.0, 1.0, float(i * 10))
+
+    assert store.size() <= 2
+    assert store.evictions >= 8
+
+
+def test_shard_size_is_capped_even_when_nothing_expired():
+    store = MemoryStore(shards=1, max_keys_per_shard=8)
+    for i in range(100):
+        store.update(f"k{i}", 100.0, 100.0, 0.0)
+
+    assert store.size() <= 8
+
+
+def test_sqlite_checks_do_not_touch_the_database(sqlite_store, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("check hit SQLite")
+
+    monkeypatch.setattr(sqlite_store, "_connect", fail)
+
+    assert [sqlite_store.update("k", 1.0, 2.0, 0.0)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_sqlite_flush_shares_consumption_between_workers(tmp_path):
+    path = str(tmp_path / "limits.db")
+    a = SQLiteStore(path, flush_interval=3600)
+    b = SQLiteStore(path, flush_interval=3600)
+    try:
+        now = time.time()
+        assert a.update("k", 1.0, 2.0, now)[0]
+        assert a.update("k", 1.0, 2.0, now)[0]
+        a.flush()
+
+        # b only knows its own request until its flush adds a's two
+        assert b.update("k", 1.0, 2.0, now)[0]
+        b.flush()
+        assert b.peek("k", now) == pytest.approx(now + 3.0, abs=0.5)
+        assert not b.update("k", 1.0, 2.0, now)[0]
+    finally:
+        a.close()
+        b.close()
+
+
+def test_sqlite_flush_failure_keeps_local_limits(sqlite_store, monkeypatch):
+    sqlite_store.update("k", 1.0, 1.0, 0.0)
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(sqlite_store, "_connect", locked)
+    sqlite_store.flush()
+
+    assert sqlite_store.flush_errors == 1
+    assert not sqlite_store.update("k", 1.0, 1.0, 0.0)[0]
+
+
+def test_sqlite_checks_do_not_wait_for_a_flush(sqlite_store):
+    with sqlite_store._flush_lock:  # a flush is in progress
+        assert sqlite_store.update("k", 1.0, 1.0, 0.0)[0]
+
+    sqlite_store.flush()
+    row = sqlite_store._connect().execute("SELECT tat FROM rate_limits WHERE key = 'k'").fetchone()
+    assert row is not None
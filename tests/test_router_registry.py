@@ -0,0 +1,135 @@
+"""Tests for lazy router loading and router requirements initialized on demand"""
+
+import asyncio
+import textwrap
+import threading
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.routes import router_registry as registry_module
+from backend.routes.router_registry import RouterRegistry
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """A router module plus initializers that record their calls"""
+    (tmp_path / "req_router.py").write_text(textwrap.dedent("""
+        from fastapi import APIRouter
+
+        router = APIRouter()
+
+        @router.get("/ping")
+        async def ping():
+            return {"ok": True}
+    """))
+    (tmp_path / "lazy_router.py").write_text(textwrap.dedent("""
+        import threading
+
+        from fastapi import APIRouter
+
+        from req_init import calls
+
+        imported_on = threading.current_thread()
+        router = APIRouter(prefix="/lazy")
+
+        @router.on_event("startup")
+        async def warm():
+            calls.append("lazy startup")
+
+        @router.get("/ping")
+        async def ping():
+            return {"ok": True}
+    """))
+    (tmp_path / "req_init.py").write_text(textwrap.dedent("""
+        calls = []
+
+        async def ready():
+            calls.append("ready")
+
+        async def broken():
+            calls.append("broken")
+            raise RuntimeError("no database")
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Lazy mode reads route paths from source under the repository root
+    monkeypatch.setattr(registry_module, "_REPO_ROOT", tmp_path)
+    import req_init
+    req_init.calls.clear()
+    return req_init
+
+
+def client_for(requires, init_requirements=True):
+    app = FastAPI()
+    registry = RouterRegistry()
+    registry.declare("Test router", "req_router", requires=requires)
+    registry.mount(app, lazy=False, init_requirements=init_requirements)
+    return TestClient(app), registry
+
+
+def test_requirement_runs_once_on_first_request(modules):
+    client, registry = client_for(["req_init:ready"])
+    assert modules.calls == []
+
+    assert client.get("/ping").status_code == 200
+    assert client.get("/ping").status_code == 200
+
+    assert modules.calls == ["ready"]
+    assert registry.get_status()["initialized_on_demand"] == ["req_init:ready"]
+
+
+def test_failed_requirement_answers_503_and_backs_off(modules):
+    client, _ = client_for(["req_init:broken"])
+
+    first = client.get("/ping")
+    second = client.get("/ping")
+
+    assert first.status_code == second.status_code == 503
+    assert modules.calls == ["broken"]
+
+
+def test_full_profile_leaves_requirements_to_startup(modules):
+    client, _ = client_for(["req_init:ready"], init_requirements=False)
+
+    assert client.get("/ping").status_code == 200
+    assert modules.calls == []
+
+
+def test_lazy_router_imports_off_the_loop_and_runs_its_startup_handler(modules):
+    app = FastAPI()
+    registry = RouterRegistry()
+    registry.declare("Lazy router", "lazy_router")
+    registry.mount(app, lazy=True)
+
+    with TestClient(app) as client:
+        assert modules.calls == []  # not mounted when the app started
+        assert client.get("/lazy/ping").status_code == 200
+        assert client.get("/lazy/ping").status_code == 200
+
+    import lazy_router
+    assert modules.calls == ["lazy startup"]
+    assert lazy_router.imported_on is not threading.main_thread()
+    assert registry.get_status()["counts"] == {"loaded": 1}
+
+
+def test_concurrent_requests_mount_a_lazy_router_once(modules):
+    app = FastAPI()
+    registry = RouterRegistry()
+    registry.declare("Lazy router", "lazy_router")
+    registry.mount(app, lazy=True)
+    routes_before = len(app.router.routes)
+
+    async def run():
+        await asyncio.gather(*[registry.ensure_for_path("/lazy/ping") for _ in range(5)])
+
+    asyncio.run(run())
+
+    (spec,) = registry.specs
+    assert spec.state == "loaded"
+    assert len(app.router.routes) == routes_before + spec.route_count
+    assert modules.calls == ["lazy startup"]
@@ -0,0 +1,161 @@
+"""Tests for self-heal run claiming, approval and concurrent dispatch"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import backend.models as models_module
+from backend.misc.trigger_mesh import trigger_mesh
+from backend.models.base_models import Base
+from backend.models.governance_models import ApprovalRequest, AuditLog
+from backend.models.self_heal_models import LearningLog, Playbook, PlaybookRun
+from backend.self_heal.runner import ExecutionRunner
+
+TABLES = [Playbook.__table__, ApprovalRequest.__table__, PlaybookRun.__table__, AuditLog.__table__, LearningLog.__table__]
+
+
+def run_with_db(tmp_path, monkeypatch, scenario):
+    """Run scenario(session_factory) with the self-heal tables on a temp database"""
+    published = []
+
+    async def publish(event):
+        published.append(event)
+
+    monkeypatch.setattr(trigger_mesh, "publish", publish)
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/self_heal.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=TABLES))
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(models_module, "async_session", session_factory)
+        try:
+            return await scenario(session_factory), published
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def add_runs(session_factory, *services, status="approved", approval_request_id=None):
+    async with session_factory() as session:
+        runs = [
+            PlaybookRun(service=service, status=status, approval_request_id=approval_request_id)
+            for service in services
+        ]
+        session.add_all(runs)
+        await session.commit()
+        return [run.id for run in runs]
+
+
+async def statuses(session_factory):
+    async with session_factory() as session:
+        rows = await session.execute(select(PlaybookRun.id, PlaybookRun.status).order_by(PlaybookRun.id))
+        return dict(rows.all())
+
+
+async def claim(runner, session_factory, busy_services=None):
+    async with session_factory() as session:
+        run = await runner._claim_next(session, datetime.now(timezone.utc), busy_services)
+        return run.id if run else None
+
+
+def test_two_claimers_race_for_one_run_and_one_wins(tmp_path, monkeypatch):
+    async def scenario(session_factory):
+        (run_id,) = await add_runs(session_factory, "api")
+        winner, loser = ExecutionRunner(), ExecutionRunner()
+        won = {}
+
+        # The loser has already read the candidate when the winner claims it
+        async def gates_then_lose_race(session, run, now):
+            won["id"] = await claim(winner, session_factory)
+            return True
+
+        loser._gates_allow = gates_then_lose_race
+        lost = await claim(loser, session_factory)
+        return run_id, won["id"], lost, loser.metrics, await statuses(session_factory)
+
+    (run_id, won, lost, loser_metrics, final), _ = run_with_db(tmp_path, monkeypatch, scenario)
+
+    assert won == run_id
+    assert lost is None
+    assert loser_metrics["claim_conflicts"] == 1 and loser_metrics["claimed"] == 0
+    assert final == {run_id: "running"}
+
+
+def test_one_live_run_per_service(tmp_path, monkeypatch):
+    async def scenario(session_factory):
+        first, second, other = await add_runs(session_factory, "api", "api", "db")
+        runner = ExecutionRunner()
+        claimed = [await claim(runner, session_factory) for _ in range(3)]
+        skipped_busy = await claim(ExecutionRunner(), session_factory, busy_services={"api"})
+        return (first, second, other), claimed, skipped_busy
+
+    ((first, second, other), claimed, skipped_busy), _ = run_with_db(tmp_path, monkeypatch, scenario)
+
+    # The second 'api' run waits while the first is running, even for a fresh runner
+    assert claimed == [first, other, None]
+    assert skipped_busy is None
+
+
+def test_dispatch_respects_the_concurrency_cap(tmp_path, monkeypatch):
+    async def scenario(session_factory):
+        await add_runs(session_factory, "a", "b", "c", "d")
+        runner = ExecutionRunner(max_concurrent=2, mode="concurrent")
+        release = asyncio.Event()
+        started = []
+
+        async def execute_run(session, run):
+            started.append(run.service)
+            await release.wait()
+
+        async def until_started(count):
+            while len(started) < count:
+                await asyncio.sleep(0.01)
+
+        runner._execute_run = execute_run
+        await runner._dispatch()
+        await asyncio.wait_for(until_started(2), timeout=5)
+        in_flight = (len(runner._inflight), sorted(runner._active_services), list(started))
+
+        release.set()
+        await asyncio.gather(*runner._inflight.values())
+        await runner._dispatch()
+        await asyncio.wait_for(until_started(4), timeout=5)
+        second_wave = sorted(started[2:])
+        await asyncio.gather(*runner._inflight.values())
+        return in_flight, second_wave, runner.metrics["claimed"]
+
+    (in_flight, second_wave, claimed), _ = run_with_db(tmp_path, monkeypatch, scenario)
+
+    assert in_flight == (2, ["a", "b"], ["a", "b"])
+    assert second_wave == ["c", "d"]
+    assert claimed == 4
+
+
+def test_approving_a_request_releases_its_runs_and_publishes(tmp_path, monkeypatch):
+    async def scenario(session_factory):
+        linked = await add_runs(session_factory, "api", "db", status="proposed", approval_request_id=7)
+        (unlinked,) = await add_runs(session_factory, "cache", status="proposed")
+        runner = ExecutionRunner()
+        async with session_factory() as session:
+            approved = await runner.approve_runs(session, approval_request_id=7, approved_by="alice")
+            again = await runner.approve_runs(session, approval_request_id=7)
+        return linked, unlinked, approved, again, runner._wakeup.is_set(), await statuses(session_factory)
+
+    (linked, unlinked, approved, again, woke, final), published = run_with_db(tmp_path, monkeypatch, scenario)
+
+    assert sorted(approved) == linked
+    assert again == []
+    assert woke
+    assert [final[run_id] for run_id in linked] == ["approved", "approved"]
+    assert final[unlinked] == "proposed"
+    assert {e.event_type for e in published} == {"self_heal.run_approved"}
+    assert sorted(e.payload["run_id"] for e in published) == linked
+    assert published[0].actor == "alice"
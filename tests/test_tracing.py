@@ -0,0 +1,120 @@
+"""Tests for request tracing: traceparent propagation and sampling"""
+
+import asyncio
+
+import pytest
+
+from backend.observability.tracing import RequestTracer, SpanContext, TRACEPARENT
+
+
+def test_traceparent_round_trip():
+    context = SpanContext(trace_id="a" * 32, span_id="b" * 16, sampled=False)
+    header = context.to_traceparent()
+
+    assert header == f"00-{'a' * 32}-{'b' * 16}-00"
+    assert SpanContext.from_traceparent(header) == context
+
+
+@pytest.mark.parametrize("value", [None, "", "00-abc-def-01", f"00-{'a' * 32}-{'b' * 16}-zz", 42])
+def test_malformed_traceparent_is_ignored(value):
+    assert SpanContext.from_traceparent(value) is None
+
+
+def test_inject_extract_continues_the_trace():
+    tracer = RequestTracer(sample_rate=1.0)
+
+    with tracer.span("producer") as producer:
+        carrier = tracer.inject({})
+
+    assert TRACEPARENT in carrier
+    with tracer.span("consumer", parent=tracer.extract(carrier)) as consumer:
+        pass
+
+    assert consumer.trace_id == producer.trace_id
+    assert consumer.parent_span_id == producer.span_id
+
+
+def test_require_parent_records_nothing_outside_a_trace():
+    tracer = RequestTracer(sample_rate=1.0)
+
+    with tracer.span("background", require_parent=True) as span:
+        assert span is None
+
+    assert tracer.stats["spans_started"] == 0
+
+
+def test_unsampled_fast_trace_is_dropped():
+    tracer = RequestTracer(sample_rate=0.0, slow_threshold_ms=10_000)
+
+    with tracer.span("request"):
+        with tracer.span("child"):
+            pass
+
+    assert tracer.stats["traces_dropped"] == 1
+    assert tracer.drain(10) == []
+
+
+def test_tail_sampling_keeps_failed_trace():
+    tracer = RequestTracer(sample_rate=0.0, slow_threshold_ms=10_000)
+
+    with pytest.raises(RuntimeError):
+        with tracer.span("request"):
+            with tracer.span("child"):
+                raise RuntimeError("boom")
+
+    assert tracer.stats["traces_kept_tail"] == 1
+    assert {span.operation_name for span in tracer.drain(10)} == {"request", "child"}
+
+
+def test_tail_sampling_keeps_slow_trace():
+    tracer = RequestTracer(sample_rate=0.0, slow_threshold_ms=0.0)
+
+    with tracer.span("request"):
+        pass
+
+    assert tracer.stats["traces_kept_tail"] == 1
+    assert tracer.recent_traces[-1]["kept_by"] == "latency"
+
+
+def test_sampled_flag_follows_the_context():
+    tracer = RequestTracer(sample_rate=0.0)
+    parent = SpanContext(trace_id="c" * 32, span_id="d" * 16, sampled=True)
+
+    with tracer.span("remote child", parent=parent) as span:
+        pass
+
+    assert span.sampled is True
+    assert tracer.stats["traces_kept_head"] == 1
+
+
+def test_spans_follow_asyncio_tasks():
+    tracer = RequestTracer(sample_rate=1.0)
+
+    async def child():
+        with tracer.span("child", require_parent=True) as span:
+            return span
+
+    async def run():
+        with tracer.span("request") as root:
+            span = await asyncio.create_task(child())
+        return root, span
+
+    root, span = asyncio.run(run())
+    assert span.parent_span_id == root.span_id
+
+
+def test_evicted_pending_trace_releases_its_open_spans():
+    tracer = RequestTracer(sample_rate=0.0, slow_threshold_ms=10_000, max_pending_traces=2)
+
+    # Requests that never finish, e.g. abandoned streams
+    abandoned = [tracer.open_span(f"request{i}") for i in range(5)]
+    with tracer.span("request"):
+        pass
+
+    assert tracer.stats["pending_evicted"] == 4
+    assert set(tracer.active_spans) == {span.span_id for span in abandoned[-1:]}
+    assert tracer.get_stats()["pending_traces"] == 1
+
+    # Closing an evicted span late is harmless
+    tracer.close_span(abandoned[0])
+    assert tracer.stats["traces_dropped"] == 1